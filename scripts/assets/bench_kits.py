@@ -0,0 +1,401 @@
+import argparse
+import functools
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+import bpy
+
+KIT_DIR = os.path.dirname(os.path.abspath(__file__))
+if KIT_DIR not in sys.path:
+    sys.path.append(KIT_DIR)
+
+import build_kits  # noqa: E402
+from kitlib import gltf_export, lod_metrics, manifest  # noqa: E402
+
+# ============================================================
+# Asset Kit Benchmark (Blender 5.0+)
+# Builds each kit --runs times, every run in its own headless Blender
+# with the build cache off, and records per kit:
+#   - wall time, and time per phase: the kit helpers (and kitlib calls)
+#     listed in PHASES are wrapped while the kit builds; a helper's time
+#     goes to its phase minus the time of wrapped helpers it calls, and
+#     whatever is left is "other"
+#   - peak RSS of the worker and bpy.data datablocks the build added
+#   - per asset and LOD: triangles, vertices and material count
+# Times and memory are the median over the runs; datablocks and
+# geometry come from the last run (builds are deterministic).
+#
+# Usage:
+#   blender --background --factory-startup \
+#       --python scripts/assets/bench_kits.py -- [options]
+#
+# Options (after "--"):
+#   --kits pier,crane       only benchmark these kits
+#   --skip seabed           skip these kits
+#   --runs N                builds per kit (default 3)
+#   --workdir PATH          where workers write their logs and results
+#   --report PATH           write the results as JSON
+#   --baseline PATH         compare against a report written earlier
+#   --update-baseline       write this run to --baseline instead
+#   --time-tolerance F      allowed growth of wall / phase time (0.25)
+#   --memory-tolerance F    allowed growth of peak RSS (0.15)
+#   --geometry-tolerance F  allowed growth of triangles / vertices and
+#                           datablock counts (0.02); material counts
+#                           may not grow at all
+#
+# A metric regresses when it exceeds baseline * (1 + tolerance), plus
+# MIN_SECONDS for times. Regressions are listed in the report and
+# printed; the exit status is 1 when any kit fails or regresses, so CI
+# can gate merges on it.
+# ============================================================
+
+DEFAULT_RUNS = 3
+DEFAULT_TOLERANCES = {"time": 0.25, "memory": 0.15, "geometry": 0.02}
+# Absolute slack on time comparisons, so millisecond phases don't flap.
+MIN_SECONDS = 0.05
+
+# Phase -> helpers that make it up. Bare names are kit module functions
+# (each kit defines its own copies); "module.name" are kitlib functions.
+PHASES = {
+    "parts": (
+        "add_box_part", "add_cylinder_part", "add_box", "add_cube", "add_cylinder",
+        "add_triangle_prism_xz", "create_trapezoid_prism_mesh", "create_grid_plane_mesh",
+        "make_rail", "make_rung", "make_hook", "make_rope_segment", "make_rope_u_loop",
+        "make_tire_torus", "make_tire_lod2_shell",
+    ),
+    "booleans": ("apply_boolean_difference", "booleans.difference"),
+    "join": (
+        "join_and_name", "join_objects", "join_meshes_no_ops", "merge_objects_evaluated",
+        "mesh_merge.merge_objects",
+    ),
+    "bevel": ("apply_bevel", "add_bevel"),
+    "convert": ("apply_modifiers_for_export",),
+    "shading": ("shade_smooth_with_autosmooth", "shade_smooth_auto", "shade_smooth"),
+    "simplify": ("duplicate_simplified", "lod_simplify.simplify"),
+    "normals": ("normal_bake.bake_normals",),
+}
+
+# bpy.data collections whose sizes are tracked.
+DATABLOCKS = (
+    "objects", "meshes", "materials", "images", "node_groups", "collections", "curves",
+)
+
+
+class PhaseTimer:
+    """Exclusive seconds and call counts per phase while helpers are wrapped."""
+
+    def __init__(self):
+        self.seconds = {phase: 0.0 for phase in PHASES}
+        self.calls = {phase: 0 for phase in PHASES}
+        # Time spent in wrapped callees, one slot per open wrapped call.
+        self._nested: List[float] = []
+
+    def wrap(self, phase: str, fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            self._nested.append(0.0)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                self.seconds[phase] += elapsed - self._nested.pop()
+                self.calls[phase] += 1
+                if self._nested:
+                    self._nested[-1] += elapsed
+        return timed
+
+    @contextmanager
+    def patched(self, module):
+        """Wrap module's PHASES helpers (and the kitlib ones) for the duration."""
+        saved = []
+        for phase, names in PHASES.items():
+            for name in names:
+                owner_name, _, attr = name.rpartition(".")
+                owner = sys.modules.get(f"kitlib.{owner_name}") if owner_name else module
+                fn = getattr(owner, attr, None) if owner is not None else None
+                if callable(fn):
+                    saved.append((owner, attr, fn))
+                    setattr(owner, attr, self.wrap(phase, fn))
+        try:
+            yield self
+        finally:
+            for owner, attr, fn in reversed(saved):
+                setattr(owner, attr, fn)
+
+    def totals(self, wall: float) -> Dict[str, float]:
+        totals = {phase: round(s, 4) for phase, s in self.seconds.items()}
+        totals["other"] = round(max(0.0, wall - sum(self.seconds.values())), 4)
+        return totals
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process, or None where unavailable."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS.
+    return round(peak / (1024.0 * 1024.0 if sys.platform == "darwin" else 1024.0), 1)
+
+
+def datablock_counts() -> Dict[str, int]:
+    return {name: len(getattr(bpy.data, name)) for name in DATABLOCKS}
+
+
+def asset_geometry(col: bpy.types.Collection) -> Dict[str, List[Dict[str, object]]]:
+    """Per asset in col, per LOD: triangles, vertices and materials."""
+    bpy.context.view_layer.update()
+    assets = {}
+    for name, roots in sorted(gltf_export.group_assets(col).items()):
+        nodes = manifest.lod_nodes(gltf_export.asset_objects(roots)) or {0: roots[0]}
+        rows = []
+        for level in sorted(nodes):
+            triangles, vertices, materials = manifest.mesh_counts(lod_metrics.surface_objects(nodes[level]))
+            rows.append({"lod": level, "triangles": triangles, "vertices": vertices,
+                         "materials": len(materials)})
+        assets[name] = rows
+    return assets
+
+
+def bench_once(name: str) -> Dict[str, object]:
+    """Build one kit in this session and measure it."""
+    result: Dict[str, object] = {"kit": name, "ok": True, "error": None}
+    before = datablock_counts()
+    timer = PhaseTimer()
+    start = time.perf_counter()
+    try:
+        build_kits.ensure_object_mode()
+        module = build_kits.load_kit(name)
+        with timer.patched(module):
+            module.main()
+    except Exception as exc:
+        result["ok"] = False
+        result["error"] = f"{type(exc).__name__}: {exc}"
+        traceback.print_exc()
+    result["seconds"] = round(time.perf_counter() - start, 4)
+    result["phases"] = timer.totals(result["seconds"])
+    result["calls"] = dict(timer.calls)
+    result["rss_mb"] = peak_rss_mb()
+    after = datablock_counts()
+    result["datablocks"] = {k: after[k] - before[k] for k in DATABLOCKS}
+
+    module = sys.modules.get(f"{name}_kit")
+    col = bpy.data.collections.get(module.COLLECTION_NAME) if module and result["ok"] else None
+    result["assets"] = asset_geometry(col) if col is not None else {}
+    return result
+
+
+# ------------------------------------------------------------
+# Runs
+# ------------------------------------------------------------
+def run_worker(name: str, run: int, workdir: str) -> Dict[str, object]:
+    stem = f"{name}_run{run}"
+    output = os.path.join(workdir, stem + ".json")
+    log_path = os.path.join(workdir, stem + ".log")
+    cmd = [
+        bpy.app.binary_path, "--background", "--factory-startup",
+        "--python", os.path.abspath(__file__), "--",
+        "--worker", "--kits", name, "--output", output,
+    ]
+    with open(log_path, "w", encoding="utf-8") as log:
+        proc = subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT)
+    if not os.path.exists(output):
+        return {"kit": name, "ok": False, "error": f"worker exited with {proc.returncode}, see {log_path}"}
+    with open(output, "r", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def _median(values: List[Optional[float]]) -> Optional[float]:
+    values = [v for v in values if v is not None]
+    return round(statistics.median(values), 4) if values else None
+
+
+def summarize(name: str, runs: List[Dict[str, object]]) -> Dict[str, object]:
+    failed = [r for r in runs if not r["ok"]]
+    done = [r for r in runs if r["ok"]]
+    summary: Dict[str, object] = {
+        "kit": name,
+        "ok": not failed,
+        "error": failed[0]["error"] if failed else None,
+        "runs": len(done),
+    }
+    if not done:
+        return summary
+    summary["seconds"] = _median([r["seconds"] for r in done])
+    summary["seconds_min"] = min(r["seconds"] for r in done)
+    summary["phases"] = {p: _median([r["phases"][p] for r in done]) for p in done[-1]["phases"]}
+    summary["calls"] = done[-1]["calls"]
+    summary["rss_mb"] = _median([r["rss_mb"] for r in done])
+    summary["datablocks"] = done[-1]["datablocks"]
+    summary["assets"] = done[-1]["assets"]
+    return summary
+
+
+# ------------------------------------------------------------
+# Baseline comparison
+# ------------------------------------------------------------
+def compare(kits: List[Dict[str, object]], baseline: Dict[str, object],
+            tolerances: Dict[str, float]) -> List[Dict[str, object]]:
+    """Every metric of kits that grew past its tolerance over baseline."""
+    regressions: List[Dict[str, object]] = []
+
+    def check(kit: str, metric: str, old, new, tolerance: float, slack: float = 0.0):
+        if old is None or new is None:
+            return
+        limit = old * (1.0 + tolerance) + slack
+        if new > limit:
+            regressions.append({"kit": kit, "metric": metric, "baseline": old, "current": new,
+                                "limit": round(limit, 4)})
+
+    previous = {k["kit"]: k for k in baseline.get("kits", [])}
+    for current in kits:
+        name = str(current["kit"])
+        old = previous.get(name)
+        if old is None or not old.get("ok") or not current["ok"]:
+            continue
+        check(name, "seconds", old.get("seconds"), current.get("seconds"), tolerances["time"], MIN_SECONDS)
+        for phase, seconds in current.get("phases", {}).items():
+            check(name, f"phases.{phase}", old.get("phases", {}).get(phase), seconds,
+                  tolerances["time"], MIN_SECONDS)
+        check(name, "rss_mb", old.get("rss_mb"), current.get("rss_mb"), tolerances["memory"])
+        for block, count in current.get("datablocks", {}).items():
+            check(name, f"datablocks.{block}", old.get("datablocks", {}).get(block), count,
+                  tolerances["geometry"])
+
+        for asset, old_lods in old.get("assets", {}).items():
+            if asset not in current.get("assets", {}):
+                regressions.append({"kit": name, "metric": asset, "baseline": "present",
+                                    "current": "missing", "limit": None})
+                continue
+            new_lods = {row["lod"]: row for row in current["assets"][asset]}
+            for row in old_lods:
+                new = new_lods.get(row["lod"])
+                prefix = f"{asset}.lod{row['lod']}"
+                if new is None:
+                    regressions.append({"kit": name, "metric": prefix, "baseline": "present",
+                                        "current": "missing", "limit": None})
+                    continue
+                check(name, f"{prefix}.triangles", row["triangles"], new["triangles"], tolerances["geometry"])
+                check(name, f"{prefix}.vertices", row["vertices"], new["vertices"], tolerances["geometry"])
+                check(name, f"{prefix}.materials", row["materials"], new["materials"], 0.0)
+    return regressions
+
+
+def print_report(kits: List[Dict[str, object]], regressions: List[Dict[str, object]]):
+    width = max([len("Kit")] + [len(str(k["kit"])) for k in kits])
+    print("")
+    print(f"{'Kit'.ljust(width)}  {'Median s':>9}  {'Peak MB':>8}  {'LOD0 tris':>10}  Status")
+    for k in kits:
+        status = "ok" if k["ok"] else f"FAILED ({k['error']})"
+        rss = f"{k['rss_mb']:8.1f}" if k.get("rss_mb") is not None else f"{'-':>8}"
+        tris = sum(rows[0]["triangles"] for rows in k.get("assets", {}).values() if rows)
+        seconds = k.get("seconds")
+        seconds = f"{seconds:9.3f}" if seconds is not None else f"{'-':>9}"
+        print(f"{str(k['kit']).ljust(width)}  {seconds}  {rss}  {tris:10d}  {status}")
+        phases = k.get("phases")
+        if phases:
+            print(" " * (width + 2) + "  ".join(f"{p} {s:.3f}" for p, s in phases.items() if s))
+
+    if regressions:
+        print("")
+        print(f"{len(regressions)} regression(s) against the baseline:")
+        for r in regressions:
+            limit = f" (limit {r['limit']})" if r["limit"] is not None else ""
+            print(f"  {r['kit']}  {r['metric']}: {r['baseline']} -> {r['current']}{limit}")
+
+
+# ------------------------------------------------------------
+# CLI
+# ------------------------------------------------------------
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    # Blender passes its own flags first; ours follow the "--" separator.
+    if "--" in argv:
+        argv = argv[argv.index("--") + 1:]
+    else:
+        argv = []
+
+    parser = argparse.ArgumentParser(prog="bench_kits.py")
+    parser.add_argument("--kits", help="comma-separated kit names to benchmark")
+    parser.add_argument("--skip", help="comma-separated kit names to skip")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="builds per kit")
+    parser.add_argument("--workdir", help="directory for worker logs and results")
+    parser.add_argument("--report", help="write the results to this JSON path")
+    parser.add_argument("--baseline", help="compare against this earlier report")
+    parser.add_argument("--update-baseline", action="store_true", help="write this run to --baseline")
+    parser.add_argument("--time-tolerance", type=float, default=DEFAULT_TOLERANCES["time"])
+    parser.add_argument("--memory-tolerance", type=float, default=DEFAULT_TOLERANCES["memory"])
+    parser.add_argument("--geometry-tolerance", type=float, default=DEFAULT_TOLERANCES["geometry"])
+    # Internal: set by run_worker for each child process.
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--output", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args(sys.argv)
+    # Measure real builds; workers inherit this through the environment.
+    os.environ["ASSET_KIT_CACHE"] = "0"
+
+    if args.worker:
+        result = bench_once(args.kits)
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(result, fh, indent=2)
+        return
+
+    if args.update_baseline and not args.baseline:
+        raise SystemExit("--update-baseline needs --baseline")
+    kits = build_kits.select_kits(build_kits.discover_kits(), build_kits.split_names(args.kits),
+                                  build_kits.split_names(args.skip))
+    workdir = args.workdir or tempfile.mkdtemp(prefix="kit_bench_")
+    os.makedirs(workdir, exist_ok=True)
+    print(f"Benchmarking {len(kits)} kit(s), {args.runs} run(s) each; output in {workdir}")
+
+    results = []
+    for name in kits:
+        runs = [run_worker(name, i, workdir) for i in range(args.runs)]
+        results.append(summarize(name, runs))
+
+    tolerances = {"time": args.time_tolerance, "memory": args.memory_tolerance,
+                  "geometry": args.geometry_tolerance}
+    report: Dict[str, object] = {
+        "blender": bpy.app.version_string,
+        "runs": args.runs,
+        "tolerances": tolerances,
+        "kits": results,
+        "baseline": None,
+        "regressions": [],
+    }
+    if args.baseline and not args.update_baseline:
+        if os.path.exists(args.baseline):
+            with open(args.baseline, "r", encoding="utf-8") as fh:
+                report["baseline"] = os.path.abspath(args.baseline)
+                report["regressions"] = compare(results, json.load(fh), tolerances)
+        else:
+            print(f"No baseline at {args.baseline}; nothing to compare against.")
+
+    print_report(results, report["regressions"])
+
+    paths = [args.report] if args.report else []
+    if args.update_baseline:
+        paths.append(args.baseline)
+    for path in paths:
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+            fh.write("\n")
+
+    if not all(r["ok"] for r in results) or report["regressions"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,15 @@
 import bpy
 import math
+import os
+import sys
 from mathutils import Vector
 
+KIT_DIR = os.path.dirname(os.path.abspath(__file__))
+if KIT_DIR not in sys.path:
+    sys.path.append(KIT_DIR)
+
+from kitlib import lod_simplify, mesh_merge, primitives, trace  # noqa: E402
+
 # ----------------------------
 # Config / Conventions
 # ----------------------------
@@ -16,10 +24,10 @@ VARIANTS = [
     ("Bollard_Heavy",    0.50, 0.42, 0.40, 0.95, 0.07, 0.14, 0.28, 0.56),
 ]
 
-# LOD decimation ratios (applied to duplicates)
-LOD_RATIOS = [
-    ("LOD1", 0.45),
-    ("LOD2", 0.20),
+# LOD simplification targets (kitlib.lod_simplify): max_error in meters and/or max_triangles
+LOD_TARGETS = [
+    ("LOD1", {"max_error": 0.003}),
+    ("LOD2", {"max_error": 0.01}),
 ]
 
 # Cylinder segment counts
@@ -153,6 +161,7 @@ def add_custom_props(obj: bpy.types.Object, asset_role: str):
     obj["forward_axis"] = FORWARD_AXIS
 
 
+@trace.traced
 def shade_smooth_with_autosmooth(obj: bpy.types.Object, angle_deg: float = 40.0):
     if obj.type != 'MESH':
         return
@@ -165,6 +174,13 @@ def shade_smooth_with_autosmooth(obj: bpy.types.Object, angle_deg: float = 40.0)
     
     obj.select_set(False)
 
+@trace.traced
+def apply_modifiers_for_export(obj: bpy.types.Object):
+    bpy.context.view_layer.objects.active = obj
+    obj.select_set(True)
+    bpy.ops.object.convert(target='MESH')  # applies modifiers
+    obj.select_set(False)
+
 def get_or_create_metal_material(name: str = METAL_MATERIAL_NAME) -> bpy.types.Material:
     mat = bpy.data.materials.get(name)
     if mat is None:
@@ -205,40 +221,27 @@ def build_bollard_mesh(name: str, base_d: float, body_d: float, top_d: float,
     - cap (short cylinder)
     - two horns (cylinders)
     """
-    deselect_all()
-
     # Base flange
-    bpy.ops.mesh.primitive_cylinder_add(
-        vertices=segments, radius=base_d * 0.5, depth=cap_h, location=(0, 0, cap_h * 0.5)
+    base = primitives.add_cylinder(
+        f"{name}__base", base_d * 0.5, cap_h, (0, 0, cap_h * 0.5), col, vertices=segments
     )
-    base = bpy.context.active_object
-    base.name = f"{name}__base"
-    force_into_collection(base, col)
 
     # Body (tapered) as a truncated cone
     body_h = max(0.01, height - (cap_h * 2.0))  # leave room for base + cap
-    bpy.ops.mesh.primitive_cone_add(
+    body = primitives.add_cone(
+        f"{name}__body",
+        body_d * 0.5,     # bottom radius
+        top_d * 0.5,      # top radius
+        body_h,
+        (0, 0, cap_h + body_h * 0.5),
+        col,
         vertices=segments,
-        radius1=body_d * 0.5,     # bottom radius
-        radius2=top_d * 0.5,      # top radius
-        depth=body_h,
-        location=(0, 0, cap_h + body_h * 0.5)
     )
-    body = bpy.context.active_object
-    body.name = f"{name}__body"
-    force_into_collection(body, col)
 
     # Cap (small cylinder on top)
-    bpy.ops.mesh.primitive_cylinder_add(
-        vertices=segments,
-        radius=top_d * 0.5,
-        depth=cap_h,
-        location=(0, 0, cap_h + body_h + cap_h * 0.5)
+    cap = primitives.add_cylinder(
+        f"{name}__cap", top_d * 0.5, cap_h, (0, 0, cap_h + body_h + cap_h * 0.5), col, vertices=segments
     )
-    
-    cap = bpy.context.active_object
-    cap.name = f"{name}__cap"
-    force_into_collection(cap, col)
 
     # Horns: two cylinders crossing along X
     # Keep horns slightly embedded for a welded look; add a small collar/flare.
@@ -247,70 +250,36 @@ def build_bollard_mesh(name: str, base_d: float, body_d: float, top_d: float,
     horn_offset = (body_d * 0.5) + (horn_len_eff * 0.5) - embed
     collar_r = horn_d * 0.65
     collar_h = max(0.012, horn_d * 0.25)
+    horn_segments = max(16, segments // 3)
+    along_x = (0, math.radians(90), 0)  # rotate so depth aligns with X
     # Left horn
-    bpy.ops.mesh.primitive_cylinder_add(
-        vertices=max(16, segments // 3),
-        radius=horn_d * 0.5,
-        depth=horn_len_eff,
-        location=(0, 0, horn_z),
-        rotation=(0, math.radians(90), 0)  # rotate so depth aligns with X
+    horn1 = primitives.add_cylinder(
+        f"{name}__horn1", horn_d * 0.5, horn_len_eff, (-horn_offset, 0, horn_z), col,
+        rotation=along_x, vertices=horn_segments,
     )
-    
-    horn1 = bpy.context.active_object
-    horn1.name = f"{name}__horn1"
-    horn1.location.x = -horn_offset
-    force_into_collection(horn1, col)
 
     # Collar for horn1
-    bpy.ops.mesh.primitive_cylinder_add(
-        vertices=max(16, segments // 3),
-        radius=collar_r,
-        depth=collar_h,
-        location=(-body_d * 0.5, 0, horn_z),
-        rotation=(0, math.radians(90), 0)
+    collar1 = primitives.add_cylinder(
+        f"{name}__collar1", collar_r, collar_h, (-body_d * 0.5, 0, horn_z), col,
+        rotation=along_x, vertices=horn_segments,
     )
-    collar1 = bpy.context.active_object
-    collar1.name = f"{name}__collar1"
-    force_into_collection(collar1, col)
 
     # Right horn
-    bpy.ops.mesh.primitive_cylinder_add(
-        vertices=max(16, segments // 3),
-        radius=horn_d * 0.5,
-        depth=horn_len_eff,
-        location=(0, 0, horn_z),
-        rotation=(0, math.radians(90), 0)
+    horn2 = primitives.add_cylinder(
+        f"{name}__horn2", horn_d * 0.5, horn_len_eff, (horn_offset, 0, horn_z), col,
+        rotation=along_x, vertices=horn_segments,
     )
-    
-    horn2 = bpy.context.active_object
-    horn2.name = f"{name}__horn2"
-    horn2.location.x = horn_offset
-    force_into_collection(horn2, col)
 
     # Collar for horn2
-    bpy.ops.mesh.primitive_cylinder_add(
-        vertices=max(16, segments // 3),
-        radius=collar_r,
-        depth=collar_h,
-        location=(body_d * 0.5, 0, horn_z),
-        rotation=(0, math.radians(90), 0)
+    collar2 = primitives.add_cylinder(
+        f"{name}__collar2", collar_r, collar_h, (body_d * 0.5, 0, horn_z), col,
+        rotation=along_x, vertices=horn_segments,
     )
-    collar2 = bpy.context.active_object
-    collar2.name = f"{name}__collar2"
-    force_into_collection(collar2, col)
-
-    ensure_object_mode()
 
     # Join parts into one mesh
+    obj = mesh_merge.merge_objects((base, body, cap, horn1, horn2, collar1, collar2), name)
+    ensure_object_mode()
     deselect_all()
-    for o in (base, body, cap, horn1, horn2, collar1, collar2):
-        o.select_set(True)
-    bpy.context.view_layer.objects.active = base
-    bpy.ops.object.join()
-    obj = bpy.context.active_object
-    obj.name = name
-    if obj.data:
-        obj.data.name = name
 
     # Cleanup: bevel to catch highlights
     bevel = obj.modifiers.new(name="Bevel", type='BEVEL')
@@ -324,10 +293,7 @@ def build_bollard_mesh(name: str, base_d: float, body_d: float, top_d: float,
     wn.keep_sharp = True
 
     # Apply modifiers for export-friendly meshes (optional; keep applied here)
-    bpy.context.view_layer.objects.active = obj
-    obj.select_set(True)
-    bpy.ops.object.convert(target='MESH')
-    obj.select_set(False)
+    apply_modifiers_for_export(obj)
 
     set_origin_to_base_center(obj)
     shade_smooth_with_autosmooth(obj, 35.0)
@@ -338,14 +304,9 @@ def build_bollard_mesh(name: str, base_d: float, body_d: float, top_d: float,
 
 
 def create_collision_cylinder(parent: bpy.types.Object, name: str, radius: float, height: float, col: bpy.types.Collection):
-    deselect_all()
-    bpy.ops.mesh.primitive_cylinder_add(
-        vertices=SEGMENTS_COLLIDER, radius=radius, depth=height, location=(0, 0, height * 0.5)
+    collider = primitives.add_cylinder(
+        f"COLLIDER_{name}", radius, height, (0, 0, height * 0.5), col, vertices=SEGMENTS_COLLIDER
     )
-    
-    collider = bpy.context.active_object
-    force_into_collection(collider, col)
-    collider.name = f"COLLIDER_{name}"
     set_origin_to_base_center(collider)
     add_custom_props(collider, "collision")
 
@@ -359,21 +320,15 @@ def create_collision_cylinder(parent: bpy.types.Object, name: str, radius: float
     return collider
 
 
-def duplicate_with_decimate(src: bpy.types.Object, new_name: str, ratio: float, col: bpy.types.Collection) -> bpy.types.Object:
-    deselect_all()
+@trace.traced
+def duplicate_simplified(src: bpy.types.Object, new_name: str, target: dict, col: bpy.types.Collection) -> bpy.types.Object:
     dup = src.copy()
     dup.data = src.data.copy()
     dup.name = new_name
     bpy.context.collection.objects.link(dup)
     force_into_collection(dup, col)
 
-    dec = dup.modifiers.new(name="Decimate", type='DECIMATE')
-    dec.ratio = ratio
-
-    bpy.context.view_layer.objects.active = dup
-    dup.select_set(True)
-    bpy.ops.object.convert(target='MESH')  # applies modifiers
-    dup.select_set(False)
+    lod_simplify.simplify(dup, src, **target)
 
     add_custom_props(dup, "visual_lod")
     assign_material(dup, get_or_create_metal_material())
@@ -431,8 +386,8 @@ def main():
         col.objects.link(collider)
 
         # LOD1 / LOD2
-        for lod_name, ratio in LOD_RATIOS:
-            lod = duplicate_with_decimate(lod0, f"{name}_{lod_name}", ratio, col)
+        for lod_name, target in LOD_TARGETS:
+            lod = duplicate_simplified(lod0, f"{name}_{lod_name}", target, col)
             lod["asset_name"] = name
             lod["lod"] = int(lod_name[-1])  # "LOD1" -> 1, "LOD2" -> 2
 
@@ -1,6 +1,14 @@
 import bpy
 import bmesh
 import math
+import os
+import sys
+
+KIT_DIR = os.path.dirname(os.path.abspath(__file__))
+if KIT_DIR not in sys.path:
+    sys.path.append(KIT_DIR)
+
+from kitlib import convex_decomp, trace  # noqa: E402
 
 # ============================================================
 # Breakwater Straight Segment Kit (Blender 5.0+)
@@ -31,10 +39,12 @@ LOD_SETTINGS = {
     "lod2": {"subdiv": 0, "disp_strength": 0.00, "disp_mid": 0.0, "noise_scale": 0.0},
 }
 
-# Collider: simple box (very cheap)
-COLLIDER_HEIGHT = HEIGHT
-COLLIDER_WIDTH = BASE_W
-COLLIDER_LENGTH = L
+# Collider: convex decomposition of LOD1 (kitlib.convex_decomp), so the
+# toe follows the rubble instead of a box spanning the full base width.
+# Error is hull volume beyond the solid, as a fraction of it.
+COLLIDER_MAX_HULLS = 6
+COLLIDER_MAX_ERROR = 0.1
+COLLIDER_MAX_VERTICES = 32
 
 # ------------------------------------------------------------
 # Helpers
@@ -227,6 +237,7 @@ def add_lod_modifiers(obj: bpy.types.Object, lod_key: str):
     wn = obj.modifiers.new(name="WEIGHTED_NORMAL", type="WEIGHTED_NORMAL")
     wn.keep_sharp = True
 
+@trace.traced
 def apply_modifiers_for_export(obj: bpy.types.Object):
     ensure_object_mode()
     deselect_all()
@@ -238,41 +249,16 @@ def apply_modifiers_for_export(obj: bpy.types.Object):
 # ------------------------------------------------------------
 # Collider + Snap empties
 # ------------------------------------------------------------
-def create_collider(col: bpy.types.Collection):
-    mesh = bpy.data.meshes.new(f"COLLIDER_{ASSET_BASE_NAME}_mesh")
-    bm = bmesh.new()
-
-    w = COLLIDER_WIDTH * 0.5
-    h = COLLIDER_HEIGHT
-    # collider along y=0..L
-    # 8 verts for a box
-    v0 = bm.verts.new((-w, 0.0, 0.0))
-    v1 = bm.verts.new(( w, 0.0, 0.0))
-    v2 = bm.verts.new(( w, 0.0, h))
-    v3 = bm.verts.new((-w, 0.0, h))
-
-    v4 = bm.verts.new((-w, L, 0.0))
-    v5 = bm.verts.new(( w, L, 0.0))
-    v6 = bm.verts.new(( w, L, h))
-    v7 = bm.verts.new((-w, L, h))
-
-    bm.faces.new((v0, v1, v2, v3))
-    bm.faces.new((v5, v4, v7, v6))
-    bm.faces.new((v0, v4, v5, v1))
-    bm.faces.new((v3, v2, v6, v7))
-    bm.faces.new((v0, v3, v7, v4))
-    bm.faces.new((v1, v5, v6, v2))
-
-    bm.normal_update()
-    bm.to_mesh(mesh)
-    bm.free()
-
-    obj = bpy.data.objects.new(f"COLLIDER_{ASSET_BASE_NAME}", mesh)
-    link_only_to_collection(obj, col)
-    obj.display_type = 'WIRE'
-    obj.hide_render = True
-    add_custom_props(obj, "collision")
-    return obj
+def create_collider(parent: bpy.types.Object, source: bpy.types.Object, col: bpy.types.Collection):
+    """Convex hulls around the displaced LOD1 mesh, parented to LOD0."""
+    colliders = convex_decomp.create_hull_colliders(
+        parent, ASSET_BASE_NAME, source, col,
+        max_hulls=COLLIDER_MAX_HULLS, max_error=COLLIDER_MAX_ERROR,
+        max_vertices=COLLIDER_MAX_VERTICES,
+    )
+    for obj in colliders:
+        add_custom_props(obj, "collision")
+    return colliders
 
 def create_snap_empty(name: str, location, col: bpy.types.Collection):
     e = bpy.data.objects.new(name, None)
@@ -321,9 +307,8 @@ def main():
     lod1.parent = lod0
     lod2.parent = lod0
 
-    # Collider (separate node)
-    collider = create_collider(col)
-    collider.parent = lod0
+    # Collider (separate nodes, one per hull)
+    create_collider(lod0, lod1, col)
 
     # Snap points
     snap_start = create_snap_empty(f"SNAP_START_{ASSET_BASE_NAME}", (0.0, 0.0, 0.0), col)
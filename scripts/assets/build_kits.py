@@ -0,0 +1,482 @@
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import bpy
+
+KIT_DIR = os.path.dirname(os.path.abspath(__file__))
+if KIT_DIR not in sys.path:
+    sys.path.append(KIT_DIR)
+
+from kitlib import blend_io, booleans, colliders, convex_decomp, gltf_export, lod_metrics, lod_simplify, manifest, trace  # noqa: E402
+
+# ============================================================
+# Asset Kit Batch Driver (Blender 5.0+)
+# Builds every *_kit.py in this folder in one headless session,
+# so Blender startup and addon init are paid once per run.
+#
+# Usage:
+#   blender --background --factory-startup \
+#       --python scripts/assets/build_kits.py -- [options]
+#
+# Options (after "--"):
+#   --kits pier,crane   only build these kits (file stem without "_kit")
+#   --skip seabed       skip these kits
+#   --jobs N            farm kits (and per-asset presets) out to N workers
+#   --workdir PATH      where parallel workers write their .blend files
+#   --no-cache          rebuild every asset, ignoring kitlib.build_cache
+#   --cache-dir PATH    build cache location (default scripts/assets/.cache)
+#   --save PATH         save the resulting .blend
+#   --report PATH       write per-kit timings as JSON, with per-target
+#                       boolean timings from kitlib.booleans, achieved
+#                       simplification ratio / error per LOD from
+#                       kitlib.lod_simplify, LOD errors / switch
+#                       distances from kitlib.lod_metrics, compound
+#                       collider sizes from kitlib.colliders and hull
+#                       counts / volume error from kitlib.convex_decomp
+#   --export DIR        write every asset as DIR/<kit>/<asset>.glb with its
+#                       LODs, collider and snaps (see kitlib.gltf_export),
+#                       indexed by DIR/manifest.json and DIR/manifest.bin
+#                       (see kitlib.manifest)
+#   --compress MODE     none (default), draco or meshopt for --export
+#
+# Tracing: with ASSET_KIT_TRACE=<path.json> in the environment, the
+# kit helpers decorated with kitlib.trace.traced record nested spans
+# (asset, LOD, part counts) and the run ends by writing them, workers'
+# spans included, as Chrome trace-event JSON to that path.
+#
+# Parallel mode: kits that expose asset_names() are split into one
+# job per asset, every other kit is one job. Each job runs in its own
+# headless Blender, writes its kit collection to a .blend, and this
+# session appends the results back into the kit collections. Kits with
+# a finalize() (e.g. to pack a shared normal atlas) get it called again
+# once every worker's output is merged.
+# ============================================================
+
+KIT_SUFFIX = "_kit.py"
+SLOWEST_BOOLEANS = 10
+
+
+def discover_kits() -> List[str]:
+    names = []
+    for filename in sorted(os.listdir(KIT_DIR)):
+        if filename.endswith(KIT_SUFFIX):
+            names.append(filename[: -len(KIT_SUFFIX)])
+    return names
+
+
+def load_kit(name: str):
+    """Import a kit fresh from disk, so a rerun in the same session sees edits."""
+    module_name = f"{name}_kit"
+    path = os.path.join(KIT_DIR, module_name + ".py")
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    if not hasattr(module, "main"):
+        raise RuntimeError(f"Kit '{name}' has no main()")
+    return module
+
+
+def ensure_object_mode():
+    obj = bpy.context.view_layer.objects.active
+    if obj and obj.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+
+def run_kit(name: str, assets: Optional[List[str]] = None) -> Dict[str, object]:
+    result: Dict[str, object] = {"kit": name, "ok": True, "seconds": 0.0, "error": None}
+    booleans.take_report()
+    lod_simplify.take_report()
+    colliders.take_report()
+    convex_decomp.take_report()
+    start = time.perf_counter()
+    try:
+        ensure_object_mode()
+        module = load_kit(name)
+        with trace.span(f"{name}_kit", assets=",".join(assets) if assets else None):
+            if assets:
+                module.main(only=assets)
+            else:
+                module.main()
+    except Exception as exc:
+        result["ok"] = False
+        result["error"] = f"{type(exc).__name__}: {exc}"
+        traceback.print_exc()
+    result["seconds"] = round(time.perf_counter() - start, 4)
+    result["booleans"] = booleans.take_report()
+    result["simplify"] = lod_simplify.take_report()
+    result["colliders"] = colliders.take_report()
+    result["hulls"] = convex_decomp.take_report()
+    return result
+
+
+# ------------------------------------------------------------
+# Parallel build
+# ------------------------------------------------------------
+def plan_jobs(kits: List[str]) -> List[Dict[str, object]]:
+    jobs = []
+    for name in kits:
+        module = load_kit(name)
+        if hasattr(module, "asset_names"):
+            for asset in module.asset_names():
+                jobs.append({"kit": name, "assets": [asset]})
+        else:
+            jobs.append({"kit": name, "assets": None})
+    return jobs
+
+
+def job_label(job: Dict[str, object]) -> str:
+    if job["assets"]:
+        return f"{job['kit']}:{','.join(job['assets'])}"
+    return str(job["kit"])
+
+
+def run_worker_job(job: Dict[str, object], workdir: str) -> Dict[str, object]:
+    stem = job_label(job).replace(":", "__").replace(",", "_")
+    output = os.path.join(workdir, stem + ".blend")
+    log_path = os.path.join(workdir, stem + ".log")
+    report_path = os.path.join(workdir, stem + ".json")
+    trace_path = os.path.join(workdir, stem + ".trace.json")
+
+    cmd = [
+        bpy.app.binary_path, "--background", "--factory-startup",
+        "--python", os.path.abspath(__file__), "--",
+        "--worker", "--kits", str(job["kit"]), "--output", output,
+        "--report", report_path,
+    ]
+    if job["assets"]:
+        cmd += ["--assets", ",".join(job["assets"])]
+
+    env = dict(os.environ)
+    if trace.enabled():
+        env[trace.ENV_VAR] = trace_path
+
+    start = time.perf_counter()
+    with open(log_path, "w", encoding="utf-8") as log:
+        proc = subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT, env=env)
+    trace.merge(trace_path)
+
+    ok = proc.returncode == 0 and os.path.exists(output)
+    worker_report: Dict[str, object] = {}
+    if os.path.exists(report_path):
+        with open(report_path, "r", encoding="utf-8") as fh:
+            worker_report = json.load(fh)
+    return {
+        "kit": job["kit"],
+        "assets": job["assets"],
+        "ok": ok,
+        "seconds": round(time.perf_counter() - start, 4),
+        "error": None if ok else f"worker exited with {proc.returncode}, see {log_path}",
+        "output": output if ok else None,
+        "booleans": worker_report.get("booleans", []),
+        "simplify": worker_report.get("simplify", []),
+        "colliders": worker_report.get("colliders", []),
+        "hulls": worker_report.get("hulls", []),
+    }
+
+
+def worker_main(args: argparse.Namespace):
+    kits = split_names(args.kits)
+    if len(kits) != 1 or not args.output:
+        raise SystemExit("--worker needs exactly one --kits entry and --output")
+
+    assets = split_names(args.assets) or None
+    trace.label(job_label({"kit": kits[0], "assets": assets}))
+    result = run_kit(kits[0], assets)
+    trace.save()
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as fh:
+            json.dump(result, fh, indent=2)
+    if not result["ok"]:
+        sys.exit(1)
+
+    module = sys.modules[f"{kits[0]}_kit"]
+    col = bpy.data.collections.get(module.COLLECTION_NAME)
+    if col is None:
+        raise SystemExit(f"Kit '{kits[0]}' produced no '{module.COLLECTION_NAME}' collection")
+    bpy.data.libraries.write(args.output, {col}, fake_user=True)
+
+
+def remove_collection_tree(col: bpy.types.Collection):
+    for child in list(col.children):
+        remove_collection_tree(child)
+    for obj in list(col.objects):
+        bpy.data.objects.remove(obj, do_unlink=True)
+    bpy.data.collections.remove(col)
+
+
+def merge_worker_output(path: str, collection_name: str):
+    before = blend_io.snapshot_id_names()
+
+    with bpy.data.libraries.load(path, link=False) as (data_from, data_to):
+        data_to.collections = [n for n in data_from.collections if n == collection_name]
+    loaded = [c for c in data_to.collections if c is not None]
+    if not loaded:
+        raise RuntimeError(f"{path} has no '{collection_name}' collection")
+    src = loaded[0]
+
+    blend_io.dedupe_loaded_ids(before)
+
+    scene_root = bpy.context.scene.collection
+    target = bpy.data.collections.get(collection_name)
+    if target is src:
+        # First result for this kit keeps the loaded collection as-is.
+        if src.name not in scene_root.children:
+            scene_root.children.link(src)
+        return
+
+    if target.name not in scene_root.children:
+        scene_root.children.link(target)
+    for obj in list(src.objects):
+        target.objects.link(obj)
+        src.objects.unlink(obj)
+    for child in list(src.children):
+        target.children.link(child)
+        src.children.unlink(child)
+    bpy.data.collections.remove(src)
+
+
+def run_parallel(kits: List[str], jobs: int, workdir: str) -> List[Dict[str, object]]:
+    os.makedirs(workdir, exist_ok=True)
+    planned = plan_jobs(kits)
+    print(f"Running {len(planned)} job(s) for {len(kits)} kit(s) on {jobs} worker(s); output in {workdir}")
+
+    # Threads only wait on the Blender subprocesses, so a thread pool is enough.
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        results = list(pool.map(lambda job: run_worker_job(job, workdir), planned))
+
+    for name in kits:
+        module = sys.modules[f"{name}_kit"]
+        existing = bpy.data.collections.get(module.COLLECTION_NAME)
+        if existing is not None:
+            remove_collection_tree(existing)
+        if hasattr(module, "ensure_units_meters"):
+            module.ensure_units_meters()
+
+    for r in results:
+        if not r["ok"]:
+            continue
+        module = sys.modules[f"{r['kit']}_kit"]
+        try:
+            merge_worker_output(str(r["output"]), module.COLLECTION_NAME)
+        except Exception as exc:
+            r["ok"] = False
+            r["error"] = f"merge failed: {type(exc).__name__}: {exc}"
+            traceback.print_exc()
+
+    for name in kits:
+        module = sys.modules[f"{name}_kit"]
+        if hasattr(module, "finalize"):
+            module.finalize()
+    return results
+
+
+def measure_lods(kits: List[str], results: List[Dict[str, object]]) -> Dict[str, List[Dict[str, object]]]:
+    """Run kitlib.lod_metrics over each successfully built kit collection."""
+    failed = {r["kit"] for r in results if not r["ok"]}
+    lods: Dict[str, List[Dict[str, object]]] = {}
+    for name in kits:
+        module = sys.modules.get(f"{name}_kit")
+        col = bpy.data.collections.get(module.COLLECTION_NAME) if module else None
+        if name in failed or col is None:
+            continue
+        try:
+            lods[name] = lod_metrics.measure_collection(col)
+        except Exception:
+            traceback.print_exc()
+    return lods
+
+
+def export_kits(kits: List[str], results: List[Dict[str, object]], out_dir: str,
+                compression: str) -> Tuple[Dict[str, object], List[Dict[str, object]]]:
+    """Write one GLB per asset of each successfully built kit; kits may
+    provide export_asset_glb(path, objects) for their own layout.
+    Returns the written files per kit and the manifest entries."""
+    failed = {r["kit"] for r in results if not r["ok"]}
+    exported: Dict[str, object] = {}
+    assets: List[Dict[str, object]] = []
+    for name in kits:
+        module = sys.modules.get(f"{name}_kit")
+        col = bpy.data.collections.get(module.COLLECTION_NAME) if module else None
+        if name in failed or col is None:
+            continue
+        hook = getattr(module, "export_asset_glb", None)
+        try:
+            records = gltf_export.export_collection(col, os.path.join(out_dir, name), compression, hook)
+            files = {r["asset"]: r["path"] for r in records}
+            assets += manifest.describe_collection(name, col, out_dir, files)
+            exported[name] = records
+        except Exception as exc:
+            traceback.print_exc()
+            exported[name] = {"error": f"{type(exc).__name__}: {exc}"}
+    return exported, assets
+
+
+# ------------------------------------------------------------
+# CLI
+# ------------------------------------------------------------
+def split_names(value: Optional[str]) -> List[str]:
+    if not value:
+        return []
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def select_kits(available: List[str], only: List[str], skip: List[str]) -> List[str]:
+    unknown = [n for n in only + skip if n not in available]
+    if unknown:
+        raise SystemExit(f"Unknown kit(s): {', '.join(unknown)}. Available: {', '.join(available)}")
+    selected = only if only else available
+    return [n for n in available if n in selected and n not in skip]
+
+
+def print_report(results: List[Dict[str, object]], total_seconds: float):
+    labels = [job_label(r) if r.get("assets") else str(r["kit"]) for r in results]
+    width = max([len("Kit")] + [len(label) for label in labels])
+    print("")
+    print(f"{'Kit'.ljust(width)}  {'Seconds':>9}  Status")
+    for label, r in zip(labels, results):
+        status = "ok" if r["ok"] else f"FAILED ({r['error']})"
+        print(f"{label.ljust(width)}  {r['seconds']:9.3f}  {status}")
+    print(f"{'Total'.ljust(width)}  {total_seconds:9.3f}")
+
+    lods = [(label, s) for label, r in zip(labels, results) for s in r.get("simplify", [])]
+    missed = [(label, s) for label, s in lods if not s["met"]]
+    if lods:
+        print("")
+        print(f"Simplified {len(lods)} LODs, {len(missed)} missed their target:")
+        for label, s in missed:
+            print(f"  {label}  {s['asset']}  error {s['error']} (max {s['max_error']}), "
+                  f"{s['triangles']} triangles (max {s['max_triangles']}), ratio {s['ratio']}")
+
+    compounds = [c for r in results for c in r.get("colliders", [])]
+    if compounds:
+        volume = sum(c["volume"] for c in compounds)
+        bounds_volume = sum(c["bounds_volume"] for c in compounds)
+        print("")
+        print(f"Compound colliders: {len(compounds)} assets, {sum(c['colliders'] for c in compounds)} primitives "
+              f"from {sum(c['parts'] for c in compounds)} parts, "
+              f"{volume / max(bounds_volume, 1e-9):.1%} of the single-box volume")
+
+    hulls = [(label, h) for label, r in zip(labels, results) for h in r.get("hulls", [])]
+    missed = [(label, h) for label, h in hulls if not h["met"]]
+    if hulls:
+        print("")
+        print(f"Convex decompositions: {len(hulls)} assets, {sum(h['hulls'] for _, h in hulls)} hulls "
+              f"in {sum(h['seconds'] for _, h in hulls):.3f}s, {len(missed)} over their error:")
+        for label, h in missed:
+            print(f"  {label}  {h['asset']}  error {h['error']} (max {h['max_error']}) "
+                  f"with {h['hulls']} hulls (max {h['max_hulls']})")
+
+    cuts = [(label, b) for label, r in zip(labels, results) for b in r.get("booleans", [])]
+    if not cuts:
+        return
+    cuts.sort(key=lambda item: item[1]["seconds"], reverse=True)
+    print("")
+    print(f"Slowest boolean targets ({len(cuts)} total, "
+          f"{sum(b['seconds'] for _, b in cuts):.3f}s):")
+    for label, b in cuts[:SLOWEST_BOOLEANS]:
+        solvers = ",".join(b["solvers"]) or "-"
+        status = "ok" if b["ok"] else f"skipped {b['skipped']} cutter(s)"
+        print(f"  {b['seconds']:9.3f}  {label}  {b['target']}  "
+              f"{b['cutters']} cutters, {b['attempts']} attempt(s) [{solvers}]  {status}")
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    # Blender passes its own flags first; ours follow the "--" separator.
+    if "--" in argv:
+        argv = argv[argv.index("--") + 1:]
+    else:
+        argv = []
+
+    parser = argparse.ArgumentParser(prog="build_kits.py")
+    parser.add_argument("--kits", help="comma-separated kit names to build")
+    parser.add_argument("--skip", help="comma-separated kit names to skip")
+    parser.add_argument("--jobs", type=int, default=1, help="number of parallel Blender workers")
+    parser.add_argument("--workdir", help="directory for parallel worker output")
+    parser.add_argument("--no-cache", action="store_true", help="rebuild every asset")
+    parser.add_argument("--cache-dir", help="build cache location")
+    parser.add_argument("--save", help="save the built scene to this .blend path")
+    parser.add_argument("--report", help="write per-kit timings to this JSON path")
+    parser.add_argument("--export", help="write one GLB per asset under this directory")
+    parser.add_argument("--compress", choices=gltf_export.COMPRESSION, default="none",
+                        help="GLB compression for --export")
+    # Internal: set by run_worker_job for each child process.
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--assets", help=argparse.SUPPRESS)
+    parser.add_argument("--output", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args(sys.argv)
+    # Kits read these when they build; workers inherit them through the environment.
+    if args.no_cache:
+        os.environ["ASSET_KIT_CACHE"] = "0"
+    if args.cache_dir:
+        os.environ["ASSET_KIT_CACHE_DIR"] = os.path.abspath(args.cache_dir)
+
+    if args.worker:
+        worker_main(args)
+        return
+    trace.label("build_kits")
+
+    kits = select_kits(discover_kits(), split_names(args.kits), split_names(args.skip))
+
+    start = time.perf_counter()
+    if args.jobs > 1:
+        workdir = args.workdir or tempfile.mkdtemp(prefix="kit_build_")
+        results = run_parallel(kits, args.jobs, workdir)
+    else:
+        results = [run_kit(name) for name in kits]
+    total_seconds = round(time.perf_counter() - start, 4)
+
+    print_report(results, total_seconds)
+    lods: Dict[str, List[Dict[str, object]]] = {}
+    # Only the report and the exported extras / manifest read the measurements.
+    if args.report or args.export:
+        lods = measure_lods(kits, results)
+        print(f"Measured LOD error for {sum(len(v) for v in lods.values())} LOD families.")
+
+    exports: Dict[str, object] = {}
+    if args.export:
+        out_dir = os.path.abspath(args.export)
+        exports, assets = export_kits(kits, results, out_dir, args.compress)
+        manifest.write(out_dir, assets)
+        written = sum(len(v) for v in exports.values() if isinstance(v, list))
+        print(f"Exported {written} GLB files and a manifest of {len(assets)} assets to {out_dir}.")
+
+    if args.report:
+        report = {
+            "total_seconds": total_seconds,
+            "jobs": args.jobs,
+            "kits": results,
+            "lod_reference": lod_metrics.reference_camera(),
+            "lods": lods,
+            "exports": exports,
+        }
+        with open(args.report, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+            fh.write("\n")
+
+    if args.save:
+        bpy.ops.wm.save_as_mainfile(filepath=os.path.abspath(args.save))
+
+    trace_path = trace.save()
+    if trace_path:
+        print(f"Wrote build trace to {trace_path}.")
+
+    if not all(r["ok"] for r in results) or any(isinstance(v, dict) for v in exports.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,16 @@
 import bpy
-import bmesh
+import os
+import sys
 from math import radians
 
+KIT_DIR = os.path.dirname(os.path.abspath(__file__))
+if KIT_DIR not in sys.path:
+    sys.path.append(KIT_DIR)
+
+from kitlib import mesh_merge, primitives, trace  # noqa: E402
+
+COLLECTION_NAME = "CLEAT"
+
 # ============================================================
 # Cleanup (idempotent)
 # ============================================================
@@ -85,72 +94,15 @@ def assign_mat(obj, mat):
 # Robust merge (depsgraph evaluated) -> one mesh per LOD
 # ============================================================
 
-def _append_bmesh(dst: bmesh.types.BMesh, src: bmesh.types.BMesh):
-    src.verts.ensure_lookup_table()
-    src.edges.ensure_lookup_table()
-    src.faces.ensure_lookup_table()
-
-    vmap = {}
-    for v in src.verts:
-        vmap[v] = dst.verts.new(v.co)
-
-    for e in src.edges:
-        v1 = vmap[e.verts[0]]
-        v2 = vmap[e.verts[1]]
-        try:
-            dst.edges.new((v1, v2))
-        except ValueError:
-            pass
-
-    for f in src.faces:
-        verts = [vmap[v] for v in f.verts]
-        try:
-            nf = dst.faces.new(verts)
-            nf.smooth = f.smooth
-        except ValueError:
-            pass
-
+@trace.traced
 def merge_objects_evaluated(name: str, objs):
-    depsgraph = bpy.context.evaluated_depsgraph_get()
-    bpy.context.view_layer.update()
-
-    bm_merged = bmesh.new()
-
-    for obj in objs:
-        if not obj or obj.type != "MESH":
-            continue
-
-        eval_obj = obj.evaluated_get(depsgraph)
-        eval_mesh = eval_obj.to_mesh(preserve_all_data_layers=True, depsgraph=depsgraph)
-        if eval_mesh is None:
-            continue
-
-        bm_part = bmesh.new()
-        bm_part.from_mesh(eval_mesh)
-        bm_part.transform(eval_obj.matrix_world)
-
-        _append_bmesh(bm_merged, bm_part)
-
-        bm_part.free()
-        eval_obj.to_mesh_clear()
-
-    merged_mesh = bpy.data.meshes.new(name + "_Mesh")
-    bm_merged.to_mesh(merged_mesh)
-    bm_merged.free()
-
-    merged_obj = bpy.data.objects.new(name, merged_mesh)
-    bpy.context.scene.collection.objects.link(merged_obj)
-
-    # delete sources
-    for obj in objs:
-        if obj and obj.name in bpy.data.objects:
-            bpy.data.objects.remove(obj, do_unlink=True)
-
+    merged_obj = mesh_merge.merge_objects(objs, name, bpy.context.scene.collection, evaluated=True)
+    merged_obj.data.name = name + "_Mesh"
     return merged_obj
 
 
 # ============================================================
-# Primitive builders (bpy.ops, stable)
+# Primitive builders (direct mesh data, no bpy.ops)
 # ============================================================
 
 def deselect_all():
@@ -158,25 +110,10 @@ def deselect_all():
         o.select_set(False)
 
 def add_cube(name, size=1.0):
-    deselect_all()
-    bpy.ops.mesh.primitive_cube_add(size=size, align="WORLD", location=(0,0,0), rotation=(0,0,0))
-    obj = bpy.context.active_object
-    obj.name = name
-    return obj
+    return primitives.add_box(name, (size, size, size), (0, 0, 0), bpy.context.scene.collection)
 
 def add_cylinder(name, radius=0.05, depth=0.1, verts=24):
-    deselect_all()
-    bpy.ops.mesh.primitive_cylinder_add(
-        vertices=verts,
-        radius=radius,
-        depth=depth,
-        align="WORLD",
-        location=(0,0,0),
-        rotation=(0,0,0),
-    )
-    obj = bpy.context.active_object
-    obj.name = name
-    return obj
+    return primitives.add_cylinder(name, radius, depth, (0, 0, 0), bpy.context.scene.collection, vertices=verts)
 
 def add_bevel(obj, width=0.005, segments=2, angle_deg=30):
     mod = obj.modifiers.new("Bevel", "BEVEL")
@@ -261,7 +198,7 @@ def build_cleat_parts(lod="LOD0", scale=1.0):
 # ============================================================
 
 def make_cleat(name="Cleat_Standard", scale=1.0):
-    root = ensure_collection("CLEAT")
+    root = ensure_collection(COLLECTION_NAME)
     col0 = ensure_collection(f"{name}_LOD0", root)
     col1 = ensure_collection(f"{name}_LOD1", root)
     col2 = ensure_collection(f"{name}_LOD2", root)
@@ -305,6 +242,11 @@ def make_cleat(name="Cleat_Standard", scale=1.0):
 # Run (idempotent)
 # ============================================================
 
-remove_collection_tree("CLEAT")
-make_cleat("Cleat_Standard", scale=1.0)
-make_cleat("Cleat_Large", scale=1.35)
+def main():
+    remove_collection_tree(COLLECTION_NAME)
+    make_cleat("Cleat_Standard", scale=1.0)
+    make_cleat("Cleat_Large", scale=1.35)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,16 @@
 import bpy
 import math
-from typing import Dict, List, Tuple
+import os
+import random
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+from mathutils import Matrix, Vector
+
+KIT_DIR = os.path.dirname(os.path.abspath(__file__))
+if KIT_DIR not in sys.path:
+    sys.path.append(KIT_DIR)
+
+from kitlib import blend_io, build_cache, colliders, gltf_instancing, mesh_merge, normal_bake, primitives, snaps, trace  # noqa: E402
 
 # ============================================================
 # Container Stack Kit (Blender 5.0+)
@@ -27,6 +37,8 @@ STACK_GAP_Y = 0.25
 # Vertical stack gap: half of length-wise frame post width.
 STACK_GAP_Z = FRAME_POST_W
 
+# Corrugation is geometry at LOD0 only; lower LODs get it from a normal
+# map baked from LOD0 (bake_size > 0) and packed into the kit atlas.
 LOD_SETTINGS = {
     "lod0": {
         "rib_pitch": 0.28,
@@ -35,14 +47,16 @@ LOD_SETTINGS = {
         "roof_ribs": True,
         "door_bars": True,
         "bevel": 0.015,
+        "bake_size": 0,
     },
     "lod1": {
-        "rib_pitch": 0.45,
-        "rib_depth": 0.02,
-        "rib_height_margin": 0.20,
-        "roof_ribs": True,
+        "rib_pitch": 0.0,
+        "rib_depth": 0.0,
+        "rib_height_margin": 0.0,
+        "roof_ribs": False,
         "door_bars": True,
         "bevel": 0.01,
+        "bake_size": 256,
     },
     "lod2": {
         "rib_pitch": 0.0,
@@ -51,8 +65,16 @@ LOD_SETTINGS = {
         "roof_ribs": False,
         "door_bars": False,
         "bevel": 0.0,
+        "bake_size": 128,
     },
 }
+# Deeper than the deepest LOD0 groove (rib_depth * 1.2).
+BAKE_CAGE_EXTRUSION = 0.05
+NORMAL_ATLAS_NAME = "Container_NormalAtlas"
+
+# Collider boxes per stack or yard block: one box per container, merged
+# into columns and then neighbouring columns until the budget is met.
+COLLIDER_BUDGET = 32
 
 # Presets are generated as blocks of identical containers.
 # Grid axes:
@@ -70,9 +92,56 @@ PRESETS = [
     {"name": "container40_stack_1x2x2", "ctype": "40ft", "grid": (1, 2, 2), "enabled": True},
 ]
 
-# Slight overlap to avoid coplanar boolean artifacts on outer faces.
-BOOLEAN_OVERLAP_EPS = 0.002
+# "instanced": each LOD is an empty holding one linked duplicate of the
+#              shared container mesh per container, with its paint colour
+#              in obj.color (exported with EXT_mesh_gpu_instancing).
+# "merged":    each LOD is one mesh with every container baked in.
+STACK_MODE = "instanced"
+DEFAULT_PAINT_COLOR = (0.58, 0.22, 0.14)
+
+# When set, every built asset is also written to <dir>/<asset name>.glb
+# (see kitlib.gltf_instancing).
+GLB_OUTPUT_DIR = os.environ.get("CONTAINER_GLB_DIR") or None
+
+# Yards: a rectangle (X across rows, Y along bays, from its start corner)
+# filled with blocks of at most rows x bays container slots, separated by
+# aisles. Every slot is 40ft long and holds either one 40ft stack or two
+# 20ft stacks (ratio_20ft); stack heights vary around fill * tiers. The
+# same seed always gives the same yard, and every block has its own random
+# stream, so blocks are generated and built one at a time (see yard_blocks).
+YARDS = [
+    {"name": "container_yard_demo", "size": (50.0, 110.0), "rows": 6, "bays": 8, "tiers": 4,
+     "fill": 0.7, "ratio_20ft": 0.3, "seed": 7, "enabled": True},
+    # About 5,000 TEU in 12 blocks; build with CONTAINER_YARD_DIR set.
+    {"name": "container_yard_5000teu", "size": (130.0, 312.0), "rows": 8, "bays": 8, "tiers": 5,
+     "fill": 0.7, "ratio_20ft": 0.3, "seed": 11, "enabled": False},
+]
+YARD_AISLE_X = 15.0  # truck lane between blocks, across rows
+YARD_AISLE_Y = 6.0  # gap between blocks along bays
+
+# Carrier liveries (linear RGB) and their share of yard containers. Colours
+# go to obj.color, which Container_Paint reads through Object Info.
+CARRIER_PALETTE = [
+    ((0.02, 0.16, 0.42), 0.20),  # deep blue
+    ((0.50, 0.52, 0.52), 0.14),  # grey
+    ((0.03, 0.22, 0.07), 0.12),  # green
+    ((0.75, 0.28, 0.02), 0.12),  # orange
+    (DEFAULT_PAINT_COLOR, 0.16),  # rust red
+    ((0.42, 0.02, 0.22), 0.08),  # magenta
+    ((0.80, 0.58, 0.02), 0.08),  # yellow
+    ((0.85, 0.85, 0.82), 0.10),  # white
+]
+
+# When set, each yard block is written to <dir>/<block name>.blend (and to
+# GLB_OUTPUT_DIR) and removed from the scene before the next one is built.
+YARD_OUTPUT_DIR = os.environ.get("CONTAINER_YARD_DIR") or None
 
+# One merged container per (ctype, lod_key, is_top_in_stack), built at the
+# origin on first use; stacks are assembled from translated copies. main()
+# clears it so edited settings take effect on the next run.
+_CONTAINER_TEMPLATES: Dict[Tuple[str, str, bool], mesh_merge.MeshArrays] = {}
+# Same keys: the bevelled, shaded mesh datablock instances share.
+_CONTAINER_MESHES: Dict[Tuple[str, str, bool], bpy.types.Mesh] = {}
 
 # ------------------------------------------------------------
 # Helpers
@@ -135,11 +204,10 @@ def purge_container_stack_objects():
     prefixes = (
         "container",
         "COLLIDER_container",
-        "SNAP_",
     )
     ensure_object_mode()
     for obj in list(bpy.data.objects):
-        if obj.name.startswith(prefixes):
+        if obj.name.startswith(prefixes) or snaps.owns_snap(obj.name, "container"):
             bpy.data.objects.remove(obj, do_unlink=True)
 
 
@@ -149,6 +217,7 @@ def add_custom_props(obj: bpy.types.Object, asset_role: str):
     obj["forward_axis"] = FORWARD_AXIS
 
 
+@trace.traced
 def shade_smooth_with_autosmooth(obj: bpy.types.Object, angle_deg: float = 35.0):
     if obj.type != "MESH":
         return
@@ -159,6 +228,14 @@ def shade_smooth_with_autosmooth(obj: bpy.types.Object, angle_deg: float = 35.0)
     obj.select_set(False)
 
 
+@trace.traced
+def apply_modifiers_for_export(obj: bpy.types.Object):
+    bpy.context.view_layer.objects.active = obj
+    obj.select_set(True)
+    bpy.ops.object.convert(target="MESH")  # applies modifiers
+    obj.select_set(False)
+
+
 def get_or_create_container_paint_material(name: str = "Container_Paint") -> bpy.types.Material:
     mat = bpy.data.materials.get(name)
     if mat is None:
@@ -171,10 +248,13 @@ def get_or_create_container_paint_material(name: str = "Container_Paint") -> bpy
 
         output = nodes.new(type="ShaderNodeOutputMaterial")
         bsdf = nodes.new(type="ShaderNodeBsdfPrincipled")
-        bsdf.inputs["Base Color"].default_value = (0.58, 0.22, 0.14, 1.0)
+        bsdf.inputs["Base Color"].default_value = (*DEFAULT_PAINT_COLOR, 1.0)
         bsdf.inputs["Metallic"].default_value = 0.05
         bsdf.inputs["Roughness"].default_value = 0.6
         links.new(bsdf.outputs["BSDF"], output.inputs["Surface"])
+        # Paint comes from obj.color, so every livery shares this material.
+        info = nodes.new(type="ShaderNodeObjectInfo")
+        links.new(info.outputs["Color"], bsdf.inputs["Base Color"])
 
     return mat
 
@@ -208,20 +288,7 @@ def assign_material(obj: bpy.types.Object, mat: bpy.types.Material):
         obj.data.materials[0] = mat
 
 
-def join_and_name(objs: List[bpy.types.Object], name: str) -> bpy.types.Object:
-    ensure_object_mode()
-    deselect_all()
-    for o in objs:
-        o.select_set(True)
-    bpy.context.view_layer.objects.active = objs[0]
-    bpy.ops.object.join()
-    obj = bpy.context.active_object
-    obj.name = name
-    if obj.data:
-        obj.data.name = name
-    return obj
-
-
+@trace.traced
 def apply_bevel(obj: bpy.types.Object, width: float, segments: int = 2):
     if width <= 0.0:
         return
@@ -239,6 +306,27 @@ def bounds_from_mesh(obj: bpy.types.Object) -> Tuple[float, float, float, float,
     return (min(xs), max(xs), min(ys), max(ys), min(zs), max(zs))
 
 
+def bounds_from_object(obj: bpy.types.Object) -> Tuple[float, float, float, float, float, float]:
+    """Local bounds of a mesh, or of the container instances under a layout root."""
+    if obj.type == "MESH":
+        return bounds_from_mesh(obj)
+    points = []
+    corners_by_mesh: Dict[str, List[Vector]] = {}
+    for child in obj.children:
+        if child.type != "MESH" or child.get("asset_role") != "container_instance":
+            continue
+        corners = corners_by_mesh.get(child.data.name)
+        if corners is None:
+            x0, x1, y0, y1, z0, z1 = bounds_from_mesh(child)
+            corners = [Vector((x, y, z)) for x in (x0, x1) for y in (y0, y1) for z in (z0, z1)]
+            corners_by_mesh[child.data.name] = corners
+        points.extend(child.matrix_basis @ corner for corner in corners)
+    xs = [p.x for p in points]
+    ys = [p.y for p in points]
+    zs = [p.z for p in points]
+    return (min(xs), max(xs), min(ys), max(ys), min(zs), max(zs))
+
+
 def set_origin_to_start_face_center(obj: bpy.types.Object):
     # Recenter mesh so origin is at x-center, y-min, z-min.
     min_x, max_x, min_y, _max_y, min_z, _max_z = bounds_from_mesh(obj)
@@ -252,73 +340,19 @@ def set_origin_to_start_face_center(obj: bpy.types.Object):
     obj.location = (0.0, 0.0, 0.0)
 
 
+def start_face_offset(parts: List[colliders.Primitive]) -> Tuple[float, float, float]:
+    """The shift set_origin_to_start_face_center applies to a mesh built from parts."""
+    lo, hi = colliders.bounds(parts)
+    return ((lo[0] + hi[0]) * 0.5, lo[1], lo[2])
+
+
 def add_box_part(name: str, dims: Tuple[float, float, float], location: Tuple[float, float, float], col: bpy.types.Collection) -> bpy.types.Object:
-    bpy.ops.mesh.primitive_cube_add(size=1.0, location=location)
-    obj = bpy.context.active_object
-    obj.name = name
-    # size=1.0 cube has unit dimensions already, so scale directly by target dims.
-    obj.scale = (dims[0], dims[1], dims[2])
-    bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
-    force_into_collection(obj, col)
-    return obj
+    return primitives.add_box(name, dims, location, col)
 
 
 def add_cylinder_part(name: str, radius: float, depth: float, location: Tuple[float, float, float],
                       rotation: Tuple[float, float, float], col: bpy.types.Collection, vertices: int = 16) -> bpy.types.Object:
-    bpy.ops.mesh.primitive_cylinder_add(
-        vertices=vertices,
-        radius=radius,
-        depth=depth,
-        location=location,
-        rotation=rotation,
-    )
-    obj = bpy.context.active_object
-    obj.name = name
-    force_into_collection(obj, col)
-    return obj
-
-
-def apply_boolean_difference(target: bpy.types.Object, cutters: List[bpy.types.Object], join_name: str):
-    if target.type != "MESH" or not cutters:
-        return
-
-    ensure_object_mode()
-    deselect_all()
-    # Keep a backup so a failed boolean pass cannot erase the container body.
-    backup_mesh = target.data.copy()
-    failed = False
-
-    bpy.context.view_layer.objects.active = target
-    target.select_set(True)
-
-    for i, cutter in enumerate(cutters):
-        if cutter is None or cutter.type != "MESH":
-            continue
-        mod = target.modifiers.new(name=f"{join_name}_{i:03d}", type="BOOLEAN")
-        mod.operation = "DIFFERENCE"
-        mod.solver = "EXACT"
-        mod.object = cutter
-        try:
-            bpy.ops.object.modifier_apply(modifier=mod.name)
-        except RuntimeError:
-            failed = True
-            break
-
-    target.select_set(False)
-
-    # If boolean produced invalid/empty output, restore the original body mesh.
-    if failed or len(target.data.polygons) < 6:
-        old_mesh = target.data
-        target.data = backup_mesh
-        if old_mesh and old_mesh.users == 0:
-            bpy.data.meshes.remove(old_mesh)
-    else:
-        if backup_mesh and backup_mesh.users == 0:
-            bpy.data.meshes.remove(backup_mesh)
-
-    for cutter in cutters:
-        if cutter and cutter.name in bpy.data.objects:
-            bpy.data.objects.remove(cutter, do_unlink=True)
+    return primitives.add_cylinder(name, radius, depth, location, col, rotation=rotation, vertices=vertices)
 
 
 def generate_grid_positions(dims: Dict[str, float], grid: Tuple[int, int, int]) -> List[Tuple[float, float, float]]:
@@ -340,6 +374,95 @@ def generate_grid_positions(dims: Dict[str, float], grid: Tuple[int, int, int])
     return positions
 
 
+def stack_layout(ctype: str, grid: Tuple[int, int, int]) -> List[Dict]:
+    """
+    One entry per container of a preset stack: ctype, is_top_in_stack,
+    location (start-face centre on its floor), rotation_z and paint color.
+    Any list in this shape can be built with build_layout_lod.
+    """
+    count_x, count_y, count_z = grid
+    per_tier = count_x * count_y
+    return [
+        {
+            "ctype": ctype,
+            "is_top_in_stack": i // per_tier == count_z - 1,
+            "location": pos,
+            "rotation_z": 0.0,
+            "color": DEFAULT_PAINT_COLOR,
+        }
+        for i, pos in enumerate(generate_grid_positions(CONTAINER_TYPES[ctype], grid))
+    ]
+
+
+def corrugation_recesses(dims: Dict[str, float], lod_key: str,
+                         is_top_in_stack: bool) -> Tuple[Dict[str, List[primitives.Recess]], float]:
+    """
+    Groove rectangles per body face (see primitives.recessed_box_geometry),
+    relative to the body centre, and the groove depth. Side walls get one
+    vertical groove per rib_pitch, the door face 2 x 3 horizontal bands,
+    the rear face vertical grooves and the roof (top of stack only) ribs
+    across the width.
+    """
+    settings = LOD_SETTINGS[lod_key]
+    w = dims["width"]
+    l = dims["length"]
+    h = dims["height"]
+    rib_pitch = settings["rib_pitch"]
+    rib_depth = settings["rib_depth"]
+    rib_height_margin = settings["rib_height_margin"]
+    recesses: Dict[str, List[primitives.Recess]] = {}
+    if rib_pitch <= 0.0 or rib_depth <= 0.0:
+        return recesses, 0.0
+
+    depth = max(rib_depth * 1.2, 0.01)
+
+    # Side walls: vertical grooves along the length.
+    rib_count = max(1, int((l - 0.2) / rib_pitch))
+    groove_w = min(rib_pitch * 0.45, 0.16)
+    groove_h = max(0.3, h - rib_height_margin)
+    side = []
+    for i in range(rib_count):
+        py = -l * 0.5 + 0.1 + (i + 0.5) * ((l - 0.2) / rib_count)
+        side.append((py - groove_w * 0.5, py + groove_w * 0.5, -groove_h * 0.5, groove_h * 0.5))
+    recesses["+X"] = side
+    recesses["-X"] = side
+
+    # Door face (-Y): exactly 2 columns x 3 horizontal bands.
+    post_w = FRAME_POST_W
+    door_panel_centers = (-w * 0.25, w * 0.25)
+    door_row_t = (0.27, 0.50, 0.73)
+    door_band_h = 0.12 if lod_key == "lod0" else 0.14
+    door_band_w = (w * 0.5) - (post_w * 0.75)
+    recesses["-Y"] = [
+        (cx - door_band_w * 0.5, cx + door_band_w * 0.5,
+         h * (t - 0.5) - door_band_h * 0.5, h * (t - 0.5) + door_band_h * 0.5)
+        for cx in door_panel_centers
+        for t in door_row_t
+    ]
+
+    # Rear face (+Y): vertical grooves across the width.
+    rear_count = 5 if lod_key == "lod0" else 4
+    rear_groove_w = min(rib_pitch * 0.8, 0.22)
+    rear_groove_h = h - 0.24
+    rear = []
+    for i in range(rear_count):
+        gx = -w * 0.5 + w * (i + 1) / (rear_count + 1)
+        rear.append((gx - rear_groove_w * 0.5, gx + rear_groove_w * 0.5, -rear_groove_h * 0.5, rear_groove_h * 0.5))
+    recesses["+Y"] = rear
+
+    # Roof corrugation only on topmost containers in a stack.
+    if settings["roof_ribs"] and is_top_in_stack:
+        roof_rib_count = max(2, int((l - 0.4) / (rib_pitch * 1.5)))
+        roof_rib_w = min(rib_pitch * 0.6, 0.22)
+        roof = []
+        for i in range(roof_rib_count):
+            py = -l * 0.5 + 0.2 + (i + 0.5) * ((l - 0.4) / roof_rib_count)
+            roof.append((-(w - 0.2) * 0.5, (w - 0.2) * 0.5, py - roof_rib_w * 0.5, py + roof_rib_w * 0.5))
+        recesses["+Z"] = roof
+
+    return recesses, depth
+
+
 def build_single_container_parts(prefix: str, dims: Dict[str, float], base_pos: Tuple[float, float, float],
                                  lod_key: str, col: bpy.types.Collection, is_top_in_stack: bool) -> List[bpy.types.Object]:
     settings = LOD_SETTINGS[lod_key]
@@ -350,11 +473,11 @@ def build_single_container_parts(prefix: str, dims: Dict[str, float], base_pos:
     x0, y0, z0 = base_pos
     parts: List[bpy.types.Object] = []
 
-    # Main body
-    body = add_box_part(
+    # Main body, with its corrugation sunk straight into the faces.
+    recesses, depth = corrugation_recesses(dims, lod_key, is_top_in_stack)
+    body = primitives.add_primitive(
         f"{prefix}__body",
-        (w, l, h),
-        (x0, y0 + (l * 0.5), z0 + (h * 0.5)),
+        primitives.recessed_box_geometry((w, l, h), recesses, depth, (x0, y0 + (l * 0.5), z0 + (h * 0.5))),
         col,
     )
     parts.append(body)
@@ -400,75 +523,6 @@ def build_single_container_parts(prefix: str, dims: Dict[str, float], base_pos:
             )
             parts.append(end_rail)
 
-    # Corrugation recesses (boolean cutters) for side walls + roof.
-    cutters: List[bpy.types.Object] = []
-    rib_pitch = settings["rib_pitch"]
-    rib_depth = settings["rib_depth"]
-    rib_height_margin = settings["rib_height_margin"]
-    if rib_pitch > 0.0 and rib_depth > 0.0:
-        rib_count = max(1, int((l - 0.2) / rib_pitch))
-        groove_w = min(rib_pitch * 0.45, 0.16)
-        groove_h = max(0.3, h - rib_height_margin)
-        groove_thickness = max(rib_depth * 1.2, 0.01)
-        for i in range(rib_count):
-            py = y0 + 0.1 + (i + 0.5) * ((l - 0.2) / rib_count)
-            for sx in (-1.0, 1.0):
-                px = x0 + sx * (w * 0.5 - groove_thickness * 0.5 + BOOLEAN_OVERLAP_EPS)
-                rib = add_box_part(
-                    f"{prefix}__groove_cut",
-                    (groove_thickness, groove_w, groove_h),
-                    (px, py, z0 + h * 0.5),
-                    col,
-                )
-                cutters.append(rib)
-
-        # Door-face recesses: exactly 2 columns x 3 horizontal bands.
-        door_panel_centers = (-w * 0.25, w * 0.25)
-        door_row_t = (0.27, 0.50, 0.73)
-        door_band_h = 0.12 if lod_key == "lod0" else 0.14
-        door_band_w = (w * 0.5) - (post_w * 0.75)
-        for cx in door_panel_centers:
-            for t in door_row_t:
-                band = add_box_part(
-                    f"{prefix}__door_band_cut",
-                    (door_band_w, groove_thickness, door_band_h),
-                    (x0 + cx, y0 + groove_thickness * 0.5 - BOOLEAN_OVERLAP_EPS, z0 + (h * t)),
-                    col,
-                )
-                cutters.append(band)
-
-        # Rear-end (+Y face) vertical corrugation recesses.
-        rear_count = 5 if lod_key == "lod0" else 4
-        rear_groove_w = min(rib_pitch * 0.8, 0.22)
-        rear_groove_h = h - 0.24
-        for i in range(rear_count):
-            tx = (i + 1) / (rear_count + 1)
-            gx = x0 - (w * 0.5) + (w * tx)
-            rear_groove = add_box_part(
-                f"{prefix}__rear_vert_groove_cut",
-                (rear_groove_w, groove_thickness, rear_groove_h),
-                (gx, y0 + l - groove_thickness * 0.5 + BOOLEAN_OVERLAP_EPS, z0 + h * 0.5),
-                col,
-            )
-            cutters.append(rear_groove)
-
-    # Roof corrugation only on topmost containers in a stack.
-    if settings["roof_ribs"] and is_top_in_stack and rib_pitch > 0.0 and rib_depth > 0.0:
-        roof_rib_count = max(2, int((l - 0.4) / (rib_pitch * 1.5)))
-        roof_rib_w = min(rib_pitch * 0.6, 0.22)
-        roof_depth = max(rib_depth * 1.2, 0.01)
-        for i in range(roof_rib_count):
-            py = y0 + 0.2 + (i + 0.5) * ((l - 0.4) / roof_rib_count)
-            roof_rib = add_box_part(
-                f"{prefix}__roof_groove_cut",
-                (w - 0.2, roof_rib_w, roof_depth),
-                (x0, py, z0 + h - roof_depth * 0.5 + BOOLEAN_OVERLAP_EPS),
-                col,
-            )
-            cutters.append(roof_rib)
-
-    apply_boolean_difference(body, cutters, f"{prefix}__corrugation_cutters")
-
     # End door bars on start face for close-range readability
     if settings["door_bars"]:
         bar_radius = 0.030 if lod_key == "lod0" else 0.034
@@ -492,75 +546,176 @@ def build_single_container_parts(prefix: str, dims: Dict[str, float], base_pos:
     return parts
 
 
-def build_stack_asset_lod(asset_name: str, dims: Dict[str, float], grid: Tuple[int, int, int],
+def remove_objects(objs: List[bpy.types.Object]):
+    for obj in objs:
+        mesh = obj.data
+        bpy.data.objects.remove(obj, do_unlink=True)
+        if mesh is not None and mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
+
+def container_template(ctype: str, lod_key: str, is_top_in_stack: bool,
+                       col: bpy.types.Collection) -> mesh_merge.MeshArrays:
+    """Mesh arrays of one container at base position (0, 0, 0), built once per run."""
+    key = (ctype, lod_key, is_top_in_stack)
+    arrays = _CONTAINER_TEMPLATES.get(key)
+    if arrays is None:
+        prefix = f"TEMPLATE_{ctype}_{lod_key}_{'top' if is_top_in_stack else 'mid'}"
+        parts = build_single_container_parts(prefix, CONTAINER_TYPES[ctype], (0.0, 0.0, 0.0), lod_key, col,
+                                             is_top_in_stack)
+        arrays = mesh_merge.concatenate(
+            mesh_merge.read_mesh_arrays(part.data, mesh_merge.world_matrix(part)) for part in parts
+        )
+        remove_objects(parts)
+        _CONTAINER_TEMPLATES[key] = arrays
+    return arrays
+
+
+def container_mesh(ctype: str, lod_key: str, is_top_in_stack: bool, col: bpy.types.Collection) -> bpy.types.Mesh:
+    """Bevelled, smooth-shaded, painted container mesh shared by every instance of its template."""
+    key = (ctype, lod_key, is_top_in_stack)
+    mesh = _CONTAINER_MESHES.get(key)
+    if mesh is not None:
+        return mesh
+
+    name = f"container_{ctype}_{lod_key}_{'top' if is_top_in_stack else 'mid'}"
+    existing = bpy.data.meshes.get(name)
+    if existing is not None and existing.users and existing.get(blend_io.SHARED_MESH_PROP):
+        # Restored from the cache earlier in this run: same key, same mesh.
+        _CONTAINER_MESHES[key] = existing
+        return existing
+    # A previous run's copy would push the new mesh to ".001".
+    if existing is not None and existing.users == 0:
+        bpy.data.meshes.remove(existing)
+
+    tmp = bpy.data.objects.new(name, mesh_merge.mesh_from_arrays(name, container_template(*key, col)))
+    col.objects.link(tmp)
+    apply_bevel(tmp, LOD_SETTINGS[lod_key]["bevel"], segments=2)
+    baked = mesh_merge.merge_objects([tmp], name, col, evaluated=True)
+    mesh = baked.data
+    bpy.data.objects.remove(baked, do_unlink=True)
+
+    mesh.shade_smooth()
+    mesh.set_sharp_from_angle(angle=math.radians(35.0))
+    mesh.materials.append(get_or_create_container_paint_material())
+    # Cache restores and worker merges fold their copies back onto this one.
+    mesh[blend_io.SHARED_MESH_PROP] = True
+    if LOD_SETTINGS[lod_key]["bake_size"] > 0:
+        bake_container_normals(mesh, container_mesh(ctype, "lod0", is_top_in_stack, col), lod_key, col)
+    _CONTAINER_MESHES[key] = mesh
+    return mesh
+
+
+def bake_container_normals(mesh: bpy.types.Mesh, source_mesh: bpy.types.Mesh, lod_key: str,
+                           col: bpy.types.Collection):
+    """Bake the LOD0 container's corrugation into mesh, once for every instance sharing it."""
+    source = bpy.data.objects.new(f"BAKE_SRC_{mesh.name}", source_mesh)
+    target = bpy.data.objects.new(f"BAKE_DST_{mesh.name}", mesh)
+    col.objects.link(source)
+    col.objects.link(target)
+    try:
+        normal_bake.bake_normals(source, target, f"{mesh.name}_normal",
+                                 LOD_SETTINGS[lod_key]["bake_size"], BAKE_CAGE_EXTRUSION)
+    finally:
+        bpy.data.objects.remove(source, do_unlink=True)
+        bpy.data.objects.remove(target, do_unlink=True)
+
+
+def build_layout_lod(name: str, layout: List[Dict], lod_key: str, col: bpy.types.Collection,
+                     recenter: bool = True) -> bpy.types.Object:
+    """
+    Empty root with one container_instance child per layout entry, all
+    sharing the cached template meshes. With recenter, the pivot ends up at
+    the start-face centre on the ground like the merged stack; otherwise
+    layout locations are kept as given.
+    """
+    root = bpy.data.objects.new(name, None)
+    root.empty_display_type = "PLAIN_AXES"
+    col.objects.link(root)
+
+    for i, item in enumerate(layout):
+        inst = bpy.data.objects.new(f"{name}_c{i:03d}",
+                                    container_mesh(item["ctype"], lod_key, item["is_top_in_stack"], col))
+        col.objects.link(inst)
+        inst.parent = root
+        inst.location = item["location"]
+        inst.rotation_euler = (0.0, 0.0, item["rotation_z"])
+        inst.color = (*item["color"], 1.0)
+        add_custom_props(inst, "container_instance")
+        inst["container_type"] = item["ctype"]
+
+    if recenter:
+        min_x, max_x, min_y, _max_y, min_z, _max_z = bounds_from_object(root)
+        shift = Vector(((min_x + max_x) * 0.5, min_y, min_z))
+        for inst in root.children:
+            inst.location -= shift
+
+    add_custom_props(root, "visual" if lod_key == "lod0" else "visual_lod")
+    return root
+
+
+def build_stack_lod(asset_name: str, ctype: str, grid: Tuple[int, int, int],
+                    lod_key: str, col: bpy.types.Collection) -> bpy.types.Object:
+    if STACK_MODE == "merged":
+        return build_stack_asset_lod(asset_name, ctype, grid, lod_key, col)
+    return build_layout_lod(f"{asset_name}_{lod_key}", stack_layout(ctype, grid), lod_key, col)
+
+
+def build_stack_asset_lod(asset_name: str, ctype: str, grid: Tuple[int, int, int],
                           lod_key: str, col: bpy.types.Collection) -> bpy.types.Object:
-    all_parts: List[bpy.types.Object] = []
+    dims = CONTAINER_TYPES[ctype]
+    copies: List[mesh_merge.MeshArrays] = []
     count_x, count_y, count_z = grid
     w = dims["width"]
     l = dims["length"]
     h = dims["height"]
     total_w = (count_x * w) + ((count_x - 1) * STACK_GAP_X)
 
-    i = 0
     for iz in range(count_z):
         for iy in range(count_y):
             for ix in range(count_x):
                 x = -0.5 * total_w + (w * 0.5) + ix * (w + STACK_GAP_X)
                 y = iy * (l + STACK_GAP_Y)
                 z = iz * (h + STACK_GAP_Z)
-                prefix = f"{asset_name}_{lod_key}_c{i:02d}"
-                container_parts = build_single_container_parts(
-                    prefix,
-                    dims,
-                    (x, y, z),
-                    lod_key,
-                    col,
-                    is_top_in_stack=(iz == count_z - 1),
-                )
-                all_parts.extend(container_parts)
-                i += 1
-
-    merged = join_and_name(all_parts, f"{asset_name}_{lod_key}")
+                template = container_template(ctype, lod_key, iz == count_z - 1, col)
+                copies.append(mesh_merge.transform_arrays(template, Matrix.Translation((x, y, z))))
+
+    name = f"{asset_name}_{lod_key}"
+    merged = bpy.data.objects.new(name, mesh_merge.mesh_from_arrays(name, mesh_merge.concatenate(copies)))
+    col.objects.link(merged)
     set_origin_to_start_face_center(merged)
     apply_bevel(merged, LOD_SETTINGS[lod_key]["bevel"], segments=2)
-
-    bpy.context.view_layer.objects.active = merged
-    merged.select_set(True)
-    bpy.ops.object.convert(target="MESH")
-    merged.select_set(False)
+    apply_modifiers_for_export(merged)
 
     shade_smooth_with_autosmooth(merged, 35.0)
     add_custom_props(merged, "visual" if lod_key == "lod0" else "visual_lod")
 
     # Painted body material for all LODs.
     assign_material(merged, get_or_create_container_paint_material())
+    merged.color = (*DEFAULT_PAINT_COLOR, 1.0)
     return merged
 
 
-def create_collider_from_bounds(parent: bpy.types.Object, asset_name: str, col: bpy.types.Collection):
-    min_x, max_x, min_y, max_y, min_z, max_z = bounds_from_mesh(parent)
-    sx = max_x - min_x
-    sy = max_y - min_y
-    sz = max_z - min_z
+def layout_colliders(layout: List[Dict], col: bpy.types.Collection) -> List[colliders.Primitive]:
+    """One box per layout entry, around its container template, in layout space."""
+    parts = []
+    for item in layout:
+        co = container_template(item["ctype"], "lod0", item["is_top_in_stack"], col)["co"]
+        lo, hi = co.min(axis=0), co.max(axis=0)
+        rotation = (0.0, 0.0, item["rotation_z"])
+        center = Matrix.Rotation(item["rotation_z"], 3, "Z") @ Vector(((lo + hi) * 0.5).tolist())
+        location = (center.x + item["location"][0], center.y + item["location"][1], center.z + item["location"][2])
+        parts.append(colliders.box(tuple((hi - lo).tolist()), location, rotation))
+    return parts
 
-    cx = (min_x + max_x) * 0.5
-    cy = (min_y + max_y) * 0.5
-    cz = (min_z + max_z) * 0.5
 
-    collider = add_box_part(
-        f"COLLIDER_{asset_name}",
-        (sx, sy, sz),
-        (cx, cy, cz),
-        col,
-    )
-
-    add_custom_props(collider, "collision")
-    collider.parent = parent
-    collider.matrix_parent_inverse = parent.matrix_world.inverted()
-    collider.display_type = "WIRE"
-    collider.hide_render = True
-    assign_material(collider, get_or_create_container_frame_material())
-    return collider
+def create_compound_collider(parent: bpy.types.Object, asset_name: str, parts: List[colliders.Primitive],
+                             col: bpy.types.Collection) -> List[bpy.types.Object]:
+    objs = colliders.create_compound(parent, asset_name, parts, col, COLLIDER_BUDGET)
+    for collider in objs:
+        add_custom_props(collider, "collision")
+        assign_material(collider, get_or_create_container_frame_material())
+    return objs
 
 
 def create_snap_empty(name: str, location: Tuple[float, float, float], parent: bpy.types.Object,
@@ -577,7 +732,7 @@ def create_snap_empty(name: str, location: Tuple[float, float, float], parent: b
 
 
 def create_stack_snaps(asset_name: str, root_obj: bpy.types.Object, col: bpy.types.Collection):
-    min_x, max_x, min_y, max_y, _min_z, max_z = bounds_from_mesh(root_obj)
+    min_x, max_x, min_y, max_y, _min_z, max_z = bounds_from_object(root_obj)
     cx = (min_x + max_x) * 0.5
 
     create_snap_empty(f"SNAP_START_{asset_name}", (cx, min_y, 0.0), root_obj, col)
@@ -588,48 +743,239 @@ def create_stack_snaps(asset_name: str, root_obj: bpy.types.Object, col: bpy.typ
 # ------------------------------------------------------------
 # Main
 # ------------------------------------------------------------
-def main():
-    ensure_units_meters()
-    purge_container_stack_objects()
-    wipe_collection(COLLECTION_NAME)
-    col = get_or_create_collection(COLLECTION_NAME)
+@trace.traced
+def build_asset_with_lods(preset: Dict, col: bpy.types.Collection):
+    asset_name = preset["name"]
+    ctype = preset["ctype"]
+    grid = preset["grid"]
+
+    lod0 = build_stack_lod(asset_name, ctype, grid, "lod0", col)
+    lod0["asset_name"] = asset_name
+    lod0["lod"] = 0
+    lod0["container_type"] = ctype
+
+    lod1 = build_stack_lod(asset_name, ctype, grid, "lod1", col)
+    lod1["asset_name"] = asset_name
+    lod1["lod"] = 1
+    lod1["container_type"] = ctype
+
+    lod2 = build_stack_lod(asset_name, ctype, grid, "lod2", col)
+    lod2["asset_name"] = asset_name
+    lod2["lod"] = 2
+    lod2["container_type"] = ctype
+
+    lod1.parent = lod0
+    lod1.matrix_parent_inverse = lod0.matrix_world.inverted()
+    lod2.parent = lod0
+    lod2.matrix_parent_inverse = lod0.matrix_world.inverted()
+
+    # Instanced stacks share the container meshes baked in container_mesh.
+    if STACK_MODE == "merged":
+        for lod_key, lod in (("lod1", lod1), ("lod2", lod2)):
+            normal_bake.bake_normals(lod0, lod, f"{asset_name}_{lod_key}_normal",
+                                     LOD_SETTINGS[lod_key]["bake_size"], BAKE_CAGE_EXTRUSION)
+
+    # Both stack modes recenter the containers onto the start face.
+    parts = layout_colliders(stack_layout(ctype, grid), col)
+    offset = start_face_offset(parts)
+    create_compound_collider(lod0, asset_name, colliders.translated(parts, [-v for v in offset]), col)
+    create_stack_snaps(asset_name, lod0, col)
+    return lod0
 
-    created = 0
 
-    for preset in PRESETS:
-        if not preset.get("enabled", True):
+# ------------------------------------------------------------
+# Yards
+# ------------------------------------------------------------
+def yard_block_size(yard: Dict) -> Tuple[float, float]:
+    rows, bays = yard["rows"], yard["bays"]
+    w = CONTAINER_TYPES["40ft"]["width"]
+    l = CONTAINER_TYPES["40ft"]["length"]
+    return rows * w + (rows - 1) * STACK_GAP_X, bays * l + (bays - 1) * STACK_GAP_Y
+
+
+def yard_blocks(yard: Dict) -> List[Tuple[str, Tuple[float, float, float]]]:
+    """(block name, start-face centre in yard space) for every block that fits, centred in the yard."""
+    size_x, size_y = yard["size"]
+    block_w, block_l = yard_block_size(yard)
+    nx = max(0, int((size_x + YARD_AISLE_X) // (block_w + YARD_AISLE_X)))
+    ny = max(0, int((size_y + YARD_AISLE_Y) // (block_l + YARD_AISLE_Y)))
+    margin_x = (size_x - (nx * block_w + (nx - 1) * YARD_AISLE_X)) * 0.5
+    margin_y = (size_y - (ny * block_l + (ny - 1) * YARD_AISLE_Y)) * 0.5
+
+    blocks = []
+    for by in range(ny):
+        for bx in range(nx):
+            x = margin_x + bx * (block_w + YARD_AISLE_X) + block_w * 0.5
+            y = margin_y + by * (block_l + YARD_AISLE_Y)
+            blocks.append((f"{yard['name']}_b{bx:02d}_{by:02d}", (x, y, 0.0)))
+    return blocks
+
+
+def pick_carrier_color(rng: random.Random) -> Tuple[float, float, float]:
+    colors = [c for c, _ in CARRIER_PALETTE]
+    weights = [w for _, w in CARRIER_PALETTE]
+    return rng.choices(colors, weights)[0]
+
+
+def yard_block_layout(yard: Dict, block_name: str) -> List[Dict]:
+    """
+    Layout (see stack_layout) of one block, relative to its start-face
+    centre. Seeded by the yard seed and block name only, so a block comes
+    out the same whether or not the others are generated.
+    """
+    rng = random.Random(f"{yard['seed']}:{block_name}")
+    rows, bays, tiers = yard["rows"], yard["bays"], yard["tiers"]
+    w = CONTAINER_TYPES["40ft"]["width"]
+    l40 = CONTAINER_TYPES["40ft"]["length"]
+    l20 = CONTAINER_TYPES["20ft"]["length"]
+    h = CONTAINER_TYPES["40ft"]["height"]
+    block_w, _block_l = yard_block_size(yard)
+
+    layout = []
+    for bay in range(bays):
+        for row in range(rows):
+            x = -0.5 * block_w + w * 0.5 + row * (w + STACK_GAP_X)
+            y = bay * (l40 + STACK_GAP_Y)
+            if rng.random() < yard["ratio_20ft"]:
+                # Two 20ft stacks fill a 40ft slot end to end.
+                stacks = [("20ft", y), ("20ft", y + l40 - l20)]
+            else:
+                stacks = [("40ft", y)]
+            for ctype, sy in stacks:
+                height = min(tiers, max(0, round(rng.gauss(yard["fill"] * tiers, 1.0))))
+                for tier in range(height):
+                    layout.append({
+                        "ctype": ctype,
+                        "is_top_in_stack": tier == height - 1,
+                        "location": (x, sy, tier * (h + STACK_GAP_Z)),
+                        "rotation_z": 0.0,
+                        "color": pick_carrier_color(rng),
+                    })
+    return layout
+
+
+@trace.traced
+def build_yard_block(block_name: str, origin: Tuple[float, float, float], layout: List[Dict],
+                     col: bpy.types.Collection) -> List[bpy.types.Object]:
+    """Instanced LOD chain + collider + snaps for one block, placed at origin; returns every object created."""
+    before = set(col.all_objects)
+    lods = []
+    for i, lod_key in enumerate(LOD_SETTINGS):
+        root = build_layout_lod(f"{block_name}_{lod_key}", layout, lod_key, col, recenter=False)
+        root["asset_name"] = block_name
+        root["lod"] = i
+        lods.append(root)
+
+    lod0 = lods[0]
+    for root in lods[1:]:
+        root.parent = lod0
+        root.matrix_parent_inverse = lod0.matrix_world.inverted()
+
+    # Built at the origin, then moved: collider and snaps follow as children.
+    create_compound_collider(lod0, block_name, layout_colliders(layout, col), col)
+    create_stack_snaps(block_name, lod0, col)
+    lod0.location = origin
+    return [obj for obj in col.all_objects if obj not in before]
+
+
+def free_block_objects(objs: List[bpy.types.Object]):
+    shared = set(_CONTAINER_MESHES.values())
+    for obj in objs:
+        data = obj.data
+        bpy.data.objects.remove(obj, do_unlink=True)
+        if data is not None and data not in shared and data.users == 0:
+            bpy.data.meshes.remove(data)
+
+
+def build_yard(yard: Dict, col: bpy.types.Collection) -> int:
+    """Build a yard block by block; returns the number of containers placed."""
+    placed = 0
+    for block_name, origin in yard_blocks(yard):
+        layout = yard_block_layout(yard, block_name)
+        if not layout:
+            continue
+        objs = build_yard_block(block_name, origin, layout, col)
+        placed += len(layout)
+
+        if GLB_OUTPUT_DIR:
+            export_asset_glb(os.path.join(GLB_OUTPUT_DIR, block_name + ".glb"), objs)
+        if YARD_OUTPUT_DIR:
+            blend_io.write_objects(os.path.join(YARD_OUTPUT_DIR, block_name + ".blend"), objs)
+            free_block_objects(objs)
+            print(f"Wrote yard block '{block_name}' ({len(layout)} containers).")
+    return placed
+
+
+def export_asset_glb(path: str, objs: List[bpy.types.Object]):
+    """
+    Write one built asset as GLB: instanced LOD roots become one
+    EXT_mesh_gpu_instancing node per container mesh; merged LODs,
+    collider and snaps are plain nodes.
+    """
+    bpy.context.view_layer.update()
+    layouts = []
+    plain = []
+    for obj in objs:
+        if obj.get("asset_role") == "container_instance":
             continue
+        if obj.type == "EMPTY" and "lod" in obj:
+            instances = [c for c in obj.children if c.get("asset_role") == "container_instance"]
+            layouts.append((obj, instances))
+        else:
+            plain.append(obj)
+    gltf_instancing.write_glb(path, layouts, plain)
+
+
+def enabled_presets() -> List[Dict]:
+    return [preset for preset in PRESETS if preset.get("enabled", True)]
+
 
-        asset_name = preset["name"]
-        dims = CONTAINER_TYPES[preset["ctype"]]
-        grid = preset["grid"]
+def enabled_yards() -> List[Dict]:
+    return [yard for yard in YARDS if yard.get("enabled", True)]
 
-        lod0 = build_stack_asset_lod(asset_name, dims, grid, "lod0", col)
-        lod0["asset_name"] = asset_name
-        lod0["lod"] = 0
-        lod0["container_type"] = preset["ctype"]
 
-        lod1 = build_stack_asset_lod(asset_name, dims, grid, "lod1", col)
-        lod1["asset_name"] = asset_name
-        lod1["lod"] = 1
-        lod1["container_type"] = preset["ctype"]
+def asset_names() -> List[str]:
+    # Unit of work for the parallel builder in build_kits.py.
+    return [preset["name"] for preset in enabled_presets()] + [yard["name"] for yard in enabled_yards()]
 
-        lod2 = build_stack_asset_lod(asset_name, dims, grid, "lod2", col)
-        lod2["asset_name"] = asset_name
-        lod2["lod"] = 2
-        lod2["container_type"] = preset["ctype"]
 
-        lod1.parent = lod0
-        lod1.matrix_parent_inverse = lod0.matrix_world.inverted()
-        lod2.parent = lod0
-        lod2.matrix_parent_inverse = lod0.matrix_world.inverted()
+def finalize():
+    """Pack every baked container mesh in the kit collection into the shared normal atlas."""
+    col = bpy.data.collections.get(COLLECTION_NAME)
+    if col is not None:
+        normal_bake.pack_atlas({obj.data for obj in col.all_objects if obj.type == "MESH"}, NORMAL_ATLAS_NAME)
 
-        create_collider_from_bounds(lod0, asset_name, col)
-        create_stack_snaps(asset_name, lod0, col)
 
+def main(only: Optional[Iterable[str]] = None):
+    ensure_units_meters()
+    purge_container_stack_objects()
+    wipe_collection(COLLECTION_NAME)
+    col = get_or_create_collection(COLLECTION_NAME)
+    _CONTAINER_TEMPLATES.clear()
+    _CONTAINER_MESHES.clear()
+
+    wanted = set(only) if only is not None else None
+    created = 0
+
+    for preset in enabled_presets():
+        if wanted is not None and preset["name"] not in wanted:
+            continue
+
+        objs = build_cache.build_or_restore(ASSET_TYPE, preset, build_asset_with_lods, col)
+        if GLB_OUTPUT_DIR:
+            export_asset_glb(os.path.join(GLB_OUTPUT_DIR, preset["name"] + ".glb"), objs)
+        created += 1
+
+    for yard in enabled_yards():
+        if wanted is not None and yard["name"] not in wanted:
+            continue
+        placed = build_yard(yard, col)
+        print(f"Built yard '{yard['name']}' with {placed} containers.")
         created += 1
 
-    print(f"Created {created} container stack presets in collection '{COLLECTION_NAME}'.")
+    finalize()
+    print(f"Created {created} container assets in collection '{COLLECTION_NAME}' "
+          f"from {len(_CONTAINER_TEMPLATES)} container templates.")
 
 
 if __name__ == "__main__":
@@ -1,6 +1,14 @@
 import bpy
 import math
-from typing import List, Tuple
+import os
+import sys
+from typing import Iterable, List, Optional, Tuple
+
+KIT_DIR = os.path.dirname(os.path.abspath(__file__))
+if KIT_DIR not in sys.path:
+    sys.path.append(KIT_DIR)
+
+from kitlib import build_cache, colliders, mesh_merge, primitives, snaps, trace  # noqa: E402
 
 # ============================================================
 # Crane Kit (Blender 5.0+)
@@ -16,11 +24,19 @@ COLLECTION_NAME = "CraneKit"
 FORWARD_AXIS = "+Y"
 ASSET_TYPE = "crane"
 
-LOD_RATIOS = [
-    ("lod1", 0.55),
-    ("lod2", 0.25),
+# Builder-level LODs: each LOD leaves out the members whose cross-section
+# (see member_section) is below its threshold in meters. Thin braces go
+# sub-pixel long before the portal and booms do, and a box member is
+# already as cheap as decimation can make it.
+MEMBER_LODS = [
+    ("lod1", 0.2),
+    ("lod2", 0.6),
 ]
 
+# Collider boxes per crane: legs, portal, booms and mast stay separate,
+# the thin braces fold into their neighbours.
+COLLIDER_BUDGET = 12
+
 # Typical STS proportions informed by ~231 ft boom class (~70.4 m)
 PRESETS = [
     {
@@ -107,10 +123,10 @@ def wipe_collection(name: str):
 
 
 def purge_crane_objects():
-    prefixes = ("crane_", "COLLIDER_crane_", "SNAP_")
+    prefixes = ("crane_", "COLLIDER_crane_")
     ensure_object_mode()
     for obj in list(bpy.data.objects):
-        if obj.name.startswith(prefixes):
+        if obj.name.startswith(prefixes) or snaps.owns_snap(obj.name, "crane_"):
             bpy.data.objects.remove(obj, do_unlink=True)
 
 
@@ -120,6 +136,7 @@ def add_custom_props(obj: bpy.types.Object, asset_role: str):
     obj["forward_axis"] = FORWARD_AXIS
 
 
+@trace.traced
 def shade_smooth_with_autosmooth(obj: bpy.types.Object, angle_deg: float = 35.0):
     if obj.type != "MESH":
         return
@@ -159,27 +176,13 @@ def assign_material(obj: bpy.types.Object, mat: bpy.types.Material):
 
 def add_box_part(name: str, dims: Tuple[float, float, float], location: Tuple[float, float, float],
                  col: bpy.types.Collection, rot: Tuple[float, float, float] = (0.0, 0.0, 0.0)):
-    bpy.ops.mesh.primitive_cube_add(size=1.0, location=location, rotation=rot)
-    obj = bpy.context.active_object
-    obj.name = name
-    obj.scale = dims
-    bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
-    force_into_collection(obj, col)
-    return obj
+    colliders.record_box(dims, location, rot)
+    return primitives.add_box(name, dims, location, col, rotation=rot)
 
 
+@trace.traced
 def join_and_name(objs: List[bpy.types.Object], name: str) -> bpy.types.Object:
-    ensure_object_mode()
-    deselect_all()
-    for o in objs:
-        o.select_set(True)
-    bpy.context.view_layer.objects.active = objs[0]
-    bpy.ops.object.join()
-    obj = bpy.context.active_object
-    obj.name = name
-    if obj.data:
-        obj.data.name = name
-    return obj
+    return mesh_merge.merge_objects(objs, name)
 
 
 def bounds_from_mesh(obj: bpy.types.Object):
@@ -189,14 +192,21 @@ def bounds_from_mesh(obj: bpy.types.Object):
     return (min(xs), max(xs), min(ys), max(ys), min(zs), max(zs))
 
 
-def set_origin_start_face_ground(obj: bpy.types.Object):
-    min_x, max_x, min_y, _max_y, min_z, _max_z = bounds_from_mesh(obj)
-    cx = (min_x + max_x) * 0.5
+def set_origin_start_face_ground(obj: bpy.types.Object,
+                                 offset: Optional[Tuple[float, float, float]] = None) -> Tuple[float, float, float]:
+    """Shift obj so its start face center sits at the origin; returns the shift.
+
+    Pass LOD0's shift as offset so a LOD with fewer members keeps LOD0's pivot.
+    """
+    if offset is None:
+        min_x, max_x, min_y, _max_y, min_z, _max_z = bounds_from_mesh(obj)
+        offset = ((min_x + max_x) * 0.5, min_y, min_z)
     for v in obj.data.vertices:
-        v.co.x -= cx
-        v.co.y -= min_y
-        v.co.z -= min_z
+        v.co.x -= offset[0]
+        v.co.y -= offset[1]
+        v.co.z -= offset[2]
     obj.location = (0.0, 0.0, 0.0)
+    return offset
 
 
 def create_snap_empty(name: str, location: Tuple[float, float, float], parent: bpy.types.Object, col: bpy.types.Collection):
@@ -211,48 +221,49 @@ def create_snap_empty(name: str, location: Tuple[float, float, float], parent: b
     return e
 
 
-def create_collider_from_bounds(parent: bpy.types.Object, base_name: str, col: bpy.types.Collection):
-    min_x, max_x, min_y, max_y, min_z, max_z = bounds_from_mesh(parent)
-    sx = max_x - min_x
-    sy = max_y - min_y
-    sz = max_z - min_z
-    cx = (min_x + max_x) * 0.5
-    cy = (min_y + max_y) * 0.5
-    cz = (min_z + max_z) * 0.5
+def create_compound_collider(parent: bpy.types.Object, base_name: str, parts: List[colliders.Primitive],
+                             col: bpy.types.Collection) -> List[bpy.types.Object]:
+    objs = colliders.create_compound(parent, base_name, parts, col, COLLIDER_BUDGET)
+    for collider in objs:
+        add_custom_props(collider, "collision")
+    return objs
 
-    collider = add_box_part(f"COLLIDER_{base_name}", (sx, sy, sz), (cx, cy, cz), col)
-    add_custom_props(collider, "collision")
-    collider.parent = parent
-    collider.matrix_parent_inverse = parent.matrix_world.inverted()
-    collider.display_type = "WIRE"
-    collider.hide_render = True
-    return collider
 
+# ------------------------------------------------------------
+# STS builder
+# ------------------------------------------------------------
+def member_section(dims: Tuple[float, float, float]) -> float:
+    """Visible cross-section of a box member: its middle dimension.
 
-def duplicate_with_decimate(src: bpy.types.Object, new_name: str, ratio: float, col: bpy.types.Collection):
-    dup = src.copy()
-    dup.data = src.data.copy()
-    dup.name = new_name
-    bpy.context.collection.objects.link(dup)
-    force_into_collection(dup, col)
+    For a brace that is its thickness, for a plate its width, so plates
+    outlive braces of the same thickness.
+    """
+    return sorted(dims)[1]
 
-    dec = dup.modifiers.new(name="Decimate", type="DECIMATE")
-    dec.ratio = ratio
 
-    bpy.context.view_layer.objects.active = dup
-    dup.select_set(True)
-    bpy.ops.object.convert(target="MESH")
-    dup.select_set(False)
+def add_member(members: List[dict], name: str, dims: Tuple[float, float, float],
+               location: Tuple[float, float, float], rot: Tuple[float, float, float] = (0.0, 0.0, 0.0)):
+    members.append({"name": name, "dims": dims, "location": location, "rot": rot,
+                    "section": member_section(dims)})
 
-    add_custom_props(dup, "visual_lod")
-    return dup
+
+def build_members(name: str, members: List[dict], min_section: float, col: bpy.types.Collection) -> bpy.types.Object:
+    """Join the members whose cross-section is at least min_section into one object."""
+    parts = [
+        add_box_part(m["name"], m["dims"], m["location"], col, rot=m["rot"])
+        for m in members
+        if m["section"] >= min_section
+    ]
+    obj = join_and_name(parts, name)
+    obj["member_count"] = len(parts)
+    obj["min_member_section"] = min_section
+    shade_smooth_with_autosmooth(obj)
+    assign_material(obj, get_or_create_material("Crane_STS_Blue", (0.18, 0.56, 0.64, 1.0), 0.5, 0.15))
+    return obj
 
 
-# ------------------------------------------------------------
-# STS builder
-# ------------------------------------------------------------
-def add_diagonal(parts: List[bpy.types.Object], prefix: str, p0: Tuple[float, float, float], p1: Tuple[float, float, float],
-                 thickness: float, col: bpy.types.Collection):
+def add_diagonal(members: List[dict], prefix: str, p0: Tuple[float, float, float], p1: Tuple[float, float, float],
+                 thickness: float):
     dx = p1[0] - p0[0]
     dy = p1[1] - p0[1]
     dz = p1[2] - p0[2]
@@ -263,20 +274,13 @@ def add_diagonal(parts: List[bpy.types.Object], prefix: str, p0: Tuple[float, fl
     rx = -math.atan2(dz, max(1e-6, dy))
 
     mid = ((p0[0] + p1[0]) * 0.5, (p0[1] + p1[1]) * 0.5, (p0[2] + p1[2]) * 0.5)
-    brace = add_box_part(
-        f"{prefix}__diag",
-        (thickness, length, thickness),
-        mid,
-        col,
-        rot=(rx, ry, 0.0),
-    )
-    parts.append(brace)
+    add_member(members, f"{prefix}__diag", (thickness, length, thickness), mid, rot=(rx, ry, 0.0))
 
 
 def build_sts_crane(name: str, rail_gauge: float, width_between_legs: float, portal_length: float,
                     height_under_beam: float, boom_l_waterside: float, boom_l_landside: float,
-                    boom_angle: float, col: bpy.types.Collection) -> bpy.types.Object:
-    parts = []
+                    boom_angle: float, col: bpy.types.Collection, min_section: float = 0.0) -> bpy.types.Object:
+    members: List[dict] = []
 
     # Coordinate frame used here:
     # X = from landside to waterside (rail gauge / ship reach direction)
@@ -297,58 +301,52 @@ def build_sts_crane(name: str, rail_gauge: float, width_between_legs: float, por
     # 4 portal legs + bogies on rails
     for lx in (x_land, x_water):
         for ly in (y_min, y_max):
-            leg = add_box_part(
+            add_member(
+                members,
                 f"{name}__leg",
                 (leg_w, leg_d, height_under_beam),
                 (lx, ly, height_under_beam * 0.5),
-                col,
             )
-            parts.append(leg)
-            bogie = add_box_part(
+            add_member(
+                members,
                 f"{name}__bogie",
                 (1.8, 1.1, 0.5),
                 (lx, ly, 0.25),
-                col,
             )
-            parts.append(bogie)
 
     # Upper portal beams (one at each rail line), spanning leg spacing along quay.
     for lx in (x_land, x_water):
-        beam = add_box_part(
+        add_member(
+            members,
             f"{name}__portal_beam",
             (0.9, width_between_legs, beam_h),
             (lx, y_mid, top_z - beam_h * 0.5),
-            col,
         )
-        parts.append(beam)
 
     # Girder across rail-gauge direction.
-    bridge = add_box_part(
+    add_member(
+        members,
         f"{name}__bridge",
         (rail_gauge, 1.6, 1.0),
         (x_mid, y_mid, top_z + 1.1),
-        col,
     )
-    parts.append(bridge)
 
     # House on landside
-    house = add_box_part(
+    add_member(
+        members,
         f"{name}__house",
         (8.5, 6.0, 3.0),
         (x_land + 4.8, y_mid, top_z + 2.6),
-        col,
     )
-    parts.append(house)
 
     # A-frame mast near waterside hinge
     mast_base_x = x_water - 1.2
-    mast = add_box_part(
+    add_member(
+        members,
         f"{name}__a_mast",
         (1.6, 1.6, 11.0),
         (mast_base_x, y_mid, top_z + 5.5),
-        col,
     )
-    parts.append(mast)
     mast_head = (mast_base_x, y_mid, top_z + 11.0)
 
     # Boom root near waterside beam
@@ -361,14 +359,13 @@ def build_sts_crane(name: str, rail_gauge: float, width_between_legs: float, por
         y_mid,
         boom_root[2] + math.sin(b_angle) * (boom_l_waterside * 0.5),
     )
-    ws_boom = add_box_part(
+    add_member(
+        members,
         f"{name}__boom_waterside",
         (boom_l_waterside, 2.0, 1.2),
         ws_mid,
-        col,
         rot=(0.0, -b_angle, 0.0),
     )
-    parts.append(ws_boom)
     boom_tip = (
         boom_root[0] + math.cos(b_angle) * boom_l_waterside,
         y_mid,
@@ -382,14 +379,13 @@ def build_sts_crane(name: str, rail_gauge: float, width_between_legs: float, por
         y_mid,
         boom_root[2] + math.sin(ls_angle) * (boom_l_landside * 0.5),
     )
-    ls_boom = add_box_part(
+    add_member(
+        members,
         f"{name}__boom_landside",
         (boom_l_landside, 1.4, 1.0),
         ls_mid,
-        col,
         rot=(0.0, ls_angle, 0.0),
     )
-    parts.append(ls_boom)
     landside_tip = (
         boom_root[0] - math.cos(ls_angle) * boom_l_landside,
         y_mid,
@@ -397,47 +393,35 @@ def build_sts_crane(name: str, rail_gauge: float, width_between_legs: float, por
     )
 
     # Structural supports
-    add_diagonal(parts, name, mast_head, boom_root, 0.22, col)
-    add_diagonal(parts, name, mast_head, boom_tip, 0.18, col)
-    add_diagonal(parts, name, mast_head, landside_tip, 0.18, col)
-    add_diagonal(parts, name, (x_water, y_min, top_z - 0.8), boom_root, 0.24, col)
-    add_diagonal(parts, name, (x_water, y_max, top_z - 0.8), boom_root, 0.24, col)
+    add_diagonal(members, name, mast_head, boom_root, 0.22)
+    add_diagonal(members, name, mast_head, boom_tip, 0.18)
+    add_diagonal(members, name, mast_head, landside_tip, 0.18)
+    add_diagonal(members, name, (x_water, y_min, top_z - 0.8), boom_root, 0.24)
+    add_diagonal(members, name, (x_water, y_max, top_z - 0.8), boom_root, 0.24)
 
     # Trolley + spreader on waterside boom
-    trolley = add_box_part(
-        f"{name}__trolley",
-        (2.2, 1.8, 1.2),
-        (
-            boom_root[0] + math.cos(b_angle) * (boom_l_waterside * 0.45),
-            y_mid,
-            boom_root[2] + math.sin(b_angle) * (boom_l_waterside * 0.45),
-        ),
-        col,
+    trolley_pos = (
+        boom_root[0] + math.cos(b_angle) * (boom_l_waterside * 0.45),
+        y_mid,
+        boom_root[2] + math.sin(b_angle) * (boom_l_waterside * 0.45),
     )
-    parts.append(trolley)
-    spreader = add_box_part(
+    add_member(members, f"{name}__trolley", (2.2, 1.8, 1.2), trolley_pos)
+    add_member(
+        members,
         f"{name}__spreader",
         (3.0, 1.0, 0.5),
-        (trolley.location.x, trolley.location.y, max(1.0, trolley.location.z - 22.0)),
-        col,
+        (trolley_pos[0], trolley_pos[1], max(1.0, trolley_pos[2] - 22.0)),
     )
-    parts.append(spreader)
 
     # Service platform
-    service = add_box_part(
+    add_member(
+        members,
         f"{name}__service_platform",
         (2.0, 4.5, 0.25),
         (x_land + 4.2, y_mid, top_z + 0.8),
-        col,
     )
-    parts.append(service)
 
-    obj = join_and_name(parts, name)
-    set_origin_start_face_ground(obj)
-    shade_smooth_with_autosmooth(obj)
-    add_custom_props(obj, "visual")
-    assign_material(obj, get_or_create_material("Crane_STS_Blue", (0.18, 0.56, 0.64, 1.0), 0.5, 0.15))
-    return obj
+    return build_members(name, members, min_section, col)
 
 
 def add_snaps(base_name: str, lod0: bpy.types.Object, col: bpy.types.Collection):
@@ -449,6 +433,7 @@ def add_snaps(base_name: str, lod0: bpy.types.Object, col: bpy.types.Collection)
     create_snap_empty(f"SNAP_TOP_{base_name}", (cx, cy, max_z), lod0, col)
 
 
+@trace.traced
 def build_asset_with_lods(defn: dict, col: bpy.types.Collection):
     name = defn["name"]
     kind = defn["kind"]
@@ -456,46 +441,65 @@ def build_asset_with_lods(defn: dict, col: bpy.types.Collection):
     if kind != "sts":
         return
 
-    lod0 = build_sts_crane(
-        f"{name}_lod0",
-        defn["rail_gauge"],
-        defn["width_between_legs"],
-        defn["portal_length"],
-        defn["height_under_beam"],
-        defn["boom_l_waterside"],
-        defn["boom_l_landside"],
-        defn["boom_angle"],
-        col,
-    )
+    def build(lod_name: str, min_section: float) -> bpy.types.Object:
+        return build_sts_crane(
+            f"{name}_{lod_name}",
+            defn["rail_gauge"],
+            defn["width_between_legs"],
+            defn["portal_length"],
+            defn["height_under_beam"],
+            defn["boom_l_waterside"],
+            defn["boom_l_landside"],
+            defn["boom_angle"],
+            col,
+            min_section,
+        )
 
+    # Every LOD0 member is an analytic box; record them for the collider.
+    with colliders.recording() as parts:
+        lod0 = build("lod0", 0.0)
+    offset = set_origin_start_face_ground(lod0)
+    add_custom_props(lod0, "visual")
     lod0["asset_name"] = name
     lod0["lod"] = 0
 
-    for lod_name, ratio in LOD_RATIOS:
-        lod = duplicate_with_decimate(lod0, f"{name}_{lod_name}", ratio, col)
+    for lod_name, min_section in MEMBER_LODS:
+        lod = build(lod_name, min_section)
+        set_origin_start_face_ground(lod, offset)
+        add_custom_props(lod, "visual_lod")
         lod["asset_name"] = name
         lod["lod"] = int(lod_name[-1])
         lod.parent = lod0
         lod.matrix_parent_inverse = lod0.matrix_world.inverted()
 
-    create_collider_from_bounds(lod0, name, col)
+    create_compound_collider(lod0, name, colliders.translated(parts, [-v for v in offset]), col)
     add_snaps(name, lod0, col)
 
 
+def enabled_presets() -> List[dict]:
+    return [defn for defn in PRESETS if defn.get("enabled", True)]
+
+
+def asset_names() -> List[str]:
+    # Unit of work for the parallel builder in build_kits.py.
+    return [defn["name"] for defn in enabled_presets()]
+
+
 # ------------------------------------------------------------
 # Main
 # ------------------------------------------------------------
-def main():
+def main(only: Optional[Iterable[str]] = None):
     ensure_units_meters()
     purge_crane_objects()
     wipe_collection(COLLECTION_NAME)
     col = get_or_create_collection(COLLECTION_NAME)
 
+    wanted = set(only) if only is not None else None
     created = 0
-    for defn in PRESETS:
-        if not defn.get("enabled", True):
+    for defn in enabled_presets():
+        if wanted is not None and defn["name"] not in wanted:
             continue
-        build_asset_with_lods(defn, col)
+        build_cache.build_or_restore(ASSET_TYPE, defn, build_asset_with_lods, col)
         created += 1
 
     print(f"Created {created} crane assets in collection '{COLLECTION_NAME}'.")
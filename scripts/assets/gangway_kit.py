@@ -1,6 +1,14 @@
 import bpy
 import math
-from typing import List, Tuple
+import os
+import sys
+from typing import Iterable, List, Optional, Tuple
+
+KIT_DIR = os.path.dirname(os.path.abspath(__file__))
+if KIT_DIR not in sys.path:
+    sys.path.append(KIT_DIR)
+
+from kitlib import build_cache, colliders, lod_simplify, mesh_merge, primitives, snaps, trace  # noqa: E402
 
 # ============================================================
 # Gangway Kit (Blender 5.0+)
@@ -15,11 +23,15 @@ COLLECTION_NAME = "GangwayKit"
 FORWARD_AXIS = "+Y"
 ASSET_TYPE = "gangway"
 
-LOD_RATIOS = [
-    ("lod1", 0.55),
-    ("lod2", 0.28),
+# Per-LOD kitlib.lod_simplify targets: max_error in meters and/or max_triangles.
+LOD_TARGETS = [
+    ("lod1", {"max_error": 0.005}),
+    ("lod2", {"max_error": 0.02}),
 ]
 
+# Collider boxes per gangway: deck, legs and one per rail side.
+COLLIDER_BUDGET = 8
+
 # Base dimensions
 DEFAULT_WIDTH = 1.4
 DEFAULT_CLEARANCE = 0.08
@@ -93,10 +105,10 @@ def wipe_collection(name: str):
 
 
 def purge_gangway_objects():
-    prefixes = ("gangway_", "COLLIDER_gangway_", "SNAP_")
+    prefixes = ("gangway_", "COLLIDER_gangway_")
     ensure_object_mode()
     for obj in list(bpy.data.objects):
-        if obj.name.startswith(prefixes):
+        if obj.name.startswith(prefixes) or snaps.owns_snap(obj.name, "gangway_"):
             bpy.data.objects.remove(obj, do_unlink=True)
 
 
@@ -106,6 +118,7 @@ def add_custom_props(obj: bpy.types.Object, asset_role: str):
     obj["forward_axis"] = FORWARD_AXIS
 
 
+@trace.traced
 def shade_smooth_with_autosmooth(obj: bpy.types.Object, angle_deg: float = 35.0):
     if obj.type != "MESH":
         return
@@ -145,27 +158,13 @@ def assign_material(obj: bpy.types.Object, mat: bpy.types.Material):
 
 def add_box_part(name: str, dims: Tuple[float, float, float], location: Tuple[float, float, float],
                  col: bpy.types.Collection, rot: Tuple[float, float, float] = (0.0, 0.0, 0.0)):
-    bpy.ops.mesh.primitive_cube_add(size=1.0, location=location, rotation=rot)
-    obj = bpy.context.active_object
-    obj.name = name
-    obj.scale = dims
-    bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
-    force_into_collection(obj, col)
-    return obj
+    colliders.record_box(dims, location, rot)
+    return primitives.add_box(name, dims, location, col, rotation=rot)
 
 
+@trace.traced
 def join_and_name(objs: List[bpy.types.Object], name: str) -> bpy.types.Object:
-    ensure_object_mode()
-    deselect_all()
-    for o in objs:
-        o.select_set(True)
-    bpy.context.view_layer.objects.active = objs[0]
-    bpy.ops.object.join()
-    obj = bpy.context.active_object
-    obj.name = name
-    if obj.data:
-        obj.data.name = name
-    return obj
+    return mesh_merge.merge_objects(objs, name)
 
 
 def bounds_from_mesh(obj: bpy.types.Object):
@@ -185,6 +184,12 @@ def set_origin_start_face_ground(obj: bpy.types.Object):
     obj.location = (0.0, 0.0, 0.0)
 
 
+def start_face_offset(parts: List[colliders.Primitive]) -> Tuple[float, float, float]:
+    """The shift set_origin_start_face_ground applies to a mesh built from parts."""
+    lo, hi = colliders.bounds(parts)
+    return ((lo[0] + hi[0]) * 0.5, lo[1], lo[2])
+
+
 def create_snap_empty(name: str, location: Tuple[float, float, float], parent: bpy.types.Object, col: bpy.types.Collection):
     deselect_all()
     bpy.ops.object.empty_add(type="PLAIN_AXES", location=location)
@@ -197,38 +202,23 @@ def create_snap_empty(name: str, location: Tuple[float, float, float], parent: b
     return e
 
 
-def create_collider_from_bounds(parent: bpy.types.Object, base_name: str, col: bpy.types.Collection):
-    min_x, max_x, min_y, max_y, min_z, max_z = bounds_from_mesh(parent)
-    sx = max_x - min_x
-    sy = max_y - min_y
-    sz = max_z - min_z
-    cx = (min_x + max_x) * 0.5
-    cy = (min_y + max_y) * 0.5
-    cz = (min_z + max_z) * 0.5
-
-    collider = add_box_part(f"COLLIDER_{base_name}", (sx, sy, sz), (cx, cy, cz), col)
-    add_custom_props(collider, "collision")
-    collider.parent = parent
-    collider.matrix_parent_inverse = parent.matrix_world.inverted()
-    collider.display_type = "WIRE"
-    collider.hide_render = True
-    return collider
+def create_compound_collider(parent: bpy.types.Object, base_name: str, parts: List[colliders.Primitive],
+                             col: bpy.types.Collection) -> List[bpy.types.Object]:
+    objs = colliders.create_compound(parent, base_name, parts, col, COLLIDER_BUDGET)
+    for collider in objs:
+        add_custom_props(collider, "collision")
+    return objs
 
 
-def duplicate_with_decimate(src: bpy.types.Object, new_name: str, ratio: float, col: bpy.types.Collection):
+@trace.traced
+def duplicate_simplified(src: bpy.types.Object, new_name: str, target: dict, col: bpy.types.Collection):
     dup = src.copy()
     dup.data = src.data.copy()
     dup.name = new_name
     bpy.context.collection.objects.link(dup)
     force_into_collection(dup, col)
 
-    dec = dup.modifiers.new(name="Decimate", type="DECIMATE")
-    dec.ratio = ratio
-
-    bpy.context.view_layer.objects.active = dup
-    dup.select_set(True)
-    bpy.ops.object.convert(target="MESH")
-    dup.select_set(False)
+    lod_simplify.simplify(dup, src, **target)
 
     add_custom_props(dup, "visual_lod")
     return dup
@@ -383,43 +373,57 @@ def add_snaps(base_name: str, lod0: bpy.types.Object, col: bpy.types.Collection)
     create_snap_empty(f"SNAP_TOP_{base_name}", (cx, max_y, max_z), lod0, col)
 
 
+@trace.traced
 def build_asset_with_lods(defn: dict, col: bpy.types.Collection):
     name = defn["name"]
     kind = defn["kind"]
 
-    if kind == "ramp":
-        lod0 = build_ramp(name + "_lod0", defn["length"], defn["angle_deg"], defn["width"], defn["rails"], col)
-    else:
-        lod0 = build_platform(name + "_lod0", defn["length"], defn["width"], defn["rails"], col)
+    # Every part is an analytic box; record them for the collider.
+    with colliders.recording() as parts:
+        if kind == "ramp":
+            lod0 = build_ramp(name + "_lod0", defn["length"], defn["angle_deg"], defn["width"], defn["rails"], col)
+        else:
+            lod0 = build_platform(name + "_lod0", defn["length"], defn["width"], defn["rails"], col)
 
     lod0["asset_name"] = name
     lod0["lod"] = 0
 
-    for lod_name, ratio in LOD_RATIOS:
-        lod = duplicate_with_decimate(lod0, f"{name}_{lod_name}", ratio, col)
+    for lod_name, target in LOD_TARGETS:
+        lod = duplicate_simplified(lod0, f"{name}_{lod_name}", target, col)
         lod["asset_name"] = name
         lod["lod"] = int(lod_name[-1])
         lod.parent = lod0
         lod.matrix_parent_inverse = lod0.matrix_world.inverted()
 
-    create_collider_from_bounds(lod0, name, col)
+    offset = start_face_offset(parts)
+    create_compound_collider(lod0, name, colliders.translated(parts, [-v for v in offset]), col)
     add_snaps(name, lod0, col)
 
 
+def enabled_presets() -> List[dict]:
+    return [defn for defn in PRESETS if defn.get("enabled", True)]
+
+
+def asset_names() -> List[str]:
+    # Unit of work for the parallel builder in build_kits.py.
+    return [defn["name"] for defn in enabled_presets()]
+
+
 # ------------------------------------------------------------
 # Main
 # ------------------------------------------------------------
-def main():
+def main(only: Optional[Iterable[str]] = None):
     ensure_units_meters()
     purge_gangway_objects()
     wipe_collection(COLLECTION_NAME)
     col = get_or_create_collection(COLLECTION_NAME)
 
+    wanted = set(only) if only is not None else None
     created = 0
-    for defn in PRESETS:
-        if not defn.get("enabled", True):
+    for defn in enabled_presets():
+        if wanted is not None and defn["name"] not in wanted:
             continue
-        build_asset_with_lods(defn, col)
+        build_cache.build_or_restore(ASSET_TYPE, defn, build_asset_with_lods, col)
         created += 1
 
     print(f"Created {created} gangway assets in collection '{COLLECTION_NAME}'.")
@@ -1,5 +1,13 @@
 import bpy
 import math
+import os
+import sys
+
+KIT_DIR = os.path.dirname(os.path.abspath(__file__))
+if KIT_DIR not in sys.path:
+    sys.path.append(KIT_DIR)
+
+from kitlib import convex_decomp, mesh_merge, primitives, trace  # noqa: E402
 
 # ============================
 # Harbor Ladder Kit (Blender 5.0+)
@@ -35,10 +43,12 @@ LOD_RUNG_SEGMENTS = {
 # LOD2: a single slab representation
 LOD2_THICKNESS = 0.02
 
-# Collider margin
-COLLIDER_MARGIN_X = 0.03
-COLLIDER_MARGIN_Y = 0.04
-COLLIDER_MARGIN_Z = 0.03
+# Collider: convex decomposition of LOD1 (kitlib.convex_decomp). The gaps
+# between rungs are meant to stay filled (climbing wants a slab), so the
+# error allowance is loose and the hulls mainly split off the hooks.
+COLLIDER_MAX_HULLS = 3
+COLLIDER_MAX_ERROR = 1.0
+COLLIDER_MAX_VERTICES = 16
 
 
 # ----------------------------
@@ -133,22 +143,28 @@ def shade_smooth_auto(obj, angle_deg=35.0):
     bpy.ops.object.shade_auto_smooth(use_auto_smooth=True, angle=math.radians(angle_deg))
     obj.select_set(False)
 
-def apply_all_transforms(obj):
+@trace.traced
+def apply_modifiers_for_export(obj):
     ensure_object_mode()
     deselect_all()
     obj.select_set(True)
     set_active(obj)
-    bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
+    bpy.ops.object.convert(target='MESH')  # applies modifiers
     obj.select_set(False)
 
+def add_box(name: str, dims, loc, col):
+    """Box of full size dims with its origin at loc (mesh centred on the origin)."""
+    o = primitives.add_box(name, dims, (0.0, 0.0, 0.0), col)
+    o.location = loc
+    return o
+
 def join_objects(objs, active_obj):
-    ensure_object_mode()
-    deselect_all()
-    for o in objs:
-        o.select_set(True)
-    set_active(active_obj)
-    bpy.ops.object.join()
-    return bpy.context.active_object
+    # As join did, the result takes active_obj's name, origin and transform.
+    matrix = mesh_merge.world_matrix(active_obj)
+    merged = mesh_merge.merge_objects(objs, active_obj.name)
+    merged.data.transform(matrix.inverted())
+    merged.matrix_world = matrix
+    return merged
 
 def create_empty(name: str, loc, col):
     e = bpy.data.objects.new(name, None)
@@ -168,13 +184,7 @@ def make_rail(x_center: float, y_center: float, z_top: float, height: float, col
     Rail is a rectangular prism extending downward along -Z.
     Top is near z_top, bottom at z_top - height.
     """
-    # Create cube and scale to rail dimensions
-    bpy.ops.mesh.primitive_cube_add(location=(x_center, y_center, z_top - height * 0.5))
-    o = bpy.context.active_object
-    o.scale = (RAIL_THICK * 0.5, RAIL_DEPTH * 0.5, height * 0.5)
-    apply_all_transforms(o)
-    link_only_to_collection(o, col)
-    return o
+    return add_box("Rail", (RAIL_THICK, RAIL_DEPTH, height), (x_center, y_center, z_top - height * 0.5), col)
 
 def make_hook(x_center: float, col):
     """
@@ -184,38 +194,40 @@ def make_hook(x_center: float, col):
     parts = []
 
     # Top lip (sits at origin height z=0)
-    bpy.ops.mesh.primitive_cube_add(location=(x_center, RAIL_DEPTH * 0.5 + HOOK_DEPTH * 0.5, -RAIL_THICK * 0.5))
-    lip = bpy.context.active_object
-    lip.scale = (RAIL_THICK * 0.55, HOOK_DEPTH * 0.5, RAIL_THICK * 0.5)
-    apply_all_transforms(lip)
+    lip = add_box(
+        "HookLip",
+        (RAIL_THICK * 1.1, HOOK_DEPTH, RAIL_THICK),
+        (x_center, RAIL_DEPTH * 0.5 + HOOK_DEPTH * 0.5, -RAIL_THICK * 0.5),
+        col,
+    )
     parts.append(lip)
 
     # Down wrap
-    bpy.ops.mesh.primitive_cube_add(location=(x_center, RAIL_DEPTH * 0.5 + HOOK_DEPTH - (RAIL_THICK * 0.35), -HOOK_DROP * 0.5))
-    wrap = bpy.context.active_object
-    wrap.scale = (RAIL_THICK * 0.45, RAIL_THICK * 0.45, HOOK_DROP * 0.5)
-    apply_all_transforms(wrap)
+    wrap = add_box(
+        "HookWrap",
+        (RAIL_THICK * 0.9, RAIL_THICK * 0.9, HOOK_DROP),
+        (x_center, RAIL_DEPTH * 0.5 + HOOK_DEPTH - (RAIL_THICK * 0.35), -HOOK_DROP * 0.5),
+        col,
+    )
     parts.append(wrap)
 
-    for p in parts:
-        link_only_to_collection(p, col)
-
     return parts
 
 def make_rung(z: float, segments: int, col):
     """
     Rung is a cylinder spanning width (X direction), located at given Z (negative).
     """
-    # Cylinder default axis is Z; rotate to align along X
-    bpy.ops.mesh.primitive_cylinder_add(
+    # Cylinder default axis is Z; rotate to align along X (baked into the mesh)
+    r = primitives.add_cylinder(
+        "Rung",
+        RUNG_DIAM * 0.5,
+        WIDTH - (RAIL_THICK * 1.2),
+        (0.0, 0.0, 0.0),
+        col,
+        rotation=(0.0, math.radians(90.0), 0.0),
         vertices=segments,
-        radius=RUNG_DIAM * 0.5,
-        depth=WIDTH - (RAIL_THICK * 1.2),
-        location=(0.0, RAIL_DEPTH * 0.35 + RUNG_DEPTH * 0.5, z),
-        rotation=(0.0, math.radians(90.0), 0.0)
     )
-    r = bpy.context.active_object
-    link_only_to_collection(r, col)
+    r.location = (0.0, RAIL_DEPTH * 0.35 + RUNG_DEPTH * 0.5, z)
     return r
 
 def build_ladder_lod(lod: int, col):
@@ -223,12 +235,7 @@ def build_ladder_lod(lod: int, col):
 
     if lod == 2:
         # Simple slab: just a thin box indicating ladder presence
-        bpy.ops.mesh.primitive_cube_add(location=(0.0, RAIL_DEPTH * 0.5, -HEIGHT * 0.5))
-        slab = bpy.context.active_object
-        slab.scale = (WIDTH * 0.5, LOD2_THICKNESS * 0.5, HEIGHT * 0.5)
-        apply_all_transforms(slab)
-        link_only_to_collection(slab, col)
-        slab.name = name
+        slab = add_box(name, (WIDTH, LOD2_THICKNESS, HEIGHT), (0.0, RAIL_DEPTH * 0.5, -HEIGHT * 0.5), col)
         add_custom_props(slab, "visual_lod")
         slab["lod"] = lod
         shade_smooth_auto(slab, 25.0)
@@ -282,37 +289,22 @@ def build_ladder_lod(lod: int, col):
         wn.keep_sharp = True
 
         # Apply modifiers for export
-        deselect_all()
-        merged.select_set(True)
-        set_active(merged)
-        bpy.ops.object.convert(target='MESH')
-        merged.select_set(False)
+        apply_modifiers_for_export(merged)
 
     shade_smooth_auto(merged, 35.0)
     return merged
 
 
-def create_collider(parent: bpy.types.Object, col):
-    # Use known dims (slightly padded)
-    w = WIDTH + 2 * COLLIDER_MARGIN_X
-    d = (RAIL_DEPTH + HOOK_DEPTH + RUNG_DEPTH) + 2 * COLLIDER_MARGIN_Y
-    h = HEIGHT + 2 * COLLIDER_MARGIN_Z
-
-    # Center of ladder volume is at z = -HEIGHT/2
-    bpy.ops.mesh.primitive_cube_add(location=(0.0, d * 0.5 * 0.15, -HEIGHT * 0.5))
-    c = bpy.context.active_object
-    c.scale = (w * 0.5, d * 0.5, h * 0.5)
-    apply_all_transforms(c)
-
-    c.name = f"COLLIDER_{ASSET_BASE}"
-    c.display_type = 'WIRE'
-    c.hide_render = True
-    link_only_to_collection(c, col)
-    add_custom_props(c, "collision")
-
-    c.parent = parent
-    c.matrix_parent_inverse = parent.matrix_world.inverted()
-    return c
+def create_collider(parent: bpy.types.Object, source: bpy.types.Object, col):
+    # Hulls around LOD1's rails, hooks and rungs, no padding
+    colliders = convex_decomp.create_hull_colliders(
+        parent, ASSET_BASE, source, col,
+        max_hulls=COLLIDER_MAX_HULLS, max_error=COLLIDER_MAX_ERROR,
+        max_vertices=COLLIDER_MAX_VERTICES,
+    )
+    for c in colliders:
+        add_custom_props(c, "collision")
+    return colliders
 
 
 # ----------------------------
@@ -335,7 +327,7 @@ def main():
     lod2.parent = lod0
 
     # Collider + snap points
-    create_collider(lod0, col)
+    create_collider(lod0, lod1, col)
 
     snap_hook = create_empty(f"SNAP_HOOK_{ASSET_BASE}", (0.0, 0.0, 0.0), col)
     snap_bottom = create_empty(f"SNAP_BOTTOM_{ASSET_BASE}", (0.0, 0.0, -HEIGHT), col)
@@ -1,88 +1,28 @@
 import bpy
-import bmesh
+import os
+import sys
 from math import radians
 from mathutils import Vector
 
+KIT_DIR = os.path.dirname(os.path.abspath(__file__))
+if KIT_DIR not in sys.path:
+    sys.path.append(KIT_DIR)
+
+from kitlib import mesh_merge, primitives  # noqa: E402
+
+COLLECTION_NAME = "HARBOR_LIGHTPOLE"
+
 # ----------------------------
 # Helpers
 # ----------------------------
 
-def _append_bmesh(dst: bmesh.types.BMesh, src: bmesh.types.BMesh):
-    """Append src geometry into dst (copy verts/edges/faces)."""
-    src.verts.ensure_lookup_table()
-    src.edges.ensure_lookup_table()
-    src.faces.ensure_lookup_table()
-
-    vmap = {}
-    for v in src.verts:
-        nv = dst.verts.new(v.co)
-        vmap[v] = nv
-
-    dst.verts.ensure_lookup_table()
-
-    # edges
-    for e in src.edges:
-        v1 = vmap[e.verts[0]]
-        v2 = vmap[e.verts[1]]
-        try:
-            dst.edges.new((v1, v2))
-        except ValueError:
-            pass  # edge already exists
-
-    dst.edges.ensure_lookup_table()
-
-    # faces
-    for f in src.faces:
-        verts = [vmap[v] for v in f.verts]
-        try:
-            nf = dst.faces.new(verts)
-            nf.smooth = f.smooth
-        except ValueError:
-            pass  # face already exists
-
 def join_meshes_no_ops(name: str, objs):
     """
     Merge mesh objects into one mesh object using evaluated depsgraph meshes.
     This avoids stale transforms/modifiers issues in Blender 5.x.
     """
-    depsgraph = bpy.context.evaluated_depsgraph_get()
-    bm_merged = bmesh.new()
-
-    # Make sure transforms are up-to-date before we read matrix_world/to_mesh
-    bpy.context.view_layer.update()
-
-    for obj in objs:
-        if not obj or obj.type != "MESH":
-            continue
-
-        eval_obj = obj.evaluated_get(depsgraph)
-
-        # Get evaluated mesh (includes modifiers, correct data layers)
-        eval_mesh = eval_obj.to_mesh(preserve_all_data_layers=True, depsgraph=depsgraph)
-        if eval_mesh is None:
-            continue
-
-        bm_part = bmesh.new()
-        bm_part.from_mesh(eval_mesh)
-        bm_part.transform(eval_obj.matrix_world)
-
-        _append_bmesh(bm_merged, bm_part)
-
-        bm_part.free()
-        eval_obj.to_mesh_clear()
-
-    merged_mesh = bpy.data.meshes.new(name + "_Mesh")
-    bm_merged.to_mesh(merged_mesh)
-    bm_merged.free()
-
-    merged_obj = bpy.data.objects.new(name, merged_mesh)
-    bpy.context.scene.collection.objects.link(merged_obj)
-
-    # Delete sources
-    for obj in objs:
-        if obj and obj.name in bpy.data.objects:
-            bpy.data.objects.remove(obj, do_unlink=True)
-
+    merged_obj = mesh_merge.merge_objects(objs, name, bpy.context.scene.collection, evaluated=True)
+    merged_obj.data.name = name + "_Mesh"
     return merged_obj
 
 
@@ -223,26 +163,15 @@ def set_active(obj):
     bpy.context.view_layer.objects.active = obj
     obj.select_set(True)
 
+# Geometry stays centred on the object origin; callers move parts via obj.location.
 def add_cylinder(name, radius, depth, verts=24, location=(0,0,0)):
-    bpy.ops.mesh.primitive_cylinder_add(
-        vertices=verts,
-        radius=radius,
-        depth=depth,
-        location=location
-    )
-    obj = bpy.context.active_object
-    obj.name = name
+    obj = primitives.add_cylinder(name, radius, depth, (0, 0, 0), bpy.context.scene.collection, vertices=verts)
+    obj.location = location
     return obj
 
 def add_uv_sphere(name, radius, seg=16, ring=8, location=(0,0,0)):
-    bpy.ops.mesh.primitive_uv_sphere_add(
-        segments=seg,
-        ring_count=ring,
-        radius=radius,
-        location=location
-    )
-    obj = bpy.context.active_object
-    obj.name = name
+    obj = primitives.add_uv_sphere(name, radius, (0, 0, 0), bpy.context.scene.collection, segments=seg, ring_count=ring)
+    obj.location = location
     return obj
 
 def add_bevel(obj, width=0.01, segments=2):
@@ -328,7 +257,7 @@ def make_lightpole(
     lens_r=0.055,
     emissive_strength=60.0
 ):
-    root_col = ensure_collection("HARBOR_LIGHTPOLE")
+    root_col = ensure_collection(COLLECTION_NAME)
     col_lod0 = ensure_collection(f"{name}_LOD0", root_col)
     col_lod1 = ensure_collection(f"{name}_LOD1", root_col)
     col_lod2 = ensure_collection(f"{name}_LOD2", root_col)
@@ -429,5 +358,10 @@ def make_presets():
         emissive_strength=120.0
     )
 
-remove_collection_tree("HARBOR_LIGHTPOLE")
-make_presets()
+def main():
+    remove_collection_tree(COLLECTION_NAME)
+    make_presets()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+"""Shared build pipeline helpers for the asset kits in scripts/assets.
+
+Kits stay runnable on their own; they add scripts/assets to sys.path and
+import from here for pipeline concerns (caching, I/O, export, tracing,
+snap ownership) and shared geometry code (primitives, mesh merging,
+batched booleans, LOD simplification, normal baking and error metrics,
+compound colliders, convex decomposition, heightfields and their
+adaptive triangulation).
+"""
@@ -0,0 +1,73 @@
+import os
+import re
+from typing import Dict, Iterable, List, Set
+
+import bpy
+
+# Shared datablocks that every written .blend carries its own copy of.
+# Meshes are only folded when both copies are flagged SHARED_MESH_PROP
+# (e.g. container templates instanced by many stacks); any other mesh
+# name clash is a different mesh.
+DEDUPE_ID_TYPES = ("materials", "node_groups", "textures", "images", "meshes")
+SHARED_MESH_PROP = "shared_mesh"
+DUPLICATE_SUFFIX = re.compile(r"^(.*)\.\d{3}$")
+
+
+def snapshot_id_names() -> Dict[str, Set[str]]:
+    return {attr: {idb.name for idb in getattr(bpy.data, attr)} for attr in DEDUPE_ID_TYPES}
+
+
+def _foldable(attr: str, copy, original) -> bool:
+    if attr != "meshes":
+        return True
+    return bool(copy.get(SHARED_MESH_PROP)) and bool(original.get(SHARED_MESH_PROP))
+
+
+def dedupe_loaded_ids(before: Dict[str, Set[str]]):
+    """Fold "Name.001" copies brought in by an appended file onto the existing "Name"."""
+    for attr in DEDUPE_ID_TYPES:
+        id_collection = getattr(bpy.data, attr)
+        for idb in list(id_collection):
+            if idb.name in before[attr]:
+                continue
+            match = DUPLICATE_SUFFIX.match(idb.name)
+            if not match or match.group(1) not in before[attr]:
+                continue
+            original = id_collection[match.group(1)]
+            if not _foldable(attr, idb, original):
+                continue
+            idb.user_remap(original)
+            id_collection.remove(idb)
+
+
+def write_objects(path: str, objs: Iterable[bpy.types.Object]):
+    """Write objects (and everything they reference) to a standalone .blend."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    bpy.data.libraries.write(tmp_path, set(objs), fake_user=True)
+    os.replace(tmp_path, path)
+
+
+def append_objects(path: str, col: bpy.types.Collection) -> List[bpy.types.Object]:
+    """Append every object from a .blend written by write_objects into col."""
+    before = snapshot_id_names()
+
+    with bpy.data.libraries.load(path, link=False) as (data_from, _):
+        mesh_names = list(data_from.meshes)
+
+    # Orphaned meshes from a previous run would push the loaded ones to ".001".
+    for name in mesh_names:
+        stale = bpy.data.meshes.get(name)
+        if stale is not None and stale.users == 0:
+            bpy.data.meshes.remove(stale)
+
+    with bpy.data.libraries.load(path, link=False) as (data_from, data_to):
+        data_to.objects = list(data_from.objects)
+
+    objs = [obj for obj in data_to.objects if obj is not None]
+    for obj in objs:
+        obj.use_fake_user = False
+        col.objects.link(obj)
+
+    dedupe_loaded_ids(before)
+    return objs
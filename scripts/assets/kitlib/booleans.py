@@ -0,0 +1,192 @@
+import time
+from typing import Dict, List, Optional, Sequence
+
+import bpy
+import numpy as np
+
+from kitlib import mesh_merge, trace
+
+# ============================================================
+# Batched boolean difference
+# All cutters for a target are merged into one cutter object and cut
+# with a single BOOLEAN modifier, evaluated through the depsgraph
+# instead of bpy.ops.object.modifier_apply. The result is validated
+# against the input; only when that fails does the stage retry:
+#   1. the same merged cutter with the fast (float) solver
+#   2. halves of the cutter set, recursively, each with 1. as its own
+#      fallback; a single cutter that still fails is skipped
+# so a bad cutter costs a few extra booleans instead of the target.
+#
+# Every difference() call appends a record (target, cutter count,
+# solver, attempts, seconds, ok) to REPORT; build_kits.py collects it
+# per kit with take_report() for its --report JSON.
+# ============================================================
+
+MIN_POLYGONS = 6
+# Bounds and volume slack for validation, in meters / cubic meters.
+BOUNDS_EPS = 1e-4
+VOLUME_EPS = 1e-6
+
+REPORT: List[Dict[str, object]] = []
+
+
+def take_report() -> List[Dict[str, object]]:
+    """Records since the last call, oldest first."""
+    records = list(REPORT)
+    REPORT.clear()
+    return records
+
+
+def fast_solver() -> str:
+    # Blender 4.5 renamed the FAST solver to FLOAT.
+    items = bpy.types.BooleanModifier.bl_rna.properties["solver"].enum_items.keys()
+    return "FLOAT" if "FLOAT" in items else "FAST"
+
+
+def _world_co(obj: bpy.types.Object) -> np.ndarray:
+    co = mesh_merge.read_mesh_arrays(obj.data, mesh_merge.world_matrix(obj))["co"]
+    return co.astype(np.float64)
+
+
+def _bounds(co: np.ndarray) -> np.ndarray:
+    if not len(co):
+        return np.zeros((2, 3))
+    return np.stack([co.min(axis=0), co.max(axis=0)])
+
+
+def _overlaps(a: np.ndarray, b: np.ndarray) -> bool:
+    return bool(np.all(a[0] <= b[1]) and np.all(b[0] <= a[1]))
+
+
+def mesh_stats(mesh: bpy.types.Mesh) -> Dict[str, object]:
+    """Polygon count, local bounds, closedness and enclosed volume."""
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    co = co.reshape(-1, 3).astype(np.float64)
+
+    loop_edge = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("edge_index", loop_edge)
+    closed = bool(len(mesh.edges)) and bool(np.all(np.bincount(loop_edge, minlength=len(mesh.edges)) == 2))
+
+    mesh.calc_loop_triangles()
+    tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("vertices", tris)
+    a, b, c = (co[tris.reshape(-1, 3)[:, k]] for k in range(3))
+    volume = float(np.einsum("ij,ij->i", a, np.cross(b, c)).sum() / 6.0)
+
+    return {
+        "polygons": len(mesh.polygons),
+        "bounds": _bounds(co),
+        "closed": closed,
+        "volume": volume,
+        "finite": bool(np.isfinite(co).all()),
+    }
+
+
+def validate(before: Dict[str, object], after: Dict[str, object]) -> bool:
+    """A difference may only remove material: it stays inside the input
+    bounds, keeps a closed input closed and does not gain volume."""
+    if not after["finite"] or after["polygons"] < MIN_POLYGONS:
+        return False
+    lo, hi = before["bounds"]
+    if np.any(after["bounds"][0] < lo - BOUNDS_EPS) or np.any(after["bounds"][1] > hi + BOUNDS_EPS):
+        return False
+    if before["closed"]:
+        if not after["closed"]:
+            return False
+        # Compare magnitudes so an inside-out input is judged the same way.
+        if not 0.0 < abs(after["volume"]) <= abs(before["volume"]) + VOLUME_EPS:
+            return False
+    return True
+
+
+def _evaluate(target: bpy.types.Object, cutter: bpy.types.Object, solver: str,
+              self_intersect: bool) -> Optional[bpy.types.Mesh]:
+    mod = target.modifiers.new(name="BatchedBoolean", type="BOOLEAN")
+    mod.operation = "DIFFERENCE"
+    mod.solver = solver
+    mod.object = cutter
+    if solver == "EXACT":
+        # Overlapping cutters make the merged cutter self-intersect.
+        mod.use_self = self_intersect
+    try:
+        bpy.context.view_layer.update()
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        return bpy.data.meshes.new_from_object(target.evaluated_get(depsgraph), depsgraph=depsgraph)
+    except RuntimeError:
+        return None
+    finally:
+        target.modifiers.remove(mod)
+
+
+def _cut(target: bpy.types.Object, cutters: List[bpy.types.Object], boxes: List[np.ndarray],
+         name: str, record: Dict[str, object]) -> bool:
+    """Cut target by the union of cutters, falling back as described above."""
+    self_intersect = any(_overlaps(boxes[i], boxes[j])
+                         for i in range(len(boxes)) for j in range(i + 1, len(boxes)))
+    cutter = mesh_merge.merge_objects(cutters, f"{name}__cutter", col=target.users_collection[0],
+                                      remove_sources=False)
+    before = mesh_stats(target.data)
+    try:
+        for solver in ("EXACT", fast_solver()):
+            record["attempts"] += 1
+            mesh = _evaluate(target, cutter, solver, self_intersect)
+            if mesh is None:
+                continue
+            if validate(before, mesh_stats(mesh)):
+                old = target.data
+                target.data = mesh
+                if old.users == 0:
+                    bpy.data.meshes.remove(old)
+                record["solvers"].add(solver)
+                return True
+            bpy.data.meshes.remove(mesh)
+    finally:
+        cutter_mesh = cutter.data
+        bpy.data.objects.remove(cutter, do_unlink=True)
+        bpy.data.meshes.remove(cutter_mesh)
+
+    if len(cutters) == 1:
+        record["skipped"] += 1
+        return False
+    half = len(cutters) // 2
+    ok_a = _cut(target, cutters[:half], boxes[:half], f"{name}_a", record)
+    ok_b = _cut(target, cutters[half:], boxes[half:], f"{name}_b", record)
+    return ok_a and ok_b
+
+
+@trace.traced
+def difference(target: bpy.types.Object, cutters: Sequence[Optional[bpy.types.Object]], name: str) -> bool:
+    """Subtract every cutter from target in one boolean and delete the cutters.
+
+    Cutters that miss the target's bounds are dropped before the cut.
+    Returns False when some cutter had to be skipped.
+    """
+    cutters = [c for c in cutters if c is not None and c.type == "MESH"]
+    if target.type != "MESH" or not cutters:
+        return True
+
+    start = time.perf_counter()
+    record: Dict[str, object] = {"target": name, "cutters": len(cutters), "solvers": set(),
+                                 "attempts": 0, "skipped": 0}
+    target_box = _bounds(_world_co(target))
+    hits, boxes = [], []
+    for cutter in cutters:
+        box = _bounds(_world_co(cutter))
+        if _overlaps(box, target_box):
+            hits.append(cutter)
+            boxes.append(box)
+
+    ok = _cut(target, hits, boxes, name, record) if hits else True
+
+    for cutter in cutters:
+        mesh = cutter.data
+        bpy.data.objects.remove(cutter, do_unlink=True)
+        if mesh is not None and mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
+    record["solvers"] = sorted(record["solvers"])
+    record["ok"] = ok
+    record["seconds"] = round(time.perf_counter() - start, 4)
+    REPORT.append(record)
+    return ok
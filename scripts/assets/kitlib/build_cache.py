@@ -0,0 +1,170 @@
+import glob
+import hashlib
+import inspect
+import json
+import os
+import types
+from typing import Callable, Dict, List, Optional
+
+import bpy
+
+from kitlib import blend_io
+
+# ============================================================
+# Content-addressed asset cache
+# An asset's key hashes everything that shapes its geometry:
+#   - the preset/module definition dict
+#   - the source of the builder and every kit/kitlib function it calls
+#   - the module-level constants those functions read (LOD_SETTINGS,
+#     WALL_THICKNESS, STACK_GAP_X, ...)
+#   - the Blender version
+# Decorated functions (kitlib.trace.traced) are unwrapped first, so the
+# key is the same whether or not ASSET_KIT_TRACE is set.
+# A hit appends the stored objects instead of rebuilding them.
+#
+# Environment:
+#   ASSET_KIT_CACHE=0        disable the cache
+#   ASSET_KIT_CACHE_DIR=...  cache location (default scripts/assets/.cache)
+# ============================================================
+
+CACHE_FORMAT = 1
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache")
+PLAIN_TYPES = (bool, int, float, str, type(None))
+
+
+def cache_enabled() -> bool:
+    return os.environ.get("ASSET_KIT_CACHE", "1") != "0"
+
+
+def cache_dir() -> str:
+    return os.environ.get("ASSET_KIT_CACHE_DIR", DEFAULT_CACHE_DIR)
+
+
+def _is_plain(value) -> bool:
+    if isinstance(value, PLAIN_TYPES):
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(_is_plain(v) for v in value)
+    if isinstance(value, dict):
+        return all(isinstance(k, str) and _is_plain(v) for k, v in value.items())
+    return False
+
+
+def _code_names(code: types.CodeType) -> set:
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _code_names(const)
+    return names
+
+
+def _function_source(fn: types.FunctionType) -> str:
+    try:
+        return inspect.getsource(fn)
+    except (OSError, TypeError):
+        # Text-editor runs have no file; fall back to the compiled code.
+        return repr((fn.__code__.co_code, fn.__code__.co_consts))
+
+
+def _module_source(module: types.ModuleType) -> str:
+    path = getattr(module, "__file__", None)
+    if not path or not os.path.exists(path):
+        return module.__name__
+    with open(path, "rb") as fh:
+        return hashlib.sha256(fh.read()).hexdigest()
+
+
+def _tracked(fn: types.FunctionType, root_module: str) -> bool:
+    module = fn.__module__ or ""
+    if module == "kitlib.trace":
+        return False
+    return module == root_module or module.startswith("kitlib")
+
+
+def collect_inputs(builder: Callable) -> Dict[str, Dict[str, object]]:
+    """Walk the builder's call graph and gather sources and constants it reads."""
+    root_module = builder.__module__
+    sources: Dict[str, str] = {}
+    constants: Dict[str, object] = {}
+    stack = [inspect.unwrap(builder)]
+
+    while stack:
+        fn = stack.pop()
+        qualname = f"{fn.__module__}.{fn.__qualname__}"
+        if qualname in sources:
+            continue
+        sources[qualname] = _function_source(fn)
+
+        for name in sorted(_code_names(fn.__code__)):
+            if name not in fn.__globals__:
+                continue
+            value = fn.__globals__[name]
+            if isinstance(value, types.FunctionType):
+                value = inspect.unwrap(value)
+                if _tracked(value, root_module):
+                    stack.append(value)
+            elif isinstance(value, types.ModuleType):
+                if value.__name__.startswith("kitlib"):
+                    constants[f"{fn.__module__}:{name}"] = _module_source(value)
+            elif _is_plain(value):
+                constants[f"{fn.__module__}:{name}"] = value
+
+    return {"sources": sources, "constants": constants}
+
+
+def asset_key(defn: Dict, builder: Callable, extra: Optional[Dict] = None) -> str:
+    payload = {
+        "format": CACHE_FORMAT,
+        "blender": bpy.app.version_string,
+        "defn": defn,
+        "extra": extra or {},
+        **collect_inputs(builder),
+    }
+    blob = json.dumps(payload, sort_keys=True, default=repr).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+def _artifact_path(kit: str, asset_name: str, key: str) -> str:
+    return os.path.join(cache_dir(), kit, f"{asset_name}.{key[:20]}.blend")
+
+
+def _prune_stale(kit: str, asset_name: str, keep: str):
+    for path in glob.glob(os.path.join(cache_dir(), kit, f"{asset_name}.*.blend")):
+        if os.path.abspath(path) != os.path.abspath(keep):
+            os.remove(path)
+
+
+def build_or_restore(
+    kit: str,
+    defn: Dict,
+    builder: Callable[[Dict, bpy.types.Collection], object],
+    col: bpy.types.Collection,
+) -> List[bpy.types.Object]:
+    """Run builder(defn, col) unless an artifact with the same key exists.
+
+    Returns the asset's objects either way. The builder must only add
+    objects for this asset to col.
+    """
+    asset_name = defn["name"]
+
+    if not cache_enabled():
+        before = set(col.all_objects)
+        builder(defn, col)
+        return [obj for obj in col.all_objects if obj not in before]
+
+    key = asset_key(defn, builder)
+    path = _artifact_path(kit, asset_name, key)
+
+    if os.path.exists(path):
+        objs = blend_io.append_objects(path, col)
+        print(f"[cache] hit  {kit}/{asset_name} ({key[:12]})")
+        return objs
+
+    before = set(col.all_objects)
+    builder(defn, col)
+    objs = [obj for obj in col.all_objects if obj not in before]
+
+    blend_io.write_objects(path, objs)
+    _prune_stale(kit, asset_name, path)
+    print(f"[cache] miss {kit}/{asset_name} ({key[:12]})")
+    return objs
@@ -0,0 +1,316 @@
+import contextlib
+import itertools
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import bpy
+import numpy as np
+from mathutils import Matrix
+
+from kitlib import mesh_merge, primitives, trace
+
+# ============================================================
+# Compound colliders
+# A single bounding box around a crane with a 70 m boom, or a warehouse
+# with its doors open, is mostly empty space. Builders already place
+# every part as an analytic box, so they hand those primitives over
+# instead and get a compound of oriented boxes (and cylinders) back:
+#   - box(), cylinder() and from_object() describe one primitive as
+#     center, size and local axes (columns), in the parent mesh's space
+#   - recording() collects every record_box() / record() made while it
+#     is open, for kits whose add_box_part only ever builds solid parts
+#   - cut() splits boxes around openings (boolean cutters sharing their
+#     axes), so a door opening stays open in the collider too
+#   - merge() first folds parts smaller than SMALL_PART into their
+#     cheapest neighbour, then merges pairs until budget primitives are
+#     left; the cost of a pair is the empty volume its merged box adds,
+#     taking the best of either part's axes or the parent's
+#   - create_compound() merges and adds one COLLIDER_ child per
+#     primitive (mesh in local space, transform on the object), so
+#     kitlib.manifest reads them back as boxes and cylinders
+#
+# Every create_compound() call appends a record (asset, parts,
+# colliders, volume against the single bounding box) to REPORT;
+# build_kits.py collects it per kit with take_report().
+# ============================================================
+
+# Default maximum number of collider primitives per asset.
+BUDGET = 16
+# Parts whose largest extent is below this (m) never stay on their own.
+SMALL_PART = 0.25
+CYLINDER_SEGMENTS = 16
+
+Primitive = Dict[str, object]
+
+REPORT: List[Dict[str, object]] = []
+
+_recording: Optional[List[Primitive]] = None
+
+# Corner signs of a unit box, (8, 3).
+_CORNERS = np.array(list(itertools.product((-0.5, 0.5), repeat=3)))
+
+
+def take_report() -> List[Dict[str, object]]:
+    """Records since the last call, oldest first."""
+    records = list(REPORT)
+    REPORT.clear()
+    return records
+
+
+def _axes(rotation: primitives.Rotation) -> np.ndarray:
+    matrix = primitives.rotation_matrix(rotation)
+    return np.identity(3) if matrix is None else np.array(matrix, dtype=np.float64)
+
+
+def box(dims: primitives.Vec3, location: primitives.Vec3, rotation: primitives.Rotation = None) -> Primitive:
+    """Box as built by primitives.add_box(name, dims, location, col, rotation)."""
+    return {"shape": "box", "center": np.array(location, dtype=np.float64),
+            "size": np.array(dims, dtype=np.float64), "axes": _axes(rotation)}
+
+
+def cylinder(radius: float, depth: float, location: primitives.Vec3,
+             rotation: primitives.Rotation = None) -> Primitive:
+    """Cylinder along its local Z, as built by primitives.add_cylinder."""
+    return {"shape": "cylinder", "center": np.array(location, dtype=np.float64),
+            "size": np.array((radius * 2.0, radius * 2.0, depth)), "axes": _axes(rotation)}
+
+
+def from_object(obj: bpy.types.Object, matrix: Optional[Matrix] = None) -> Primitive:
+    """
+    Oriented box around obj's mesh, in obj's own axes. matrix defaults to
+    the world matrix, read without waiting for a depsgraph update.
+    """
+    matrix = mesh_merge.world_matrix(obj) if matrix is None else matrix
+    co = np.empty(len(obj.data.vertices) * 3, dtype=np.float32)
+    obj.data.vertices.foreach_get("co", co)
+    co = co.reshape(-1, 3).astype(np.float64)
+    lo, hi = co.min(axis=0), co.max(axis=0)
+    m = np.array(matrix, dtype=np.float64)
+    scale = np.linalg.norm(m[:3, :3], axis=0)
+    return {"shape": "box", "center": m[:3, :3] @ ((lo + hi) * 0.5) + m[:3, 3],
+            "size": (hi - lo) * scale, "axes": m[:3, :3] / scale}
+
+
+def translated(prims: Sequence[Primitive], offset: Sequence[float]) -> List[Primitive]:
+    return [dict(p, center=p["center"] + np.asarray(offset, dtype=np.float64)) for p in prims]
+
+
+def corners(prim: Primitive) -> np.ndarray:
+    """The 8 corners of prim's box (a cylinder's bounding box), (8, 3)."""
+    return prim["center"] + (_CORNERS * prim["size"]) @ prim["axes"].T
+
+
+def bounds(prims: Sequence[Primitive]) -> Tuple[np.ndarray, np.ndarray]:
+    """Axis-aligned min and max corner over prims."""
+    points = np.concatenate([corners(p) for p in prims])
+    return points.min(axis=0), points.max(axis=0)
+
+
+@contextlib.contextmanager
+def recording() -> Iterator[List[Primitive]]:
+    """Collect the primitives recorded while open into the yielded list."""
+    global _recording
+    previous, _recording = _recording, []
+    try:
+        yield _recording
+    finally:
+        _recording = previous
+
+
+def record(prim: Primitive):
+    if _recording is not None:
+        _recording.append(prim)
+
+
+def record_box(dims: primitives.Vec3, location: primitives.Vec3, rotation: primitives.Rotation = None):
+    if _recording is not None:
+        _recording.append(box(dims, location, rotation))
+
+
+def _aligned(a: Primitive, b: Primitive) -> bool:
+    """True when b's axes are a's up to order and sign."""
+    rel = np.abs(a["axes"].T @ b["axes"])
+    return bool(np.allclose(rel, np.round(rel), atol=1e-6))
+
+
+def _cut_box(prim: Primitive, hole: Primitive) -> List[Primitive]:
+    if prim["shape"] != "box" or not _aligned(prim, hole):
+        return [prim]
+    axes = prim["axes"]
+    center = prim["center"] @ axes
+    lo, hi = center - prim["size"] * 0.5, center + prim["size"] * 0.5
+    hole_local = corners(hole) @ axes
+    cut_lo = np.maximum(lo, hole_local.min(axis=0))
+    cut_hi = np.minimum(hi, hole_local.max(axis=0))
+    if np.any(cut_hi <= cut_lo):
+        return [prim]
+
+    # Slabs either side of the hole along X, then Y, then Z, each one
+    # narrowed to the hole's span on the axes already split.
+    pieces = []
+    for axis in range(3):
+        for a, b in ((lo[axis], cut_lo[axis]), (cut_hi[axis], hi[axis])):
+            if b - a <= 0.0:
+                continue
+            piece_lo, piece_hi = lo.copy(), hi.copy()
+            piece_lo[axis], piece_hi[axis] = a, b
+            pieces.append({"shape": "box", "center": axes @ ((piece_lo + piece_hi) * 0.5),
+                           "size": piece_hi - piece_lo, "axes": axes})
+        lo[axis], hi[axis] = cut_lo[axis], cut_hi[axis]
+    return pieces
+
+
+def cut(prims: Sequence[Primitive], holes: Sequence[Primitive]) -> List[Primitive]:
+    """Split the boxes in prims around each hole that shares their axes."""
+    out = list(prims)
+    for hole in holes:
+        out = [piece for prim in out for piece in _cut_box(prim, hole)]
+    return out
+
+
+# ------------------------------------------------------------
+# Merging
+# ------------------------------------------------------------
+def _merge_row(i: int, points: np.ndarray, axes: np.ndarray, extents: np.ndarray,
+               centers: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Volume of the box around part i and each part j, and which frame
+    gives it (0: i's axes, 1: j's axes, 2: parent axes).
+    """
+    own = points[i]
+    volumes = []
+    # In i's axes: project everything onto them.
+    local = points @ axes[i]
+    own_local = own @ axes[i]
+    lo = np.minimum(local.min(axis=1), own_local.min(axis=0))
+    hi = np.maximum(local.max(axis=1), own_local.max(axis=0))
+    volumes.append(np.prod(hi - lo, axis=1))
+    # In each j's axes: j's extent is its own box, project i onto it.
+    own_in_j = np.einsum("kc,ncd->nkd", own, axes)
+    j_center = np.einsum("nc,ncd->nd", centers, axes)
+    lo = np.minimum(j_center - extents * 0.5, own_in_j.min(axis=1))
+    hi = np.maximum(j_center + extents * 0.5, own_in_j.max(axis=1))
+    volumes.append(np.prod(hi - lo, axis=1))
+    # In the parent's axes.
+    lo = np.minimum(points.min(axis=1), own.min(axis=0))
+    hi = np.maximum(points.max(axis=1), own.max(axis=0))
+    volumes.append(np.prod(hi - lo, axis=1))
+
+    volumes = np.stack(volumes)
+    return volumes.min(axis=0), volumes.argmin(axis=0)
+
+
+def _merged(a: Primitive, b: Primitive, axes: np.ndarray) -> Primitive:
+    points = np.concatenate([corners(a), corners(b)]) @ axes
+    lo, hi = points.min(axis=0), points.max(axis=0)
+    return {"shape": "box", "center": axes @ ((lo + hi) * 0.5), "size": hi - lo, "axes": axes}
+
+
+def merge(prims: Sequence[Primitive], budget: int = BUDGET, small_part: float = SMALL_PART) -> List[Primitive]:
+    """
+    Fold parts under small_part into a neighbour, then merge the cheapest
+    pairs until at most budget primitives remain. Parts keep their order.
+    """
+    prims = [dict(p) for p in prims]
+    count = len(prims)
+    if count <= 1:
+        return prims
+    budget = max(1, budget)
+
+    points = np.stack([corners(p) for p in prims])
+    axes = np.stack([p["axes"] for p in prims])
+    extents = np.stack([p["size"] for p in prims])
+    centers = np.stack([p["center"] for p in prims])
+    volume = np.prod(extents, axis=1)
+    active = np.ones(count, dtype=bool)
+    cost = np.full((count, count), np.inf)
+    frame = np.zeros((count, count), dtype=np.int64)
+
+    def update(i: int):
+        merged, best = _merge_row(i, points, axes, extents, centers)
+        row = merged - volume[i] - volume
+        row[~active] = np.inf
+        row[i] = np.inf
+        cost[i], cost[:, i] = row, row
+        frame[i], frame[:, i] = best, np.where(best == 2, 2, 1 - best)
+
+    for i in range(count):
+        update(i)
+
+    def combine(i: int, j: int):
+        choice = frame[i, j]
+        target = (axes[i], axes[j], np.identity(3))[choice]
+        prims[i] = _merged(prims[i], prims[j], target)
+        points[i] = corners(prims[i])
+        axes[i], extents[i], centers[i] = prims[i]["axes"], prims[i]["size"], prims[i]["center"]
+        volume[i] = np.prod(extents[i])
+        active[j] = False
+        cost[j], cost[:, j] = np.inf, np.inf
+        update(i)
+
+    while active.sum() > 1:
+        small = np.flatnonzero(active & (extents.max(axis=1) < small_part))
+        if not len(small):
+            break
+        i = int(small[0])
+        combine(i, int(cost[i].argmin()))
+
+    while active.sum() > budget:
+        i, j = np.unravel_index(int(cost.argmin()), cost.shape)
+        combine(int(min(i, j)), int(max(i, j)))
+
+    return [p for p, keep in zip(prims, active) if keep]
+
+
+# ------------------------------------------------------------
+# Collider objects
+# ------------------------------------------------------------
+def _matrix(prim: Primitive) -> Matrix:
+    axes = prim["axes"]
+    if np.linalg.det(axes) < 0.0:
+        axes = axes * np.array((1.0, 1.0, -1.0))
+    matrix = Matrix.Identity(4)
+    for r in range(3):
+        for c in range(3):
+            matrix[r][c] = float(axes[r, c])
+        matrix[r][3] = float(prim["center"][r])
+    return matrix
+
+
+@trace.traced
+def create_compound(parent: bpy.types.Object, asset_name: str, parts: Sequence[Primitive],
+                    col: bpy.types.Collection, budget: int = BUDGET) -> List[bpy.types.Object]:
+    """
+    Merge parts (in parent's mesh space) down to budget primitives and add
+    them under parent as COLLIDER_<asset> (or COLLIDER_<asset>_NN for
+    several), wire-displayed and hidden from renders.
+    """
+    prims = merge(parts, budget)
+    objs = []
+    for i, prim in enumerate(prims):
+        name = f"COLLIDER_{asset_name}" if len(prims) == 1 else f"COLLIDER_{asset_name}_{i:02d}"
+        if prim["shape"] == "cylinder":
+            obj = primitives.add_cylinder(name, float(prim["size"][0]) * 0.5, float(prim["size"][2]),
+                                          (0.0, 0.0, 0.0), col, vertices=CYLINDER_SEGMENTS)
+        else:
+            obj = primitives.add_box(name, tuple(float(v) for v in prim["size"]), (0.0, 0.0, 0.0), col)
+        obj.matrix_basis = _matrix(prim)
+        obj["collider_shape"] = prim["shape"]
+        obj.parent = parent
+        obj.matrix_parent_inverse = parent.matrix_world.inverted()
+        obj.display_type = "WIRE"
+        obj.hide_render = True
+        objs.append(obj)
+
+    lo, hi = bounds(parts)
+    volume = float(sum(np.prod(p["size"]) * (np.pi / 4.0 if p["shape"] == "cylinder" else 1.0) for p in prims))
+    bounds_volume = float(np.prod(hi - lo))
+    REPORT.append({
+        "asset": asset_name,
+        "parts": len(parts),
+        "colliders": len(prims),
+        "cylinders": sum(p["shape"] == "cylinder" for p in prims),
+        "volume": round(volume, 3),
+        "bounds_volume": round(bounds_volume, 3),
+        "fill": round(volume / bounds_volume, 4) if bounds_volume > 0.0 else 1.0,
+    })
+    return objs
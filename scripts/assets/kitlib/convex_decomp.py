@@ -0,0 +1,392 @@
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+
+import bpy
+import numpy as np
+
+from kitlib import lod_metrics, mesh_merge, primitives, trace
+
+# ============================================================
+# Approximate convex decomposition
+# Splits an irregular mesh (rubble breakwater, tyre fender, seabed
+# tile) into at most max_hulls convex hulls, in NumPy only:
+#   1. voxelize the triangles: surface voxels from samples spaced under
+#      half a voxel, interior where the winding number of rays along Z
+#      is non-zero (so overlapping shells fill as their union, whichever
+#      way they are wound); with a floor the mesh is a heightfield and
+#      every column is filled down to it
+#   2. start from the whole solid and keep splitting the part whose hull
+#      adds the most volume, along the axis-aligned plane (at
+#      SPLITS_PER_AXIS positions per axis) that gives the smallest pair
+#      of hulls, until the hulls exceed the voxel volume by at most
+#      max_error (a fraction of it) or max_hulls is reached
+#   3. each hull is a quickhull over the part's voxel corners, stopped
+#      at max_vertices; corners are integer grid points, so every
+#      orientation test is exact
+# Only corners extreme along some grid line can be hull vertices, so
+# each part hands quickhull those alone.
+#
+# create_hull_colliders() adds one COLLIDER_ mesh per hull under the
+# asset root (collider_shape "hull") and appends a record (asset,
+# hulls, error, vertices, seconds) to REPORT; build_kits.py collects it
+# per kit with take_report().
+# ============================================================
+
+MAX_HULLS = 8
+# Hull volume beyond the voxelized solid, as a fraction of the solid.
+MAX_ERROR = 0.1
+MAX_VERTICES = 32
+# Voxels along the longest side of the mesh bounds.
+RESOLUTION = 48
+SPLITS_PER_AXIS = 5
+
+Hull = Dict[str, np.ndarray]
+
+REPORT: List[Dict[str, object]] = []
+
+
+def take_report() -> List[Dict[str, object]]:
+    """Records since the last call, oldest first."""
+    records = list(REPORT)
+    REPORT.clear()
+    return records
+
+
+# ------------------------------------------------------------
+# Voxelization
+# ------------------------------------------------------------
+def _surface_samples(tris: np.ndarray, spacing: float) -> np.ndarray:
+    """Points on every triangle, no further than spacing apart."""
+    edges = np.linalg.norm(tris - np.roll(tris, 1, axis=1), axis=2).max(axis=1)
+    steps = np.maximum(1, np.ceil(edges / spacing)).astype(np.int64)
+    chunks = [tris.reshape(-1, 3)]
+    for n in np.unique(steps):
+        if n == 1:
+            continue
+        group = tris[steps == n]
+        i, j = np.meshgrid(np.arange(n + 1), np.arange(n + 1), indexing="ij")
+        keep = i + j <= n
+        weights = np.stack([n - i[keep] - j[keep], i[keep], j[keep]], axis=1) / n
+        chunks.append(np.einsum("sk,tkd->tsd", weights, group).reshape(-1, 3))
+    return np.concatenate(chunks)
+
+
+def _column_hits(tris: np.ndarray, origin: np.ndarray, voxel: float,
+                 shape: Tuple[int, int, int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (column index, z, winding step) where a vertical ray through each
+    column centre crosses a triangle; the step is +1 entering a shell
+    (triangle facing down) and -1 leaving it.
+    """
+    # Nudge the rays off the grid so they do not run exactly through shared edges.
+    nudge = np.array((0.5 + 1.3e-4, 0.5 + 2.9e-4))
+    xy = (tris[:, :, :2] - origin[:2]) / voxel - nudge
+    lo = np.clip(np.ceil(xy.min(axis=1)), 0, np.array(shape[:2]) - 1).astype(np.int64)
+    hi = np.clip(np.floor(xy.max(axis=1)), -1, np.array(shape[:2]) - 1).astype(np.int64)
+    counts = np.maximum(hi - lo + 1, 0)
+    total = counts[:, 0] * counts[:, 1]
+    tri = np.repeat(np.arange(len(tris)), total)
+    if not len(tri):
+        return np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0, dtype=np.int64)
+    local = np.arange(len(tri)) - np.repeat(np.cumsum(total) - total, total)
+    ci = lo[tri, 0] + local // counts[tri, 1]
+    cj = lo[tri, 1] + local % counts[tri, 1]
+
+    a, b, c = xy[tri, 0], xy[tri, 1], xy[tri, 2]
+    px, py = ci.astype(np.float64), cj.astype(np.float64)
+    det = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (c[:, 0] - a[:, 0]) * (b[:, 1] - a[:, 1])
+    ok = np.abs(det) > 1e-12
+    det = np.where(ok, det, 1.0)
+    u = ((px - a[:, 0]) * (c[:, 1] - a[:, 1]) - (c[:, 0] - a[:, 0]) * (py - a[:, 1])) / det
+    v = ((b[:, 0] - a[:, 0]) * (py - a[:, 1]) - (px - a[:, 0]) * (b[:, 1] - a[:, 1])) / det
+    inside = ok & (u >= 0.0) & (v >= 0.0) & (u + v <= 1.0)
+    z = tris[tri, 0, 2] + u * (tris[tri, 1, 2] - tris[tri, 0, 2]) + v * (tris[tri, 2, 2] - tris[tri, 0, 2])
+    step = np.where(det[inside] < 0.0, 1, -1)
+    return (ci * shape[1] + cj)[inside], z[inside], step
+
+
+def voxelize(tris: np.ndarray, resolution: int = RESOLUTION,
+             floor: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Solid occupancy of the (T, 3, 3) triangles: (mask, grid origin, voxel
+    size). With floor, columns are filled from floor up to their highest
+    surface crossing instead of by winding number.
+    """
+    lo, hi = tris.reshape(-1, 3).min(axis=0), tris.reshape(-1, 3).max(axis=0)
+    if floor is not None:
+        lo[2] = min(lo[2], floor)
+    voxel = float((hi - lo).max()) / resolution
+    origin = lo - voxel * 0.5
+    shape = tuple(int(n) for n in np.ceil((hi - origin) / voxel + 0.5).astype(np.int64))
+    nx, ny, nz = shape
+
+    fill = np.zeros((nx * ny, nz + 1), dtype=np.int32)
+    columns, z, step = _column_hits(tris, origin, voxel, shape)
+    cell = (z - origin[2]) / voxel - 0.5
+    if floor is not None:
+        top = np.full(nx * ny, -np.inf)
+        np.maximum.at(top, columns, cell)
+        hit = np.isfinite(top)
+        fill[hit, 0] += 1
+        k1 = np.clip(np.floor(top[hit]).astype(np.int64) + 1, 0, nz)
+        np.add.at(fill, (np.flatnonzero(hit), k1), -1)
+    elif len(columns):
+        order = np.lexsort((z, columns))
+        columns, cell, step = columns[order], cell[order], step[order]
+        # Winding after each crossing, restarted per column.
+        winding = np.cumsum(step)
+        starts = np.r_[0, np.flatnonzero(np.diff(columns)) + 1]
+        lengths = np.diff(np.r_[starts, len(columns)])
+        winding -= np.repeat(winding[starts] - step[starts], lengths)
+        enter = np.flatnonzero((winding[:-1] != 0) & (columns[1:] == columns[:-1]))
+        k0 = np.clip(np.ceil(cell[enter]).astype(np.int64), 0, nz)
+        k1 = np.clip(np.floor(cell[enter + 1]).astype(np.int64) + 1, 0, nz)
+        np.add.at(fill, (columns[enter], k0), 1)
+        np.add.at(fill, (columns[enter], k1), -1)
+    mask = (np.cumsum(fill, axis=1)[:, :nz] > 0).reshape(shape)
+
+    samples = _surface_samples(tris, voxel * 0.5)
+    idx = np.clip(np.floor((samples - origin) / voxel).astype(np.int64), 0, np.array(shape) - 1)
+    mask[idx[:, 0], idx[:, 1], idx[:, 2]] = True
+    return mask, origin, voxel
+
+
+# ------------------------------------------------------------
+# Quickhull
+# ------------------------------------------------------------
+def quickhull(points: np.ndarray, max_vertices: int = MAX_VERTICES) -> Optional[np.ndarray]:
+    """
+    Outward-wound (F, 3) faces into points of their convex hull, adding
+    the farthest outside point first and stopping at max_vertices. Exact
+    for integer coordinates; None when the points are flat.
+    """
+    p = np.asarray(points, dtype=np.float64)
+    i0 = int(np.argmin(p[:, 0]))
+    d = ((p - p[i0]) ** 2).sum(axis=1)
+    i1 = int(np.argmax(d))
+    if d[i1] == 0.0:
+        return None
+    d = (np.cross(p[i1] - p[i0], p - p[i0]) ** 2).sum(axis=1)
+    i2 = int(np.argmax(d))
+    if d[i2] == 0.0:
+        return None
+    d = (p - p[i0]) @ np.cross(p[i1] - p[i0], p[i2] - p[i0])
+    i3 = int(np.argmax(np.abs(d)))
+    if d[i3] == 0.0:
+        return None
+
+    inside4 = p[[i0, i1, i2, i3]].sum(axis=0)
+    faces: List[Tuple[int, int, int]] = []
+    for a, b, c in ((i0, i1, i2), (i0, i3, i1), (i1, i3, i2), (i2, i3, i0)):
+        n = np.cross(p[b] - p[a], p[c] - p[a])
+        faces.append((a, c, b) if n @ (inside4 - 4.0 * p[a]) > 0.0 else (a, b, c))
+
+    tri = np.array(faces, dtype=np.int64)
+    normals = np.cross(p[tri[:, 1]] - p[tri[:, 0]], p[tri[:, 2]] - p[tri[:, 0]])
+    offsets = np.einsum("fd,fd->f", normals, p[tri[:, 0]])
+    alive = np.ones(len(tri), dtype=bool)
+    conflicts: Dict[int, np.ndarray] = {}
+    farthest: Dict[int, Tuple[float, int]] = {}
+
+    def assign(pool: np.ndarray, face_ids: np.ndarray):
+        if not len(pool):
+            return
+        dist = p[pool] @ normals[face_ids].T - offsets[face_ids]
+        best = dist.argmax(axis=1)
+        outside = dist[np.arange(len(pool)), best] > 0.0
+        for k, f in enumerate(face_ids):
+            members = pool[outside & (best == k)]
+            if len(members):
+                conflicts[int(f)] = members
+                scaled = dist[outside & (best == k), k] / np.linalg.norm(normals[f])
+                farthest[int(f)] = (float(scaled.max()), int(members[scaled.argmax()]))
+
+    pool = np.setdiff1d(np.arange(len(p)), [i0, i1, i2, i3])
+    assign(pool, np.arange(4))
+
+    count = 4
+    while farthest and count < max_vertices:
+        _dist, eye = max(farthest.values())
+        visible = np.flatnonzero(alive & (normals @ p[eye] - offsets > 0.0))
+        edges = set()
+        for a, b, c in tri[visible]:
+            edges.update(((a, b), (b, c), (c, a)))
+        horizon = [(u, v) for u, v in edges if (v, u) not in edges]
+
+        new = np.array([(u, v, eye) for u, v in horizon], dtype=np.int64)
+        new_normals = np.cross(p[new[:, 1]] - p[new[:, 0]], p[new[:, 2]] - p[new[:, 0]])
+        new_ids = np.arange(len(tri), len(tri) + len(new))
+        tri = np.concatenate([tri, new])
+        normals = np.concatenate([normals, new_normals])
+        offsets = np.concatenate([offsets, np.einsum("fd,fd->f", new_normals, p[new[:, 0]])])
+        alive[visible] = False
+        alive = np.concatenate([alive, np.ones(len(new), dtype=bool)])
+
+        pool = [conflicts.pop(int(f)) for f in visible if int(f) in conflicts]
+        for f in visible:
+            farthest.pop(int(f), None)
+        pool = np.concatenate(pool) if pool else np.zeros(0, dtype=np.int64)
+        assign(pool[pool != eye], new_ids)
+        count += 1
+    return tri[alive]
+
+
+def hull_volume(points: np.ndarray, faces: np.ndarray) -> float:
+    a, b, c = points[faces[:, 0]], points[faces[:, 1]], points[faces[:, 2]]
+    return float(np.einsum("fd,fd->f", a, np.cross(b, c)).sum()) / 6.0
+
+
+# ------------------------------------------------------------
+# Decomposition
+# ------------------------------------------------------------
+def _line_extremes(points: np.ndarray, axis: int) -> np.ndarray:
+    """Per grid line along axis, its lowest and highest point."""
+    others = [a for a in range(3) if a != axis]
+    order = np.lexsort((points[:, axis], points[:, others[1]], points[:, others[0]]))
+    points = points[order]
+    key = points[:, others]
+    new_line = np.r_[True, np.any(key[1:] != key[:-1], axis=1)]
+    starts = np.flatnonzero(new_line)
+    ends = np.r_[starts[1:], len(points)] - 1
+    return np.unique(np.concatenate([points[starts], points[ends]]), axis=0)
+
+
+def _corner_points(mask: np.ndarray, offset: np.ndarray) -> np.ndarray:
+    """Grid corners of mask's voxels that can be vertices of their hull."""
+    filled = mask.any(axis=2)
+    kmin = mask.argmax(axis=2)
+    kmax = mask.shape[2] - 1 - mask[:, :, ::-1].argmax(axis=2)
+    ii, jj = np.nonzero(filled)
+    chunks = []
+    for di in (0, 1):
+        for dj in (0, 1):
+            chunks.append(np.stack([ii + di, jj + dj, kmin[ii, jj]], axis=1))
+            chunks.append(np.stack([ii + di, jj + dj, kmax[ii, jj] + 1], axis=1))
+    points = np.concatenate(chunks)
+    for axis in (2, 0, 1):
+        points = _line_extremes(points, axis)
+    return points + offset
+
+
+def _part(mask: np.ndarray, offset: np.ndarray, max_vertices: int) -> Optional[Dict[str, object]]:
+    """A part cropped to its voxels, with its hull in grid coordinates."""
+    if not mask.any():
+        return None
+    nonzero = [np.flatnonzero(mask.any(axis=tuple(a for a in range(3) if a != axis))) for axis in range(3)]
+    lo = np.array([n[0] for n in nonzero])
+    hi = np.array([n[-1] + 1 for n in nonzero])
+    mask = mask[lo[0]:hi[0], lo[1]:hi[1], lo[2]:hi[2]]
+    offset = offset + lo
+    points = _corner_points(mask, offset).astype(np.float64)
+    faces = quickhull(points, max_vertices)
+    voxels = int(mask.sum())
+    volume = hull_volume(points, faces) if faces is not None else float(voxels)
+    return {"mask": mask, "offset": offset, "points": points, "faces": faces,
+            "voxels": voxels, "excess": volume - voxels}
+
+
+def _split(part: Dict[str, object], max_vertices: int) -> Optional[List[Dict[str, object]]]:
+    """The two halves along the candidate plane with the least hull excess."""
+    mask, offset = part["mask"], part["offset"]
+    best, best_excess = None, math.inf
+    for axis in range(3):
+        size = mask.shape[axis]
+        if size < 2:
+            continue
+        for k in np.unique(np.linspace(1, size - 1, SPLITS_PER_AXIS + 2)[1:-1].round().astype(np.int64)):
+            shift = np.zeros(3, dtype=np.int64)
+            shift[axis] = k
+            halves = [_part(np.take(mask, np.arange(k), axis=axis), offset, max_vertices),
+                      _part(np.take(mask, np.arange(k, size), axis=axis), offset + shift, max_vertices)]
+            if None in halves:
+                continue
+            excess = sum(h["excess"] for h in halves)
+            if excess < best_excess:
+                best, best_excess = halves, excess
+    return best
+
+
+def decompose(tris: np.ndarray, max_hulls: int = MAX_HULLS, max_error: float = MAX_ERROR,
+              max_vertices: int = MAX_VERTICES, resolution: int = RESOLUTION,
+              floor: Optional[float] = None) -> Dict[str, object]:
+    """
+    Convex hulls covering the (T, 3, 3) triangles. Returns hulls (each
+    {"vertices": (V, 3), "faces": (F, 3)} in the triangles' space), the
+    achieved error, voxel size and count.
+    """
+    mask, origin, voxel = voxelize(tris, resolution, floor)
+    # Voxel corners stand up to a voxel proud of the surface; pull hull
+    # vertices back inside the mesh bounds.
+    lo, hi = tris.reshape(-1, 3).min(axis=0), tris.reshape(-1, 3).max(axis=0)
+    if floor is not None:
+        lo[2] = min(lo[2], floor)
+    total = int(mask.sum())
+    parts = [p for p in [_part(mask, np.zeros(3, dtype=np.int64), max_vertices)] if p is not None]
+
+    def error() -> float:
+        return sum(p["excess"] for p in parts) / max(1, total)
+
+    while parts and len(parts) < max_hulls and error() > max_error:
+        worst = max(range(len(parts)), key=lambda i: parts[i]["excess"])
+        halves = _split(parts[worst], max_vertices) if parts[worst]["voxels"] > 1 else None
+        if halves is None:
+            break
+        parts[worst:worst + 1] = halves
+
+    hulls = []
+    for part in parts:
+        if part["faces"] is None:
+            continue
+        used, faces = np.unique(part["faces"], return_inverse=True)
+        hulls.append({"vertices": np.clip(origin + part["points"][used] * voxel, lo, hi),
+                      "faces": faces.reshape(-1, 3)})
+    return {"hulls": hulls, "error": error(), "voxel": voxel, "voxels": total}
+
+
+# ------------------------------------------------------------
+# Collider objects
+# ------------------------------------------------------------
+@trace.traced
+def create_hull_colliders(parent: bpy.types.Object, asset_name: str, source: bpy.types.Object,
+                          col: bpy.types.Collection, max_hulls: int = MAX_HULLS,
+                          max_error: float = MAX_ERROR, max_vertices: int = MAX_VERTICES,
+                          resolution: int = RESOLUTION, floor: Optional[float] = None) -> List[bpy.types.Object]:
+    """
+    Decompose source's mesh (usually LOD1; floor as in voxelize, in
+    parent space) and add one hull per part under parent as
+    COLLIDER_<asset> (or COLLIDER_<asset>_NN for several), in parent's
+    space, wire-displayed and hidden from renders.
+    """
+    start = time.perf_counter()
+    matrix = mesh_merge.world_matrix(parent).inverted() @ mesh_merge.world_matrix(source)
+    tris = lod_metrics.mesh_triangles(source.data, matrix)
+    result = decompose(tris, max_hulls, max_error, max_vertices, resolution, floor)
+
+    hulls = result["hulls"]
+    objs = []
+    for i, hull in enumerate(hulls):
+        name = f"COLLIDER_{asset_name}" if len(hulls) == 1 else f"COLLIDER_{asset_name}_{i:02d}"
+        geometry = ([tuple(float(v) for v in co) for co in hull["vertices"]],
+                    [tuple(int(v) for v in face) for face in hull["faces"]])
+        obj = primitives.add_primitive(name, geometry, col)
+        obj["collider_shape"] = "hull"
+        obj.parent = parent
+        obj.display_type = "WIRE"
+        obj.hide_render = True
+        objs.append(obj)
+
+    REPORT.append({
+        "asset": asset_name,
+        "source": source.name,
+        "hulls": len(hulls),
+        "max_hulls": max_hulls,
+        "error": round(result["error"], 4),
+        "max_error": max_error,
+        "met": result["error"] <= max_error,
+        "vertices": max((len(h["vertices"]) for h in hulls), default=0),
+        "voxel": round(result["voxel"], 4),
+        "voxels": result["voxels"],
+        "seconds": round(time.perf_counter() - start, 4),
+    })
+    return objs
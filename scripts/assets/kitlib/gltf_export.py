@@ -0,0 +1,131 @@
+import os
+import shutil
+import subprocess
+from typing import Callable, Dict, Iterable, List, Optional
+
+import bpy
+
+from kitlib import gltf_instancing, lod_metrics
+
+# ============================================================
+# Per-asset GLB export
+# A kit collection holds one object tree per asset: a top-level root
+# (the LOD0 mesh or an empty) with the other LODs, the COLLIDER_ node
+# and the SNAP_ empties parented below it. Every root with the same
+# asset name (asset_name prop, else the name without its _lodN suffix)
+# is written to one <asset>.glb:
+#   - roots in world space, children relative to their parent, so the
+#     Blender hierarchy and object names carry over unchanged
+#   - custom props (asset_role, lod, lod metrics, ...) as node extras
+#   - evaluated meshes, so modifiers left on an object are exported;
+#     these are written per object, not shared through the mesh data
+# through kitlib.gltf_instancing.GlbBuilder, which visits objects by
+# name and writes sorted JSON: an unchanged asset gives identical bytes.
+#
+# Compression runs the gltf-transform CLI (draco or meshopt) over the
+# written file; it is found on PATH or through $GLTF_TRANSFORM.
+# ============================================================
+
+COMPRESSION = ("none", "draco", "meshopt")
+GLTF_TRANSFORM_ENV = "GLTF_TRANSFORM"
+
+ExportHook = Callable[[str, List[bpy.types.Object]], None]
+
+
+def asset_roots(col: bpy.types.Collection) -> List[bpy.types.Object]:
+    """Objects in col whose parent is not in col, by name."""
+    members = set(col.all_objects)
+    return sorted((obj for obj in members if obj.parent not in members), key=lambda o: o.name)
+
+
+def asset_name(root: bpy.types.Object) -> str:
+    name = root.get("asset_name")
+    if isinstance(name, str) and name:
+        return name
+    match = lod_metrics.LOD_NAME.match(root.name)
+    return match.group(1) if match else root.name
+
+
+def group_assets(col: bpy.types.Collection) -> Dict[str, List[bpy.types.Object]]:
+    assets: Dict[str, List[bpy.types.Object]] = {}
+    for root in asset_roots(col):
+        assets.setdefault(asset_name(root), []).append(root)
+    return assets
+
+
+def asset_objects(roots: Iterable[bpy.types.Object]) -> List[bpy.types.Object]:
+    """roots and all their descendants, by name."""
+    found = set()
+    for root in roots:
+        found.add(root)
+        found.update(root.children_recursive)
+    return sorted(found, key=lambda o: o.name)
+
+
+def _add_tree(builder: gltf_instancing.GlbBuilder, obj: bpy.types.Object, depsgraph,
+              parent: Optional[int] = None) -> int:
+    if parent is None:
+        matrix = obj.matrix_world
+    else:
+        matrix = obj.parent.matrix_world.inverted() @ obj.matrix_world
+
+    mesh = None
+    if obj.type == "MESH" and len(obj.modifiers):
+        mesh = bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph), depsgraph=depsgraph)
+    try:
+        index = builder.object_node(obj, matrix, parent, mesh)
+    finally:
+        if mesh is not None:
+            bpy.data.meshes.remove(mesh)
+
+    for child in sorted(obj.children, key=lambda o: o.name):
+        _add_tree(builder, child, depsgraph, index)
+    return index
+
+
+def asset_glb(roots: Iterable[bpy.types.Object]) -> bytes:
+    bpy.context.view_layer.update()
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    builder = gltf_instancing.GlbBuilder()
+    for root in sorted(roots, key=lambda o: o.name):
+        _add_tree(builder, root, depsgraph)
+    return builder.to_bytes()
+
+
+def gltf_transform() -> str:
+    tool = os.environ.get(GLTF_TRANSFORM_ENV) or shutil.which("gltf-transform")
+    if not tool:
+        raise RuntimeError(f"Compressed export needs the gltf-transform CLI on PATH or in ${GLTF_TRANSFORM_ENV} "
+                           f"(npm install -g @gltf-transform/cli)")
+    return tool
+
+
+def compress(path: str, method: str):
+    """Re-encode the GLB at path in place with draco or meshopt."""
+    if method == "none":
+        return
+    if method not in COMPRESSION:
+        raise ValueError(f"Unknown compression '{method}', expected one of {', '.join(COMPRESSION)}")
+    tmp_path = path + ".tmp.glb"
+    subprocess.run([gltf_transform(), method, path, tmp_path], check=True,
+                   stdout=subprocess.DEVNULL)
+    os.replace(tmp_path, path)
+
+
+def export_collection(col: bpy.types.Collection, out_dir: str, compression: str = "none",
+                      hook: Optional[ExportHook] = None) -> List[Dict[str, object]]:
+    """
+    Write every asset in col to out_dir/<asset>.glb; hook(path, objects)
+    replaces the default writer for kits with their own layout (e.g.
+    instanced container stacks). Returns one record per file.
+    """
+    records = []
+    for name, roots in sorted(group_assets(col).items()):
+        path = os.path.join(out_dir, f"{name}.glb")
+        if hook is not None:
+            hook(path, asset_objects(roots))
+        else:
+            gltf_instancing.write_atomic(path, asset_glb(roots))
+        compress(path, compression)
+        records.append({"asset": name, "path": path, "bytes": os.path.getsize(path)})
+    return records
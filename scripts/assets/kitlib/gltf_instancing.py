@@ -0,0 +1,404 @@
+import json
+import os
+import struct
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import bpy
+import numpy as np
+from mathutils import Matrix
+
+from kitlib import normal_bake
+
+# ============================================================
+# Instanced glTF (GLB) writer
+# Writes layouts built from linked duplicates (many objects sharing one
+# mesh under an empty root) as one glTF mesh per shared mesh plus the
+# EXT_mesh_gpu_instancing attributes of every copy:
+#   TRANSLATION / ROTATION / SCALE  per-instance transform
+#   _COLOR_0                        per-instance RGB (obj.color), which
+#                                   three.js feeds to instanceColor
+# so a runtime draws a whole stack or yard block in one call per mesh.
+# Other objects (colliders, snap empties) are written as plain nodes.
+# Every node is written top-level in world space; instances stay local
+# to their layout root.
+#
+# Meshes with a baked normal atlas (kitlib.normal_bake) also carry:
+#   TEXCOORD_0  the ATLAS_UV layer, V flipped to glTF's top-left origin
+#   TANGENT     Blender's MikkTSpace tangents on ATLAS_UV, the space the
+#               normals were baked in. Blender only computes them for
+#               tris and quads; meshes with n-gons are written without,
+#               and the runtime must generate MikkTSpace tangents itself
+#               (three.js: BufferGeometryUtils.computeMikkTSpaceTangents)
+# and "<name>_Baked" materials get the atlas as an embedded PNG
+# normalTexture.
+#
+# Blender is Z up, glTF is Y up: (x, y, z) -> (x, z, -y).
+# Output is deterministic: objects are visited by name and the JSON is
+# written with sorted keys, so unchanged layouts give identical bytes.
+# ============================================================
+
+GLB_MAGIC = 0x46546C67  # "glTF"
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+INSTANCING_EXTENSION = "EXT_mesh_gpu_instancing"
+
+# glTF componentType / target enums.
+FLOAT = 5126
+UNSIGNED_INT = 5125
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+LINEAR = 9729
+LINEAR_MIPMAP_LINEAR = 9987
+CLAMP_TO_EDGE = 33071
+
+_TO_GLTF = np.array([[1.0, 0.0, 0.0], [0.0, 0.0, 1.0], [0.0, -1.0, 0.0]])
+_PLAIN_TYPES = (bool, int, float, str)
+
+
+def to_gltf_vectors(v: np.ndarray) -> np.ndarray:
+    return np.asarray(v, dtype=np.float64) @ _TO_GLTF.T
+
+
+def to_gltf_trs(matrix: Matrix) -> Tuple[List[float], List[float], List[float]]:
+    """Blender matrix -> glTF translation, rotation (x, y, z, w) and scale."""
+    t, q, s = matrix.decompose()
+    return [t.x, t.z, -t.y], [q.x, q.z, -q.y, q.w], [s.x, s.z, s.y]
+
+
+def extras_from(idb) -> Dict[str, object]:
+    """JSON-safe custom properties of an ID, for glTF extras."""
+    extras = {}
+    for key in sorted(idb.keys()):
+        value = idb[key]
+        if hasattr(value, "to_list"):
+            value = value.to_list()
+        if isinstance(value, _PLAIN_TYPES) or (
+                isinstance(value, list) and all(isinstance(v, _PLAIN_TYPES) for v in value)):
+            extras[key] = value
+    return extras
+
+
+def png_bytes(image: bpy.types.Image) -> bytes:
+    """8-bit RGB PNG of image's pixels (as stored, no colour transform)."""
+    width, height = image.size
+    pixels = np.empty(width * height * 4, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    # Blender stores rows bottom-up, PNG top-down.
+    rgb = np.clip(pixels.reshape(height, width, 4)[::-1, :, :3], 0.0, 1.0)
+    rows = (rgb * 255.0 + 0.5).astype(np.uint8).reshape(height, width * 3)
+    raw = np.hstack([np.zeros((height, 1), dtype=np.uint8), rows]).tobytes()
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw, 6))
+            + chunk(b"IEND", b""))
+
+
+def _corner_tangents(mesh: bpy.types.Mesh, uv_name: str) -> Optional[np.ndarray]:
+    """Per-corner (x, y, z, bitangent sign) on uv_name, or None for meshes with n-gons."""
+    try:
+        mesh.calc_tangents(uvmap=uv_name)
+    except RuntimeError:
+        return None
+    n_loops = len(mesh.loops)
+    tangents = np.empty(n_loops * 3, dtype=np.float32)
+    mesh.loops.foreach_get("tangent", tangents)
+    signs = np.empty(n_loops, dtype=np.float32)
+    mesh.loops.foreach_get("bitangent_sign", signs)
+    mesh.free_tangents()
+    return np.concatenate([tangents.reshape(-1, 3), signs.reshape(-1, 1)], axis=1)
+
+
+def mesh_primitives(mesh: bpy.types.Mesh) -> Dict[str, object]:
+    """
+    Triangulated, per-corner buffers of a mesh in glTF axes: positions/
+    normals (N, 3) float32, texcoords (N, 2) and tangents (N, 4) when
+    the mesh has an ATLAS_UV layer (else None), and one uint32 index
+    array per material slot that has triangles.
+    """
+    mesh.calc_loop_triangles()
+    n_verts, n_loops, n_tris = len(mesh.vertices), len(mesh.loops), len(mesh.loop_triangles)
+
+    co = np.empty(n_verts * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    loop_vert = np.empty(n_loops, dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vert)
+    normals = np.empty(n_loops * 3, dtype=np.float32)
+    mesh.corner_normals.foreach_get("vector", normals)
+    tri_loops = np.empty(n_tris * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("loops", tri_loops)
+    tri_material = np.empty(n_tris, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("material_index", tri_material)
+
+    columns = [co.reshape(-1, 3)[loop_vert], normals.reshape(-1, 3)]
+    uv_layer = mesh.uv_layers.get(normal_bake.ATLAS_UV)
+    tangents = None
+    if uv_layer is not None:
+        uv = np.empty(n_loops * 2, dtype=np.float32)
+        uv_layer.data.foreach_get("uv", uv)
+        columns.append(uv.reshape(-1, 2))
+        tangents = _corner_tangents(mesh, uv_layer.name)
+        if tangents is not None:
+            columns.append(tangents)
+
+    # One glTF vertex per distinct corner (position, normal[, uv[, tangent]]).
+    unique, remap = np.unique(np.concatenate(columns, axis=1), axis=0, return_inverse=True)
+    indices = remap.ravel()[tri_loops].reshape(-1, 3).astype(np.uint32)
+
+    groups = {}
+    for slot in sorted(set(tri_material.tolist())):
+        groups[slot] = indices[tri_material == slot].ravel()
+
+    texcoords = None
+    if uv_layer is not None:
+        texcoords = np.stack([unique[:, 6], 1.0 - unique[:, 7]], axis=1).astype(np.float32)
+    if tangents is not None:
+        tangents = np.concatenate([to_gltf_vectors(unique[:, 8:11]), unique[:, 11:12]], axis=1)
+        tangents = tangents.astype(np.float32)
+
+    return {
+        "positions": to_gltf_vectors(unique[:, :3]).astype(np.float32),
+        "normals": to_gltf_vectors(unique[:, 3:6]).astype(np.float32),
+        "texcoords": texcoords,
+        "tangents": tangents,
+        "groups": groups,
+    }
+
+
+class GlbBuilder:
+    """Accumulates glTF JSON and one binary buffer."""
+
+    def __init__(self, generator: str = "ship-sim asset kits"):
+        self.doc: Dict[str, object] = {
+            "asset": {"version": "2.0", "generator": generator},
+            "scene": 0,
+            "scenes": [{"nodes": []}],
+            "nodes": [],
+            "meshes": [],
+            "materials": [],
+            "textures": [],
+            "images": [],
+            "samplers": [],
+            "accessors": [],
+            "bufferViews": [],
+            "buffers": [],
+        }
+        self.chunks: List[bytes] = []
+        self.offset = 0
+        self.mesh_index: Dict[str, int] = {}
+        self.material_index: Dict[str, int] = {}
+        self.texture_index: Dict[str, int] = {}
+
+    def buffer_view(self, raw: bytes, target: Optional[int] = None) -> int:
+        view = {"buffer": 0, "byteOffset": self.offset, "byteLength": len(raw)}
+        if target is not None:
+            view["target"] = target
+        self.doc["bufferViews"].append(view)
+        pad = (-len(raw)) % 4
+        self.chunks.append(raw + b"\0" * pad)
+        self.offset += len(raw) + pad
+        return len(self.doc["bufferViews"]) - 1
+
+    def accessor(self, data: np.ndarray, accessor_type: str, target: Optional[int] = None,
+                 bounds: bool = False) -> int:
+        data = np.ascontiguousarray(data)
+        component = UNSIGNED_INT if data.dtype == np.uint32 else FLOAT
+        raw = data.astype("<u4" if component == UNSIGNED_INT else "<f4").tobytes()
+
+        width = {"SCALAR": 1, "VEC2": 2, "VEC3": 3, "VEC4": 4}[accessor_type]
+        acc = {
+            "bufferView": self.buffer_view(raw, target),
+            "componentType": component,
+            "count": int(data.size // width),
+            "type": accessor_type,
+        }
+        if bounds:
+            rows = data.reshape(-1, width)
+            acc["min"] = [float(v) for v in rows.min(axis=0)]
+            acc["max"] = [float(v) for v in rows.max(axis=0)]
+        self.doc["accessors"].append(acc)
+        return len(self.doc["accessors"]) - 1
+
+    def texture(self, image: bpy.types.Image) -> int:
+        """Texture sampling image, embedded once as PNG."""
+        if image.name in self.texture_index:
+            return self.texture_index[image.name]
+        if not self.doc["samplers"]:
+            self.doc["samplers"].append({"magFilter": LINEAR, "minFilter": LINEAR_MIPMAP_LINEAR,
+                                         "wrapS": CLAMP_TO_EDGE, "wrapT": CLAMP_TO_EDGE})
+        self.doc["images"].append({"name": image.name, "mimeType": "image/png",
+                                   "bufferView": self.buffer_view(png_bytes(image))})
+        self.doc["textures"].append({"sampler": 0, "source": len(self.doc["images"]) - 1})
+        self.texture_index[image.name] = len(self.doc["textures"]) - 1
+        return self.texture_index[image.name]
+
+    def material(self, mat: Optional[bpy.types.Material], white_base: bool = False) -> int:
+        """
+        Metallic-roughness material from a Principled BSDF, plus the normal
+        atlas of a "<name>_Baked" material; white_base leaves colour to
+        instances.
+        """
+        name = mat.name if mat is not None else "Default"
+        key = f"{name}|{white_base}"
+        if key in self.material_index:
+            return self.material_index[key]
+
+        base, metallic, roughness = [0.8, 0.8, 0.8, 1.0], 0.0, 0.5
+        nodes = mat.node_tree.nodes if mat is not None and mat.node_tree else []
+        for node in nodes:
+            if node.type == "BSDF_PRINCIPLED":
+                base = list(node.inputs["Base Color"].default_value)
+                metallic = node.inputs["Metallic"].default_value
+                roughness = node.inputs["Roughness"].default_value
+                break
+        if white_base:
+            base = [1.0, 1.0, 1.0, 1.0]
+
+        material = {
+            "name": name,
+            "pbrMetallicRoughness": {
+                "baseColorFactor": [float(v) for v in base],
+                "metallicFactor": float(metallic),
+                "roughnessFactor": float(roughness),
+            },
+        }
+        atlas = normal_bake.baked_atlas(mat)
+        if atlas is not None:
+            material["normalTexture"] = {"index": self.texture(atlas), "texCoord": 0}
+        self.doc["materials"].append(material)
+        self.material_index[key] = len(self.doc["materials"]) - 1
+        return self.material_index[key]
+
+    def mesh(self, mesh: bpy.types.Mesh, white_base: bool = False, name: Optional[str] = None,
+             owner: Optional[bpy.types.Object] = None) -> int:
+        """
+        glTF mesh for mesh, written once per name (default mesh.name), or
+        once per owner object (and under its name) for an evaluated copy.
+        """
+        name = name or (owner.name if owner is not None else mesh.name)
+        key = f"{name}|{white_base}" if owner is None else f"{owner.name}|{white_base}|evaluated"
+        if key in self.mesh_index:
+            return self.mesh_index[key]
+        prims = mesh_primitives(mesh)
+        attributes = {
+            "POSITION": self.accessor(prims["positions"], "VEC3", ARRAY_BUFFER, bounds=True),
+            "NORMAL": self.accessor(prims["normals"], "VEC3", ARRAY_BUFFER),
+        }
+        if prims["texcoords"] is not None:
+            attributes["TEXCOORD_0"] = self.accessor(prims["texcoords"], "VEC2", ARRAY_BUFFER)
+        if prims["tangents"] is not None:
+            attributes["TANGENT"] = self.accessor(prims["tangents"], "VEC4", ARRAY_BUFFER)
+
+        primitives = []
+        for slot, indices in prims["groups"].items():
+            mat = mesh.materials[slot] if slot < len(mesh.materials) else None
+            primitives.append({
+                "attributes": dict(attributes),
+                "indices": self.accessor(indices, "SCALAR", ELEMENT_ARRAY_BUFFER),
+                "material": self.material(mat, white_base),
+            })
+        self.doc["meshes"].append({"name": name, "primitives": primitives})
+        self.mesh_index[key] = len(self.doc["meshes"]) - 1
+        return self.mesh_index[key]
+
+    def node(self, node: Dict[str, object], parent: Optional[int] = None) -> int:
+        self.doc["nodes"].append(node)
+        index = len(self.doc["nodes"]) - 1
+        if parent is None:
+            self.doc["scenes"][0]["nodes"].append(index)
+        else:
+            self.doc["nodes"][parent].setdefault("children", []).append(index)
+        return index
+
+    def object_node(self, obj: bpy.types.Object, matrix: Matrix, parent: Optional[int] = None,
+                    mesh: Optional[bpy.types.Mesh] = None) -> int:
+        """
+        Node for obj. mesh replaces obj.data (an evaluated copy) and is
+        written under obj's name: objects sharing obj.data can carry
+        different modifiers, so only the plain data is shared by name.
+        """
+        t, r, s = to_gltf_trs(matrix)
+        node = {"name": obj.name, "translation": t, "rotation": r, "scale": s}
+        extras = extras_from(obj)
+        if extras:
+            node["extras"] = extras
+        if obj.type == "MESH":
+            if mesh is None:
+                node["mesh"] = self.mesh(obj.data)
+            else:
+                node["mesh"] = self.mesh(mesh, owner=obj)
+        return self.node(node, parent)
+
+    def instanced_node(self, name: str, mesh: bpy.types.Mesh, instances: List[bpy.types.Object],
+                       parent: Optional[int] = None) -> int:
+        """One node drawing mesh at every instance's local transform, tinted by obj.color."""
+        trs = [to_gltf_trs(obj.matrix_basis) for obj in instances]
+        colors = np.array([list(obj.color)[:3] for obj in instances], dtype=np.float32)
+        attributes = {
+            "TRANSLATION": self.accessor(np.array([t for t, _, _ in trs], dtype=np.float32), "VEC3"),
+            "ROTATION": self.accessor(np.array([r for _, r, _ in trs], dtype=np.float32), "VEC4"),
+            "SCALE": self.accessor(np.array([s for _, _, s in trs], dtype=np.float32), "VEC3"),
+            "_COLOR_0": self.accessor(colors, "VEC3"),
+        }
+        node = {
+            "name": name,
+            "mesh": self.mesh(mesh, white_base=True),
+            "extensions": {INSTANCING_EXTENSION: {"attributes": attributes}},
+        }
+        used = self.doc.setdefault("extensionsUsed", [])
+        if INSTANCING_EXTENSION not in used:
+            used.append(INSTANCING_EXTENSION)
+        return self.node(node, parent)
+
+    def to_bytes(self) -> bytes:
+        binary = b"".join(self.chunks)
+        self.doc["buffers"] = [{"byteLength": len(binary)}]
+        doc = {k: v for k, v in self.doc.items() if v != []}
+        text = json.dumps(doc, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        text += b" " * ((-len(text)) % 4)
+
+        chunks = struct.pack("<II", len(text), CHUNK_JSON) + text
+        if binary:
+            chunks += struct.pack("<II", len(binary), CHUNK_BIN) + binary
+        return struct.pack("<III", GLB_MAGIC, 2, 12 + len(chunks)) + chunks
+
+
+def add_layout(builder: GlbBuilder, root: bpy.types.Object, instances: Iterable[bpy.types.Object]) -> int:
+    """
+    Write root (usually an empty) in world space with one instanced child
+    node "<root>_<mesh>" per mesh its instances share. Instances must be
+    children of root with an identity parent inverse.
+    """
+    index = builder.object_node(root, root.matrix_world)
+    by_mesh: Dict[str, List[bpy.types.Object]] = {}
+    for obj in sorted(instances, key=lambda o: o.name):
+        by_mesh.setdefault(obj.data.name, []).append(obj)
+    for mesh_name in sorted(by_mesh):
+        group = by_mesh[mesh_name]
+        builder.instanced_node(f"{root.name}_{mesh_name}", group[0].data, group, index)
+    return index
+
+
+def write_glb(path: str, layouts: Iterable[Tuple[bpy.types.Object, List[bpy.types.Object]]],
+              objects: Iterable[bpy.types.Object] = ()):
+    """
+    Write (root, instances) layouts (see add_layout) plus objects as plain
+    top-level nodes in world space to path, atomically.
+    """
+    builder = GlbBuilder()
+    for root, instances in sorted(layouts, key=lambda item: item[0].name):
+        add_layout(builder, root, instances)
+    for obj in sorted(objects, key=lambda o: o.name):
+        builder.object_node(obj, obj.matrix_world)
+    write_atomic(path, builder.to_bytes())
+
+
+def write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp_path, path)
@@ -0,0 +1,212 @@
+import math
+import os
+import struct
+from typing import Optional, Tuple
+
+import bpy
+import numpy as np
+
+# ============================================================
+# Heightfield engine
+# Terrain-like surfaces (seabed tiles) are evaluated as whole NumPy
+# arrays instead of per-vertex Python or Geometry Nodes + convert:
+#   - gradient noise / fBm on coordinate arrays
+#   - regular lattices addressed by integer sample index, so the same
+#     world position always yields bit-identical coordinates
+#   - filtered downsampling so coarse LODs are derived from the fine
+#     field instead of re-evaluating noise
+#   - one foreach_set pass to turn a height array into a grid mesh
+#   - quantized uint16 heightmap files for GPU displacement at runtime
+#
+# Height arrays are indexed [row, column] = [y, x].
+# ============================================================
+
+NOISE_SEED = 1337
+
+# .hmap layout, little-endian: 32-byte header
+#   magic "SBHM", version u16, samples per side u16,
+#   origin x/y/z f32, tile size f32, min z f32, max z f32
+# followed by samples*samples uint16 heights, row-major with rows along +Y
+# and columns along +X. z = min_z + q / 65535 * (max_z - min_z).
+HEIGHTMAP_MAGIC = b"SBHM"
+HEIGHTMAP_VERSION = 1
+HEIGHTMAP_HEADER = struct.Struct("<4sHHffffff")
+
+
+def _permutation(seed: int) -> np.ndarray:
+    perm = np.random.RandomState(seed).permutation(256).astype(np.int64)
+    return np.concatenate([perm, perm])
+
+
+_PERM = _permutation(NOISE_SEED)
+_GRAD = np.array([(math.cos(a), math.sin(a)) for a in np.arange(8) * (math.pi / 4.0)])
+
+
+def _fade(t: np.ndarray) -> np.ndarray:
+    return t * t * t * (t * (t * 6.0 - 15.0) + 10.0)
+
+
+def perlin(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """2D gradient noise in roughly [-1, 1], evaluated element-wise."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    x0 = np.floor(x)
+    y0 = np.floor(y)
+    fx = x - x0
+    fy = y - y0
+    xi = x0.astype(np.int64) & 255
+    yi = y0.astype(np.int64) & 255
+
+    def corner(dx: int, dy: int) -> np.ndarray:
+        h = _PERM[_PERM[xi + dx] + yi + dy] & 7
+        g = _GRAD[h]
+        return g[..., 0] * (fx - dx) + g[..., 1] * (fy - dy)
+
+    u = _fade(fx)
+    v = _fade(fy)
+    n0 = corner(0, 0) + u * (corner(1, 0) - corner(0, 0))
+    n1 = corner(0, 1) + u * (corner(1, 1) - corner(0, 1))
+    # Unit gradients peak at sqrt(0.5); rescale to about [-1, 1].
+    return (n0 + v * (n1 - n0)) * math.sqrt(2.0)
+
+
+def fbm(x: np.ndarray, y: np.ndarray, scale: float, detail: float, roughness: float) -> np.ndarray:
+    """Fractal noise shaped like Blender's Noise Texture Fac output (0..1, centred on 0.5).
+
+    detail counts extra octaves (fractional values blend in the last
+    one) and roughness is the per-octave amplitude falloff.
+    """
+    x = np.asarray(x, dtype=np.float64) * scale
+    y = np.asarray(y, dtype=np.float64) * scale
+    octaves = int(math.floor(detail))
+    blend = detail - octaves
+
+    total = np.zeros(np.broadcast(x, y).shape)
+    amp, freq, norm = 1.0, 1.0, 0.0
+    for _ in range(octaves + 1):
+        total += perlin(x * freq, y * freq) * amp
+        norm += amp
+        amp *= roughness
+        freq *= 2.0
+    if blend > 0.0:
+        total += perlin(x * freq, y * freq) * amp * blend
+        norm += amp * blend
+    return np.clip(0.5 + 0.5 * total / norm, 0.0, 1.0)
+
+
+def lattice(res: int, step: float, origin_index: Tuple[int, int] = (0, 0), apron: int = 0):
+    """World X/Y arrays for a (res+1) x (res+1) sample grid.
+
+    Sample (j, i) sits at (origin_index + (i, j)) * step, so a sample
+    shared by two neighbouring grids gets the same coordinates in both.
+    apron adds that many extra samples on every side.
+    """
+    ix = np.arange(-apron, res + apron + 1, dtype=np.int64) + origin_index[0]
+    iy = np.arange(-apron, res + apron + 1, dtype=np.int64) + origin_index[1]
+    return np.meshgrid(ix * step, iy * step)
+
+
+def seam_mask(x: np.ndarray, y: np.ndarray, size: float, guard: float) -> np.ndarray:
+    """1 inside the tile, 0 within guard of any edge (x/y are tile-local)."""
+    inside = (x > guard) & (y > guard) & ((size - x) > guard) & ((size - y) > guard)
+    return inside.astype(np.float64)
+
+
+def _tent_kernel(factor: int) -> np.ndarray:
+    k = factor - np.abs(np.arange(-factor + 1, factor, dtype=np.float64))
+    return k / k.sum()
+
+
+def _filter_axis(field: np.ndarray, kernel: np.ndarray, axis: int) -> np.ndarray:
+    radius = len(kernel) // 2
+    n = field.shape[axis] - 2 * radius
+    out = np.zeros_like(np.take(field, np.arange(n), axis=axis))
+    for k, w in enumerate(kernel):
+        out += w * np.take(field, np.arange(k, k + n), axis=axis)
+    return out
+
+
+def downsample(field: np.ndarray, factor: int, apron: int = 0) -> np.ndarray:
+    """Low-pass and decimate a (res+1)^2 field by an integer factor.
+
+    Each coarse sample is a tent-weighted average of the fine samples
+    within factor steps of it, so detail finer than the coarse spacing
+    fades out instead of aliasing. Samples outside the grid come from
+    the apron when the field has one (apron >= factor - 1), otherwise
+    the border is repeated.
+    """
+    if factor == 1:
+        return field[apron:field.shape[0] - apron, apron:field.shape[1] - apron].copy()
+    res = field.shape[0] - 1 - 2 * apron
+    if res % factor:
+        raise ValueError(f"Grid of {res} cells does not divide by {factor}")
+
+    radius = factor - 1
+    if apron >= radius:
+        cut = apron - radius
+        padded = field[cut:field.shape[0] - cut, cut:field.shape[1] - cut]
+    else:
+        core = field[apron:field.shape[0] - apron, apron:field.shape[1] - apron]
+        padded = np.pad(core, radius, mode="edge")
+
+    kernel = _tent_kernel(factor)
+    smooth = _filter_axis(_filter_axis(padded, kernel, 0), kernel, 1)
+    return smooth[::factor, ::factor].copy()
+
+
+def grid_mesh(name: str, heights: np.ndarray, size: float) -> bpy.types.Mesh:
+    """Quad grid spanning 0..size in X and Y with Z taken from heights[row, col]."""
+    rows, cols = heights.shape
+    xs = np.linspace(0.0, size, cols)
+    ys = np.linspace(0.0, size, rows)
+    gx, gy = np.meshgrid(xs, ys)
+    co = np.stack([gx, gy, heights], axis=-1).astype(np.float32).ravel()
+
+    # Quad (j, i) -> corners counter-clockwise seen from +Z.
+    j, i = np.meshgrid(np.arange(rows - 1), np.arange(cols - 1), indexing="ij")
+    v00 = (j * cols + i).ravel()
+    quads = np.stack([v00, v00 + 1, v00 + cols + 1, v00 + cols], axis=-1).astype(np.int32)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(rows * cols)
+    mesh.vertices.foreach_set("co", co)
+    mesh.loops.add(quads.size)
+    mesh.loops.foreach_set("vertex_index", quads.ravel())
+    mesh.polygons.add(len(quads))
+    mesh.polygons.foreach_set("loop_start", np.arange(0, quads.size, 4, dtype=np.int32))
+    mesh.update(calc_edges=True)
+    return mesh
+
+
+def quantize_heights(heights: np.ndarray, z_range: Optional[Tuple[float, float]] = None):
+    """uint16 codes plus the (min_z, max_z) they span.
+
+    The range defaults to the field's own min..max. Pass a fixed z_range
+    shared by neighbouring tiles so equal heights get equal codes.
+    """
+    min_z, max_z = z_range if z_range is not None else (float(heights.min()), float(heights.max()))
+    span = max_z - min_z
+    if span <= 0.0:
+        return np.zeros(heights.shape, dtype=np.uint16), min_z, max_z
+    codes = np.rint(np.clip((heights - min_z) / span, 0.0, 1.0) * 65535.0)
+    return codes.astype(np.uint16), min_z, max_z
+
+
+def write_heightmap(path: str, heights: np.ndarray, origin: Tuple[float, float, float], size: float,
+                    z_range: Optional[Tuple[float, float]] = None):
+    """Write a square height array as a .hmap file (see HEIGHTMAP_HEADER)."""
+    rows, cols = heights.shape
+    if rows != cols or rows > 0xFFFF:
+        raise ValueError(f"Heightmap must be square with at most 65535 samples per side, got {rows}x{cols}")
+    codes, min_z, max_z = quantize_heights(heights, z_range)
+    header = HEIGHTMAP_HEADER.pack(
+        HEIGHTMAP_MAGIC, HEIGHTMAP_VERSION, rows,
+        origin[0], origin[1], origin[2], size, min_z, max_z,
+    )
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as fh:
+        fh.write(header)
+        fh.write(codes.astype("<u2").tobytes())
+    os.replace(tmp_path, path)
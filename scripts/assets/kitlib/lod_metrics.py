@@ -0,0 +1,178 @@
+import math
+import re
+from typing import Dict, Iterable, List, Optional
+
+import bpy
+import numpy as np
+from mathutils.bvhtree import BVHTree
+
+# ============================================================
+# Screen-space LOD metrics
+# For every LOD family in a kit collection (objects named *_lod0,
+# *_lod1, ... or *_LOD0, ...) measures how far each lower LOD's
+# surface strays from LOD0: a sampled, symmetric Hausdorff distance
+# between the evaluated world-space surfaces, including child meshes
+# (instanced container stacks) but not nested LODs, colliders or snaps.
+#
+# The error converts to the distance at which it projects to at most
+# PIXEL_ERROR pixels for a reference camera:
+#   distance = error * HEIGHT_PX / (2 * tan(FOV / 2) * PIXEL_ERROR)
+# Results are stored as custom properties (exported as glTF extras):
+#   lodN:  lod_error, lod_mean_error, lod_switch_distance
+#   lod0:  lod_switch_distances plus the reference camera
+# and returned per family for the build report.
+# ============================================================
+
+REFERENCE_FOV_DEG = 55.0
+REFERENCE_HEIGHT_PX = 1080
+PIXEL_ERROR = 1.0
+SAMPLES = 4096
+SEED = 0
+
+LOD_NAME = re.compile(r"^(.*)_(?:lod|LOD)(\d+)$")
+
+
+def switch_distance(error: float, fov_deg: float = REFERENCE_FOV_DEG,
+                    height_px: int = REFERENCE_HEIGHT_PX, pixel_error: float = PIXEL_ERROR) -> float:
+    """Camera distance beyond which a world-space error covers at most pixel_error pixels."""
+    return error * height_px / (2.0 * math.tan(math.radians(fov_deg) * 0.5) * pixel_error)
+
+
+def _is_lod_child(obj: bpy.types.Object) -> bool:
+    return "lod" in obj or obj.name.startswith(("COLLIDER_", "SNAP_")) or obj.get("asset_role") == "collision"
+
+
+def surface_objects(root: bpy.types.Object) -> List[bpy.types.Object]:
+    """root and its mesh descendants, skipping nested LODs, colliders and snaps."""
+    found = [root] if root.type == "MESH" else []
+    for child in root.children:
+        if not _is_lod_child(child):
+            found.extend(surface_objects(child))
+    return found
+
+
+def mesh_triangles(mesh: bpy.types.Mesh, matrix) -> np.ndarray:
+    """(T, 3, 3) triangles of mesh transformed by matrix."""
+    mesh.calc_loop_triangles()
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("vertices", tris)
+    m = np.array(matrix, dtype=np.float64)
+    world = co.reshape(-1, 3).astype(np.float64) @ m[:3, :3].T + m[:3, 3]
+    return world[tris.reshape(-1, 3)]
+
+
+def world_triangles(objs: Iterable[bpy.types.Object]) -> np.ndarray:
+    """(T, 3, 3) evaluated triangles in world space."""
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    chunks = []
+    for obj in objs:
+        eval_obj = obj.evaluated_get(depsgraph)
+        mesh = eval_obj.to_mesh()
+        if mesh is None:
+            continue
+        chunks.append(mesh_triangles(mesh, eval_obj.matrix_world))
+        eval_obj.to_mesh_clear()
+    return np.concatenate(chunks) if chunks else np.zeros((0, 3, 3))
+
+
+def sample_surface(tris: np.ndarray, count: int, rng: np.random.Generator) -> np.ndarray:
+    """Area-weighted random points on the triangles, plus up to count distinct vertices."""
+    verts = np.unique(tris.reshape(-1, 3), axis=0)
+    if len(verts) > count:
+        verts = verts[rng.choice(len(verts), size=count, replace=False)]
+    area = np.linalg.norm(np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0]), axis=1)
+    if area.sum() <= 0.0:
+        return verts
+    pick = rng.choice(len(tris), size=count, p=area / area.sum())
+    u, v = rng.random(count), rng.random(count)
+    flip = u + v > 1.0
+    u[flip], v[flip] = 1.0 - u[flip], 1.0 - v[flip]
+    t = tris[pick]
+    points = t[:, 0] + u[:, None] * (t[:, 1] - t[:, 0]) + v[:, None] * (t[:, 2] - t[:, 0])
+    # Vertices catch silhouette corners that random samples tend to miss.
+    return np.concatenate([points, verts])
+
+
+def _bvh(tris: np.ndarray) -> BVHTree:
+    verts = tris.reshape(-1, 3).tolist()
+    polys = np.arange(len(verts)).reshape(-1, 3).tolist()
+    return BVHTree.FromPolygons(verts, polys, all_triangles=True)
+
+
+def _distances(points: np.ndarray, tree: BVHTree) -> np.ndarray:
+    out = np.empty(len(points))
+    for i, p in enumerate(points):
+        hit = tree.find_nearest(p)
+        out[i] = hit[3] if hit[0] is not None else np.inf
+    return out
+
+
+def deviation(reference: np.ndarray, lod: np.ndarray, samples: int = SAMPLES) -> Dict[str, float]:
+    """Sampled symmetric Hausdorff (max) and mean distance between two triangle soups."""
+    rng = np.random.default_rng(SEED)
+    forward = _distances(sample_surface(reference, samples, rng), _bvh(lod))
+    backward = _distances(sample_surface(lod, samples, rng), _bvh(reference))
+    both = np.concatenate([forward, backward])
+    return {"max": float(both.max()), "mean": float(both.mean())}
+
+
+def lod_families(objs: Iterable[bpy.types.Object]) -> Dict[str, Dict[int, bpy.types.Object]]:
+    families: Dict[str, Dict[int, bpy.types.Object]] = {}
+    for obj in objs:
+        match = LOD_NAME.match(obj.name)
+        if match is None:
+            continue
+        level = int(obj.get("lod", match.group(2)))
+        families.setdefault(match.group(1), {})[level] = obj
+    return {name: lods for name, lods in families.items() if 0 in lods and len(lods) > 1}
+
+
+def measure_family(lods: Dict[int, bpy.types.Object]) -> Optional[Dict[str, object]]:
+    reference = world_triangles(surface_objects(lods[0]))
+    if not len(reference):
+        return None
+
+    records = []
+    distance = 0.0
+    for level in sorted(lods):
+        if level == 0:
+            continue
+        obj = lods[level]
+        tris = world_triangles(surface_objects(obj))
+        if not len(tris):
+            continue
+        dev = deviation(reference, tris)
+        # Never switch to a coarser LOD closer than a finer one.
+        distance = max(distance, switch_distance(dev["max"]))
+        obj["lod_error"] = dev["max"]
+        obj["lod_mean_error"] = dev["mean"]
+        obj["lod_switch_distance"] = distance
+        records.append({
+            "lod": level,
+            "error": round(dev["max"], 6),
+            "mean_error": round(dev["mean"], 6),
+            "switch_distance": round(distance, 3),
+        })
+
+    root = lods[0]
+    root["lod_switch_distances"] = [r["switch_distance"] for r in records]
+    root["lod_reference_fov_deg"] = REFERENCE_FOV_DEG
+    root["lod_reference_height_px"] = REFERENCE_HEIGHT_PX
+    root["lod_pixel_error"] = PIXEL_ERROR
+    return {"lods": records}
+
+
+def measure_collection(col: bpy.types.Collection) -> List[Dict[str, object]]:
+    """Measure every LOD family in col; one report record per family."""
+    report = []
+    for name, lods in sorted(lod_families(col.all_objects).items()):
+        result = measure_family(lods)
+        if result is not None:
+            report.append({"asset": name, **result})
+    return report
+
+
+def reference_camera() -> Dict[str, float]:
+    return {"fov_deg": REFERENCE_FOV_DEG, "height_px": REFERENCE_HEIGHT_PX, "pixel_error": PIXEL_ERROR}
@@ -0,0 +1,217 @@
+import math
+import time
+from typing import Dict, List, Optional
+
+import bpy
+import numpy as np
+
+from kitlib import lod_metrics, trace
+
+# ============================================================
+# Error-driven LOD simplification
+# Replaces fixed Decimate ratios with a per-LOD target: a maximum
+# geometric error (meters, the sampled Hausdorff distance from
+# kitlib.lod_metrics) and/or a triangle budget. The LOD object gets two
+# modifiers that are evaluated, never applied, while searching:
+#   1. planar DISSOLVE at PLANAR_ANGLE_DEG, delimited by material, seam,
+#      sharp and UV borders; it merges the coplanar quads box-built
+#      parts are made of at no geometric cost
+#   2. COLLAPSE, weighted by a vertex group holding the protected
+#      vertices (weight 1): boundary edges, feature edges sharper than
+#      FEATURE_ANGLE_DEG (they carry the silhouette from any view) and
+#      material borders. Decimate penalises low weights, so the group is
+#      inverted: protected edges collapse last
+# The collapse ratio is bisected until the coarsest mesh within
+# max_error and max_triangles is found; when both cannot be met the
+# triangle budget wins. The chosen mesh replaces the object's data.
+#
+# Every simplify() call appends a record (asset, ratio, error,
+# triangles, met, evaluations, seconds) to REPORT; build_kits.py
+# collects it per kit with take_report() for its --report JSON.
+# ============================================================
+
+PLANAR_ANGLE_DEG = 0.5
+FEATURE_ANGLE_DEG = 30.0
+PROTECT_GROUP = "LODProtect"
+# Decimate adds edge_length * (2 - w1 - w2) * factor to an edge's
+# collapse cost, w being the (inverted) group weights: an edge between
+# two protected vertices costs 2 * factor times its length more, one
+# between unprotected vertices nothing. The factor is capped at 1000.
+PROTECT_FACTOR = 1000.0
+RATIO_TOLERANCE = 0.01
+SAMPLES = 2048
+
+REPORT: List[Dict[str, object]] = []
+
+
+def take_report() -> List[Dict[str, object]]:
+    """Records since the last call, oldest first."""
+    records = list(REPORT)
+    REPORT.clear()
+    return records
+
+
+def protected_vertices(mesh: bpy.types.Mesh, feature_angle_deg: float = FEATURE_ANGLE_DEG) -> np.ndarray:
+    """Indices of vertices on boundary, non-manifold, feature, seam/sharp or material-border edges."""
+    edge_count = len(mesh.edges)
+    if not edge_count:
+        return np.zeros(0, dtype=np.int64)
+    edge_verts = np.empty(edge_count * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edge_verts)
+
+    loop_edge = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("edge_index", loop_edge)
+    loop_total = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_total)
+    loop_poly = np.repeat(np.arange(len(mesh.polygons)), loop_total)
+
+    normals = np.empty(len(mesh.polygons) * 3, dtype=np.float32)
+    mesh.polygons.foreach_get("normal", normals)
+    normals = normals.reshape(-1, 3)
+    materials = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", materials)
+
+    faces = np.bincount(loop_edge, minlength=edge_count)
+    # For a manifold edge these are its two faces.
+    first = np.full(edge_count, len(mesh.polygons), dtype=np.int64)
+    last = np.full(edge_count, -1, dtype=np.int64)
+    np.minimum.at(first, loop_edge, loop_poly)
+    np.maximum.at(last, loop_edge, loop_poly)
+
+    protect = faces != 2
+    manifold = ~protect
+    a, b = first[manifold], last[manifold]
+    cos_angle = np.einsum("ij,ij->i", normals[a], normals[b])
+    protect[manifold] = (cos_angle < math.cos(math.radians(feature_angle_deg))) | (materials[a] != materials[b])
+
+    for flag in ("use_seam", "use_edge_sharp"):
+        marked = np.zeros(edge_count, dtype=bool)
+        mesh.edges.foreach_get(flag, marked)
+        protect |= marked
+
+    return np.unique(edge_verts.reshape(-1, 2)[protect])
+
+
+def _add_modifiers(obj: bpy.types.Object):
+    planar = obj.modifiers.new(name="LODPlanar", type="DECIMATE")
+    planar.decimate_type = "DISSOLVE"
+    planar.angle_limit = math.radians(PLANAR_ANGLE_DEG)
+    planar.delimit = {"MATERIAL", "SEAM", "SHARP", "UV"}
+    planar.use_dissolve_boundaries = False
+
+    collapse = obj.modifiers.new(name="LODCollapse", type="DECIMATE")
+    collapse.decimate_type = "COLLAPSE"
+    collapse.use_collapse_triangulate = True
+    collapse.vertex_group = PROTECT_GROUP
+    collapse.invert_vertex_group = True
+    collapse.vertex_group_factor = PROTECT_FACTOR
+    return planar, collapse
+
+
+def _evaluated_triangles(obj: bpy.types.Object) -> np.ndarray:
+    bpy.context.view_layer.update()
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    eval_obj = obj.evaluated_get(depsgraph)
+    mesh = eval_obj.to_mesh()
+    try:
+        return lod_metrics.mesh_triangles(mesh, eval_obj.matrix_world)
+    finally:
+        eval_obj.to_mesh_clear()
+
+
+def _apply(obj: bpy.types.Object):
+    """Replace obj's data with its evaluated mesh and drop the modifiers."""
+    bpy.context.view_layer.update()
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    mesh = bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph), depsgraph=depsgraph)
+    old, name = obj.data, obj.data.name
+    obj.modifiers.clear()
+    obj.data = mesh
+    if old.users == 0:
+        bpy.data.meshes.remove(old)
+    mesh.name = name
+    group = obj.vertex_groups.get(PROTECT_GROUP)
+    if group is not None:
+        obj.vertex_groups.remove(group)
+
+
+@trace.traced
+def simplify(obj: bpy.types.Object, source: bpy.types.Object, max_error: Optional[float] = None,
+             max_triangles: Optional[int] = None) -> Dict[str, object]:
+    """
+    Simplify obj (a copy of source) to the coarsest mesh whose error
+    against source stays within max_error and whose triangle count stays
+    within max_triangles. At least one target is required.
+    """
+    if max_error is None and max_triangles is None:
+        raise ValueError(f"{obj.name}: simplify needs max_error or max_triangles")
+
+    start = time.perf_counter()
+    reference = lod_metrics.world_triangles([source])
+
+    protect = protected_vertices(obj.data)
+    group = obj.vertex_groups.get(PROTECT_GROUP) or obj.vertex_groups.new(name=PROTECT_GROUP)
+    group.add(protect.tolist(), 1.0, "REPLACE")
+    _planar, collapse = _add_modifiers(obj)
+
+    triangles: Dict[float, int] = {}
+    errors: Dict[float, float] = {}
+
+    def measure(ratio: float, with_error: bool) -> None:
+        if ratio in triangles and (ratio in errors or not with_error):
+            return
+        collapse.ratio = ratio
+        tris = _evaluated_triangles(obj)
+        triangles[ratio] = len(tris)
+        if with_error:
+            errors[ratio] = lod_metrics.deviation(reference, tris, SAMPLES)["max"] if len(tris) else math.inf
+
+    def bisect(good: float, bad: float, passes) -> float:
+        """Move good towards bad while passes(ratio) holds; returns the last passing ratio."""
+        while abs(good - bad) > RATIO_TOLERANCE:
+            mid = 0.5 * (good + bad)
+            if passes(mid):
+                good = mid
+            else:
+                bad = mid
+        return good
+
+    def within_budget(ratio: float) -> bool:
+        measure(ratio, False)
+        return triangles[ratio] <= max_triangles
+
+    def within_error(ratio: float) -> bool:
+        measure(ratio, True)
+        return errors[ratio] <= max_error
+
+    ratio = 1.0
+    if max_triangles is not None and not within_budget(ratio):
+        ratio = bisect(0.0, 1.0, within_budget)
+    if max_error is not None and within_error(ratio):
+        ratio = bisect(ratio, 0.0, within_error)
+    measure(ratio, True)
+
+    collapse.ratio = ratio
+    _apply(obj)
+
+    met = ((max_error is None or errors[ratio] <= max_error)
+           and (max_triangles is None or triangles[ratio] <= max_triangles))
+    obj["lod_simplify_ratio"] = triangles[ratio] / max(1, len(reference))
+    obj["lod_simplify_error"] = errors[ratio]
+    record = {
+        "asset": obj.name,
+        "source": source.name,
+        "source_triangles": len(reference),
+        "triangles": triangles[ratio],
+        "collapse_ratio": round(ratio, 4),
+        "ratio": round(triangles[ratio] / max(1, len(reference)), 4),
+        "error": round(errors[ratio], 6),
+        "max_error": max_error,
+        "max_triangles": max_triangles,
+        "protected_vertices": len(protect),
+        "met": met,
+        "evaluations": len(triangles),
+        "seconds": round(time.perf_counter() - start, 4),
+    }
+    REPORT.append(record)
+    return record
@@ -0,0 +1,320 @@
+import json
+import math
+import os
+import re
+import struct
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import bpy
+import numpy as np
+from mathutils import Matrix, Vector
+
+from kitlib import gltf_export, gltf_instancing, lod_metrics
+
+# ============================================================
+# Asset manifest
+# One index per build so a runtime (e.g. the editor's placement and
+# snapping tools) can list the catalogue without opening any GLB. Per
+# asset it records:
+#   - the GLB file and its size
+#   - bounds of LOD0
+#   - per LOD: node name, triangle / vertex counts, switch distance
+#     (kitlib.lod_metrics) and the byte span of the LOD's mesh data in
+#     the GLB, for range requests
+#   - material slots, snap point transforms and collider primitives
+#     (box, cylinder or hull bounds; one per COLLIDER_ node, so compound
+#     colliders from kitlib.colliders and hulls from kitlib.convex_decomp
+#     list every part; hull vertices ship as the nodes' meshes in the GLB)
+# All positions are in the asset root's space, in glTF axes (Y up), like
+# the exported GLB.
+#
+# write() stores it twice: manifest.json, and manifest.bin with the same
+# content as fixed-size little-endian records (read by
+# src/lib/assets/assetManifest.ts):
+#   header      "SSAM", u32 version, u32 counts: assets, lods, snaps,
+#               colliders, materials, u32 string table bytes
+#   assets      u32 name, kit, file (string offsets), u32 file bytes,
+#               f32 min[3], max[3], u32 first/count of lods, snaps,
+#               colliders, materials
+#   lods        u32 node, lod, triangles, vertices, byte offset,
+#               byte length, f32 switch distance (NaN when unmeasured)
+#   snaps       u32 name, f32 translation[3], rotation[4] (x, y, z, w)
+#   colliders   u32 name, shape, f32 center[3], size[3], rotation[4]
+#   materials   u32 name
+#   strings     u16 byte length + UTF-8, at the offsets used above
+# ============================================================
+
+MANIFEST_VERSION = 1
+MAGIC = b"SSAM"
+JSON_NAME = "manifest.json"
+BINARY_NAME = "manifest.bin"
+
+SHAPES = ("box", "cylinder", "hull")
+# Relative tolerance when recognising box and cylinder colliders.
+SHAPE_EPS = 1e-3
+
+SNAP_KIND = re.compile(r"^SNAP_([A-Z]+)_")
+
+HEADER = struct.Struct("<4s7I")
+ASSET = struct.Struct("<4I6f8I")
+LOD = struct.Struct("<6If")
+SNAP = struct.Struct("<I7f")
+COLLIDER = struct.Struct("<2I10f")
+MATERIAL = struct.Struct("<I")
+
+
+def is_collider(obj: bpy.types.Object) -> bool:
+    return obj.name.startswith("COLLIDER_") or obj.get("asset_role") == "collision"
+
+
+def is_snap(obj: bpy.types.Object) -> bool:
+    return obj.name.startswith("SNAP_") or obj.get("asset_role") == "snap_point"
+
+
+def _local_co(obj: bpy.types.Object) -> np.ndarray:
+    co = np.empty(len(obj.data.vertices) * 3, dtype=np.float32)
+    obj.data.vertices.foreach_get("co", co)
+    return co.reshape(-1, 3).astype(np.float64)
+
+
+def collider_shape(co: np.ndarray) -> str:
+    """box for the 8 corners of the bounds, cylinder for a Z-axis prism of a regular polygon, else hull."""
+    if not len(co):
+        return "hull"
+    lo, hi = co.min(axis=0), co.max(axis=0)
+    eps = SHAPE_EPS * max(float((hi - lo).max()), 1e-6)
+    on_bounds = (np.abs(co - lo) < eps) | (np.abs(co - hi) < eps)
+    if len(co) == 8 and on_bounds.all():
+        return "box"
+    center = (lo + hi) * 0.5
+    radius = np.linalg.norm(co[:, :2] - center[:2], axis=1)
+    if len(co) >= 12 and on_bounds[:, 2].all() and np.ptp(radius) < eps:
+        return "cylinder"
+    return "hull"
+
+
+def _gltf_size(v) -> List[float]:
+    return [abs(float(v[0])), abs(float(v[2])), abs(float(v[1]))]
+
+
+def describe_collider(obj: bpy.types.Object, to_asset: Matrix) -> Dict[str, object]:
+    co = _local_co(obj) if obj.type == "MESH" else np.zeros((0, 3))
+    lo, hi = (co.min(axis=0), co.max(axis=0)) if len(co) else (np.zeros(3), np.zeros(3))
+    matrix = to_asset @ obj.matrix_world
+    _t, _r, s = matrix.decompose()
+    center = matrix @ Vector(((lo + hi) * 0.5).tolist())
+    size = (hi - lo) * np.array(s)
+    _t, rotation, _s = gltf_instancing.to_gltf_trs(matrix)
+    shape = obj.get("collider_shape")
+    return {
+        "name": obj.name,
+        "shape": shape if shape in SHAPES else collider_shape(co),
+        "center": [float(v) for v in gltf_instancing.to_gltf_vectors(np.array(center))],
+        "size": _gltf_size(size),
+        "rotation": [float(v) for v in rotation],
+    }
+
+
+def describe_snap(obj: bpy.types.Object, to_asset: Matrix) -> Dict[str, object]:
+    translation, rotation, _s = gltf_instancing.to_gltf_trs(to_asset @ obj.matrix_world)
+    match = SNAP_KIND.match(obj.name)
+    return {
+        "name": obj.name,
+        "kind": match.group(1) if match else "",
+        "translation": [float(v) for v in translation],
+        "rotation": [float(v) for v in rotation],
+    }
+
+
+def lod_nodes(objs: Iterable[bpy.types.Object]) -> Dict[int, bpy.types.Object]:
+    """First object per LOD level among objs, by "lod" property or _lodN name."""
+    lods: Dict[int, bpy.types.Object] = {}
+    for obj in objs:
+        if is_collider(obj) or is_snap(obj):
+            continue
+        match = lod_metrics.LOD_NAME.match(obj.name)
+        if "lod" in obj or match:
+            lods.setdefault(int(obj.get("lod", match.group(2) if match else 0)), obj)
+    return lods
+
+
+def mesh_counts(objs: Iterable[bpy.types.Object]) -> Tuple[int, int, List[str]]:
+    """Evaluated triangle and vertex totals of objs, and their material names."""
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    triangles = vertices = 0
+    materials: List[str] = []
+    for obj in objs:
+        eval_obj = obj.evaluated_get(depsgraph)
+        mesh = eval_obj.to_mesh()
+        if mesh is None:
+            continue
+        mesh.calc_loop_triangles()
+        triangles += len(mesh.loop_triangles)
+        vertices += len(mesh.vertices)
+        for mat in mesh.materials:
+            if mat is not None and mat.name not in materials:
+                materials.append(mat.name)
+        eval_obj.to_mesh_clear()
+    return triangles, vertices, materials
+
+
+def glb_node_spans(path: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Per node name, the (file offset, length) span of the binary data of
+    its meshes and its non-LOD/collider/snap descendants' meshes. Reads
+    plain, draco and meshopt encoded GLBs.
+    """
+    with open(path, "rb") as fh:
+        data = fh.read()
+    json_len = struct.unpack_from("<I", data, 12)[0]
+    doc = json.loads(data[20:20 + json_len])
+    bin_start = 20 + json_len + 8
+
+    def view_span(index: int) -> Optional[Tuple[int, int]]:
+        view = doc["bufferViews"][index]
+        view = view.get("extensions", {}).get("EXT_meshopt_compression", view)
+        if view.get("buffer", 0) != 0:
+            return None
+        start = bin_start + view.get("byteOffset", 0)
+        return start, start + view["byteLength"]
+
+    def mesh_views(mesh_index: int) -> List[int]:
+        views = []
+        for prim in doc["meshes"][mesh_index]["primitives"]:
+            accessors = list(prim["attributes"].values()) + ([prim["indices"]] if "indices" in prim else [])
+            views += [doc["accessors"][a]["bufferView"] for a in accessors if "bufferView" in doc["accessors"][a]]
+            draco = prim.get("extensions", {}).get("KHR_draco_mesh_compression")
+            if draco is not None:
+                views.append(draco["bufferView"])
+        return views
+
+    nodes = doc.get("nodes", [])
+
+    def node_views(index: int, top: bool) -> List[int]:
+        node = nodes[index]
+        extras = node.get("extras", {})
+        name = node.get("name", "")
+        if not top and ("lod" in extras or name.startswith(("COLLIDER_", "SNAP_"))):
+            return []
+        views = mesh_views(node["mesh"]) if "mesh" in node else []
+        for ext in node.get("extensions", {}).values():
+            views += [doc["accessors"][a]["bufferView"] for a in ext.get("attributes", {}).values()]
+        for child in node.get("children", []):
+            views += node_views(child, False)
+        return views
+
+    spans = {}
+    for i, node in enumerate(nodes):
+        ranges = [r for r in (view_span(v) for v in node_views(i, True)) if r is not None]
+        if ranges:
+            start = min(r[0] for r in ranges)
+            spans[node.get("name", "")] = (start, max(r[1] for r in ranges) - start)
+    return spans
+
+
+def describe_asset(kit: str, name: str, roots: List[bpy.types.Object], out_dir: str,
+                   glb_path: Optional[str]) -> Dict[str, object]:
+    objs = gltf_export.asset_objects(roots)
+    anchor = roots[0]
+    to_asset = anchor.matrix_world.inverted()
+    spans = glb_node_spans(glb_path) if glb_path and os.path.exists(glb_path) else {}
+
+    nodes = lod_nodes(objs) or {0: anchor}
+    lods, materials = [], []
+    for level in sorted(nodes):
+        node = nodes[level]
+        triangles, vertices, lod_materials = mesh_counts(lod_metrics.surface_objects(node))
+        materials += [m for m in lod_materials if m not in materials]
+        offset, length = spans.get(node.name, (0, 0))
+        switch = node.get("lod_switch_distance")
+        lods.append({
+            "lod": level,
+            "node": node.name,
+            "triangles": triangles,
+            "vertices": vertices,
+            "byteOffset": offset,
+            "byteLength": length,
+            "switchDistance": float(switch) if switch is not None else None,
+        })
+
+    reference = lod_metrics.world_triangles(lod_metrics.surface_objects(nodes[min(nodes)]))
+    if len(reference):
+        m = np.array(to_asset, dtype=np.float64)
+        local = reference.reshape(-1, 3) @ m[:3, :3].T + m[:3, 3]
+        points = gltf_instancing.to_gltf_vectors(local)
+        bounds = {"min": points.min(axis=0).tolist(), "max": points.max(axis=0).tolist()}
+    else:
+        bounds = {"min": [0.0, 0.0, 0.0], "max": [0.0, 0.0, 0.0]}
+
+    return {
+        "name": name,
+        "kit": kit,
+        "file": os.path.relpath(glb_path, out_dir).replace(os.sep, "/") if glb_path else None,
+        "fileBytes": os.path.getsize(glb_path) if glb_path and os.path.exists(glb_path) else 0,
+        "bounds": bounds,
+        "lods": lods,
+        "materials": materials,
+        "snaps": [describe_snap(o, to_asset) for o in objs if is_snap(o)],
+        "colliders": [describe_collider(o, to_asset) for o in objs if is_collider(o)],
+    }
+
+
+def describe_collection(kit: str, col: bpy.types.Collection, out_dir: str,
+                        files: Dict[str, str]) -> List[Dict[str, object]]:
+    """One manifest entry per asset in col; files maps asset name -> GLB path."""
+    bpy.context.view_layer.update()
+    return [describe_asset(kit, name, roots, out_dir, files.get(name))
+            for name, roots in sorted(gltf_export.group_assets(col).items())]
+
+
+class _Strings:
+    def __init__(self):
+        self.blob = bytearray()
+        self.offsets: Dict[str, int] = {}
+
+    def __call__(self, text: Optional[str]) -> int:
+        text = text or ""
+        if text not in self.offsets:
+            raw = text.encode("utf-8")
+            self.offsets[text] = len(self.blob)
+            self.blob += struct.pack("<H", len(raw)) + raw
+        return self.offsets[text]
+
+
+def pack(assets: List[Dict[str, object]]) -> bytes:
+    """manifest.bin bytes for the records returned by describe_collection."""
+    strings = _Strings()
+    asset_rows, lod_rows, snap_rows, collider_rows, material_rows = [], [], [], [], []
+    for a in assets:
+        asset_rows.append(ASSET.pack(
+            strings(a["name"]), strings(a["kit"]), strings(a["file"]), a["fileBytes"],
+            *a["bounds"]["min"], *a["bounds"]["max"],
+            len(lod_rows), len(a["lods"]), len(snap_rows), len(a["snaps"]),
+            len(collider_rows), len(a["colliders"]), len(material_rows), len(a["materials"]),
+        ))
+        for lod in a["lods"]:
+            switch = lod["switchDistance"]
+            lod_rows.append(LOD.pack(strings(lod["node"]), lod["lod"], lod["triangles"], lod["vertices"],
+                                     lod["byteOffset"], lod["byteLength"],
+                                     math.nan if switch is None else switch))
+        for snap in a["snaps"]:
+            snap_rows.append(SNAP.pack(strings(snap["name"]), *snap["translation"], *snap["rotation"]))
+        for c in a["colliders"]:
+            collider_rows.append(COLLIDER.pack(strings(c["name"]), SHAPES.index(c["shape"]),
+                                               *c["center"], *c["size"], *c["rotation"]))
+        for mat in a["materials"]:
+            material_rows.append(MATERIAL.pack(strings(mat)))
+
+    header = HEADER.pack(MAGIC, MANIFEST_VERSION, len(asset_rows), len(lod_rows), len(snap_rows),
+                         len(collider_rows), len(material_rows), len(strings.blob))
+    return b"".join([header] + asset_rows + lod_rows + snap_rows + collider_rows + material_rows) + bytes(strings.blob)
+
+
+def write(out_dir: str, assets: List[Dict[str, object]]) -> Dict[str, str]:
+    """Write manifest.json and manifest.bin to out_dir; returns their paths."""
+    doc = {"version": MANIFEST_VERSION, "assets": assets}
+    text = json.dumps(doc, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    paths = {"json": os.path.join(out_dir, JSON_NAME), "binary": os.path.join(out_dir, BINARY_NAME)}
+    gltf_instancing.write_atomic(paths["json"], text)
+    gltf_instancing.write_atomic(paths["binary"], pack(assets))
+    return paths
@@ -0,0 +1,220 @@
+from typing import Dict, Iterable, List, Optional
+
+import bpy
+import numpy as np
+from mathutils import Matrix
+
+from kitlib import trace
+
+# ============================================================
+# Array-based mesh merge
+# Reads each part with foreach_get into NumPy arrays, concatenates
+# positions, edges, loops and faces with index offsets, and writes the
+# result back with one foreach_set per attribute. Replaces both the
+# per-element bmesh copy (_append_bmesh) and bpy.ops.object.join, so
+# merging needs no selection, active object or operator context.
+#
+# Carried across: vertex positions (world space), edges, face corners,
+# per-face material index (remapped onto the merged slot list),
+# per-face smooth flag and every UV layer, matched by name.
+# ============================================================
+
+MeshArrays = Dict[str, object]
+
+
+def world_matrix(obj: bpy.types.Object) -> Matrix:
+    """obj.matrix_world without waiting for a depsgraph update."""
+    if obj.parent is None:
+        return obj.matrix_basis.copy()
+    return world_matrix(obj.parent) @ obj.matrix_parent_inverse @ obj.matrix_basis
+
+
+def read_mesh_arrays(mesh: bpy.types.Mesh, matrix: Optional[Matrix] = None,
+                     materials: Optional[List] = None) -> MeshArrays:
+    n_verts, n_edges = len(mesh.vertices), len(mesh.edges)
+    n_loops, n_faces = len(mesh.loops), len(mesh.polygons)
+
+    co = np.empty(n_verts * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    co = co.reshape(-1, 3)
+    if matrix is not None:
+        m = np.array(matrix, dtype=np.float64)
+        co = (co.astype(np.float64) @ m[:3, :3].T + m[:3, 3]).astype(np.float32)
+
+    edges = np.empty(n_edges * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edges)
+
+    loop_vert = np.empty(n_loops, dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vert)
+
+    loop_start = np.empty(n_faces, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_start)
+    material_index = np.empty(n_faces, dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", material_index)
+    smooth = np.empty(n_faces, dtype=bool)
+    mesh.polygons.foreach_get("use_smooth", smooth)
+
+    uvs = {}
+    for layer in mesh.uv_layers:
+        uv = np.empty(n_loops * 2, dtype=np.float32)
+        layer.data.foreach_get("uv", uv)
+        uvs[layer.name] = uv.reshape(-1, 2)
+
+    return {
+        "co": co,
+        "edges": edges.reshape(-1, 2),
+        "loop_vert": loop_vert,
+        "loop_start": loop_start,
+        "material_index": material_index,
+        "smooth": smooth,
+        "uvs": uvs,
+        "materials": list(mesh.materials) if materials is None else materials,
+    }
+
+
+def concatenate(parts: Iterable[MeshArrays]) -> MeshArrays:
+    """Stack parts into one set of arrays; material slots are shared by identity."""
+    parts = list(parts)
+    materials: List = []
+    uv_names: List[str] = []
+    for part in parts:
+        for name in part["uvs"]:
+            if name not in uv_names:
+                uv_names.append(name)
+
+    co, edges, loop_vert, loop_start, material_index, smooth = [], [], [], [], [], []
+    uvs: Dict[str, List[np.ndarray]] = {name: [] for name in uv_names}
+    vert_offset = loop_offset = 0
+
+    for part in parts:
+        remap = []
+        for mat in part["materials"]:
+            if mat not in materials:
+                materials.append(mat)
+            remap.append(materials.index(mat))
+        part_mat = part["material_index"]
+        if remap:
+            part_mat = np.asarray(remap, dtype=np.int32)[np.clip(part_mat, 0, len(remap) - 1)]
+
+        co.append(part["co"])
+        edges.append(part["edges"] + vert_offset)
+        loop_vert.append(part["loop_vert"] + vert_offset)
+        loop_start.append(part["loop_start"] + loop_offset)
+        material_index.append(part_mat)
+        smooth.append(part["smooth"])
+
+        n_loops = len(part["loop_vert"])
+        for name in uv_names:
+            uv = part["uvs"].get(name)
+            uvs[name].append(uv if uv is not None else np.zeros((n_loops, 2), dtype=np.float32))
+
+        vert_offset += len(part["co"])
+        loop_offset += n_loops
+
+    def stack(chunks, shape, dtype):
+        return np.concatenate(chunks) if chunks else np.zeros(shape, dtype=dtype)
+
+    return {
+        "co": stack(co, (0, 3), np.float32),
+        "edges": stack(edges, (0, 2), np.int32),
+        "loop_vert": stack(loop_vert, (0,), np.int32),
+        "loop_start": stack(loop_start, (0,), np.int32),
+        "material_index": stack(material_index, (0,), np.int32),
+        "smooth": stack(smooth, (0,), bool),
+        "uvs": {name: stack(chunks, (0, 2), np.float32) for name, chunks in uvs.items()},
+        "materials": materials,
+    }
+
+
+def transform_arrays(arrays: MeshArrays, matrix: Matrix) -> MeshArrays:
+    """Copy of arrays with positions moved by matrix; topology arrays are shared, not copied."""
+    m = np.array(matrix, dtype=np.float64)
+    moved = dict(arrays)
+    moved["co"] = (arrays["co"].astype(np.float64) @ m[:3, :3].T + m[:3, 3]).astype(np.float32)
+    return moved
+
+
+def mesh_from_arrays(name: str, arrays: MeshArrays) -> bpy.types.Mesh:
+    mesh = bpy.data.meshes.new(name)
+    co = arrays["co"]
+    edges = arrays["edges"]
+    loop_vert = arrays["loop_vert"]
+    loop_start = arrays["loop_start"]
+
+    mesh.vertices.add(len(co))
+    mesh.vertices.foreach_set("co", np.ascontiguousarray(co, dtype=np.float32).ravel())
+    mesh.edges.add(len(edges))
+    mesh.edges.foreach_set("vertices", np.ascontiguousarray(edges, dtype=np.int32).ravel())
+    mesh.loops.add(len(loop_vert))
+    mesh.loops.foreach_set("vertex_index", np.ascontiguousarray(loop_vert, dtype=np.int32))
+    # Face sizes follow from consecutive loop starts.
+    mesh.polygons.add(len(loop_start))
+    mesh.polygons.foreach_set("loop_start", np.ascontiguousarray(loop_start, dtype=np.int32))
+    mesh.polygons.foreach_set("material_index", np.ascontiguousarray(arrays["material_index"], dtype=np.int32))
+    mesh.polygons.foreach_set("use_smooth", np.ascontiguousarray(arrays["smooth"], dtype=bool))
+
+    for uv_name, uv in arrays["uvs"].items():
+        layer = mesh.uv_layers.new(name=uv_name)
+        layer.data.foreach_set("uv", np.ascontiguousarray(uv, dtype=np.float32).ravel())
+
+    for mat in arrays["materials"]:
+        mesh.materials.append(mat)
+
+    # Fills in loop edge indices and any face edges the parts did not list.
+    mesh.update(calc_edges=True)
+    return mesh
+
+
+@trace.traced
+def merge_objects(
+    objs: Iterable[bpy.types.Object],
+    name: str,
+    col: Optional[bpy.types.Collection] = None,
+    evaluated: bool = False,
+    remove_sources: bool = True,
+) -> bpy.types.Object:
+    """Merge mesh objects into a new object at the world origin.
+
+    Geometry is read in world space. evaluated=True reads each part
+    through the depsgraph so its modifiers are applied; otherwise the
+    raw mesh data is used, as bpy.ops.object.join does. The result is
+    linked into col, or into the first part's collections.
+    """
+    objs = [o for o in objs if o is not None and o.type == "MESH"]
+    if col is None and not objs:
+        raise ValueError(f"merge_objects('{name}'): nothing to merge and no collection given")
+    target_cols = [col] if col is not None else list(objs[0].users_collection)
+
+    parts = []
+    if evaluated:
+        bpy.context.view_layer.update()
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        for obj in objs:
+            eval_obj = obj.evaluated_get(depsgraph)
+            eval_mesh = eval_obj.to_mesh(preserve_all_data_layers=True, depsgraph=depsgraph)
+            if eval_mesh is None:
+                continue
+            # to_mesh drops object-linked slots, so take materials from the object.
+            parts.append(read_mesh_arrays(eval_mesh, eval_obj.matrix_world,
+                                          [slot.material for slot in obj.material_slots]))
+            eval_obj.to_mesh_clear()
+    else:
+        for obj in objs:
+            parts.append(read_mesh_arrays(obj.data, world_matrix(obj),
+                                          [slot.material for slot in obj.material_slots]))
+
+    merged = bpy.data.objects.new(name, mesh_from_arrays(name, concatenate(parts)))
+    for target in target_cols:
+        target.objects.link(merged)
+
+    if remove_sources:
+        for obj in objs:
+            mesh = obj.data
+            bpy.data.objects.remove(obj, do_unlink=True)
+            if mesh is not None and mesh.users == 0:
+                bpy.data.meshes.remove(mesh)
+        # A source may have held the name; claim it now that it is gone.
+        merged.name = name
+        merged.data.name = name
+
+    return merged
@@ -0,0 +1,215 @@
+import math
+from typing import Dict, Iterable, Optional, Tuple
+
+import bpy
+import numpy as np
+
+from kitlib import trace
+
+# ============================================================
+# LOD normal baking
+# Lower LODs drop corrugation geometry and get it back as a tangent-
+# space normal map baked from LOD0 with Cycles on the CPU:
+#   - bake_normals unwraps the target into BAKE_UV, bakes LOD0 onto it
+#     (selected to active) into a per-mesh image and stores that image
+#     on the mesh, so cached and worker-built assets carry their bakes
+#   - pack_atlas copies every baked image of a kit into one atlas,
+#     writes ATLAS_UV (BAKE_UV moved into the mesh's tile) and swaps
+#     the mesh's materials for "<name>_Baked" copies that sample it
+#
+# pack_atlas always starts from the per-mesh images and BAKE_UV, so it
+# can run again after more assets are appended (build_kits.py repacks
+# after merging parallel workers).
+# ============================================================
+
+BAKE_UV = "BakeUV"
+ATLAS_UV = "AtlasUV"
+BAKE_IMAGE_PROP = "normal_bake_image"
+BAKED_FROM_PROP = "baked_from"
+BAKED_NODE = "BakedNormal"
+ATLAS_WIDTH = 2048
+MARGIN_PX = 4
+FLAT_NORMAL = (0.5, 0.5, 1.0, 1.0)
+
+
+def unwrap(obj: bpy.types.Object, margin: float):
+    """Smart UV project every face of obj into the BAKE_UV layer."""
+    mesh = obj.data
+    layer = mesh.uv_layers.get(BAKE_UV) or mesh.uv_layers.new(name=BAKE_UV)
+    mesh.uv_layers.active = layer
+
+    bpy.context.view_layer.objects.active = obj
+    obj.select_set(True)
+    bpy.ops.object.mode_set(mode="EDIT")
+    bpy.ops.mesh.select_all(action="SELECT")
+    bpy.ops.uv.smart_project(angle_limit=math.radians(66.0), island_margin=margin, scale_to_bounds=False)
+    bpy.ops.object.mode_set(mode="OBJECT")
+    obj.select_set(False)
+
+
+def new_normal_image(name: str, width: int, height: int) -> bpy.types.Image:
+    stale = bpy.data.images.get(name)
+    if stale is not None:
+        bpy.data.images.remove(stale)
+    image = bpy.data.images.new(name, width, height, alpha=False, is_data=True)
+    image.colorspace_settings.name = "Non-Color"
+    image.generated_color = FLAT_NORMAL
+    return image
+
+
+def _configure_bake(scene: bpy.types.Scene, cage_extrusion: float) -> Tuple[str, str, int]:
+    previous = (scene.render.engine, scene.cycles.device, scene.cycles.samples)
+    scene.render.engine = "CYCLES"
+    scene.cycles.device = "CPU"
+    # Normals come from ray hits, not light transport; one sample is enough.
+    scene.cycles.samples = 1
+    bake = scene.render.bake
+    bake.use_selected_to_active = True
+    bake.use_cage = False
+    bake.cage_extrusion = cage_extrusion
+    bake.max_ray_distance = cage_extrusion * 2.0
+    bake.normal_space = "TANGENT"
+    bake.target = "IMAGE_TEXTURES"
+    bake.margin = MARGIN_PX
+    bake.use_clear = True
+    return previous
+
+
+@trace.traced
+def bake_normals(source: bpy.types.Object, target: bpy.types.Object, image_name: str, size: int,
+                 cage_extrusion: float) -> bpy.types.Image:
+    """
+    Bake source's surface detail into a size x size tangent-space normal
+    map on target's BAKE_UV. Both objects must overlap in world space;
+    cage_extrusion should exceed the deepest groove the target drops.
+    """
+    if target.mode != "OBJECT":
+        bpy.ops.object.mode_set(mode="OBJECT")
+    for obj in bpy.context.selected_objects:
+        obj.select_set(False)
+
+    unwrap(target, MARGIN_PX / size)
+    image = new_normal_image(image_name, size, size)
+
+    # Cycles writes into the active image node of each of the target's materials.
+    temp_nodes = []
+    for mat in {slot.material for slot in target.material_slots if slot.material is not None}:
+        mat.use_nodes = True
+        node = mat.node_tree.nodes.new("ShaderNodeTexImage")
+        node.image = image
+        mat.node_tree.nodes.active = node
+        temp_nodes.append((mat, node))
+
+    scene = bpy.context.scene
+    previous = _configure_bake(scene, cage_extrusion)
+    source.select_set(True)
+    target.select_set(True)
+    bpy.context.view_layer.objects.active = target
+    try:
+        bpy.ops.object.bake(type="NORMAL", uv_layer=BAKE_UV)
+    finally:
+        scene.render.engine, scene.cycles.device, scene.cycles.samples = previous
+        for mat, node in temp_nodes:
+            mat.node_tree.nodes.remove(node)
+        source.select_set(False)
+        target.select_set(False)
+
+    image.pack()
+    target.data[BAKE_IMAGE_PROP] = image
+    return image
+
+
+def baked_material(base: bpy.types.Material, atlas: bpy.types.Image) -> bpy.types.Material:
+    """Copy of base whose BSDF normal comes from the atlas through ATLAS_UV."""
+    name = f"{base.name}_Baked"
+    mat = bpy.data.materials.get(name)
+    if mat is None:
+        mat = base.copy()
+        mat.name = name
+        mat[BAKED_FROM_PROP] = base.name
+        nodes = mat.node_tree.nodes
+        links = mat.node_tree.links
+        bsdf = next(n for n in nodes if n.type == "BSDF_PRINCIPLED")
+
+        uv = nodes.new(type="ShaderNodeUVMap")
+        uv.uv_map = ATLAS_UV
+        tex = nodes.new(type="ShaderNodeTexImage")
+        tex.name = BAKED_NODE
+        tex.interpolation = "Linear"
+        normal = nodes.new(type="ShaderNodeNormalMap")
+        normal.space = "TANGENT"
+        normal.uv_map = ATLAS_UV
+        links.new(uv.outputs["UV"], tex.inputs["Vector"])
+        links.new(tex.outputs["Color"], normal.inputs["Color"])
+        links.new(normal.outputs["Normal"], bsdf.inputs["Normal"])
+    mat.node_tree.nodes[BAKED_NODE].image = atlas
+    return mat
+
+
+def baked_atlas(mat: Optional[bpy.types.Material]) -> Optional[bpy.types.Image]:
+    """The atlas a "<name>_Baked" material samples its normal from, else None."""
+    if mat is None or mat.node_tree is None:
+        return None
+    node = mat.node_tree.nodes.get(BAKED_NODE)
+    return node.image if node is not None else None
+
+
+def _base_material(mat: bpy.types.Material) -> bpy.types.Material:
+    base = bpy.data.materials.get(mat.get(BAKED_FROM_PROP, ""))
+    return base if base is not None else mat
+
+
+def _shelf_pack(sizes: Dict[str, Tuple[int, int]], width: int) -> Tuple[Dict[str, Tuple[int, int]], int]:
+    """Pixel offsets per key, tallest first in rows of at most width; returns (offsets, height)."""
+    offsets: Dict[str, Tuple[int, int]] = {}
+    x = y = shelf_h = 0
+    for key in sorted(sizes, key=lambda k: (-sizes[k][1], -sizes[k][0], k)):
+        w, h = sizes[key]
+        if x + w > width:
+            x, y, shelf_h = 0, y + shelf_h, 0
+        offsets[key] = (x, y)
+        x += w
+        shelf_h = max(shelf_h, h)
+    return offsets, y + shelf_h
+
+
+def pack_atlas(meshes: Iterable[bpy.types.Mesh], atlas_name: str,
+               width: int = ATLAS_WIDTH) -> Optional[bpy.types.Image]:
+    """Pack the baked images of meshes into one atlas and point the meshes at it."""
+    baked = {}
+    for mesh in meshes:
+        image = mesh.get(BAKE_IMAGE_PROP)
+        if isinstance(image, bpy.types.Image) and mesh.uv_layers.get(BAKE_UV) is not None:
+            baked[mesh.name] = (mesh, image)
+    if not baked:
+        return None
+
+    sizes = {name: tuple(image.size) for name, (_mesh, image) in baked.items()}
+    width = max([width] + [w for w, _h in sizes.values()])
+    offsets, used_h = _shelf_pack(sizes, width)
+    height = 1 << max(0, used_h - 1).bit_length()
+
+    pixels = np.empty((height, width, 4), dtype=np.float32)
+    pixels[:] = FLAT_NORMAL
+    for name, (mesh, image) in baked.items():
+        (x, y), (w, h) = offsets[name], sizes[name]
+        tile = np.empty(w * h * 4, dtype=np.float32)
+        image.pixels.foreach_get(tile)
+        pixels[y:y + h, x:x + w] = tile.reshape(h, w, 4)
+
+    atlas = new_normal_image(atlas_name, width, height)
+    atlas.pixels.foreach_set(pixels.ravel())
+    atlas.pack()
+
+    for name, (mesh, image) in baked.items():
+        (x, y), (w, h) = offsets[name], sizes[name]
+        uv = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+        mesh.uv_layers[BAKE_UV].data.foreach_get("uv", uv)
+        uv = uv.reshape(-1, 2) * (w / width, h / height) + (x / width, y / height)
+        layer = mesh.uv_layers.get(ATLAS_UV) or mesh.uv_layers.new(name=ATLAS_UV)
+        layer.data.foreach_set("uv", uv.astype(np.float32).ravel())
+
+        for i, mat in enumerate(mesh.materials):
+            if mat is not None:
+                mesh.materials[i] = baked_material(_base_material(mat), atlas)
+    return atlas
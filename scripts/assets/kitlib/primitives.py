@@ -0,0 +1,377 @@
+import math
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import bpy
+from mathutils import Euler, Matrix, Vector
+
+# ============================================================
+# Direct-data primitives
+# Builds mesh datablocks from vertex/face lists with the transform
+# baked into the vertices, instead of bpy.ops.mesh.primitive_*_add
+# followed by transform_apply. No operator context, selection,
+# depsgraph update or undo push per part.
+#
+# Topology mirrors the Blender primitives (cube corners, cylinder and
+# cone rings starting at +Y, n-gon caps, torus rings, UV sphere poles)
+# so switching a kit over does not change its shading or bevels.
+# Objects are created at the world origin with identity transform.
+# ============================================================
+
+Vec3 = Tuple[float, float, float]
+Rotation = Optional[Union[Vec3, Matrix]]
+Geometry = Tuple[List[Vec3], List[Tuple[int, ...]]]
+# (lo_a, hi_a, lo_b, hi_b) on a box face, see recessed_box_geometry.
+Recess = Tuple[float, float, float, float]
+
+
+def rotation_matrix(rotation: Rotation) -> Optional[Matrix]:
+    if rotation is None:
+        return None
+    if isinstance(rotation, Matrix):
+        return rotation.to_3x3()
+    if not any(rotation):
+        return None
+    return Euler(rotation, 'XYZ').to_matrix()
+
+
+def transform_points(points: List[Vec3], location: Vec3 = (0.0, 0.0, 0.0), rotation: Rotation = None) -> List[Vec3]:
+    rot = rotation_matrix(rotation)
+    lx, ly, lz = location
+    if rot is None:
+        return [(x + lx, y + ly, z + lz) for x, y, z in points]
+    out = []
+    for p in points:
+        v = rot @ Vector(p)
+        out.append((v.x + lx, v.y + ly, v.z + lz))
+    return out
+
+
+def _ring(radius: float, segments: int, z: float) -> List[Vec3]:
+    # Same start and direction as bmesh create_circle/create_cone.
+    step = 2.0 * math.pi / segments
+    return [(radius * math.sin(i * step), radius * math.cos(i * step), z) for i in range(segments)]
+
+
+# ------------------------------------------------------------
+# Geometry builders (local vertices + faces)
+# ------------------------------------------------------------
+def box_geometry(dims: Vec3, location: Vec3 = (0.0, 0.0, 0.0), rotation: Rotation = None) -> Geometry:
+    hx, hy, hz = dims[0] * 0.5, dims[1] * 0.5, dims[2] * 0.5
+    verts = [
+        (-hx, -hy, -hz), (-hx, -hy, hz), (-hx, hy, -hz), (-hx, hy, hz),
+        (hx, -hy, -hz), (hx, -hy, hz), (hx, hy, -hz), (hx, hy, hz),
+    ]
+    faces = [
+        (0, 1, 3, 2), (2, 3, 7, 6), (6, 7, 5, 4),
+        (4, 5, 1, 0), (2, 6, 4, 0), (7, 3, 1, 5),
+    ]
+    return transform_points(verts, location, rotation), faces
+
+
+def cone_geometry(
+    radius1: float,
+    radius2: float,
+    depth: float,
+    vertices: int = 32,
+    location: Vec3 = (0.0, 0.0, 0.0),
+    rotation: Rotation = None,
+    cap_ends: bool = True,
+) -> Geometry:
+    """Frustum along local Z centred on location; radius 0 ends collapse to an apex."""
+    half = depth * 0.5
+    verts: List[Vec3] = []
+    faces: List[Tuple[int, ...]] = []
+
+    def add_end(radius: float, z: float) -> List[int]:
+        if radius <= 0.0:
+            verts.append((0.0, 0.0, z))
+            return [len(verts) - 1] * vertices
+        start = len(verts)
+        verts.extend(_ring(radius, vertices, z))
+        return list(range(start, start + vertices))
+
+    bottom = add_end(radius1, -half)
+    top = add_end(radius2, half)
+
+    for i in range(vertices):
+        j = (i + 1) % vertices
+        quad = (bottom[i], top[i], top[j], bottom[j])
+        # Drop the repeated apex index so pointed ends become triangles.
+        face = tuple(dict.fromkeys(quad))
+        if len(face) >= 3:
+            faces.append(face)
+
+    if cap_ends and radius1 > 0.0:
+        faces.append(tuple(bottom))
+    if cap_ends and radius2 > 0.0:
+        faces.append(tuple(reversed(top)))
+
+    return transform_points(verts, location, rotation), faces
+
+
+def cylinder_geometry(
+    radius: float,
+    depth: float,
+    vertices: int = 32,
+    location: Vec3 = (0.0, 0.0, 0.0),
+    rotation: Rotation = None,
+    cap_ends: bool = True,
+) -> Geometry:
+    return cone_geometry(radius, radius, depth, vertices, location, rotation, cap_ends)
+
+
+def torus_geometry(
+    major_radius: float,
+    minor_radius: float,
+    major_segments: int = 48,
+    minor_segments: int = 12,
+    location: Vec3 = (0.0, 0.0, 0.0),
+    rotation: Rotation = None,
+) -> Geometry:
+    verts: List[Vec3] = []
+    for i in range(major_segments):
+        theta = 2.0 * math.pi * i / major_segments
+        ct, st = math.cos(theta), math.sin(theta)
+        for j in range(minor_segments):
+            phi = 2.0 * math.pi * j / minor_segments
+            ring = major_radius + minor_radius * math.cos(phi)
+            verts.append((ring * ct, ring * st, minor_radius * math.sin(phi)))
+
+    faces = []
+    for i in range(major_segments):
+        i2 = (i + 1) % major_segments
+        for j in range(minor_segments):
+            j2 = (j + 1) % minor_segments
+            faces.append((
+                i * minor_segments + j,
+                i2 * minor_segments + j,
+                i2 * minor_segments + j2,
+                i * minor_segments + j2,
+            ))
+    return transform_points(verts, location, rotation), faces
+
+
+def uv_sphere_geometry(
+    radius: float,
+    segments: int = 32,
+    ring_count: int = 16,
+    location: Vec3 = (0.0, 0.0, 0.0),
+    rotation: Rotation = None,
+) -> Geometry:
+    verts: List[Vec3] = [(0.0, 0.0, radius)]
+    for r in range(1, ring_count):
+        polar = math.pi * r / ring_count
+        z = radius * math.cos(polar)
+        verts.extend(_ring(radius * math.sin(polar), segments, z))
+    verts.append((0.0, 0.0, -radius))
+    south = len(verts) - 1
+
+    def ring_index(r: int, i: int) -> int:
+        return 1 + (r - 1) * segments + (i % segments)
+
+    faces: List[Tuple[int, ...]] = []
+    for i in range(segments):
+        faces.append((0, ring_index(1, i + 1), ring_index(1, i)))
+    for r in range(1, ring_count - 1):
+        for i in range(segments):
+            faces.append((
+                ring_index(r, i), ring_index(r, i + 1),
+                ring_index(r + 1, i + 1), ring_index(r + 1, i),
+            ))
+    for i in range(segments):
+        faces.append((south, ring_index(ring_count - 1, i), ring_index(ring_count - 1, i + 1)))
+    return transform_points(verts, location, rotation), faces
+
+
+def prism_geometry(
+    profile_xz: Sequence[Tuple[float, float]],
+    y0: float,
+    y1: float,
+    location: Vec3 = (0.0, 0.0, 0.0),
+    rotation: Rotation = None,
+) -> Geometry:
+    """Extrude a simple XZ polygon along +Y from y0 to y1."""
+    n = len(profile_xz)
+    area = 0.0
+    for i in range(n):
+        x0, z0 = profile_xz[i]
+        x1, z1 = profile_xz[(i + 1) % n]
+        area += x0 * z1 - x1 * z0
+    pts = list(profile_xz) if area > 0.0 else list(reversed(profile_xz))
+
+    verts = [(x, y0, z) for x, z in pts] + [(x, y1, z) for x, z in pts]
+    # Counter-clockwise in XZ faces -Y, so the start cap keeps that order.
+    faces: List[Tuple[int, ...]] = [tuple(range(n)), tuple(range(2 * n - 1, n - 1, -1))]
+    for i in range(n):
+        j = (i + 1) % n
+        faces.append((i, n + i, n + j, j))
+    return transform_points(verts, location, rotation), faces
+
+
+def _newell_normal(points: List[Vec3]) -> Vec3:
+    nx = ny = nz = 0.0
+    for i, (x0, y0, z0) in enumerate(points):
+        x1, y1, z1 = points[(i + 1) % len(points)]
+        nx += (y0 - y1) * (z0 + z1)
+        ny += (z0 - z1) * (x0 + x1)
+        nz += (x0 - x1) * (y0 + y1)
+    return nx, ny, nz
+
+
+def recessed_box_geometry(
+    dims: Vec3,
+    recesses: Dict[str, Sequence[Recess]],
+    depth: float,
+    location: Vec3 = (0.0, 0.0, 0.0),
+    rotation: Rotation = None,
+) -> Geometry:
+    """Closed box with rectangular pockets sunk depth into its faces.
+
+    recesses maps a face ("+X", "-X", "+Y", "-Y", "+Z", "-Z") to
+    non-overlapping (lo_a, hi_a, lo_b, hi_b) rectangles on it, where a/b
+    are the face's two tangent axes in X/Y/Z order, relative to the box
+    centre. Pockets must stay clear of the face border. Each pocketed face
+    is a grid over the pocket bounds (flat and sunk cells plus the walls
+    between them) framed by four n-gons, so the box edges keep their 8
+    corners and faces weld into one closed shell. Cost grows with the
+    number of pockets; this replaces carving grooves with boolean cutters.
+    """
+    half = (dims[0] * 0.5, dims[1] * 0.5, dims[2] * 0.5)
+    verts: List[Vec3] = []
+    index: Dict[Vec3, int] = {}
+    faces: List[Tuple[int, ...]] = []
+
+    def vert(p: Vec3) -> int:
+        key = (round(p[0], 9), round(p[1], 9), round(p[2], 9))
+        i = index.get(key)
+        if i is None:
+            i = index[key] = len(verts)
+            verts.append(p)
+        return i
+
+    def add_face(points: List[Vec3], facing: Vec3):
+        nx, ny, nz = _newell_normal(points)
+        if nx * facing[0] + ny * facing[1] + nz * facing[2] < 0.0:
+            points = points[::-1]
+        faces.append(tuple(vert(p) for p in points))
+
+    for face in ("+X", "-X", "+Y", "-Y", "+Z", "-Z"):
+        axis = "XYZ".index(face[1])
+        sign = 1.0 if face[0] == "+" else -1.0
+        ta, tb = [k for k in range(3) if k != axis]
+        ha, hb = half[ta], half[tb]
+        normal = tuple(sign if k == axis else 0.0 for k in range(3))
+
+        def point(a: float, b: float, d: float = 0.0) -> Vec3:
+            p = [0.0, 0.0, 0.0]
+            p[axis] = sign * (half[axis] - d)
+            p[ta] = a
+            p[tb] = b
+            return tuple(p)
+
+        def tangent(da: float, db: float) -> Vec3:
+            t = [0.0, 0.0, 0.0]
+            t[ta] = da
+            t[tb] = db
+            return tuple(t)
+
+        outer = [point(-ha, -hb), point(ha, -hb), point(ha, hb), point(-ha, hb)]
+        rects = list(recesses.get(face, ())) if depth > 0.0 else []
+        if not rects:
+            add_face(outer, normal)
+            continue
+
+        us = sorted({u for r in rects for u in r[:2]})
+        vs = sorted({v for r in rects for v in r[2:]})
+        if us[0] <= -ha or us[-1] >= ha or vs[0] <= -hb or vs[-1] >= hb:
+            raise ValueError(f"recessed_box_geometry: pockets on {face} reach the face border")
+
+        def sunk(i: int, j: int) -> bool:
+            if i < 0 or j < 0 or i >= len(us) - 1 or j >= len(vs) - 1:
+                return False
+            cu = (us[i] + us[i + 1]) * 0.5
+            cv = (vs[j] + vs[j + 1]) * 0.5
+            return any(r[0] < cu < r[1] and r[2] < cv < r[3] for r in rects)
+
+        for i in range(len(us) - 1):
+            for j in range(len(vs) - 1):
+                d = depth if sunk(i, j) else 0.0
+                add_face([point(us[i], vs[j], d), point(us[i + 1], vs[j], d),
+                          point(us[i + 1], vs[j + 1], d), point(us[i], vs[j + 1], d)], normal)
+
+        # Walls face from the flat side into the pocket.
+        for i in range(len(us)):
+            for j in range(len(vs) - 1):
+                before, after = sunk(i - 1, j), sunk(i, j)
+                if before != after:
+                    add_face([point(us[i], vs[j]), point(us[i], vs[j + 1]),
+                              point(us[i], vs[j + 1], depth), point(us[i], vs[j], depth)],
+                             tangent(-1.0 if before else 1.0, 0.0))
+        for j in range(len(vs)):
+            for i in range(len(us) - 1):
+                before, after = sunk(i, j - 1), sunk(i, j)
+                if before != after:
+                    add_face([point(us[i], vs[j]), point(us[i + 1], vs[j]),
+                              point(us[i + 1], vs[j], depth), point(us[i], vs[j], depth)],
+                             tangent(0.0, -1.0 if before else 1.0))
+
+        # Frame between the face outline and the pocket grid.
+        south = [point(u, vs[0]) for u in us]
+        north = [point(u, vs[-1]) for u in us]
+        west = [point(us[0], v) for v in vs]
+        east = [point(us[-1], v) for v in vs]
+        add_face([outer[0], outer[1]] + south[::-1], normal)
+        add_face([outer[1], outer[2]] + east[::-1], normal)
+        add_face([outer[2], outer[3]] + north, normal)
+        add_face([outer[3], outer[0]] + west, normal)
+
+    return transform_points(verts, location, rotation), faces
+
+
+# ------------------------------------------------------------
+# Datablocks
+# ------------------------------------------------------------
+def mesh_from_geometry(name: str, geometry: Geometry) -> bpy.types.Mesh:
+    verts, faces = geometry
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(verts, [], faces)
+    mesh.update()
+    return mesh
+
+
+def add_primitive(name: str, geometry: Geometry, col: bpy.types.Collection) -> bpy.types.Object:
+    obj = bpy.data.objects.new(name, mesh_from_geometry(name, geometry))
+    col.objects.link(obj)
+    return obj
+
+
+def add_box(name: str, dims: Vec3, location: Vec3, col: bpy.types.Collection,
+            rotation: Rotation = None) -> bpy.types.Object:
+    return add_primitive(name, box_geometry(dims, location, rotation), col)
+
+
+def add_cylinder(name: str, radius: float, depth: float, location: Vec3, col: bpy.types.Collection,
+                 rotation: Rotation = None, vertices: int = 32) -> bpy.types.Object:
+    return add_primitive(name, cylinder_geometry(radius, depth, vertices, location, rotation), col)
+
+
+def add_cone(name: str, radius1: float, radius2: float, depth: float, location: Vec3,
+             col: bpy.types.Collection, rotation: Rotation = None, vertices: int = 32) -> bpy.types.Object:
+    return add_primitive(name, cone_geometry(radius1, radius2, depth, vertices, location, rotation), col)
+
+
+def add_torus(name: str, major_radius: float, minor_radius: float, location: Vec3, col: bpy.types.Collection,
+              rotation: Rotation = None, major_segments: int = 48, minor_segments: int = 12) -> bpy.types.Object:
+    geometry = torus_geometry(major_radius, minor_radius, major_segments, minor_segments, location, rotation)
+    return add_primitive(name, geometry, col)
+
+
+def add_uv_sphere(name: str, radius: float, location: Vec3, col: bpy.types.Collection,
+                  segments: int = 32, ring_count: int = 16) -> bpy.types.Object:
+    return add_primitive(name, uv_sphere_geometry(radius, segments, ring_count, location), col)
+
+
+def add_prism(name: str, profile_xz: Sequence[Tuple[float, float]], y0: float, y1: float,
+              col: bpy.types.Collection, location: Vec3 = (0.0, 0.0, 0.0),
+              rotation: Rotation = None) -> bpy.types.Object:
+    return add_primitive(name, prism_geometry(profile_xz, y0, y1, location, rotation), col)
@@ -0,0 +1,260 @@
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import bpy
+import numpy as np
+
+# ============================================================
+# Right-triangulated irregular network (RTIN)
+# Adaptive triangulation of a (2^k + 1)^2 heightfield: the grid is the
+# leaf level of a binary tree of right isosceles triangles, and a
+# triangle is split only where its plane misses one of the samples it
+# covers by more than max_error. Errors are accumulated bottom-up so a
+# split always forces the splits it depends on, which keeps the mesh
+# free of T-junctions inside the tile and every sample within max_error.
+#
+# Tiles stay crack-free against each other through edge seeds: the
+# error of every boundary vertex can be raised to the value computed by
+# the neighbouring tile, so both sides make the same split decisions
+# along a shared edge. solve_seeds iterates this to a fixed point over a
+# block of tiles.
+#
+# Arrays are indexed [row, column] = [y, x], like kitlib.heightfield.
+# ============================================================
+
+EDGES = ("south", "north", "west", "east")
+Triangles = List[Tuple[np.ndarray, np.ndarray, np.ndarray]]
+Tile = Tuple[int, int]
+
+
+def grid_cells(heights: np.ndarray) -> int:
+    rows, cols = heights.shape
+    cells = rows - 1
+    if rows != cols or cells < 2 or cells & (cells - 1):
+        raise ValueError(f"RTIN needs a (2^k + 1)^2 grid, got {rows}x{cols}")
+    return cells
+
+
+@lru_cache(maxsize=8)
+def triangle_levels(cells: int) -> Triangles:
+    """(a, b, c) corner arrays per level, coarsest first.
+
+    a/b end the hypotenuse and c is the right angle. Levels stop at
+    triangles whose hypotenuse midpoint is still a grid sample.
+    """
+    a = np.array([[0, 0], [cells, cells]], dtype=np.int64)
+    b = np.array([[cells, cells], [0, 0]], dtype=np.int64)
+    c = np.array([[cells, 0], [0, cells]], dtype=np.int64)
+    levels: Triangles = []
+    while True:
+        levels.append((a, b, c))
+        if np.abs(a - b).sum(axis=1).max() <= 2:
+            break
+        m = (a + b) // 2
+        # Children: (c, a, m) and (b, c, m), each with its right angle at m.
+        a, b, c = np.concatenate([c, b]), np.concatenate([a, c]), np.concatenate([m, m])
+    return levels
+
+
+def _flat(p: np.ndarray, size: int) -> np.ndarray:
+    return p[:, 1] * size + p[:, 0]
+
+
+def _edge_index(cells: int, edge: str) -> np.ndarray:
+    size = cells + 1
+    i = np.arange(size)
+    if edge == "south":
+        return i
+    if edge == "north":
+        return cells * size + i
+    if edge == "west":
+        return i * size
+    return i * size + cells
+
+
+def _shape_offsets(ax: int, ay: int, bx: int, by: int):
+    """Grid offsets inside a triangle with legs (ax, ay) / (bx, by) from its right angle, plus barycentrics."""
+    ox, oy = np.meshgrid(np.arange(min(0, ax, bx), max(0, ax, bx) + 1),
+                         np.arange(min(0, ay, by), max(0, ay, by) + 1))
+    ox, oy = ox.ravel(), oy.ravel()
+    det = ax * by - ay * bx
+    u = (ox * by - oy * bx) / det
+    v = (ax * oy - ay * ox) / det
+    inside = (u >= -1e-9) & (v >= -1e-9) & (u + v <= 1.0 + 1e-9)
+    return ox[inside], oy[inside], u[inside], v[inside]
+
+
+def plane_deviation(h: np.ndarray, size: int, a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """Per triangle, the largest |height - triangle plane| over the grid samples it covers."""
+    legs = np.concatenate([a - c, b - c], axis=1)
+    shapes, inverse = np.unique(legs, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    ia, ib, ic = _flat(a, size), _flat(b, size), _flat(c, size)
+
+    out = np.zeros(len(a))
+    # Triangles of one shape cover the same offsets from their right angle.
+    for s, (ax, ay, bx, by) in enumerate(shapes):
+        sel = np.nonzero(inverse == s)[0]
+        ox, oy, u, v = _shape_offsets(ax, ay, bx, by)
+        hc = h[ic[sel]][:, None]
+        surface = hc + u * (h[ia[sel]][:, None] - hc) + v * (h[ib[sel]][:, None] - hc)
+        samples = ic[sel][:, None] + oy * size + ox
+        out[sel] = np.abs(surface - h[samples]).max(axis=1)
+    return out
+
+
+def compute_errors(heights: np.ndarray, seeds: Optional[Dict[str, np.ndarray]] = None) -> np.ndarray:
+    """
+    Split error per sample: the worst deviation left by not inserting it,
+    raised to cover every split that depends on it. Boundary samples start
+    from seeds[edge] (per-sample arrays along that edge).
+    """
+    cells = grid_cells(heights)
+    size = cells + 1
+    h = heights.ravel()
+    errors = np.zeros(size * size)
+    for edge, seed in (seeds or {}).items():
+        idx = _edge_index(cells, edge)
+        errors[idx] = np.maximum(errors[idx], seed)
+
+    levels = triangle_levels(cells)
+    for level in range(len(levels) - 1, -1, -1):
+        a, b, c = levels[level]
+        err = plane_deviation(h, size, a, b, c)
+        if level < len(levels) - 1:
+            left = errors[_flat((a + c) // 2, size)]
+            right = errors[_flat((b + c) // 2, size)]
+            err = np.maximum(err, np.maximum(left, right))
+        np.maximum.at(errors, _flat((a + b) // 2, size), err)
+    return errors.reshape(size, size)
+
+
+def edge_errors(errors: np.ndarray) -> Dict[str, np.ndarray]:
+    cells = errors.shape[0] - 1
+    flat = errors.ravel()
+    return {edge: flat[_edge_index(cells, edge)].copy() for edge in EDGES}
+
+
+# edge -> (tile offset of the neighbour across it, that neighbour's name for it)
+NEIGHBOURS = {
+    "south": ((0, -1), "north"),
+    "north": ((0, 1), "south"),
+    "west": ((-1, 0), "east"),
+    "east": ((1, 0), "west"),
+}
+
+
+def solve_seeds(tiles: Iterable[Tile], heights_for: Callable[[Tile], Dict[str, np.ndarray]],
+                wrap: bool = False) -> Dict[Tile, Dict[str, Dict[str, np.ndarray]]]:
+    """
+    Edge seeds that make every shared edge split identically on both sides.
+
+    tiles are (tx, ty) indices and heights_for(tile) returns that tile's
+    height arrays by key (e.g. per LOD); it is called once per tile per
+    pass, so only edge errors are held between passes. wrap=True treats
+    the block as periodic (a single self-tiling tile is its own
+    neighbour). Returns seeds[tile][key] for compute_errors/triangulate.
+    """
+    tiles = list(tiles)
+    xs = sorted({t[0] for t in tiles})
+    ys = sorted({t[1] for t in tiles})
+
+    def neighbour(tile: Tile, edge: str) -> Tile:
+        (dx, dy), _ = NEIGHBOURS[edge]
+        tx, ty = tile[0] + dx, tile[1] + dy
+        if wrap:
+            tx = xs[0] + (tx - xs[0]) % len(xs)
+            ty = ys[0] + (ty - ys[0]) % len(ys)
+        return tx, ty
+
+    edges: Dict[Tile, Dict[str, Dict[str, np.ndarray]]] = {}
+
+    def seeds_for(tile: Tile, key: str) -> Dict[str, np.ndarray]:
+        seeds = {}
+        for edge, (_, other_edge) in NEIGHBOURS.items():
+            other = edges.get(neighbour(tile, edge), {}).get(key)
+            if other is not None:
+                seeds[edge] = other[other_edge]
+        return seeds
+
+    # Seeds only ever raise errors, so this settles after a few passes.
+    changed = True
+    while changed:
+        changed = False
+        for tile in tiles:
+            result = {}
+            for key, heights in heights_for(tile).items():
+                result[key] = edge_errors(compute_errors(heights, seeds_for(tile, key)))
+            old = edges.get(tile)
+            if old is None or any(not np.array_equal(old[k][e], result[k][e]) for k in result for e in EDGES):
+                changed = True
+            edges[tile] = result
+
+    return {tile: {key: seeds_for(tile, key) for key in edges[tile]} for tile in tiles}
+
+
+def extract(errors: np.ndarray, max_error: float) -> np.ndarray:
+    """Triangles (T, 3) as flat grid indices (right angle last), counter-clockwise seen from +Z."""
+    cells = errors.shape[0] - 1
+    size = cells + 1
+    flat = errors.ravel()
+    a, b, c = triangle_levels(cells)[0]
+    emitted = []
+
+    while len(a):
+        m = (a + b) // 2
+        # Triangles with unit legs cannot split further.
+        can_split = np.abs(a - c).sum(axis=1) > 1
+        split = can_split & (flat[_flat(m, size)] > max_error)
+        keep = ~split
+        emitted.append(np.stack([_flat(a[keep], size), _flat(b[keep], size), _flat(c[keep], size)], axis=1))
+        a, b, c, m = a[split], b[split], c[split], m[split]
+        a, b, c = np.concatenate([c, b]), np.concatenate([a, c]), np.concatenate([m, m])
+
+    tris = np.concatenate(emitted)
+    x, y = tris % size, tris // size
+    cross = (x[:, 1] - x[:, 0]) * (y[:, 2] - y[:, 0]) - (y[:, 1] - y[:, 0]) * (x[:, 2] - x[:, 0])
+    flip = cross < 0
+    tris[flip] = tris[flip][:, [1, 0, 2]]
+    return tris
+
+
+def achieved_error(heights: np.ndarray, tris: np.ndarray) -> float:
+    """Largest vertical distance between any grid sample and the triangulated surface."""
+    if not len(tris):
+        return 0.0
+    size = heights.shape[0]
+    corners = [np.stack([tris[:, k] % size, tris[:, k] // size], axis=1) for k in range(3)]
+    # extract() keeps the right angle last, whatever the winding.
+    return float(plane_deviation(heights.ravel(), size, *corners).max())
+
+
+def triangulate(heights: np.ndarray, max_error: float,
+                seeds: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, object]:
+    errors = compute_errors(heights, seeds)
+    tris = extract(errors, max_error)
+    return {
+        "triangles": tris,
+        "max_error": max_error,
+        "achieved_error": achieved_error(heights, tris),
+        "edges": edge_errors(errors),
+    }
+
+
+def mesh_from_triangulation(name: str, heights: np.ndarray, size: float, tris: np.ndarray) -> bpy.types.Mesh:
+    """Mesh spanning 0..size in X and Y using only the samples the triangles reference."""
+    samples = heights.shape[0]
+    used, local = np.unique(tris, return_inverse=True)
+    local = local.reshape(-1, 3).astype(np.int32)
+    step = size / (samples - 1)
+    co = np.stack([(used % samples) * step, (used // samples) * step, heights.ravel()[used]], axis=1)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(used))
+    mesh.vertices.foreach_set("co", co.astype(np.float32).ravel())
+    mesh.loops.add(local.size)
+    mesh.loops.foreach_set("vertex_index", local.ravel())
+    mesh.polygons.add(len(local))
+    mesh.polygons.foreach_set("loop_start", np.arange(0, local.size, 3, dtype=np.int32))
+    mesh.update(calc_edges=True)
+    return mesh
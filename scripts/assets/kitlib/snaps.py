@@ -0,0 +1,24 @@
+import functools
+import re
+from typing import Pattern
+
+# ============================================================
+# Snap point ownership
+# Snap empties are named SNAP_<KIND>_<asset name>: KIND is upper case
+# (START, END, TOP, 00, ...) and asset names start with their kit's
+# lower-case asset prefix (SNAP_START_pier_straight_30m,
+# SNAP_TOP_container20_single). In a batch run every kit purges its own
+# snaps before building and must leave the other kits' alone, so a snap
+# belongs to a kit when the prefix follows the kind directly; a prefix
+# appearing later in the name does not count.
+# ============================================================
+
+
+@functools.lru_cache(maxsize=None)
+def _snap_pattern(asset_prefix: str) -> Pattern:
+    return re.compile(rf"^SNAP_[A-Z0-9_]+?_{re.escape(asset_prefix)}")
+
+
+def owns_snap(name: str, asset_prefix: str) -> bool:
+    """True when name is a snap empty of an asset whose name starts with asset_prefix."""
+    return _snap_pattern(asset_prefix).match(name) is not None
@@ -0,0 +1,133 @@
+import contextlib
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# ============================================================
+# Build tracing
+# Start Blender with ASSET_KIT_TRACE=<path.json> and every helper
+# decorated with @traced records one span per call; save() writes them
+# as Chrome trace-event JSON (open in chrome://tracing or
+# ui.perfetto.dev), nested by time like the calls were.
+#
+# Unset, traced() hands back the function itself and span() a shared
+# no-op context, so instrumented kits run exactly as before. The switch
+# is read once at import, so it has to be in the environment before the
+# kits load; build_kits.py passes its own path on to its workers and
+# merges their traces back in.
+#
+# Span args are taken from the call, before it runs (a join may free its
+# inputs): objects, collections and dicts with a "name" by name, other
+# sequences by length (part counts), str / number / bool as they are
+# (asset names, LOD keys).
+# ============================================================
+
+ENV_VAR = "ASSET_KIT_TRACE"
+PATH: Optional[str] = os.environ.get(ENV_VAR) or None
+
+_EVENTS: Optional[List[Dict[str, object]]] = [] if PATH else None
+_NO_SPAN = contextlib.nullcontext()
+# perf_counter -> wall clock, so traces from parallel workers line up.
+_CLOCK_OFFSET = time.time() - time.perf_counter()
+
+
+def enabled() -> bool:
+    return _EVENTS is not None
+
+
+def _describe(value) -> object:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, dict):
+        return value.get("name")
+    name = getattr(value, "name", None)
+    if isinstance(name, str):
+        return name
+    if isinstance(value, (list, tuple, set)):
+        if 0 < len(value) <= 4 and all(isinstance(v, (int, float)) for v in value):
+            return list(value)
+        return len(value)
+    if callable(value):
+        return getattr(value, "__qualname__", None)
+    return None
+
+
+def _record(name: str, category: str, start: float, args: Dict[str, object]):
+    end = time.perf_counter()
+    _EVENTS.append({
+        "name": name,
+        "cat": category,
+        "ph": "X",
+        "ts": round((start + _CLOCK_OFFSET) * 1e6, 1),
+        "dur": round((end - start) * 1e6, 1),
+        "pid": os.getpid(),
+        "tid": threading.get_ident(),
+        "args": args,
+    })
+
+
+def traced(fn: Callable) -> Callable:
+    """Record a span per call of fn while tracing is on; fn itself otherwise."""
+    if _EVENTS is None:
+        return fn
+    signature = inspect.signature(fn)
+    category = fn.__module__.rpartition(".")[2]
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            bound = signature.bind(*args, **kwargs).arguments
+        except TypeError:
+            bound = {}
+        described = {k: _describe(v) for k, v in bound.items()}
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _record(fn.__name__, category, start, {k: v for k, v in described.items() if v is not None})
+    return wrapper
+
+
+@contextlib.contextmanager
+def _span(name: str, args: Dict[str, object]):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, "span", start, args)
+
+
+def span(name: str, **args):
+    """Context manager recording one span around a block."""
+    if _EVENTS is None:
+        return _NO_SPAN
+    return _span(name, {k: _describe(v) for k, v in args.items()})
+
+
+def label(process_name: str):
+    """Name this process in the trace viewer (e.g. the worker's job)."""
+    if _EVENTS is not None:
+        _EVENTS.append({"name": "process_name", "ph": "M", "pid": os.getpid(),
+                        "args": {"name": process_name}})
+
+
+def merge(path: str):
+    """Append the events of a trace written by another process (a worker)."""
+    if _EVENTS is None or not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as fh:
+        _EVENTS.extend(json.load(fh).get("traceEvents", []))
+
+
+def save(path: Optional[str] = None) -> Optional[str]:
+    """Write the events recorded so far to path (default PATH); returns it."""
+    path = path or PATH
+    if _EVENTS is None or not path:
+        return None
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump({"traceEvents": _EVENTS, "displayTimeUnit": "ms"}, fh)
+    return path
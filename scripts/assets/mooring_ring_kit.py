@@ -1,8 +1,17 @@
 import bpy
-import bmesh
+import os
+import sys
 from math import radians
 from mathutils import Matrix
 
+KIT_DIR = os.path.dirname(os.path.abspath(__file__))
+if KIT_DIR not in sys.path:
+    sys.path.append(KIT_DIR)
+
+from kitlib import mesh_merge, primitives, trace  # noqa: E402
+
+COLLECTION_NAME = "MOORING_RING"
+
 # ============================================================
 # Cleanup (idempotent)
 # ============================================================
@@ -87,74 +96,15 @@ def assign_mat(obj, mat):
 # (no bpy.ops.join / no selection fragility)
 # ============================================================
 
-def _append_bmesh(dst: bmesh.types.BMesh, src: bmesh.types.BMesh):
-    src.verts.ensure_lookup_table()
-    src.edges.ensure_lookup_table()
-    src.faces.ensure_lookup_table()
-
-    vmap = {}
-    for v in src.verts:
-        nv = dst.verts.new(v.co)
-        vmap[v] = nv
-
-    for e in src.edges:
-        v1 = vmap[e.verts[0]]
-        v2 = vmap[e.verts[1]]
-        try:
-            dst.edges.new((v1, v2))
-        except ValueError:
-            pass
-
-    for f in src.faces:
-        verts = [vmap[v] for v in f.verts]
-        try:
-            nf = dst.faces.new(verts)
-            nf.smooth = f.smooth
-        except ValueError:
-            pass
-
-
+@trace.traced
 def merge_objects_evaluated(name: str, objs):
-    depsgraph = bpy.context.evaluated_depsgraph_get()
-    bpy.context.view_layer.update()
-
-    bm_merged = bmesh.new()
-
-    for obj in objs:
-        if not obj or obj.type != "MESH":
-            continue
-
-        eval_obj = obj.evaluated_get(depsgraph)
-        eval_mesh = eval_obj.to_mesh(preserve_all_data_layers=True, depsgraph=depsgraph)
-        if eval_mesh is None:
-            continue
-
-        bm_part = bmesh.new()
-        bm_part.from_mesh(eval_mesh)
-        bm_part.transform(eval_obj.matrix_world)
-
-        _append_bmesh(bm_merged, bm_part)
-
-        bm_part.free()
-        eval_obj.to_mesh_clear()
-
-    merged_mesh = bpy.data.meshes.new(name + "_Mesh")
-    bm_merged.to_mesh(merged_mesh)
-    bm_merged.free()
-
-    merged_obj = bpy.data.objects.new(name, merged_mesh)
-    bpy.context.scene.collection.objects.link(merged_obj)
-
-    # delete sources
-    for obj in objs:
-        if obj and obj.name in bpy.data.objects:
-            bpy.data.objects.remove(obj, do_unlink=True)
-
+    merged_obj = mesh_merge.merge_objects(objs, name, bpy.context.scene.collection, evaluated=True)
+    merged_obj.data.name = name + "_Mesh"
     return merged_obj
 
 
 # ============================================================
-# Primitive builders (stable bpy.ops)
+# Primitive builders (direct mesh data, no bpy.ops)
 # ============================================================
 
 def deselect_all():
@@ -162,26 +112,13 @@ def deselect_all():
         o.select_set(False)
 
 def add_torus(name, major_radius, minor_radius, major_segments=32, minor_segments=16):
-    deselect_all()
-    bpy.ops.mesh.primitive_torus_add(
-        major_radius=major_radius,
-        minor_radius=minor_radius,
-        major_segments=major_segments,
-        minor_segments=minor_segments,
-        align='WORLD',
-        location=(0, 0, 0),
-        rotation=(0, 0, 0),
+    return primitives.add_torus(
+        name, major_radius, minor_radius, (0, 0, 0), bpy.context.scene.collection,
+        major_segments=major_segments, minor_segments=minor_segments,
     )
-    obj = bpy.context.active_object
-    obj.name = name
-    return obj
 
 def add_cube(name, size=1.0):
-    deselect_all()
-    bpy.ops.mesh.primitive_cube_add(size=size, align='WORLD', location=(0, 0, 0), rotation=(0, 0, 0))
-    obj = bpy.context.active_object
-    obj.name = name
-    return obj
+    return primitives.add_box(name, (size, size, size), (0, 0, 0), bpy.context.scene.collection)
 
 
 # ============================================================
@@ -261,7 +198,7 @@ def build_mooring_ring_parts(lod="LOD0"):
 
 
 def make_mooring_ring(name="MooringRing_Standard"):
-    root = ensure_collection("MOORING_RING")
+    root = ensure_collection(COLLECTION_NAME)
     col0 = ensure_collection(f"{name}_LOD0", root)
     col1 = ensure_collection(f"{name}_LOD1", root)
     col2 = ensure_collection(f"{name}_LOD2", root)
@@ -303,5 +240,10 @@ def make_mooring_ring(name="MooringRing_Standard"):
 # Run (idempotent)
 # ============================================================
 
-remove_collection_tree("MOORING_RING")
-make_mooring_ring("MooringRing_Standard")
+def main():
+    remove_collection_tree(COLLECTION_NAME)
+    make_mooring_ring("MooringRing_Standard")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,13 @@
 import bpy
 import math
+import os
+import sys
+
+KIT_DIR = os.path.dirname(os.path.abspath(__file__))
+if KIT_DIR not in sys.path:
+    sys.path.append(KIT_DIR)
+
+from kitlib import mesh_merge, primitives, snaps, trace  # noqa: E402
 
 # ----------------------------
 # Config / Conventions
@@ -81,10 +89,10 @@ def wipe_collection(name: str):
 
 
 def purge_pier_objects():
-    prefixes = (f"{ASSET_TYPE}_", "SNAP_")
+    prefixes = (f"{ASSET_TYPE}_",)
     ensure_object_mode()
     for obj in list(bpy.data.objects):
-        if obj.name.startswith(prefixes):
+        if obj.name.startswith(prefixes) or snaps.owns_snap(obj.name, f"{ASSET_TYPE}_"):
             bpy.data.objects.remove(obj, do_unlink=True)
 
 
@@ -94,6 +102,7 @@ def add_custom_props(obj: bpy.types.Object, asset_role: str):
     obj["forward_axis"] = FORWARD_AXIS
 
 
+@trace.traced
 def shade_smooth_with_autosmooth(obj: bpy.types.Object, angle_deg: float = 35.0):
     if obj.type != 'MESH':
         return
@@ -139,15 +148,12 @@ def assign_material(obj: bpy.types.Object, mat: bpy.types.Material):
 # ----------------------------
 def build_slab_deck(name: str, length: float, width: float, bottom_z: float,
                     thickness: float, col: bpy.types.Collection) -> bpy.types.Object:
-    deselect_all()
-    bpy.ops.mesh.primitive_cube_add(size=1.0)
-    deck = bpy.context.active_object
-    deck.name = f"{name}__deck"
-    deck.scale = (width * 0.5, length * 0.5, thickness * 0.5)
-    deck.location = (0.0, length * 0.5, bottom_z + (thickness * 0.5))
-    bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
-    force_into_collection(deck, col)
-    return deck
+    return primitives.add_box(
+        f"{name}__deck",
+        (width * 0.5, length * 0.5, thickness * 0.5),
+        (0.0, length * 0.5, bottom_z + (thickness * 0.5)),
+        col,
+    )
 
 
 def build_support_posts(name: str, length: float, height: float, size: float,
@@ -156,13 +162,12 @@ def build_support_posts(name: str, length: float, height: float, size: float,
     y = length * 0.5
     x = center_x - (size * 0.5)
     for sx in (-x, x):
-        bpy.ops.mesh.primitive_cube_add(size=1.0)
-        p = bpy.context.active_object
-        p.name = f"{name}__support"
-        p.scale = (size * 0.5, size * 0.5, height * 0.5)
-        p.location = (sx, y, height * 0.5)
-        bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
-        force_into_collection(p, col)
+        p = primitives.add_box(
+            f"{name}__support",
+            (size * 0.5, size * 0.5, height * 0.5),
+            (sx, y, height * 0.5),
+            col,
+        )
         posts.append(p)
     return posts
 
@@ -177,31 +182,21 @@ def build_stringers(name: str, length: float, top_z: float, count: int,
         start = -((count - 1) * spacing * 0.5)
         xs = [start + i * spacing for i in range(count)]
     for sx in xs:
-        bpy.ops.mesh.primitive_cube_add(size=1.0)
-        s = bpy.context.active_object
-        s.name = f"{name}__stringer"
         # Rotate 90° around Y so cross-section is flipped
-        s.scale = (s_height * 0.5, length * 0.5, s_width * 0.5)
-        s.location = (sx, length * 0.5, top_z - (s_height * 0.5))
-        s.rotation_euler = (0.0, math.radians(90.0), 0.0)
-        bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
-        force_into_collection(s, col)
+        s = primitives.add_box(
+            f"{name}__stringer",
+            (s_height * 0.5, length * 0.5, s_width * 0.5),
+            (sx, length * 0.5, top_z - (s_height * 0.5)),
+            col,
+            rotation=(0.0, math.radians(90.0), 0.0),
+        )
         stringers.append(s)
     return stringers
 
 
+@trace.traced
 def join_and_name(objs, name: str):
-    ensure_object_mode()
-    deselect_all()
-    for o in objs:
-        o.select_set(True)
-    bpy.context.view_layer.objects.active = objs[0]
-    bpy.ops.object.join()
-    obj = bpy.context.active_object
-    obj.name = name
-    if obj.data:
-        obj.data.name = name
-    return obj
+    return mesh_merge.merge_objects(objs, name)
 
 
 def build_pier_straight(name: str, length: float, width: float, support_height: float,
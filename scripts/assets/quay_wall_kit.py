@@ -1,5 +1,13 @@
 import bpy
 import math
+import os
+import sys
+
+KIT_DIR = os.path.dirname(os.path.abspath(__file__))
+if KIT_DIR not in sys.path:
+    sys.path.append(KIT_DIR)
+
+from kitlib import lod_simplify, mesh_merge, primitives, snaps, trace  # noqa: E402
 
 # ----------------------------
 # Config / Conventions
@@ -17,10 +25,10 @@ WALL_THICKNESS = 2.0
 COPING_HEIGHT = 0.25
 COPING_OVERHANG = 0.15
 
-# LOD decimation ratios
-LOD_RATIOS = [
-    ("lod1", 0.5),
-    ("lod2", 0.2),
+# LOD simplification targets (kitlib.lod_simplify): max_error in meters and/or max_triangles
+LOD_TARGETS = [
+    ("lod1", {"max_error": 0.01}),
+    ("lod2", {"max_error": 0.04}),
 ]
 
 # Cylinder segment counts (only used for non-box bits, if any)
@@ -84,10 +92,10 @@ def wipe_collection(name: str):
 
 
 def purge_quay_objects():
-    prefixes = (f"{ASSET_TYPE}_", "SNAP_")
+    prefixes = (f"{ASSET_TYPE}_",)
     ensure_object_mode()
     for obj in list(bpy.data.objects):
-        if obj.name.startswith(prefixes):
+        if obj.name.startswith(prefixes) or snaps.owns_snap(obj.name, f"{ASSET_TYPE}_"):
             bpy.data.objects.remove(obj, do_unlink=True)
 
 
@@ -124,6 +132,7 @@ def add_custom_props(obj: bpy.types.Object, asset_role: str):
     obj["forward_axis"] = FORWARD_AXIS
 
 
+@trace.traced
 def shade_smooth_with_autosmooth(obj: bpy.types.Object, angle_deg: float = 35.0):
     if obj.type != 'MESH':
         return
@@ -170,38 +179,23 @@ def assign_material(obj: bpy.types.Object, mat: bpy.types.Material):
 def build_wall_block(name: str, length: float, height: float, thickness: float,
                      coping_h: float, coping_overhang: float,
                      col: bpy.types.Collection) -> bpy.types.Object:
-    deselect_all()
-
     # Main wall block
-    bpy.ops.mesh.primitive_cube_add(size=1.0)
-    wall = bpy.context.active_object
-    wall.name = f"{name}__wall"
-    wall.scale = (thickness * 0.5, length * 0.5, height * 0.5)
-    wall.location = (0.0, 0.0, height * 0.5)
-    bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
-    force_into_collection(wall, col)
+    wall = primitives.add_box(
+        f"{name}__wall",
+        (thickness * 0.5, length * 0.5, height * 0.5),
+        (0.0, 0.0, height * 0.5),
+        col,
+    )
 
     # Deck/coping slab (slight overhang)
-    bpy.ops.mesh.primitive_cube_add(size=1.0)
-    coping = bpy.context.active_object
-    coping.name = f"{name}__coping"
-    coping.scale = ((thickness + coping_overhang * 2.0) * 0.5,
-                    length * 0.5,
-                    coping_h * 0.5)
-    coping.location = (0.0, 0.0, height + (coping_h * 0.15))
-    bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
-    force_into_collection(coping, col)
+    coping = primitives.add_box(
+        f"{name}__coping",
+        ((thickness + coping_overhang * 2.0) * 0.5, length * 0.5, coping_h * 0.5),
+        (0.0, 0.0, height + (coping_h * 0.15)),
+        col,
+    )
 
-    ensure_object_mode()
-    deselect_all()
-    for o in (wall, coping):
-        o.select_set(True)
-    bpy.context.view_layer.objects.active = wall
-    bpy.ops.object.join()
-    obj = bpy.context.active_object
-    obj.name = name
-    if obj.data:
-        obj.data.name = name
+    obj = mesh_merge.merge_objects((wall, coping), name)
 
     set_origin_start_face_ground(obj)
     shade_smooth_with_autosmooth(obj, 40.0)
@@ -222,21 +216,15 @@ def create_snap_empty(name: str, location: tuple, parent: bpy.types.Object, col:
     return e
 
 
-def duplicate_with_decimate(src: bpy.types.Object, new_name: str, ratio: float, col: bpy.types.Collection) -> bpy.types.Object:
-    deselect_all()
+@trace.traced
+def duplicate_simplified(src: bpy.types.Object, new_name: str, target: dict, col: bpy.types.Collection) -> bpy.types.Object:
     dup = src.copy()
     dup.data = src.data.copy()
     dup.name = new_name
     bpy.context.collection.objects.link(dup)
     force_into_collection(dup, col)
 
-    dec = dup.modifiers.new(name="Decimate", type='DECIMATE')
-    dec.ratio = ratio
-
-    bpy.context.view_layer.objects.active = dup
-    dup.select_set(True)
-    bpy.ops.object.convert(target='MESH')  # applies modifiers
-    dup.select_set(False)
+    lod_simplify.simplify(dup, src, **target)
 
     add_custom_props(dup, "visual_lod")
     assign_material(dup, get_or_create_concrete_material())
@@ -269,8 +257,8 @@ def main():
 
     # LODs
     for base_name, root in assets:
-        for lod_name, ratio in LOD_RATIOS:
-            lod = duplicate_with_decimate(root, f"{base_name}_{lod_name}", ratio, col)
+        for lod_name, target in LOD_TARGETS:
+            lod = duplicate_simplified(root, f"{base_name}_{lod_name}", target, col)
             lod["asset_name"] = base_name
             lod["lod"] = int(lod_name[-1])
             lod.location = (0.0, 0.0, 0.0)
@@ -1,13 +1,27 @@
 import bpy
-import bmesh
 import math
+import os
+import sys
+
+import numpy as np
+
+KIT_DIR = os.path.dirname(os.path.abspath(__file__))
+if KIT_DIR not in sys.path:
+    sys.path.append(KIT_DIR)
+
+from kitlib import blend_io, convex_decomp, heightfield, rtin  # noqa: E402
 
 # ============================================================
 # Seabed Tile Kit (Blender 5.0+)
 # - Tileable square plane with procedural displacement
-# - LOD0/LOD1/LOD2
-# - Collider as separate node
+# - LOD0/LOD1/LOD2 (LOD1/LOD2 downsampled from the LOD0 heightfield),
+#   adaptively triangulated to a max vertical error per LOD
+# - Collider: convex hulls over LOD1 down to a floor, as separate nodes
 # - Snap points (corners) as empties
+# - TILE_MODE = "world": an N x M block of tiles cut from one world-space
+#   field, with boundary vertices shared exactly between neighbours
+# - Optional uint16 heightmap per tile (.hmap) + one shared flat grid, for
+#   displacing in the runtime's vertex shader instead of shipping vertices
 #
 # Conventions:
 #   Units: meters (1 BU = 1m)
@@ -21,13 +35,49 @@ ASSET_BASE_NAME = f"seabed_{PRESET}_tile_25m"
 COLLECTION_NAME = f"SeabedKit_{PRESET}"
 
 S = 25.0  # tile size (meters)
-END_SEAM_GUARD = 0.7  # meters kept perfectly flat at tile edges
-
-# LOD settings: subdivision grid + displacement strength
+END_SEAM_GUARD = 0.7  # meters kept perfectly flat at tile edges ("single" mode only)
+
+TILE_MODE = "single"  # "single" (one guarded, self-tiling tile) | "world"
+WORLD_TILES = (4, 4)  # tiles along X, Y in world mode
+WORLD_TILE_ORIGIN = (0, 0)  # index of the first tile; tile (i, j) starts at (i*S, j*S)
+# World mode: when set, every tile is written to <dir>/<tile name>.blend and
+# removed from the scene before the next one is built, so only the block's
+# height fields (held for RTIN seeding) grow with the tile count.
+WORLD_OUTPUT_DIR = os.environ.get("SEABED_WORLD_OUTPUT_DIR") or None
+
+# When set, every tile's LOD0 field is also written to <dir>/<tile name>.hmap
+# (see kitlib.heightfield.HEIGHTMAP_HEADER) and a flat "<base>_grid" mesh
+# with the same resolution is added for runtimes that displace on the GPU.
+HEIGHTMAP_OUTPUT_DIR = os.environ.get("SEABED_HEIGHTMAP_DIR") or None
+
+# LOD settings: sample grid per side and the max vertical error (meters)
+# the triangulation may introduce. Displacement is evaluated at LOD0 only;
+# the other LODs filter it down, so their grids must divide LOD0's.
 LOD_SETTINGS = {
-    "lod0": {"grid": 160, "disp_strength": 0.35, "noise_scale": 14.0, "detail": 6.0},
-    "lod1": {"grid": 80,  "disp_strength": 0.22, "noise_scale": 16.0, "detail": 4.0},
-    "lod2": {"grid": 4,   "disp_strength": 0.00, "noise_scale": 0.0,  "detail": 0.0},
+    "lod0": {"grid": 128, "max_error": 0.02},
+    "lod1": {"grid": 64, "max_error": 0.05},
+    "lod2": {"grid": 4, "max_error": 0.15},
+}
+
+# "rtin": keep only the triangles needed to stay within max_error
+#         (kitlib.rtin; grids must be powers of two). Shared tile edges
+#         split identically, so tiles built in the same run never crack.
+# "grid": full quad grid at every LOD.
+TRIANGULATION = "rtin"
+
+# Displacement recipe per preset:
+#   z = (sin(x * ripple_freq + (breakup - 0.5) * distortion) * strength
+#        + (big - 0.5) * big_strength) * seam_mask
+DISPLACEMENT = {
+    "harbor": {
+        "strength": 0.35, "ripple_freq": 2.4, "distortion": 1.6,
+        "breakup_scale": 0.35, "big_strength": 0.06, "big_scale": 2.8,
+    },
+    # Mostly kill the periodic ripples: lower freq + much lower strength, more breakup
+    "deep": {
+        "strength": 0.35 * 0.35, "ripple_freq": 0.7, "distortion": 2.6,
+        "breakup_scale": 0.18, "big_strength": 0.14, "big_scale": 1.6,
+    },
 }
 
 # Optional: gentle large-scale slope/undulation
@@ -35,214 +85,20 @@ ADD_BIG_WAVES = True
 BIG_WAVE_STRENGTH = 0.10
 BIG_WAVE_SCALE = 3.0  # larger = smoother
 
-# Collider: flat plane / thin box (you probably won't collide with seabed often)
+# Collider: LOD1 decomposed as a heightfield (kitlib.convex_decomp) into
+# hulls that reach from the surface down to COLLIDER_THICKNESS below its
+# lowest point, so keels touch the ripples rather than a flat slab at 0.
+# Error is hull volume beyond that solid, as a fraction of it.
 COLLIDER_THICKNESS = 0.05
+COLLIDER_MAX_HULLS = 16
+COLLIDER_MAX_ERROR = 0.1
+COLLIDER_MAX_VERTICES = 32
+COLLIDER_RESOLUTION = 64
 
 
 # ------------------------------------------------------------
 # Helpers
 # ------------------------------------------------------------
-def get_or_create_seabed_ripple_gn(group_name: str):
-    """
-    Geometry Nodes group that displaces Z to create sand ripples,
-    with a seam guard so tiles stitch cleanly.
-    """
-    ng = bpy.data.node_groups.get(group_name)
-    if ng is not None:
-        return ng
-
-    ng = bpy.data.node_groups.new(group_name, 'GeometryNodeTree')
-    nodes = ng.nodes
-    links = ng.links
-    nodes.clear()
-
-    # Group I/O
-    n_in = nodes.new("NodeGroupInput")
-    n_in.location = (-900, 0)
-    n_out = nodes.new("NodeGroupOutput")
-    n_out.location = (900, 0)
-
-    # Inputs
-    ng.interface.new_socket(name="Geometry", in_out='INPUT', socket_type='NodeSocketGeometry')
-    ng.interface.new_socket(name="TileSize", in_out='INPUT', socket_type='NodeSocketFloat')
-    ng.interface.new_socket(name="SeamGuard", in_out='INPUT', socket_type='NodeSocketFloat')
-    ng.interface.new_socket(name="Strength", in_out='INPUT', socket_type='NodeSocketFloat')
-    ng.interface.new_socket(name="RippleFreq", in_out='INPUT', socket_type='NodeSocketFloat')
-    ng.interface.new_socket(name="Distortion", in_out='INPUT', socket_type='NodeSocketFloat')
-    ng.interface.new_socket(name="BreakupScale", in_out='INPUT', socket_type='NodeSocketFloat')
-    ng.interface.new_socket(name="BigWaveStrength", in_out='INPUT', socket_type='NodeSocketFloat')
-    ng.interface.new_socket(name="BigWaveScale", in_out='INPUT', socket_type='NodeSocketFloat')
-
-    ng.interface.new_socket(name="Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
-
-    # Nodes
-    n_pos = nodes.new("GeometryNodeInputPosition")
-    n_pos.location = (-700, 120)
-
-    n_sep = nodes.new("ShaderNodeSeparateXYZ")
-    n_sep.location = (-520, 120)
-    links.new(n_pos.outputs["Position"], n_sep.inputs["Vector"])
-
-    # Seam mask: mask = step(seam, x) * step(seam, y) * step(seam, tile-x) * step(seam, tile-y)
-    n_tile_minus_x = nodes.new("ShaderNodeMath"); n_tile_minus_x.operation = 'SUBTRACT'
-    n_tile_minus_x.location = (-520, -40)
-    links.new(n_in.outputs["TileSize"], n_tile_minus_x.inputs[0])
-    links.new(n_sep.outputs["X"], n_tile_minus_x.inputs[1])
-
-    n_tile_minus_y = nodes.new("ShaderNodeMath"); n_tile_minus_y.operation = 'SUBTRACT'
-    n_tile_minus_y.location = (-520, -120)
-    links.new(n_in.outputs["TileSize"], n_tile_minus_y.inputs[0])
-    links.new(n_sep.outputs["Y"], n_tile_minus_y.inputs[1])
-
-    def step_node(x_input, edge_input, loc):
-        # step(edge, x) ~= clamp((x-edge)*1e6,0,1) but use Compare node for clarity
-        c = nodes.new("FunctionNodeCompare")
-        c.data_type = 'FLOAT'
-        c.operation = 'GREATER_THAN'
-        c.location = loc
-        links.new(x_input, c.inputs[0])
-        links.new(edge_input, c.inputs[1])
-        return c
-
-    c_x0 = step_node(n_sep.outputs["X"], n_in.outputs["SeamGuard"], (-300, 80))
-    c_y0 = step_node(n_sep.outputs["Y"], n_in.outputs["SeamGuard"], (-300, 20))
-    c_x1 = step_node(n_tile_minus_x.outputs[0], n_in.outputs["SeamGuard"], (-300, -40))
-    c_y1 = step_node(n_tile_minus_y.outputs[0], n_in.outputs["SeamGuard"], (-300, -100))
-
-    n_mul1 = nodes.new("ShaderNodeMath"); n_mul1.operation = 'MULTIPLY'
-    n_mul1.location = (-120, 60)
-    links.new(c_x0.outputs["Result"], n_mul1.inputs[0])
-    links.new(c_y0.outputs["Result"], n_mul1.inputs[1])
-
-    n_mul2 = nodes.new("ShaderNodeMath"); n_mul2.operation = 'MULTIPLY'
-    n_mul2.location = (-120, -20)
-    links.new(c_x1.outputs["Result"], n_mul2.inputs[0])
-    links.new(c_y1.outputs["Result"], n_mul2.inputs[1])
-
-    n_mask = nodes.new("ShaderNodeMath"); n_mask.operation = 'MULTIPLY'
-    n_mask.location = (60, 20)
-    links.new(n_mul1.outputs[0], n_mask.inputs[0])
-    links.new(n_mul2.outputs[0], n_mask.inputs[1])
-
-    # Breakup noise (procedural)
-    n_noise = nodes.new("ShaderNodeTexNoise")
-    n_noise.location = (-520, 260)
-    n_noise.inputs["Detail"].default_value = 2.0
-    n_noise.inputs["Roughness"].default_value = 0.5
-    links.new(n_pos.outputs["Position"], n_noise.inputs["Vector"])
-    links.new(n_in.outputs["BreakupScale"], n_noise.inputs["Scale"])
-
-    # Distortion term: (noise - 0.5) * Distortion
-    n_noise_center = nodes.new("ShaderNodeMath"); n_noise_center.operation = 'SUBTRACT'
-    n_noise_center.location = (-300, 260)
-    links.new(n_noise.outputs["Fac"], n_noise_center.inputs[0])
-    n_noise_center.inputs[1].default_value = 0.5
-
-    n_dist = nodes.new("ShaderNodeMath"); n_dist.operation = 'MULTIPLY'
-    n_dist.location = (-120, 260)
-    links.new(n_noise_center.outputs[0], n_dist.inputs[0])
-    links.new(n_in.outputs["Distortion"], n_dist.inputs[1])
-
-    # Ripple phase: X * RippleFreq + distortion
-    n_x_freq = nodes.new("ShaderNodeMath"); n_x_freq.operation = 'MULTIPLY'
-    n_x_freq.location = (-300, 140)
-    links.new(n_sep.outputs["X"], n_x_freq.inputs[0])
-    links.new(n_in.outputs["RippleFreq"], n_x_freq.inputs[1])
-
-    n_phase = nodes.new("ShaderNodeMath"); n_phase.operation = 'ADD'
-    n_phase.location = (-120, 140)
-    links.new(n_x_freq.outputs[0], n_phase.inputs[0])
-    links.new(n_dist.outputs[0], n_phase.inputs[1])
-
-    # Sine -> ripples
-    n_sin = nodes.new("ShaderNodeMath"); n_sin.operation = 'SINE'
-    n_sin.location = (60, 140)
-    links.new(n_phase.outputs[0], n_sin.inputs[0])
-
-    # Big wave (very low frequency)
-    n_big_noise = nodes.new("ShaderNodeTexNoise")
-    n_big_noise.location = (-520, 420)
-    n_big_noise.inputs["Detail"].default_value = 1.0
-    n_big_noise.inputs["Roughness"].default_value = 0.4
-    links.new(n_pos.outputs["Position"], n_big_noise.inputs["Vector"])
-    links.new(n_in.outputs["BigWaveScale"], n_big_noise.inputs["Scale"])
-
-    n_big_center = nodes.new("ShaderNodeMath"); n_big_center.operation = 'SUBTRACT'
-    n_big_center.location = (-300, 420)
-    links.new(n_big_noise.outputs["Fac"], n_big_center.inputs[0])
-    n_big_center.inputs[1].default_value = 0.5
-
-    n_big_amp = nodes.new("ShaderNodeMath"); n_big_amp.operation = 'MULTIPLY'
-    n_big_amp.location = (-120, 420)
-    links.new(n_big_center.outputs[0], n_big_amp.inputs[0])
-    links.new(n_in.outputs["BigWaveStrength"], n_big_amp.inputs[1])
-
-    # Total displacement: (sin * Strength + big) * mask
-    n_sin_amp = nodes.new("ShaderNodeMath"); n_sin_amp.operation = 'MULTIPLY'
-    n_sin_amp.location = (240, 140)
-    links.new(n_sin.outputs[0], n_sin_amp.inputs[0])
-    links.new(n_in.outputs["Strength"], n_sin_amp.inputs[1])
-
-    n_sum = nodes.new("ShaderNodeMath"); n_sum.operation = 'ADD'
-    n_sum.location = (420, 220)
-    links.new(n_sin_amp.outputs[0], n_sum.inputs[0])
-    links.new(n_big_amp.outputs[0], n_sum.inputs[1])
-
-    n_apply_mask = nodes.new("ShaderNodeMath"); n_apply_mask.operation = 'MULTIPLY'
-    n_apply_mask.location = (600, 220)
-    links.new(n_sum.outputs[0], n_apply_mask.inputs[0])
-    links.new(n_mask.outputs[0], n_apply_mask.inputs[1])
-
-    # Set Position: add (0,0,disp) to pos
-    n_combine = nodes.new("ShaderNodeCombineXYZ")
-    n_combine.location = (600, 60)
-    links.new(n_apply_mask.outputs[0], n_combine.inputs["Z"])
-
-    n_add_vec = nodes.new("ShaderNodeVectorMath"); n_add_vec.operation = 'ADD'
-    n_add_vec.location = (760, 120)
-    links.new(n_pos.outputs["Position"], n_add_vec.inputs[0])
-    links.new(n_combine.outputs["Vector"], n_add_vec.inputs[1])
-
-    n_setpos = nodes.new("GeometryNodeSetPosition")
-    n_setpos.location = (760, -40)
-    links.new(n_in.outputs["Geometry"], n_setpos.inputs["Geometry"])
-    links.new(n_add_vec.outputs["Vector"], n_setpos.inputs["Position"])
-
-    links.new(n_setpos.outputs["Geometry"], n_out.inputs["Geometry"])
-
-    return ng
-
-def add_ripple_geo_nodes(obj, tile_size, seam_guard, strength, ripple_freq,
-                         distortion, breakup_scale, big_strength, big_scale):
-    ng = get_or_create_seabed_ripple_gn("GN_SeabedRipples")
-    mod = obj.modifiers.new(name="GN_RIPPLES", type='NODES')
-    mod.node_group = ng
-
-    # Assign inputs by name (stable)
-    def set_input(name, value):
-        # Geometry input is implicit
-        idx = None
-        for i, s in enumerate(ng.interface.items_tree):
-            pass
-
-    # In Blender 5.x, modifier inputs can be set via mod["Input_x"] keys,
-    # but those keys are not stable across versions. Safer approach:
-    # set defaults on the node group sockets (interface).
-    # We'll set socket default values directly:
-    for sock in ng.interface.items_tree:
-        if getattr(sock, "in_out", None) != 'INPUT':
-            continue
-        if sock.name == "TileSize": sock.default_value = tile_size
-        if sock.name == "SeamGuard": sock.default_value = seam_guard
-        if sock.name == "Strength": sock.default_value = strength
-        if sock.name == "RippleFreq": sock.default_value = ripple_freq
-        if sock.name == "Distortion": sock.default_value = distortion
-        if sock.name == "BreakupScale": sock.default_value = breakup_scale
-        if sock.name == "BigWaveStrength": sock.default_value = big_strength
-        if sock.name == "BigWaveScale": sock.default_value = big_scale
-
-    return mod
-
 def ensure_units_meters():
     scene = bpy.context.scene
     scene.unit_settings.system = 'METRIC'
@@ -308,197 +164,144 @@ def shade_smooth_auto(obj: bpy.types.Object, angle_deg: float = 35.0):
     bpy.ops.object.shade_auto_smooth(use_auto_smooth=True, angle=math.radians(angle_deg))
     obj.select_set(False)
 
-def apply_modifiers_for_export(obj: bpy.types.Object):
-    ensure_object_mode()
-    deselect_all()
-    obj.select_set(True)
-    set_active(obj)
-    bpy.ops.object.convert(target='MESH')
-    obj.select_set(False)
-
 
 # ------------------------------------------------------------
-# Mesh creation: grid plane spanning 0..S in X and Y
+# Heightfield: evaluated once at LOD0 over the whole grid
 # ------------------------------------------------------------
-def create_grid_plane_mesh(mesh_name: str, grid_res: int):
+def seabed_heights(x: np.ndarray, y: np.ndarray, params) -> np.ndarray:
+    """Ripple + breakup + big-wave displacement (before the seam mask)."""
+    breakup = heightfield.fbm(x, y, params["breakup_scale"], 2.0, 0.5)
+    phase = x * params["ripple_freq"] + (breakup - 0.5) * params["distortion"]
+    big = (heightfield.fbm(x, y, params["big_scale"], 1.0, 0.4) - 0.5) * params["big_strength"]
+    return np.sin(phase) * params["strength"] + big
+
+def build_lod_heights():
     """
-    Creates a subdivided plane with (grid_res x grid_res) quads,
-    spanning X:0..S, Y:0..S.
+    Height arrays for every LOD. LOD1/LOD2 are low-passed copies of LOD0,
+    so the LODs agree with each other; the seam mask is reapplied at each
+    resolution to keep tile edges flat.
     """
-    mesh = bpy.data.meshes.new(mesh_name)
-    bm = bmesh.new()
-
-    # Create a unit grid centered at origin, then scale/translate
-    bmesh.ops.create_grid(
-        bm,
-        x_segments=grid_res,
-        y_segments=grid_res,
-        size=0.5  # grid spans approx -0.5..+0.5 in both axes
-    )
-
-    # Scale to S and move to 0..S
-    for v in bm.verts:
-        v.co.x = (v.co.x + 0.5) * S
-        v.co.y = (v.co.y + 0.5) * S
-        v.co.z = 0.0
+    res0 = LOD_SETTINGS["lod0"]["grid"]
+    x, y = heightfield.lattice(res0, S / res0)
+    z0 = seabed_heights(x, y, DISPLACEMENT[PRESET]) * heightfield.seam_mask(x, y, S, END_SEAM_GUARD)
 
-    bm.normal_update()
-    bm.to_mesh(mesh)
-    bm.free()
-    return mesh
-
-def create_object_from_mesh(obj_name: str, mesh: bpy.types.Mesh, col: bpy.types.Collection):
-    obj = bpy.data.objects.new(obj_name, mesh)
-    link_only_to_collection(obj, col)
-    obj.location = (0.0, 0.0, 0.0)
-    add_custom_props(obj, "visual_lod")
-    return obj
-
-
-# ------------------------------------------------------------
-# Seam-safe displacement mask:
-# - weight 1 in interior
-# - weight 0 near all borders (within END_SEAM_GUARD)
-# keeps tile edges flat for perfect tiling.
-# ------------------------------------------------------------
-def add_displace_mask_vertex_group(obj: bpy.types.Object, group_name="DISPLACE_MASK"):
-    vg = obj.vertex_groups.new(name=group_name)
+    heights = {"lod0": z0}
+    for lod_key, s in LOD_SETTINGS.items():
+        if lod_key == "lod0":
+            continue
+        res = s["grid"]
+        z = heightfield.downsample(z0, res0 // res)
+        cx, cy = heightfield.lattice(res, S / res)
+        heights[lod_key] = z * heightfield.seam_mask(cx, cy, S, END_SEAM_GUARD)
+    return heights
 
-    for i, v in enumerate(obj.data.vertices):
-        x, y, z = v.co.x, v.co.y, v.co.z
+def build_world_tile_heights(tx: int, ty: int):
+    """
+    Height arrays for tile (tx, ty) of the world field, without a seam mask.
+    Samples are addressed by global integer index and evaluated with an
+    apron wide enough for the coarsest downsample filter, so a vertex on a
+    shared edge comes out bit-identical in both neighbouring tiles, at
+    every LOD.
+    """
+    res0 = LOD_SETTINGS["lod0"]["grid"]
+    factors = {lod_key: res0 // s["grid"] for lod_key, s in LOD_SETTINGS.items()}
+    apron = max(factors.values()) - 1
 
-        if (x < END_SEAM_GUARD or x > (S - END_SEAM_GUARD) or
-            y < END_SEAM_GUARD or y > (S - END_SEAM_GUARD)):
-            w = 0.0
-        else:
-            w = 1.0
+    x, y = heightfield.lattice(res0, S / res0, (tx * res0, ty * res0), apron)
+    z = seabed_heights(x, y, DISPLACEMENT[PRESET])
+    return {lod_key: heightfield.downsample(z, f, apron) for lod_key, f in factors.items()}
 
-        if w > 0.0:
-            vg.add([i], w, 'REPLACE')
+def tile_name(tx: int, ty: int) -> str:
+    return f"{ASSET_BASE_NAME}_x{tx:03d}_y{ty:03d}"
 
-    return vg
+def heightmap_z_range():
+    """
+    Fixed quantization range covering every height the preset can produce,
+    so neighbouring tiles encode a shared edge with identical codes.
+    """
+    params = DISPLACEMENT[PRESET]
+    r = params["strength"] + 0.5 * params["big_strength"]
+    return (-r, r)
 
+def export_heightmap(base_name: str, heights, origin=(0.0, 0.0, 0.0)):
+    if not HEIGHTMAP_OUTPUT_DIR:
+        return
+    path = os.path.join(HEIGHTMAP_OUTPUT_DIR, base_name + ".hmap")
+    heightfield.write_heightmap(path, heights["lod0"], origin, S, heightmap_z_range())
 
 # ------------------------------------------------------------
-# Textures + modifiers
+# Mesh creation: grid plane spanning 0..S in X and Y
 # ------------------------------------------------------------
-def get_or_create_wave(tex_name: str, scale: float, distortion: float):
+def create_grid_plane_mesh(mesh_name: str, heights: np.ndarray):
     """
-    Produces sand-ripple bands. Not 'tileable' by itself, but our seam guard keeps borders flat,
-    so tiles still stitch perfectly.
+    Creates a quad plane spanning X:0..S, Y:0..S with one vertex per
+    height sample and Z written straight from the array.
     """
-    tex = bpy.data.textures.get(tex_name)
-    if tex is None:
-        tex = bpy.data.textures.new(tex_name, type='WAVE')
-
-    tex.wave_type = 'BANDS'          # ripples
-    tex.bands_direction = 'Y'        # ripples perpendicular to +Y by default (adjust via object rotation if desired)
-    tex.use_wave_add = False
-    tex.use_normal_map = False
+    return heightfield.grid_mesh(mesh_name, heights, S)
 
-    tex.noise_scale = scale          # wavelength-ish control
-    tex.nabla = 0.03                 # sharpness of the waves (smaller = crisper, but can alias)
-    tex.distortion = distortion      # adds slight irregularity to bands
+def create_shared_grid(col: bpy.types.Collection):
+    """Flat LOD0-resolution grid every heightmap tile is displaced onto."""
+    res0 = LOD_SETTINGS["lod0"]["grid"]
+    mesh = create_grid_plane_mesh(f"{ASSET_BASE_NAME}_grid_mesh", np.zeros((res0 + 1, res0 + 1)))
+    obj = bpy.data.objects.new(f"{ASSET_BASE_NAME}_grid", mesh)
+    link_only_to_collection(obj, col)
+    add_custom_props(obj, "heightmap_grid")
+    obj["grid"] = res0
+    return obj
 
-    return tex
+def create_object_from_mesh(obj_name: str, mesh: bpy.types.Mesh, col: bpy.types.Collection):
+    obj = bpy.data.objects.new(obj_name, mesh)
+    link_only_to_collection(obj, col)
+    obj.location = (0.0, 0.0, 0.0)
+    add_custom_props(obj, "visual_lod")
+    return obj
 
-def get_or_create_musgrave(tex_name: str, noise_scale: float, detail: float):
+def create_lod_object(col: bpy.types.Collection, base_name: str, lod_key: str, heights: np.ndarray, seeds=None):
     """
-    Procedural Musgrave gives a good seabed feel.
+    One visual LOD. With TRIANGULATION = "rtin" the mesh keeps only the
+    triangles needed for the LOD's max_error (seeds: that LOD's edge seeds
+    from rtin.solve_seeds); the error budget and the largest deviation
+    actually left are stored on the object.
     """
-    tex = bpy.data.textures.get(tex_name)
-    if tex is None:
-        tex = bpy.data.textures.new(tex_name, type='MUSGRAVE')
-    tex.noise_scale = noise_scale
-    tex.musgrave_type = 'FBM'
-    tex.dimension_max = detail  # "detail"/fractal dimension
-    return tex
-
-def get_or_create_clouds(tex_name: str, noise_scale: float):
-    tex = bpy.data.textures.get(tex_name)
-    if tex is None:
-        tex = bpy.data.textures.new(tex_name, type='CLOUDS')
-    tex.noise_scale = noise_scale
-    tex.cloud_type = 'GRAYSCALE'
-    return tex
-
-def add_seabed_modifiers(obj: bpy.types.Object, lod_key: str):
-    s = LOD_SETTINGS[lod_key]
-    strength = float(s["disp_strength"])
-    if strength <= 0.0:
-        return
+    name = f"{base_name}_{lod_key}"
+    if TRIANGULATION == "rtin":
+        result = rtin.triangulate(heights, LOD_SETTINGS[lod_key]["max_error"], seeds)
+        mesh = rtin.mesh_from_triangulation(f"{name}_mesh", heights, S, result["triangles"])
+    else:
+        mesh = create_grid_plane_mesh(f"{name}_mesh", heights)
+
+    obj = create_object_from_mesh(name, mesh, col)
+    obj["lod"] = int(lod_key[3:])
+    if TRIANGULATION == "rtin":
+        obj["max_error"] = result["max_error"]
+        obj["achieved_error"] = result["achieved_error"]
+    return obj
 
+def solve_edge_seeds(tiles, heights_for, wrap: bool = False):
+    """Per-tile, per-LOD RTIN edge seeds (None for the plain grid)."""
+    if TRIANGULATION != "rtin":
+        return {tile: None for tile in tiles}
+    return rtin.solve_seeds(tiles, heights_for, wrap)
 
-    if PRESET == "harbor":
-        ripple_freq = 2.4 if lod_key == "lod0" else 2.0
-        distortion = 1.6 if lod_key == "lod0" else 1.2
-        breakup_scale = 0.35
-        big_strength = 0.06
-        big_scale = 2.8
-
-    else:  # deep
-        # Mostly kill the periodic ripples: lower freq + much lower strength, more breakup
-        ripple_freq = 0.7 if lod_key == "lod0" else 0.5
-        distortion = 2.6 if lod_key == "lod0" else 2.0
-        breakup_scale = 0.18
-        big_strength = 0.14
-        big_scale = 1.6
-
-        # Also reduce the fine ripple contribution by scaling Strength down
-        strength *= 0.35
-
-    add_ripple_geo_nodes(
-        obj,
-        tile_size=S,
-        seam_guard=END_SEAM_GUARD,
-        strength=strength,
-        ripple_freq=ripple_freq,
-        distortion=distortion,
-        breakup_scale=breakup_scale,
-        big_strength=big_strength,
-        big_scale=big_scale,
-    )
 
 # ------------------------------------------------------------
 # Collider + Snap points
 # ------------------------------------------------------------
-def create_collider(col: bpy.types.Collection):
+def create_collider(parent: bpy.types.Object, source: bpy.types.Object, col: bpy.types.Collection,
+                    base_name: str = ASSET_BASE_NAME, z_min: float = 0.0):
     """
-    Thin box that matches tile footprint.
+    Convex hulls under source's surface, down to COLLIDER_THICKNESS below
+    z_min (its lowest height), parented to parent.
     """
-    mesh = bpy.data.meshes.new(f"COLLIDER_{ASSET_BASE_NAME}_mesh")
-    bm = bmesh.new()
-
-    z0 = -COLLIDER_THICKNESS
-    z1 = 0.0
-
-    v0 = bm.verts.new((0.0, 0.0, z0))
-    v1 = bm.verts.new((S,   0.0, z0))
-    v2 = bm.verts.new((S,   S,   z0))
-    v3 = bm.verts.new((0.0, S,   z0))
-
-    v4 = bm.verts.new((0.0, 0.0, z1))
-    v5 = bm.verts.new((S,   0.0, z1))
-    v6 = bm.verts.new((S,   S,   z1))
-    v7 = bm.verts.new((0.0, S,   z1))
-
-    bm.faces.new((v0, v1, v2, v3))
-    bm.faces.new((v7, v6, v5, v4))
-    bm.faces.new((v0, v4, v5, v1))
-    bm.faces.new((v1, v5, v6, v2))
-    bm.faces.new((v2, v6, v7, v3))
-    bm.faces.new((v3, v7, v4, v0))
-
-    bm.normal_update()
-    bm.to_mesh(mesh)
-    bm.free()
-
-    obj = bpy.data.objects.new(f"COLLIDER_{ASSET_BASE_NAME}", mesh)
-    link_only_to_collection(obj, col)
-    obj.display_type = 'WIRE'
-    obj.hide_render = True
-    add_custom_props(obj, "collision")
-    return obj
+    colliders = convex_decomp.create_hull_colliders(
+        parent, base_name, source, col,
+        max_hulls=COLLIDER_MAX_HULLS, max_error=COLLIDER_MAX_ERROR,
+        max_vertices=COLLIDER_MAX_VERTICES, resolution=COLLIDER_RESOLUTION,
+        floor=z_min - COLLIDER_THICKNESS,
+    )
+    for obj in colliders:
+        add_custom_props(obj, "collision")
+    return colliders
 
 def create_snap_empty(name: str, location, col: bpy.types.Collection):
     e = bpy.data.objects.new(name, None)
@@ -511,53 +314,107 @@ def create_snap_empty(name: str, location, col: bpy.types.Collection):
 
 
 # ------------------------------------------------------------
-# Main
+# Tile assembly
 # ------------------------------------------------------------
-def main():
-    ensure_units_meters()
-
-    wipe_collection(COLLECTION_NAME)
-    col = create_collection(COLLECTION_NAME)
+def build_tile(col: bpy.types.Collection, base_name: str, heights, location=(0.0, 0.0, 0.0), seeds=None):
+    """LOD chain + collider + corner snaps for one tile; returns every object created."""
+    seeds = seeds or {}
 
     # LOD2 (flat-ish)
-    mesh2 = create_grid_plane_mesh(f"{ASSET_BASE_NAME}_lod2_mesh", LOD_SETTINGS["lod2"]["grid"])
-    lod2 = create_object_from_mesh(f"{ASSET_BASE_NAME}_lod2", mesh2, col)
-    lod2["lod"] = 2
+    lod2 = create_lod_object(col, base_name, "lod2", heights["lod2"], seeds.get("lod2"))
     shade_smooth_auto(lod2, 30.0)
 
     # LOD1
-    mesh1 = create_grid_plane_mesh(f"{ASSET_BASE_NAME}_lod1_mesh", LOD_SETTINGS["lod1"]["grid"])
-    lod1 = create_object_from_mesh(f"{ASSET_BASE_NAME}_lod1", mesh1, col)
-    lod1["lod"] = 1
-    add_seabed_modifiers(lod1, "lod1")
-    apply_modifiers_for_export(lod1)
+    lod1 = create_lod_object(col, base_name, "lod1", heights["lod1"], seeds.get("lod1"))
     shade_smooth_auto(lod1, 35.0)
 
     # LOD0
-    mesh0 = create_grid_plane_mesh(f"{ASSET_BASE_NAME}_lod0_mesh", LOD_SETTINGS["lod0"]["grid"])
-    lod0 = create_object_from_mesh(f"{ASSET_BASE_NAME}_lod0", mesh0, col)
-    lod0["lod"] = 0
-    add_seabed_modifiers(lod0, "lod0")
-    apply_modifiers_for_export(lod0)
+    lod0 = create_lod_object(col, base_name, "lod0", heights["lod0"], seeds.get("lod0"))
+    lod0.location = location
     shade_smooth_auto(lod0, 35.0)
 
     # Parent under LOD0 (optional organization)
     lod1.parent = lod0
     lod2.parent = lod0
 
-    # Collider
-    collider = create_collider(col)
-    collider.parent = lod0
+    # Collider (one node per hull)
+    colliders = create_collider(lod0, lod1, col, base_name, float(np.min(heights["lod1"])))
 
-    # Snap corners (tile grid placement)
-    snap00 = create_snap_empty(f"SNAP_00_{ASSET_BASE_NAME}", (0.0, 0.0, 0.0), col)
-    snap10 = create_snap_empty(f"SNAP_10_{ASSET_BASE_NAME}", (S,   0.0, 0.0), col)
-    snap01 = create_snap_empty(f"SNAP_01_{ASSET_BASE_NAME}", (0.0, S,   0.0), col)
-    snap11 = create_snap_empty(f"SNAP_11_{ASSET_BASE_NAME}", (S,   S,   0.0), col)
+    # Snap corners (tile grid placement), local to LOD0
+    snap00 = create_snap_empty(f"SNAP_00_{base_name}", (0.0, 0.0, 0.0), col)
+    snap10 = create_snap_empty(f"SNAP_10_{base_name}", (S,   0.0, 0.0), col)
+    snap01 = create_snap_empty(f"SNAP_01_{base_name}", (0.0, S,   0.0), col)
+    snap11 = create_snap_empty(f"SNAP_11_{base_name}", (S,   S,   0.0), col)
 
     for s in (snap00, snap10, snap01, snap11):
         s.parent = lod0
 
+    return [lod0, lod1, lod2, *colliders, snap00, snap10, snap01, snap11]
+
+def free_objects(objs):
+    for obj in objs:
+        data = obj.data
+        bpy.data.objects.remove(obj, do_unlink=True)
+        if data is not None and data.users == 0:
+            bpy.data.meshes.remove(data)
+
+def build_world_tiles(col: bpy.types.Collection):
+    """
+    Build WORLD_TILES tiles; tile (i, j) is placed at (i*S, j*S). Every
+    tile's height field is generated once. With RTIN the fields of the
+    whole block are held (small next to the meshes) while edge seeds are
+    solved over it, so RTIN edges match inside the block; tiles from a
+    separate run only match on edges where both sides happen to agree.
+    Only with WORLD_OUTPUT_DIR set are tiles written and freed one at a
+    time; otherwise they all stay in the scene.
+    """
+    nx, ny = WORLD_TILES
+    ox, oy = WORLD_TILE_ORIGIN
+    tiles = [(tx, ty) for ty in range(oy, oy + ny) for tx in range(ox, ox + nx)]
+    fields = {}
+    if TRIANGULATION == "rtin":
+        fields = {tile: build_world_tile_heights(*tile) for tile in tiles}
+    seeds = solve_edge_seeds(tiles, fields.__getitem__)
+
+    for tx, ty in tiles:
+        name = tile_name(tx, ty)
+        heights = fields.pop((tx, ty), None)
+        if heights is None:
+            heights = build_world_tile_heights(tx, ty)
+        objs = build_tile(col, name, heights, (tx * S, ty * S, 0.0), seeds[(tx, ty)])
+        objs[0]["tile_index"] = (tx, ty)
+        export_heightmap(name, heights, (tx * S, ty * S, 0.0))
+        del heights
+
+        if WORLD_OUTPUT_DIR:
+            blend_io.write_objects(os.path.join(WORLD_OUTPUT_DIR, name + ".blend"), objs)
+            free_objects(objs)
+            print(f"Wrote seabed tile '{name}'.")
+
+
+# ------------------------------------------------------------
+# Main
+# ------------------------------------------------------------
+def main():
+    ensure_units_meters()
+
+    wipe_collection(COLLECTION_NAME)
+    col = create_collection(COLLECTION_NAME)
+
+    if HEIGHTMAP_OUTPUT_DIR:
+        create_shared_grid(col)
+
+    if TILE_MODE == "world":
+        build_world_tiles(col)
+        print(f"Created {WORLD_TILES[0]}x{WORLD_TILES[1]} seabed tiles '{ASSET_BASE_NAME}' in collection '{COLLECTION_NAME}'.")
+        return
+
+    heights = build_lod_heights()
+    # The tile repeats next to itself, so its opposite edges must split alike.
+    seeds = solve_edge_seeds([(0, 0)], lambda tile: heights, wrap=True)
+    build_tile(col, ASSET_BASE_NAME, heights, seeds=seeds[(0, 0)])
+    export_heightmap(ASSET_BASE_NAME, heights)
+
     print(f"Created seabed tile kit '{ASSET_BASE_NAME}' in collection '{COLLECTION_NAME}'.")
 
 if __name__ == "__main__":
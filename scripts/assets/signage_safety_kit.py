@@ -1,7 +1,15 @@
 import bpy
 import math
+import os
+import sys
 from typing import List, Tuple
 
+KIT_DIR = os.path.dirname(os.path.abspath(__file__))
+if KIT_DIR not in sys.path:
+    sys.path.append(KIT_DIR)
+
+from kitlib import lod_simplify, mesh_merge, primitives, snaps, trace  # noqa: E402
+
 # ============================================================
 # Signage & Safety Kit (Blender 5.0+)
 # Conventions:
@@ -15,9 +23,10 @@ COLLECTION_NAME = "SignageSafetyKit"
 FORWARD_AXIS = "+Y"
 ASSET_TYPE = "safety"
 
-LOD_RATIOS = [
-    ("lod1", 0.55),
-    ("lod2", 0.25),
+# Per-LOD kitlib.lod_simplify targets: max_error in meters and/or max_triangles.
+LOD_TARGETS = [
+    ("lod1", {"max_error": 0.003}),
+    ("lod2", {"max_error": 0.01}),
 ]
 
 # ------------------------------------------------------------
@@ -77,10 +86,10 @@ def wipe_collection(name: str):
 
 
 def purge_objects():
-    prefixes = ("safety_", "COLLIDER_safety_", "SNAP_")
+    prefixes = ("safety_", "COLLIDER_safety_")
     ensure_object_mode()
     for obj in list(bpy.data.objects):
-        if obj.name.startswith(prefixes):
+        if obj.name.startswith(prefixes) or snaps.owns_snap(obj.name, "safety_"):
             bpy.data.objects.remove(obj, do_unlink=True)
 
 
@@ -90,6 +99,7 @@ def add_custom_props(obj: bpy.types.Object, asset_role: str):
     obj["forward_axis"] = FORWARD_AXIS
 
 
+@trace.traced
 def shade_smooth_with_autosmooth(obj: bpy.types.Object, angle_deg: float = 35.0):
     if obj.type != "MESH":
         return
@@ -128,27 +138,12 @@ def assign_material(obj: bpy.types.Object, mat: bpy.types.Material):
 
 
 def add_box_part(name: str, dims: Tuple[float, float, float], location: Tuple[float, float, float], col: bpy.types.Collection):
-    bpy.ops.mesh.primitive_cube_add(size=1.0, location=location)
-    obj = bpy.context.active_object
-    obj.name = name
-    obj.scale = dims
-    bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
-    force_into_collection(obj, col)
-    return obj
+    return primitives.add_box(name, dims, location, col)
 
 
+@trace.traced
 def join_and_name(objs: List[bpy.types.Object], name: str) -> bpy.types.Object:
-    ensure_object_mode()
-    deselect_all()
-    for o in objs:
-        o.select_set(True)
-    bpy.context.view_layer.objects.active = objs[0]
-    bpy.ops.object.join()
-    obj = bpy.context.active_object
-    obj.name = name
-    if obj.data:
-        obj.data.name = name
-    return obj
+    return mesh_merge.merge_objects(objs, name)
 
 
 def bounds_from_mesh(obj: bpy.types.Object):
@@ -198,20 +193,15 @@ def create_collider_from_bounds(parent: bpy.types.Object, name: str, col: bpy.ty
     return collider
 
 
-def duplicate_with_decimate(src: bpy.types.Object, new_name: str, ratio: float, col: bpy.types.Collection) -> bpy.types.Object:
+@trace.traced
+def duplicate_simplified(src: bpy.types.Object, new_name: str, target: dict, col: bpy.types.Collection) -> bpy.types.Object:
     dup = src.copy()
     dup.data = src.data.copy()
     dup.name = new_name
     bpy.context.collection.objects.link(dup)
     force_into_collection(dup, col)
 
-    dec = dup.modifiers.new(name="Decimate", type="DECIMATE")
-    dec.ratio = ratio
-
-    bpy.context.view_layer.objects.active = dup
-    dup.select_set(True)
-    bpy.ops.object.convert(target="MESH")
-    dup.select_set(False)
+    lod_simplify.simplify(dup, src, **target)
 
     add_custom_props(dup, "visual_lod")
     return dup
@@ -224,10 +214,7 @@ def build_warning_sign(name: str, col: bpy.types.Collection) -> bpy.types.Object
     parts = []
 
     # post
-    bpy.ops.mesh.primitive_cylinder_add(vertices=16, radius=0.03, depth=2.2, location=(0.0, 0.0, 1.1))
-    post = bpy.context.active_object
-    post.name = f"{name}__post"
-    force_into_collection(post, col)
+    post = primitives.add_cylinder(f"{name}__post", 0.03, 2.2, (0.0, 0.0, 1.1), col, vertices=16)
     parts.append(post)
 
     # triangular panel (cube + rotate to look like warning board silhouette)
@@ -244,10 +231,7 @@ def build_warning_sign(name: str, col: bpy.types.Collection) -> bpy.types.Object
 
 def build_speed_board(name: str, col: bpy.types.Collection) -> bpy.types.Object:
     parts = []
-    bpy.ops.mesh.primitive_cylinder_add(vertices=16, radius=0.025, depth=2.4, location=(0.0, 0.0, 1.2))
-    post = bpy.context.active_object
-    post.name = f"{name}__post"
-    force_into_collection(post, col)
+    post = primitives.add_cylinder(f"{name}__post", 0.025, 2.4, (0.0, 0.0, 1.2), col, vertices=16)
     parts.append(post)
 
     board = add_box_part(f"{name}__board", (0.55, 0.03, 0.55), (0.0, 0.0, 1.95), col)
@@ -263,10 +247,7 @@ def build_speed_board(name: str, col: bpy.types.Collection) -> bpy.types.Object:
 
 def build_barrier_post(name: str, col: bpy.types.Collection) -> bpy.types.Object:
     parts = []
-    bpy.ops.mesh.primitive_cylinder_add(vertices=20, radius=0.06, depth=1.2, location=(0.0, 0.0, 0.6))
-    body = bpy.context.active_object
-    body.name = f"{name}__body"
-    force_into_collection(body, col)
+    body = primitives.add_cylinder(f"{name}__body", 0.06, 1.2, (0.0, 0.0, 0.6), col, vertices=20)
     parts.append(body)
 
     cap = add_box_part(f"{name}__cap", (0.16, 0.16, 0.08), (0.0, 0.0, 1.16), col)
@@ -286,10 +267,7 @@ def build_cone(name: str, col: bpy.types.Collection) -> bpy.types.Object:
     base = add_box_part(f"{name}__base", (0.34, 0.34, 0.05), (0.0, 0.0, 0.025), col)
     parts.append(base)
 
-    bpy.ops.mesh.primitive_cone_add(vertices=24, radius1=0.14, radius2=0.02, depth=0.45, location=(0.0, 0.0, 0.275))
-    cone = bpy.context.active_object
-    cone.name = f"{name}__cone"
-    force_into_collection(cone, col)
+    cone = primitives.add_cone(f"{name}__cone", 0.14, 0.02, 0.45, (0.0, 0.0, 0.275), col, vertices=24)
     parts.append(cone)
 
     stripe = add_box_part(f"{name}__stripe", (0.20, 0.20, 0.06), (0.0, 0.0, 0.28), col)
@@ -311,13 +289,14 @@ def add_snaps_for_asset(asset_name: str, obj: bpy.types.Object, col: bpy.types.C
     create_snap_empty(f"SNAP_TOP_{asset_name}", (cx, min_y, max_z), obj, col)
 
 
+@trace.traced
 def build_asset_with_lods(base_name: str, lod0_builder, col: bpy.types.Collection):
     lod0 = lod0_builder(f"{base_name}_lod0", col)
     lod0["asset_name"] = base_name
     lod0["lod"] = 0
 
-    for lod_name, ratio in LOD_RATIOS:
-        lod = duplicate_with_decimate(lod0, f"{base_name}_{lod_name}", ratio, col)
+    for lod_name, target in LOD_TARGETS:
+        lod = duplicate_simplified(lod0, f"{base_name}_{lod_name}", target, col)
         lod["asset_name"] = base_name
         lod["lod"] = int(lod_name[-1])
         lod.parent = lod0
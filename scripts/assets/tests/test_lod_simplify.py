@@ -0,0 +1,60 @@
+import math
+import os
+import sys
+import unittest
+
+import bpy
+
+ASSETS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ASSETS_DIR not in sys.path:
+    sys.path.append(ASSETS_DIR)
+
+from kitlib import lod_simplify  # noqa: E402
+
+# ============================================================
+# kitlib.lod_simplify checks (need Blender's bpy):
+#   blender --background --factory-startup --python-exit-code 1 \
+#       --python scripts/assets/tests/test_lod_simplify.py
+# ============================================================
+
+GRID_CUTS = 16
+
+
+def bumpy_grid(name: str) -> bpy.types.Object:
+    """2 m grid whose interior is bumped (so planar dissolve keeps it) and whose border stays flat."""
+    bpy.ops.mesh.primitive_grid_add(x_subdivisions=GRID_CUTS, y_subdivisions=GRID_CUTS, size=2.0)
+    obj = bpy.context.active_object
+    obj.name = name
+    for v in obj.data.vertices:
+        x, y = v.co.x, v.co.y
+        if max(abs(x), abs(y)) < 0.999:
+            v.co.z = 0.15 * math.sin(4.0 * x) * math.cos(3.0 * y) + 0.05 * math.sin(9.0 * x * y)
+    obj.data.update()
+    return obj
+
+
+def border_points(mesh: bpy.types.Mesh) -> set:
+    return {(round(v.co.x, 4), round(v.co.y, 4)) for v in mesh.vertices
+            if max(abs(v.co.x), abs(v.co.y)) > 0.999}
+
+
+class SimplifyProtectsBorders(unittest.TestCase):
+    def setUp(self):
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+
+    def test_border_survives_interior_collapse(self):
+        source = bumpy_grid("source")
+        target = bumpy_grid("target")
+        before = border_points(target.data)
+        source_tris = sum(len(p.vertices) - 2 for p in source.data.polygons)
+
+        record = lod_simplify.simplify(target, source, max_triangles=source_tris // 3)
+
+        self.assertLessEqual(record["triangles"], source_tris // 3)
+        self.assertEqual(border_points(target.data), before)
+
+
+if __name__ == "__main__":
+    result = unittest.main(argv=[sys.argv[0]], exit=False).result
+    if not result.wasSuccessful():
+        sys.exit(1)
@@ -1,5 +1,13 @@
 import bpy
 import math
+import os
+import sys
+
+KIT_DIR = os.path.dirname(os.path.abspath(__file__))
+if KIT_DIR not in sys.path:
+    sys.path.append(KIT_DIR)
+
+from kitlib import convex_decomp, mesh_merge, primitives, trace  # noqa: E402
 
 # ============================
 # Harbor Tire Fender Kit (Blender 5.0+)
@@ -32,8 +40,12 @@ LOD_ROPE_SEGMENTS   = {0: 16, 1: 12, 2: 8}
 # LOD2 simplification: represent tire as a simple low-poly cylinder "ringish"
 LOD2_USE_TORUS = False  # if False, LOD2 uses a cylinder shell approximation
 
-# Collider margins
-COLLIDER_MARGIN = 0.06
+# Collider: convex decomposition of LOD1 (kitlib.convex_decomp). The tyre
+# hole and the rope loops are what the hulls give up; error is hull volume
+# beyond the solid, as a fraction of it.
+COLLIDER_MAX_HULLS = 6
+COLLIDER_MAX_ERROR = 0.2
+COLLIDER_MAX_VERTICES = 24
 
 MAT_TIRE = None
 MAT_ROPE = None
@@ -132,22 +144,22 @@ def shade_smooth_auto(obj, angle_deg=35.0):
     bpy.ops.object.shade_auto_smooth(use_auto_smooth=True, angle=math.radians(angle_deg))
     obj.select_set(False)
 
-def apply_all_transforms(obj):
+@trace.traced
+def apply_modifiers_for_export(obj):
     ensure_object_mode()
     deselect_all()
     obj.select_set(True)
     set_active(obj)
-    bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
+    bpy.ops.object.convert(target='MESH')  # applies modifiers
     obj.select_set(False)
 
 def join_objects(objs, active_obj):
-    ensure_object_mode()
-    deselect_all()
-    for o in objs:
-        o.select_set(True)
-    set_active(active_obj)
-    bpy.ops.object.join()
-    return bpy.context.active_object
+    # As join did, the result takes active_obj's name, origin and transform.
+    matrix = mesh_merge.world_matrix(active_obj)
+    merged = mesh_merge.merge_objects(objs, active_obj.name)
+    merged.data.transform(matrix.inverted())
+    merged.matrix_world = matrix
+    return merged
 
 def bake_location_into_mesh(obj):
     """
@@ -180,30 +192,30 @@ def create_empty(name: str, loc, col):
 # Geometry builders
 # ----------------------------
 def make_tire_torus(lod: int, center, col):
+    import mathutils
+
     major_r = TIRE_OUTER_D * 0.5 - (TIRE_OUTER_D - TIRE_INNER_D) * 0.25
     minor_r = (TIRE_OUTER_D - TIRE_INNER_D) * 0.25  # approx "tube" radius
 
-    bpy.ops.mesh.primitive_torus_add(
-        major_segments=LOD_TORUS_MAJOR_SEG[lod],
-        minor_segments=LOD_TORUS_MINOR_SEG[lod],
-        major_radius=major_r,
-        minor_radius=minor_r,
-        location=center,
-        rotation=(math.radians(90), 0.0, 0.0)  # rotate so "hole axis" is Y; thickness along Y
-    )
-    t = bpy.context.active_object
-    link_only_to_collection(t, col)
-
-    assign_mat(t, MAT_TIRE)
-
     # Scale thickness along Y to match TIRE_THICK
     # Default torus tube is symmetric; we squash along Y a bit by scaling Y
-    # because we want a thicker tire depth. Better: scale after creation.
+    # because we want a thicker tire depth.
     target = TIRE_THICK
     # Roughly, torus "depth" depends on minor radius; we simply scale Y until bbox matches.
     # We'll do a simple scale guess:
-    t.scale.y = max(0.3, target / (minor_r * 2.0))
-    apply_all_transforms(t)
+    scale_y = max(0.3, target / (minor_r * 2.0))
+    # Rotate so "hole axis" is Y; thickness along Y. Rotation and scale are baked into the mesh.
+    rot = mathutils.Euler((math.radians(90), 0.0, 0.0)).to_matrix() @ mathutils.Matrix.Diagonal((1.0, scale_y, 1.0))
+
+    t = primitives.add_torus(
+        "Tire", major_r, minor_r, (0.0, 0.0, 0.0), col,
+        rotation=rot,
+        major_segments=LOD_TORUS_MAJOR_SEG[lod],
+        minor_segments=LOD_TORUS_MINOR_SEG[lod],
+    )
+    t.location = center
+
+    assign_mat(t, MAT_TIRE)
     return t
 
 def make_tire_lod2_shell(center, col):
@@ -214,31 +226,25 @@ def make_tire_lod2_shell(center, col):
     inner_r = TIRE_INNER_D * 0.5
 
     # Outer cylinder
-    bpy.ops.mesh.primitive_cylinder_add(
-        vertices=18, radius=outer_r, depth=TIRE_THICK,
-        location=center, rotation=(math.radians(90), 0.0, 0.0)
+    outer = primitives.add_cylinder(
+        "TireShell", outer_r, TIRE_THICK, (0.0, 0.0, 0.0), col,
+        rotation=(math.radians(90), 0.0, 0.0), vertices=18,
     )
-    outer = bpy.context.active_object
-    link_only_to_collection(outer, col)
+    outer.location = center
 
     # Inner cylinder (to be subtracted) — easiest is to just scale down and keep as visual hint
-    bpy.ops.mesh.primitive_cylinder_add(
-        vertices=18, radius=inner_r, depth=TIRE_THICK * 1.02,
-        location=center, rotation=(math.radians(90), 0.0, 0.0)
+    inner = primitives.add_cylinder(
+        "TireShellCutter", inner_r, TIRE_THICK * 1.02, (0.0, 0.0, 0.0), col,
+        rotation=(math.radians(90), 0.0, 0.0), vertices=18,
     )
-    inner = bpy.context.active_object
-    link_only_to_collection(inner, col)
+    inner.location = center
 
     # Boolean difference
     mod = outer.modifiers.new(name="BoolInner", type='BOOLEAN')
     mod.operation = 'DIFFERENCE'
     mod.object = inner
 
-    deselect_all()
-    outer.select_set(True)
-    set_active(outer)
-    bpy.ops.object.convert(target='MESH')
-    outer.select_set(False)
+    apply_modifiers_for_export(outer)
 
     # delete cutter
     deselect_all()
@@ -285,12 +291,7 @@ def make_rope_u_loop(lod: int, left_pt, right_pt, sag: float, col):
     link_only_to_collection(obj, col)
 
     # Convert to mesh so it joins cleanly
-    ensure_object_mode()
-    deselect_all()
-    obj.select_set(True)
-    set_active(obj)
-    bpy.ops.object.convert(target='MESH')
-    obj.select_set(False)
+    apply_modifiers_for_export(obj)
 
     assign_mat(obj, MAT_ROPE)
     return obj
@@ -309,24 +310,16 @@ def make_rope_segment(lod: int, p0, p1, col):
         return None
 
     mid = (v0 + v1) * 0.5
-    # Cylinder aligned along Z by default; rotate to align with d
-    bpy.ops.mesh.primitive_cylinder_add(
-        vertices=LOD_ROPE_SEGMENTS[lod],
-        radius=ROPE_RADIUS,
-        depth=length,
-        location=mid
+    # Cylinder aligned along Z by default; rotate local Z onto d (baked into the mesh)
+    z_axis = mathutils.Vector((0, 0, 1))
+    rot = z_axis.rotation_difference(d.normalized()).to_matrix()
+    c = primitives.add_cylinder(
+        "RopeSegment", ROPE_RADIUS, length, (0.0, 0.0, 0.0), col,
+        rotation=rot, vertices=LOD_ROPE_SEGMENTS[lod],
     )
-    c = bpy.context.active_object
-    link_only_to_collection(c, col)
+    c.location = mid
 
     assign_mat(c, MAT_ROPE)
-
-    # Align cylinder local Z to direction d
-    z_axis = mathutils.Vector((0, 0, 1))
-    rot = z_axis.rotation_difference(d.normalized())
-    c.rotation_mode = 'QUATERNION'
-    c.rotation_quaternion = rot
-    apply_all_transforms(c)
     return c
 
 
@@ -413,45 +406,23 @@ def build_fender(name_base: str, lod: int, variant: str, col):
         wn = merged.modifiers.new(name="WeightedNormal", type='WEIGHTED_NORMAL')
         wn.keep_sharp = True
 
-        deselect_all()
-        merged.select_set(True)
-        set_active(merged)
-        bpy.ops.object.convert(target='MESH')
-        merged.select_set(False)
+        apply_modifiers_for_export(merged)
 
     shade_smooth_auto(merged, 35.0)
     return merged
 
-def create_collider(parent_obj, name_base: str, variant: str, col):
+def create_collider(parent_obj, source_obj, name_base: str, col):
     """
-    Simple box collider enclosing the fender.
+    Convex hulls around the fender's LOD1 (tyres and ropes).
     """
-    outer_r = TIRE_OUTER_D * 0.5
-    w = (outer_r * 2.0) + COLLIDER_MARGIN * 2.0
-    d = (TIRE_THICK + ROPE_FORWARD_Y + 0.25) + COLLIDER_MARGIN * 2.0
-
-    # Height depends on variant
-    if variant == "single":
-        h = (HOOK_TO_TIRE_TOP + TIRE_OUTER_D) + COLLIDER_MARGIN * 2.0
-        z_center = -h * 0.5
-    else:
-        h = (HOOK_TO_TIRE_TOP + (TIRE_OUTER_D * 2.0) + DOUBLE_GAP_Z + TIRE_OUTER_D) + COLLIDER_MARGIN * 2.0
-        z_center = -h * 0.5
-
-    bpy.ops.mesh.primitive_cube_add(location=(0.0, d * 0.18, z_center))
-    c = bpy.context.active_object
-    c.scale = (w * 0.5, d * 0.5, h * 0.5)
-    apply_all_transforms(c)
-
-    c.name = f"COLLIDER_{name_base}"
-    c.display_type = 'WIRE'
-    c.hide_render = True
-    link_only_to_collection(c, col)
-    add_custom_props(c, "collision")
-
-    c.parent = parent_obj
-    c.matrix_parent_inverse = parent_obj.matrix_world.inverted()
-    return c
+    colliders = convex_decomp.create_hull_colliders(
+        parent_obj, name_base, source_obj, col,
+        max_hulls=COLLIDER_MAX_HULLS, max_error=COLLIDER_MAX_ERROR,
+        max_vertices=COLLIDER_MAX_VERTICES,
+    )
+    for c in colliders:
+        add_custom_props(c, "collision")
+    return colliders
 
 def add_snaps(parent_obj, name_base: str, variant: str, col):
     snap_hook = create_empty(f"SNAP_HOOK_{name_base}", (0.0, 0.0, 0.0), col)
@@ -483,7 +454,7 @@ def main():
     lod1_s.parent = lod0_s
     lod2_s.parent = lod0_s
 
-    create_collider(lod0_s, base_single, "single", col)
+    create_collider(lod0_s, lod1_s, base_single, col)
     add_snaps(lod0_s, base_single, "single", col)
 
     # ---- Double variant ----
@@ -495,7 +466,7 @@ def main():
     lod1_d.parent = lod0_d
     lod2_d.parent = lod0_d
 
-    create_collider(lod0_d, base_double, "double", col)
+    create_collider(lod0_d, lod1_d, base_double, col)
     add_snaps(lod0_d, base_double, "double", col)
 
     print(f"Created tire fender kit in collection '{COLLECTION_NAME}'.")
@@ -2,6 +2,8 @@ import bpy
 import bmesh
 from math import radians
 
+COLLECTION_NAME = "UTILITY_CABINET"
+
 # ----------------------------
 # Idempotency: remove our generated collection tree
 # ----------------------------
@@ -236,7 +238,7 @@ def build_cabinet_lod2(name: str, w=0.80, d=0.35, h=1.20):
 
 def make_utility_cabinet(name="UtilityCabinet",
                          w=0.80, d=0.35, h=1.20):
-    root_col = ensure_collection("UTILITY_CABINET")
+    root_col = ensure_collection(COLLECTION_NAME)
     col_lod0 = ensure_collection(f"{name}_LOD0", root_col)
     col_lod1 = ensure_collection(f"{name}_LOD1", root_col)
     col_lod2 = ensure_collection(f"{name}_LOD2", root_col)
@@ -279,6 +281,11 @@ def make_utility_cabinet(name="UtilityCabinet",
 # Run (idempotent)
 # ----------------------------
 
-remove_collection_tree("UTILITY_CABINET")
-make_utility_cabinet(name="UtilityCabinet_Small", w=0.70, d=0.30, h=1.10)
-make_utility_cabinet(name="UtilityCabinet_Large", w=0.95, d=0.40, h=1.45)
+def main():
+    remove_collection_tree(COLLECTION_NAME)
+    make_utility_cabinet(name="UtilityCabinet_Small", w=0.70, d=0.30, h=1.10)
+    make_utility_cabinet(name="UtilityCabinet_Large", w=0.95, d=0.40, h=1.45)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,14 @@
 import bpy
-import bmesh
 import math
-from typing import Dict, List, Optional, Tuple
+import os
+import sys
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+KIT_DIR = os.path.dirname(os.path.abspath(__file__))
+if KIT_DIR not in sys.path:
+    sys.path.append(KIT_DIR)
+
+from kitlib import booleans, build_cache, colliders, mesh_merge, normal_bake, primitives, snaps, trace  # noqa: E402
 
 # ============================================================
 # Warehouse Kit (Blender 5.0+)
@@ -24,11 +31,19 @@ ROOF_THICKNESS = 0.18
 FRAME_W = 0.18
 ROLLER_DOOR_HEIGHT = 5.0
 
+# Corrugation is geometry at LOD0 only; lower LODs get it from a normal
+# map baked from LOD0 (bake_size > 0) and packed into the kit atlas.
 LOD_SETTINGS = {
-    "lod0": {"rib_spacing": 1.35, "rib_depth": 0.06, "roof_seam_spacing": 1.4, "door_slats": 12},
-    "lod1": {"rib_spacing": 2.4, "rib_depth": 0.04, "roof_seam_spacing": 2.8, "door_slats": 6},
-    "lod2": {"rib_spacing": 0.0, "rib_depth": 0.0, "roof_seam_spacing": 0.0, "door_slats": 0},
+    "lod0": {"rib_spacing": 1.35, "rib_depth": 0.06, "roof_seam_spacing": 1.4, "door_slats": 12, "bake_size": 0},
+    "lod1": {"rib_spacing": 0.0, "rib_depth": 0.0, "roof_seam_spacing": 0.0, "door_slats": 0, "bake_size": 1024},
+    "lod2": {"rib_spacing": 0.0, "rib_depth": 0.0, "roof_seam_spacing": 0.0, "door_slats": 0, "bake_size": 512},
 }
+# Deeper than the deepest LOD0 groove (rib_depth * 1.2).
+BAKE_CAGE_EXTRUSION = 0.1
+NORMAL_ATLAS_NAME = "Warehouse_NormalAtlas"
+
+# Collider boxes per asset, see shell_colliders.
+COLLIDER_BUDGET = 24
 
 MODULES = [
     {"name": "warehouse_wall_6m", "kind": "wall", "length": 6.0, "enabled": True},
@@ -111,10 +126,10 @@ def wipe_collection(name: str):
 
 
 def purge_warehouse_objects():
-    prefixes = (f"{ASSET_TYPE}_", "COLLIDER_", "SNAP_")
+    prefixes = (f"{ASSET_TYPE}_", f"COLLIDER_{ASSET_TYPE}_")
     ensure_object_mode()
     for obj in list(bpy.data.objects):
-        if obj.name.startswith(prefixes):
+        if obj.name.startswith(prefixes) or snaps.owns_snap(obj.name, f"{ASSET_TYPE}_"):
             bpy.data.objects.remove(obj, do_unlink=True)
 
 
@@ -124,6 +139,7 @@ def add_custom_props(obj: bpy.types.Object, asset_role: str):
     obj["forward_axis"] = FORWARD_AXIS
 
 
+@trace.traced
 def shade_smooth_with_autosmooth(obj: bpy.types.Object, angle_deg: float = 35.0):
     if obj.type != "MESH":
         return
@@ -134,6 +150,14 @@ def shade_smooth_with_autosmooth(obj: bpy.types.Object, angle_deg: float = 35.0)
     obj.select_set(False)
 
 
+@trace.traced
+def apply_modifiers_for_export(obj: bpy.types.Object):
+    bpy.context.view_layer.objects.active = obj
+    obj.select_set(True)
+    bpy.ops.object.convert(target="MESH")  # applies modifiers
+    obj.select_set(False)
+
+
 def get_or_create_material(name: str, base_color: Tuple[float, float, float, float], roughness: float, metallic: float = 0.0):
     mat = bpy.data.materials.get(name)
     if mat is None:
@@ -163,30 +187,12 @@ def assign_material(obj: bpy.types.Object, mat: bpy.types.Material):
 
 def add_box_part(name: str, dims: Tuple[float, float, float], loc: Tuple[float, float, float],
                  col: bpy.types.Collection, rot: Optional[Tuple[float, float, float]] = None) -> bpy.types.Object:
-    kwargs = {"size": 1.0, "location": loc}
-    if rot is not None:
-        kwargs["rotation"] = rot
-    bpy.ops.mesh.primitive_cube_add(**kwargs)
-    obj = bpy.context.active_object
-    obj.name = name
-    obj.scale = (dims[0], dims[1], dims[2])
-    bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
-    force_into_collection(obj, col)
-    return obj
+    return primitives.add_box(name, dims, loc, col, rotation=rot)
 
 
+@trace.traced
 def join_and_name(objs: List[bpy.types.Object], name: str) -> bpy.types.Object:
-    ensure_object_mode()
-    deselect_all()
-    for o in objs:
-        o.select_set(True)
-    bpy.context.view_layer.objects.active = objs[0]
-    bpy.ops.object.join()
-    obj = bpy.context.active_object
-    obj.name = name
-    if obj.data:
-        obj.data.name = name
-    return obj
+    return mesh_merge.merge_objects(objs, name)
 
 
 def bounds_from_mesh(obj: bpy.types.Object):
@@ -206,6 +212,13 @@ def set_origin_start_face_ground(obj: bpy.types.Object):
     obj.location = (0.0, 0.0, 0.0)
 
 
+def start_face_offset(parts: List[colliders.Primitive]) -> Tuple[float, float, float]:
+    """The shift set_origin_start_face_ground applies to a mesh built from parts."""
+    lo, hi = colliders.bounds(parts)
+    return ((lo[0] + hi[0]) * 0.5, lo[1], lo[2])
+
+
+@trace.traced
 def apply_bevel(obj: bpy.types.Object, width: float):
     if width <= 0.0:
         return
@@ -216,15 +229,6 @@ def apply_bevel(obj: bpy.types.Object, width: float):
     mod.angle_limit = math.radians(45.0)
 
 
-def apply_rotation_only(obj: bpy.types.Object):
-    ensure_object_mode()
-    deselect_all()
-    bpy.context.view_layer.objects.active = obj
-    obj.select_set(True)
-    bpy.ops.object.transform_apply(location=False, rotation=True, scale=False)
-    obj.select_set(False)
-
-
 def create_snap_empty(name: str, location: Tuple[float, float, float], parent: bpy.types.Object, col: bpy.types.Collection):
     deselect_all()
     bpy.ops.object.empty_add(type="PLAIN_AXES", location=location)
@@ -237,66 +241,21 @@ def create_snap_empty(name: str, location: Tuple[float, float, float], parent: b
     return snap
 
 
-def create_collider_from_bounds(parent: bpy.types.Object, asset_name: str, col: bpy.types.Collection):
-    min_x, max_x, min_y, max_y, min_z, max_z = bounds_from_mesh(parent)
-    sx = max_x - min_x
-    sy = max_y - min_y
-    sz = max_z - min_z
-    cx = (min_x + max_x) * 0.5
-    cy = (min_y + max_y) * 0.5
-    cz = (min_z + max_z) * 0.5
-
-    collider = add_box_part(f"COLLIDER_{asset_name}", (sx, sy, sz), (cx, cy, cz), col)
-    add_custom_props(collider, "collision")
-    collider.parent = parent
-    collider.matrix_parent_inverse = parent.matrix_world.inverted()
-    collider.display_type = "WIRE"
-    collider.hide_render = True
-    return collider
+def create_compound_collider(parent: bpy.types.Object, asset_name: str, parts: List[colliders.Primitive],
+                             col: bpy.types.Collection) -> List[bpy.types.Object]:
+    objs = colliders.create_compound(parent, asset_name, parts, col, COLLIDER_BUDGET)
+    for collider in objs:
+        add_custom_props(collider, "collision")
+    return objs
 
 
 # ------------------------------------------------------------
 # Geometry builders
 # ------------------------------------------------------------
+@trace.traced
 def apply_boolean_difference(target: bpy.types.Object, cutters: List[bpy.types.Object], join_name: str):
-    if target.type != "MESH" or not cutters:
-        return
-
-    ensure_object_mode()
-    deselect_all()
-    backup_mesh = target.data.copy()
-    failed = False
-
-    bpy.context.view_layer.objects.active = target
-    target.select_set(True)
-
-    for i, cutter in enumerate(cutters):
-        if cutter is None or cutter.type != "MESH":
-            continue
-        mod = target.modifiers.new(name=f"{join_name}_{i:03d}", type="BOOLEAN")
-        mod.operation = "DIFFERENCE"
-        mod.solver = "EXACT"
-        mod.object = cutter
-        try:
-            bpy.ops.object.modifier_apply(modifier=mod.name)
-        except RuntimeError:
-            failed = True
-            break
-
-    target.select_set(False)
-
-    if failed or len(target.data.polygons) < 6:
-        old_mesh = target.data
-        target.data = backup_mesh
-        if old_mesh and old_mesh.users == 0:
-            bpy.data.meshes.remove(old_mesh)
-    else:
-        if backup_mesh and backup_mesh.users == 0:
-            bpy.data.meshes.remove(backup_mesh)
-
-    for cutter in cutters:
-        if cutter and cutter.name in bpy.data.objects:
-            bpy.data.objects.remove(cutter, do_unlink=True)
+    # One merged cutter and one boolean per target; see kitlib.booleans for the fallbacks.
+    booleans.difference(target, cutters, join_name)
 
 
 def create_vertical_corrugation_cutters(prefix: str, normal_axis: str, repeat_axis: str,
@@ -360,45 +319,24 @@ def apply_roof_corrugation(roof_obj: bpy.types.Object, prefix: str, width: float
         y = (i + 0.5) * (length / count)
         if centered_y:
             y -= length * 0.5
-        cutters.append(
-            add_box_part(
-                f"{prefix}__roof_cut_{i:02d}",
-                (width - 0.35, groove_w, groove_t),
-                (0.0, y, roof_top_z - groove_t * 0.5 + BOOLEAN_OVERLAP_EPS),
-                col,
-            )
+        cutter = add_box_part(
+            f"{prefix}__roof_cut_{i:02d}",
+            (width - 0.35, groove_w, groove_t),
+            (0.0, y, roof_top_z - groove_t * 0.5 + BOOLEAN_OVERLAP_EPS),
+            col,
         )
+        # Grooves are laid out in the roof's local frame; sloped panels keep their tilt as a transform.
+        cutter.matrix_basis = roof_obj.matrix_basis.copy()
+        cutters.append(cutter)
 
     apply_boolean_difference(roof_obj, cutters, f"{prefix}_roof_corr")
 
 
 def add_triangle_prism_xz(name: str, x0: float, z0: float, x1: float, z1: float, x2: float, z2: float,
                           y_center: float, y_thickness: float, col: bpy.types.Collection) -> bpy.types.Object:
-    mesh = bpy.data.meshes.new(name + "_Mesh")
-    bm = bmesh.new()
     y0 = y_center - y_thickness * 0.5
     y1 = y_center + y_thickness * 0.5
-
-    v0 = bm.verts.new((x0, y0, z0))
-    v1 = bm.verts.new((x1, y0, z1))
-    v2 = bm.verts.new((x2, y0, z2))
-    v3 = bm.verts.new((x0, y1, z0))
-    v4 = bm.verts.new((x1, y1, z1))
-    v5 = bm.verts.new((x2, y1, z2))
-
-    bm.faces.new((v0, v1, v2))
-    bm.faces.new((v5, v4, v3))
-    bm.faces.new((v0, v3, v4, v1))
-    bm.faces.new((v1, v4, v5, v2))
-    bm.faces.new((v2, v5, v3, v0))
-
-    bm.to_mesh(mesh)
-    bm.free()
-
-    obj = bpy.data.objects.new(name, mesh)
-    bpy.context.scene.collection.objects.link(obj)
-    force_into_collection(obj, col)
-    return obj
+    return primitives.add_prism(name, [(x0, z0), (x1, z1), (x2, z2)], y0, y1, col)
 
 
 def apply_endcap_corrugation(cap_obj: bpy.types.Object, prefix: str, spacing: float, depth: float,
@@ -451,8 +389,6 @@ def apply_clerestory_corrugation(wall_obj: bpy.types.Object, prefix: str, spacin
         thickness=thickness,
         col=col,
     )
-    apply_boolean_difference(wall_obj, cutters_neg, f"{prefix}_corr_negx")
-
     cutters_pos = create_vertical_corrugation_cutters(
         prefix=prefix + "_posx",
         normal_axis="X",
@@ -469,14 +405,171 @@ def apply_clerestory_corrugation(wall_obj: bpy.types.Object, prefix: str, spacin
         thickness=thickness,
         col=col,
     )
-    apply_boolean_difference(wall_obj, cutters_pos, f"{prefix}_corr_posx")
+    apply_boolean_difference(wall_obj, cutters_neg + cutters_pos, f"{prefix}_corr")
+
+
+# ------------------------------------------------------------
+# Shells and LOD details
+# A shell holds what every LOD of an asset shares (panels, openings,
+# frames, trim), built once per asset. Details are the per-LOD passes
+# (ribs, roof seams, door slats) run on each LOD's copy of a part, and
+# children are sub-assemblies (roller doors) finished once per LOD and
+# placed at several locations. Holes are the openings cut into the parts,
+# kept so the collider leaves them open as well.
+# ------------------------------------------------------------
+Detail = Callable[[bpy.types.Object, str, bpy.types.Collection], None]
+MaterialSpec = Tuple[str, Tuple[float, float, float, float], float, float]
+
 
+def new_shell(name: str, bevel: float, material: MaterialSpec) -> Dict:
+    return {"name": name, "bevel": bevel, "material": material, "parts": [], "details": [], "children": [],
+            "holes": []}
 
-def build_roof_parts(prefix: str, width: float, length: float, wall_h: float, roof_type: str,
-                     lod_key: str, col: bpy.types.Collection) -> List[bpy.types.Object]:
-    s = LOD_SETTINGS[lod_key]
-    parts: List[bpy.types.Object] = []
 
+def add_shell_part(shell: Dict, obj: bpy.types.Object, detail: Optional[Detail] = None) -> bpy.types.Object:
+    shell["parts"].append(obj)
+    if detail is not None:
+        shell["details"].append((obj.name, detail))
+    return obj
+
+
+def derive_lod_parts(shell: Dict, lod_key: str, col: bpy.types.Collection) -> List[bpy.types.Object]:
+    copies: Dict[str, bpy.types.Object] = {}
+    for part in shell["parts"]:
+        dup = part.copy()
+        dup.data = part.data.copy()
+        col.objects.link(dup)
+        copies[part.name] = dup
+    for part_name, detail in shell["details"]:
+        detail(copies[part_name], lod_key, col)
+    return list(copies.values())
+
+
+@trace.traced
+def build_lod(shell: Dict, lod_key: str, col: bpy.types.Collection) -> bpy.types.Object:
+    parts = derive_lod_parts(shell, lod_key, col)
+    for child, locations in shell["children"]:
+        child_obj = build_lod(child, lod_key, col)
+        placed = [child_obj] + [child_obj.copy() for _ in locations[1:]]
+        for obj, loc in zip(placed, locations):
+            if obj is not child_obj:
+                col.objects.link(obj)
+            obj.location = loc
+        parts.extend(placed)
+
+    obj = join_and_name(parts, f"{shell['name']}_{lod_key}")
+    set_origin_start_face_ground(obj)
+    apply_bevel(obj, shell["bevel"] if lod_key != "lod2" else 0.0)
+    apply_modifiers_for_export(obj)
+    shade_smooth_with_autosmooth(obj, 35.0)
+    add_custom_props(obj, "visual" if lod_key == "lod0" else "visual_lod")
+    assign_material(obj, get_or_create_material(*shell["material"]))
+    return obj
+
+
+def remove_shell(shell: Dict):
+    for child, _locations in shell["children"]:
+        remove_shell(child)
+    for part in shell["parts"]:
+        mesh = part.data
+        bpy.data.objects.remove(part, do_unlink=True)
+        if mesh is not None and mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
+
+def shell_colliders(shell: Dict) -> List[colliders.Primitive]:
+    """
+    One box per shell part (oriented boxes for the rotated roof panels,
+    bounds for the gable prisms) with the openings cut out, plus the
+    children at each placement, relative to the LOD's start face.
+    """
+    parts = colliders.cut([colliders.from_object(part) for part in shell["parts"]], shell["holes"])
+    for child, locations in shell["children"]:
+        child_parts = shell_colliders(child)
+        for loc in locations:
+            parts.extend(colliders.translated(child_parts, loc))
+    offset = start_face_offset(parts)
+    return colliders.translated(parts, [-v for v in offset])
+
+
+def wall_corrugation_detail(prefix: str, faces: List[Dict]) -> Detail:
+    """faces: create_vertical_corrugation_cutters arguments other than depth, spacing and col."""
+    def detail(obj: bpy.types.Object, lod_key: str, col: bpy.types.Collection):
+        s = LOD_SETTINGS[lod_key]
+        cutters: List[bpy.types.Object] = []
+        for face in faces:
+            cutters += create_vertical_corrugation_cutters(depth=s["rib_depth"], spacing=s["rib_spacing"], col=col, **face)
+        apply_boolean_difference(obj, cutters, f"{prefix}_{lod_key}_corr")
+    return detail
+
+
+def roof_corrugation_detail(prefix: str, width: float, length: float, roof_top_z: float, centered_y: bool = False) -> Detail:
+    def detail(obj: bpy.types.Object, lod_key: str, col: bpy.types.Collection):
+        s = LOD_SETTINGS[lod_key]
+        apply_roof_corrugation(obj, prefix, width, length, s["roof_seam_spacing"], s["rib_depth"], roof_top_z, col, centered_y=centered_y)
+    return detail
+
+
+def endcap_corrugation_detail(prefix: str, face_dir: float) -> Detail:
+    def detail(obj: bpy.types.Object, lod_key: str, col: bpy.types.Collection):
+        s = LOD_SETTINGS[lod_key]
+        apply_endcap_corrugation(obj, prefix, s["rib_spacing"], s["rib_depth"], face_dir=face_dir, col=col)
+    return detail
+
+
+def clerestory_corrugation_detail(prefix: str) -> Detail:
+    def detail(obj: bpy.types.Object, lod_key: str, col: bpy.types.Collection):
+        s = LOD_SETTINGS[lod_key]
+        apply_clerestory_corrugation(obj, prefix, s["rib_spacing"], s["rib_depth"], col)
+    return detail
+
+
+def shutter_slat_detail(prefix: str, width: float, frame_t: float, shutter_h: float, shutter_z: float) -> Detail:
+    def detail(obj: bpy.types.Object, lod_key: str, col: bpy.types.Collection):
+        s = LOD_SETTINGS[lod_key]
+        corr_count = int(s["door_slats"])
+        if corr_count <= 0 or s["rib_depth"] <= 0.0:
+            return
+        z_min = shutter_z - (shutter_h * 0.5) + 0.08
+        z_max = shutter_z + (shutter_h * 0.5) - 0.08
+        groove_t = max(0.01, s["rib_depth"] * 0.9)
+        groove_h = max(0.03, (z_max - z_min) / max(1, corr_count * 2))
+        groove_w = width - frame_t * 2.2
+        cutters: List[bpy.types.Object] = []
+        for i in range(corr_count):
+            z = z_min + (i + 0.5) * ((z_max - z_min) / corr_count)
+            cutters.append(
+                add_box_part(
+                    f"{prefix}__shutter_hcorr_cut_{i:02d}",
+                    (groove_w, groove_t, groove_h),
+                    (0.0, groove_t * 0.5 - BOOLEAN_OVERLAP_EPS, z),
+                    col,
+                )
+            )
+        apply_boolean_difference(obj, cutters, f"{prefix}_{lod_key}_shutter_corr")
+    return detail
+
+
+def personnel_door_detail(prefix: str, p_w: float, p_h: float, p_x: float, p_y: float, p_z: float) -> Detail:
+    def detail(obj: bpy.types.Object, lod_key: str, col: bpy.types.Collection):
+        s = LOD_SETTINGS[lod_key]
+        if s["rib_depth"] <= 0.0:
+            return
+        band_t = max(0.01, s["rib_depth"] * 0.8)
+        pd_cutters = [
+            add_box_part(f"{prefix}__pd_cut_l", (0.06, band_t, p_h - 0.08), (p_x - p_w * 0.5 + 0.05, p_y + 0.01 + band_t * 0.5, p_z), col),
+            add_box_part(f"{prefix}__pd_cut_r", (0.06, band_t, p_h - 0.08), (p_x + p_w * 0.5 - 0.05, p_y + 0.01 + band_t * 0.5, p_z), col),
+            add_box_part(f"{prefix}__pd_cut_t", (p_w - 0.08, band_t, 0.08), (p_x, p_y + 0.01 + band_t * 0.5, p_h - 0.04), col),
+        ]
+        apply_boolean_difference(obj, pd_cutters, f"{prefix}_{lod_key}_pd_corr")
+    return detail
+
+
+# ------------------------------------------------------------
+# Shell builders
+# ------------------------------------------------------------
+def add_roof_parts(shell: Dict, prefix: str, width: float, length: float, wall_h: float, roof_type: str,
+                   col: bpy.types.Collection):
     if roof_type == "gable":
         rise = max(0.7, min(2.2, width * 0.09))
         half_w = width * 0.5
@@ -491,10 +584,9 @@ def build_roof_parts(prefix: str, width: float, length: float, wall_h: float, ro
             (0.0, 0.0, 0.0),
             col,
         )
-        apply_roof_corrugation(left, prefix + "_gable_l", panel_w, length, s["roof_seam_spacing"], s["rib_depth"], ROOF_THICKNESS * 0.5, col, centered_y=True)
         left.location = (-panel_w * 0.5, length * 0.5, cz)
         left.rotation_euler = (0.0, -angle, 0.0)
-        apply_rotation_only(left)
+        add_shell_part(shell, left, roof_corrugation_detail(prefix + "_gable_l", panel_w, length, ROOF_THICKNESS * 0.5, centered_y=True))
 
         right = add_box_part(
             f"{prefix}__roof_gable_r",
@@ -502,10 +594,9 @@ def build_roof_parts(prefix: str, width: float, length: float, wall_h: float, ro
             (0.0, 0.0, 0.0),
             col,
         )
-        apply_roof_corrugation(right, prefix + "_gable_r", panel_w, length, s["roof_seam_spacing"], s["rib_depth"], ROOF_THICKNESS * 0.5, col, centered_y=True)
         right.location = (panel_w * 0.5, length * 0.5, cz)
         right.rotation_euler = (0.0, angle, 0.0)
-        apply_rotation_only(right)
+        add_shell_part(shell, right, roof_corrugation_detail(prefix + "_gable_r", panel_w, length, ROOF_THICKNESS * 0.5, centered_y=True))
 
         ridge = add_box_part(
             f"{prefix}__roof_ridge",
@@ -513,20 +604,20 @@ def build_roof_parts(prefix: str, width: float, length: float, wall_h: float, ro
             (0.0, length * 0.5, wall_h + rise + 0.03),
             col,
         )
+        add_shell_part(shell, ridge)
         # Triangular end closures for gable end gaps.
         front_tri = add_triangle_prism_xz(
             f"{prefix}__gable_end_f",
             -half_w, wall_h, half_w, wall_h, 0.0, wall_h + rise,
             0.03, 0.06, col
         )
-        apply_endcap_corrugation(front_tri, f"{prefix}_gable_end_f", s["rib_spacing"], s["rib_depth"], face_dir=-1.0, col=col)
+        add_shell_part(shell, front_tri, endcap_corrugation_detail(f"{prefix}_gable_end_f", face_dir=-1.0))
         back_tri = add_triangle_prism_xz(
             f"{prefix}__gable_end_b",
             -half_w, wall_h, half_w, wall_h, 0.0, wall_h + rise,
             length - 0.03, 0.06, col
         )
-        apply_endcap_corrugation(back_tri, f"{prefix}_gable_end_b", s["rib_spacing"], s["rib_depth"], face_dir=1.0, col=col)
-        parts.extend([left, right, ridge, front_tri, back_tri])
+        add_shell_part(shell, back_tri, endcap_corrugation_detail(f"{prefix}_gable_end_b", face_dir=1.0))
 
     elif roof_type == "sawtooth":
         base_top = wall_h + ROOF_THICKNESS
@@ -536,7 +627,7 @@ def build_roof_parts(prefix: str, width: float, length: float, wall_h: float, ro
             (0.0, length * 0.5, wall_h + ROOF_THICKNESS * 0.5),
             col,
         )
-        parts.append(base)
+        add_shell_part(shell, base, roof_corrugation_detail(prefix + "_saw_base", width, length, base_top))
         tooth_count = max(2, int(width / 4.5))
         tooth_w = width / tooth_count
         lift = max(0.45, min(1.1, width * 0.03))
@@ -551,8 +642,7 @@ def build_roof_parts(prefix: str, width: float, length: float, wall_h: float, ro
                 (x_peak, length * 0.5, base_top + lift * 0.5),
                 col,
             )
-            apply_clerestory_corrugation(wall_piece, f"{prefix}_roof_tooth_wall_{i:02d}", s["rib_spacing"], s["rib_depth"], col)
-            parts.append(wall_piece)
+            add_shell_part(shell, wall_piece, clerestory_corrugation_detail(f"{prefix}_roof_tooth_wall_{i:02d}"))
 
             # Sloped panel from apex down to next valley; low edge flush to base roof.
             span = max(0.2, x1 - x_peak)
@@ -564,11 +654,9 @@ def build_roof_parts(prefix: str, width: float, length: float, wall_h: float, ro
                 (0.0, 0.0, 0.0),
                 col,
             )
-            apply_roof_corrugation(panel, f"{prefix}_slope_{i:02d}", span, length, s["roof_seam_spacing"], s["rib_depth"], ROOF_THICKNESS * 0.5, col, centered_y=True)
             panel.location = ((x_peak + x1) * 0.5, length * 0.5, cz)
             panel.rotation_euler = (0.0, angle, 0.0)
-            apply_rotation_only(panel)
-            parts.append(panel)
+            add_shell_part(shell, panel, roof_corrugation_detail(f"{prefix}_slope_{i:02d}", span, length, ROOF_THICKNESS * 0.5, centered_y=True))
 
             # True triangular end caps for each sawtooth opening.
             front_tri = add_triangle_prism_xz(
@@ -576,16 +664,13 @@ def build_roof_parts(prefix: str, width: float, length: float, wall_h: float, ro
                 x_peak, base_top, x1, base_top, x_peak, base_top + lift,
                 0.03, 0.06, col
             )
-            apply_endcap_corrugation(front_tri, f"{prefix}_roof_tooth_cap_f_{i:02d}", s["rib_spacing"], s["rib_depth"], face_dir=-1.0, col=col)
+            add_shell_part(shell, front_tri, endcap_corrugation_detail(f"{prefix}_roof_tooth_cap_f_{i:02d}", face_dir=-1.0))
             back_tri = add_triangle_prism_xz(
                 f"{prefix}__roof_tooth_cap_b_{i:02d}",
                 x_peak, base_top, x1, base_top, x_peak, base_top + lift,
                 length - 0.03, 0.06, col
             )
-            apply_endcap_corrugation(back_tri, f"{prefix}_roof_tooth_cap_b_{i:02d}", s["rib_spacing"], s["rib_depth"], face_dir=1.0, col=col)
-            parts.extend([front_tri, back_tri])
-
-        apply_roof_corrugation(base, prefix + "_saw_base", width, length, s["roof_seam_spacing"], s["rib_depth"], base_top, col)
+            add_shell_part(shell, back_tri, endcap_corrugation_detail(f"{prefix}_roof_tooth_cap_b_{i:02d}", face_dir=1.0))
 
     else:
         roof = add_box_part(
@@ -594,77 +679,42 @@ def build_roof_parts(prefix: str, width: float, length: float, wall_h: float, ro
             (0.0, length * 0.5, wall_h + ROOF_THICKNESS * 0.5),
             col,
         )
-        parts.append(roof)
-        apply_roof_corrugation(roof, prefix + "_flat", width, length, s["roof_seam_spacing"], s["rib_depth"], wall_h + ROOF_THICKNESS, col)
-
-    return parts
-
+        add_shell_part(shell, roof, roof_corrugation_detail(prefix + "_flat", width, length, wall_h + ROOF_THICKNESS))
 
-def build_wall_module(asset_name: str, length: float, lod_key: str, col: bpy.types.Collection) -> bpy.types.Object:
-    s = LOD_SETTINGS[lod_key]
-    parts: List[bpy.types.Object] = []
 
+def build_wall_shell(asset_name: str, length: float, col: bpy.types.Collection) -> Dict:
+    shell = new_shell(asset_name, 0.01, ("Warehouse_Wall", (0.36, 0.38, 0.40, 1.0), 0.7, 0.05))
     wall = add_box_part(
         f"{asset_name}__panel",
         (WALL_THICKNESS, length, WALL_HEIGHT),
         (0.0, length * 0.5, WALL_HEIGHT * 0.5),
         col,
     )
-    parts.append(wall)
+    faces = [
+        {"prefix": asset_name + side, "normal_axis": "X", "repeat_axis": "Y",
+         "center_x": 0.0, "center_y": length * 0.5, "repeat_min": 0.1, "repeat_max": length - 0.1,
+         "z_min": 0.0, "z_max": WALL_HEIGHT, "face_dir": face_dir, "thickness": WALL_THICKNESS}
+        for side, face_dir in (("_negx", -1.0), ("_posx", 1.0))
+    ]
+    add_shell_part(shell, wall, wall_corrugation_detail(asset_name, faces))
+    return shell
 
-    cutters = []
-    cutters += create_vertical_corrugation_cutters(
-        asset_name + "_negx", "X", "Y",
-        0.0, length * 0.5, 0.1, length - 0.1, 0.0, WALL_HEIGHT,
-        s["rib_depth"], s["rib_spacing"], -1.0, WALL_THICKNESS, col
-    )
-    cutters += create_vertical_corrugation_cutters(
-        asset_name + "_posx", "X", "Y",
-        0.0, length * 0.5, 0.1, length - 0.1, 0.0, WALL_HEIGHT,
-        s["rib_depth"], s["rib_spacing"], 1.0, WALL_THICKNESS, col
-    )
-    apply_boolean_difference(wall, cutters, f"{asset_name}_{lod_key}_corr")
 
-    obj = join_and_name(parts, f"{asset_name}_{lod_key}")
-    set_origin_start_face_ground(obj)
-    apply_bevel(obj, 0.01 if lod_key != "lod2" else 0.0)
-    bpy.context.view_layer.objects.active = obj
-    obj.select_set(True)
-    bpy.ops.object.convert(target="MESH")
-    obj.select_set(False)
-    shade_smooth_with_autosmooth(obj, 35.0)
-    add_custom_props(obj, "visual" if lod_key == "lod0" else "visual_lod")
-    assign_material(obj, get_or_create_material("Warehouse_Wall", (0.36, 0.38, 0.40, 1.0), 0.7, 0.05))
-    return obj
-
-
-def build_roof_module(asset_name: str, length: float, lod_key: str, col: bpy.types.Collection, roof_type: str = "flat") -> bpy.types.Object:
-    width = 6.0
-    parts = build_roof_parts(asset_name, width, length, 0.0, roof_type, lod_key, col)
-
-    obj = join_and_name(parts, f"{asset_name}_{lod_key}")
-    set_origin_start_face_ground(obj)
-    apply_bevel(obj, 0.008 if lod_key != "lod2" else 0.0)
-    bpy.context.view_layer.objects.active = obj
-    obj.select_set(True)
-    bpy.ops.object.convert(target="MESH")
-    obj.select_set(False)
-    shade_smooth_with_autosmooth(obj, 35.0)
-    add_custom_props(obj, "visual" if lod_key == "lod0" else "visual_lod")
-    assign_material(obj, get_or_create_material("Warehouse_Roof", (0.25, 0.27, 0.29, 1.0), 0.65, 0.15))
-    return obj
+def build_roof_shell(asset_name: str, length: float, col: bpy.types.Collection, roof_type: str = "flat") -> Dict:
+    shell = new_shell(asset_name, 0.008, ("Warehouse_Roof", (0.25, 0.27, 0.29, 1.0), 0.65, 0.15))
+    add_roof_parts(shell, asset_name, 6.0, length, 0.0, roof_type, col)
+    return shell
 
 
-def build_roller_door_module(asset_name: str, width: float, lod_key: str, col: bpy.types.Collection, is_open: bool = False) -> bpy.types.Object:
-    s = LOD_SETTINGS[lod_key]
+def build_roller_door_shell(asset_name: str, width: float, col: bpy.types.Collection, is_open: bool = False) -> Dict:
+    shell = new_shell(asset_name, 0.007, ("Warehouse_Door", (0.42, 0.44, 0.46, 1.0), 0.55, 0.2))
     height = ROLLER_DOOR_HEIGHT
     panel_t = 0.10
     frame_t = 0.18
-    parts: List[bpy.types.Object] = []
 
-    left = add_box_part(f"{asset_name}__frame_l", (frame_t, panel_t, height), (-width * 0.5 + frame_t * 0.5, panel_t * 0.5, height * 0.5), col)
-    right = add_box_part(f"{asset_name}__frame_r", (frame_t, panel_t, height), (width * 0.5 - frame_t * 0.5, panel_t * 0.5, height * 0.5), col)
-    top = add_box_part(f"{asset_name}__frame_t", (width, panel_t, frame_t), (0.0, panel_t * 0.5, height - frame_t * 0.5), col)
+    add_shell_part(shell, add_box_part(f"{asset_name}__frame_l", (frame_t, panel_t, height), (-width * 0.5 + frame_t * 0.5, panel_t * 0.5, height * 0.5), col))
+    add_shell_part(shell, add_box_part(f"{asset_name}__frame_r", (frame_t, panel_t, height), (width * 0.5 - frame_t * 0.5, panel_t * 0.5, height * 0.5), col))
+    add_shell_part(shell, add_box_part(f"{asset_name}__frame_t", (width, panel_t, frame_t), (0.0, panel_t * 0.5, height - frame_t * 0.5), col))
     if is_open:
         # Park shutter at the top to create a clear opening to the ground.
         shutter_h = (height - frame_t) * 0.28
@@ -678,91 +728,39 @@ def build_roller_door_module(asset_name: str, width: float, lod_key: str, col: b
         (0.0, panel_t * 0.5, shutter_z),
         col,
     )
-    parts.extend([left, right, top, shutter])
+    add_shell_part(shell, shutter, shutter_slat_detail(asset_name, width, frame_t, shutter_h, shutter_z))
+    return shell
 
-    corr_count = int(s["door_slats"])
-    if corr_count > 0 and s["rib_depth"] > 0.0:
-        z_min = shutter_z - (shutter_h * 0.5) + 0.08
-        z_max = shutter_z + (shutter_h * 0.5) - 0.08
-        groove_t = max(0.01, s["rib_depth"] * 0.9)
-        groove_h = max(0.03, (z_max - z_min) / max(1, corr_count * 2))
-        groove_w = width - frame_t * 2.2
-        cutters: List[bpy.types.Object] = []
-        for i in range(corr_count):
-            z = z_min + (i + 0.5) * ((z_max - z_min) / corr_count)
-            cutters.append(
-                add_box_part(
-                    f"{asset_name}__shutter_hcorr_cut_{i:02d}",
-                    (groove_w, groove_t, groove_h),
-                    (0.0, groove_t * 0.5 - BOOLEAN_OVERLAP_EPS, z),
-                    col,
-                )
-            )
-        apply_boolean_difference(shutter, cutters, f"{asset_name}_{lod_key}_shutter_corr")
 
-    obj = join_and_name(parts, f"{asset_name}_{lod_key}")
-    set_origin_start_face_ground(obj)
-    apply_bevel(obj, 0.007 if lod_key != "lod2" else 0.0)
-    bpy.context.view_layer.objects.active = obj
-    obj.select_set(True)
-    bpy.ops.object.convert(target="MESH")
-    obj.select_set(False)
-    shade_smooth_with_autosmooth(obj, 35.0)
-    add_custom_props(obj, "visual" if lod_key == "lod0" else "visual_lod")
-    assign_material(obj, get_or_create_material("Warehouse_Door", (0.42, 0.44, 0.46, 1.0), 0.55, 0.2))
-    return obj
-
-
-def build_preset_warehouse(asset_name: str, width: float, length: float, door_count: int, lod_key: str,
-                           col: bpy.types.Collection, roof_type: str = "flat",
-                           canopy: bool = False, dock_bumpers: bool = False, wall_height: float = WALL_HEIGHT) -> bpy.types.Object:
-    s = LOD_SETTINGS[lod_key]
-    parts: List[bpy.types.Object] = []
+def build_preset_shell(asset_name: str, width: float, length: float, door_count: int,
+                       col: bpy.types.Collection, roof_type: str = "flat",
+                       canopy: bool = False, dock_bumpers: bool = False, wall_height: float = WALL_HEIGHT) -> Dict:
+    shell = new_shell(asset_name, 0.012, ("Warehouse_Paint", (0.53, 0.55, 0.56, 1.0), 0.72, 0.02))
 
     half_w = width * 0.5
     t = WALL_THICKNESS
     wall_h = wall_height
 
-    # Four perimeter walls.
+    def wall_face(side: str, normal_axis: str, repeat_axis: str, center_x: float, center_y: float,
+                  repeat_min: float, repeat_max: float, face_dir: float) -> List[Dict]:
+        return [{"prefix": asset_name + side, "normal_axis": normal_axis, "repeat_axis": repeat_axis,
+                 "center_x": center_x, "center_y": center_y, "repeat_min": repeat_min, "repeat_max": repeat_max,
+                 "z_min": 0.0, "z_max": wall_h, "face_dir": face_dir, "thickness": t}]
+
+    # Four perimeter walls, with full-height corrugation recesses added per LOD.
     front = add_box_part(f"{asset_name}__front", (width, t, wall_h), (0.0, t * 0.5, wall_h * 0.5), col)
     back = add_box_part(f"{asset_name}__back", (width, t, wall_h), (0.0, length - t * 0.5, wall_h * 0.5), col)
     left = add_box_part(f"{asset_name}__left", (t, length, wall_h), (-half_w + t * 0.5, length * 0.5, wall_h * 0.5), col)
     right = add_box_part(f"{asset_name}__right", (t, length, wall_h), (half_w - t * 0.5, length * 0.5, wall_h * 0.5), col)
-    parts.extend([front, back, left, right])
-    parts.extend(build_roof_parts(asset_name + "_roof", width, length, wall_h, roof_type, lod_key, col))
-
-    # Full-height corrugation recesses on all wall faces.
-    if s["rib_spacing"] > 0.0 and s["rib_depth"] > 0.0:
-        # Front/back walls (repeat across X)
-        fb_cutters = []
-        fb_cutters += create_vertical_corrugation_cutters(
-            asset_name + "_front_posy", "Y", "X", 0.0, t * 0.5,
-            -width * 0.5 + 0.1, width * 0.5 - 0.1, 0.0, wall_h,
-            s["rib_depth"], s["rib_spacing"], -1.0, t, col
-        )
-        apply_boolean_difference(front, fb_cutters, f"{asset_name}_{lod_key}_front_corr")
-
-        bb_cutters = []
-        bb_cutters += create_vertical_corrugation_cutters(
-            asset_name + "_back_negy", "Y", "X", 0.0, length - t * 0.5,
-            -width * 0.5 + 0.1, width * 0.5 - 0.1, 0.0, wall_h,
-            s["rib_depth"], s["rib_spacing"], 1.0, t, col
-        )
-        apply_boolean_difference(back, bb_cutters, f"{asset_name}_{lod_key}_back_corr")
-
-        # Side walls (repeat across Y)
-        left_cutters = create_vertical_corrugation_cutters(
-            asset_name + "_left_negx", "X", "Y", -half_w + t * 0.5, length * 0.5,
-            0.1, length - 0.1, 0.0, wall_h,
-            s["rib_depth"], s["rib_spacing"], -1.0, t, col
-        )
-        right_cutters = create_vertical_corrugation_cutters(
-            asset_name + "_right_posx", "X", "Y", half_w - t * 0.5, length * 0.5,
-            0.1, length - 0.1, 0.0, wall_h,
-            s["rib_depth"], s["rib_spacing"], 1.0, t, col
-        )
-        apply_boolean_difference(left, left_cutters, f"{asset_name}_{lod_key}_left_corr")
-        apply_boolean_difference(right, right_cutters, f"{asset_name}_{lod_key}_right_corr")
+    add_shell_part(shell, front, wall_corrugation_detail(f"{asset_name}_front", wall_face(
+        "_front_posy", "Y", "X", 0.0, t * 0.5, -width * 0.5 + 0.1, width * 0.5 - 0.1, -1.0)))
+    add_shell_part(shell, back, wall_corrugation_detail(f"{asset_name}_back", wall_face(
+        "_back_negy", "Y", "X", 0.0, length - t * 0.5, -width * 0.5 + 0.1, width * 0.5 - 0.1, 1.0)))
+    add_shell_part(shell, left, wall_corrugation_detail(f"{asset_name}_left", wall_face(
+        "_left_negx", "X", "Y", -half_w + t * 0.5, length * 0.5, 0.1, length - 0.1, -1.0)))
+    add_shell_part(shell, right, wall_corrugation_detail(f"{asset_name}_right", wall_face(
+        "_right_posx", "X", "Y", half_w - t * 0.5, length * 0.5, 0.1, length - 0.1, 1.0)))
+    add_roof_parts(shell, asset_name + "_roof", width, length, wall_h, roof_type, col)
 
     # Front roller-door facades.
     door_w = 4.6
@@ -773,7 +771,7 @@ def build_preset_warehouse(asset_name: str, width: float, length: float, door_co
         start = -span * 0.5
         door_xs = [start + i * (span / (door_count - 1)) for i in range(door_count)]
 
-    # Cut exact openings in the front wall for roller doors.
+    # Cut exact openings in the front wall for roller doors, once for all LODs.
     opening_cutters: List[bpy.types.Object] = []
     for i, dx in enumerate(door_xs):
         opening_cutters.append(
@@ -784,12 +782,14 @@ def build_preset_warehouse(asset_name: str, width: float, length: float, door_co
                 col,
             )
         )
-    apply_boolean_difference(front, opening_cutters, f"{asset_name}_{lod_key}_front_openings")
+    shell["holes"].extend(colliders.from_object(cutter) for cutter in opening_cutters)
+    apply_boolean_difference(front, opening_cutters, f"{asset_name}_front_openings")
+
+    # Every door is the same, so each LOD finishes one and places it at every opening.
+    door_shell = build_roller_door_shell(f"{asset_name}__door", door_w, col, is_open=False)
+    shell["children"].append((door_shell, [(dx, -0.05, 0.0) for dx in door_xs]))
 
     for i, dx in enumerate(door_xs):
-        door = build_roller_door_module(f"{asset_name}__door{i}", door_w, lod_key, col, is_open=False)
-        door.location = (dx, -0.05, 0.0)
-        parts.append(door)
         if canopy:
             can = add_box_part(
                 f"{asset_name}__canopy_{i}",
@@ -797,7 +797,7 @@ def build_preset_warehouse(asset_name: str, width: float, length: float, door_co
                 (dx, -0.7, ROLLER_DOOR_HEIGHT + 0.4),
                 col,
             )
-            parts.append(can)
+            add_shell_part(shell, can)
         if dock_bumpers:
             bump_w = 0.20
             bump_h = 0.95
@@ -814,7 +814,8 @@ def build_preset_warehouse(asset_name: str, width: float, length: float, door_co
                 (dx + (door_w * 0.5 - 0.25), -0.08, bump_h * 0.5),
                 col,
             )
-            parts.extend([left_bump, right_bump])
+            add_shell_part(shell, left_bump)
+            add_shell_part(shell, right_bump)
 
     # Rear personnel door (2.0m x 0.6m), attached on back face.
     p_w = 0.6
@@ -831,36 +832,18 @@ def build_preset_warehouse(asset_name: str, width: float, length: float, door_co
         (p_x, p_y, p_z),
         col,
     )
-    apply_boolean_difference(back, [p_opening], f"{asset_name}_{lod_key}_personnel_opening")
+    shell["holes"].append(colliders.from_object(p_opening))
+    apply_boolean_difference(back, [p_opening], f"{asset_name}_personnel_opening")
 
     p_face_y = length + p_t * 0.5
     p_frame = add_box_part(f"{asset_name}__personnel_frame", (p_w + 0.14, p_t + 0.02, p_h + 0.14), (p_x, p_face_y, p_z), col)
     p_panel = add_box_part(f"{asset_name}__personnel_panel", (p_w, p_t * 0.7, p_h), (p_x, p_face_y + 0.012, p_z), col)
-    parts.extend([p_frame, p_panel])
+    add_shell_part(shell, p_frame)
+    add_shell_part(shell, p_panel, personnel_door_detail(asset_name, p_w, p_h, p_x, p_y, p_z))
     # Add simple handle/lock plate detail.
-    handle = add_box_part(f"{asset_name}__personnel_handle", (0.04, 0.02, 0.14), (p_x + p_w * 0.33, p_face_y + 0.03, 0.95), col)
-    latch = add_box_part(f"{asset_name}__personnel_latch", (0.08, 0.015, 0.04), (p_x + p_w * 0.33, p_face_y + 0.03, 1.05), col)
-    parts.extend([handle, latch])
-    if s["rib_depth"] > 0.0:
-        band_t = max(0.01, s["rib_depth"] * 0.8)
-        pd_cutters = [
-            add_box_part(f"{asset_name}__pd_cut_l", (0.06, band_t, p_h - 0.08), (p_x - p_w * 0.5 + 0.05, p_y + 0.01 + band_t * 0.5, p_z), col),
-            add_box_part(f"{asset_name}__pd_cut_r", (0.06, band_t, p_h - 0.08), (p_x + p_w * 0.5 - 0.05, p_y + 0.01 + band_t * 0.5, p_z), col),
-            add_box_part(f"{asset_name}__pd_cut_t", (p_w - 0.08, band_t, 0.08), (p_x, p_y + 0.01 + band_t * 0.5, p_h - 0.04), col),
-        ]
-        apply_boolean_difference(p_panel, pd_cutters, f"{asset_name}_{lod_key}_pd_corr")
-
-    obj = join_and_name(parts, f"{asset_name}_{lod_key}")
-    set_origin_start_face_ground(obj)
-    apply_bevel(obj, 0.012 if lod_key != "lod2" else 0.0)
-    bpy.context.view_layer.objects.active = obj
-    obj.select_set(True)
-    bpy.ops.object.convert(target="MESH")
-    obj.select_set(False)
-    shade_smooth_with_autosmooth(obj, 35.0)
-    add_custom_props(obj, "visual" if lod_key == "lod0" else "visual_lod")
-    assign_material(obj, get_or_create_material("Warehouse_Paint", (0.53, 0.55, 0.56, 1.0), 0.72, 0.02))
-    return obj
+    add_shell_part(shell, add_box_part(f"{asset_name}__personnel_handle", (0.04, 0.02, 0.14), (p_x + p_w * 0.33, p_face_y + 0.03, 0.95), col))
+    add_shell_part(shell, add_box_part(f"{asset_name}__personnel_latch", (0.08, 0.015, 0.04), (p_x + p_w * 0.33, p_face_y + 0.03, 1.05), col))
+    return shell
 
 
 # ------------------------------------------------------------
@@ -886,48 +869,65 @@ def add_preset_snaps(asset_name: str, obj: bpy.types.Object, col: bpy.types.Coll
     create_snap_empty(f"SNAP_TOP_{asset_name}", (cx, cy, max_z), obj, col)
 
 
+def build_asset_shell(defn: Dict, col: bpy.types.Collection) -> Optional[Dict]:
+    name = defn["name"]
+    kind = defn["kind"]
+    if kind == "wall":
+        return build_wall_shell(name, defn["length"], col)
+    if kind == "roof":
+        return build_roof_shell(name, defn["length"], col, roof_type=defn.get("roof_type", "flat"))
+    if kind == "door":
+        return build_roller_door_shell(name, defn["width"], col, is_open=bool(defn.get("open", False)))
+    if kind == "preset":
+        return build_preset_shell(
+            name,
+            defn["width"],
+            defn["length"],
+            defn["door_count"],
+            col,
+            roof_type=defn.get("roof_type", "flat"),
+            canopy=bool(defn.get("canopy", False)),
+            dock_bumpers=bool(defn.get("dock_bumpers", False)),
+            wall_height=float(defn.get("wall_height", WALL_HEIGHT)),
+        )
+    return None
+
+
+@trace.traced
 def build_asset_lods(defn: Dict, col: bpy.types.Collection):
     name = defn["name"]
     kind = defn["kind"]
 
+    # Walls, openings and door placement are LOD-independent: build them
+    # once and derive every LOD from copies of the shell.
+    shell = build_asset_shell(defn, col)
+    if shell is None:
+        return None
+
+    parts = shell_colliders(shell)
     built = {}
     for lod in ENABLED_LODS:
-        if kind == "wall":
-            obj = build_wall_module(name, defn["length"], lod, col)
-        elif kind == "roof":
-            obj = build_roof_module(name, defn["length"], lod, col, roof_type=defn.get("roof_type", "flat"))
-        elif kind == "door":
-            obj = build_roller_door_module(name, defn["width"], lod, col, is_open=bool(defn.get("open", False)))
-        elif kind == "preset":
-            obj = build_preset_warehouse(
-                name,
-                defn["width"],
-                defn["length"],
-                defn["door_count"],
-                lod,
-                col,
-                roof_type=defn.get("roof_type", "flat"),
-                canopy=bool(defn.get("canopy", False)),
-                dock_bumpers=bool(defn.get("dock_bumpers", False)),
-                wall_height=float(defn.get("wall_height", WALL_HEIGHT)),
-            )
-        else:
-            continue
-
+        obj = build_lod(shell, lod, col)
         obj["asset_name"] = name
         obj["lod"] = int(lod[-1])
         obj["asset_kind"] = kind
         built[lod] = obj
+    remove_shell(shell)
 
     if "lod0" not in built:
         return None
 
+    for lod in ("lod1", "lod2"):
+        if lod in built and LOD_SETTINGS[lod]["bake_size"] > 0:
+            normal_bake.bake_normals(built["lod0"], built[lod], f"{name}_{lod}_normal",
+                                     LOD_SETTINGS[lod]["bake_size"], BAKE_CAGE_EXTRUSION)
+
     for lod in ("lod1", "lod2"):
         if lod in built:
             built[lod].parent = built["lod0"]
             built[lod].matrix_parent_inverse = built["lod0"].matrix_world.inverted()
 
-    create_collider_from_bounds(built["lod0"], name, col)
+    create_compound_collider(built["lod0"], name, parts, col)
     if kind == "preset":
         add_preset_snaps(name, built["lod0"], col)
     else:
@@ -939,27 +939,44 @@ def build_asset_lods(defn: Dict, col: bpy.types.Collection):
 # ------------------------------------------------------------
 # Main
 # ------------------------------------------------------------
-def main():
+def enabled_items() -> List[Dict]:
+    items = MODULES + PRESETS
+    if EXPORT_MODE == "modules_only":
+        items = MODULES
+    elif EXPORT_MODE == "presets_only":
+        items = PRESETS
+    return [item for item in items if item.get("enabled", True)]
+
+
+def asset_names() -> List[str]:
+    # Unit of work for the parallel builder in build_kits.py.
+    return [item["name"] for item in enabled_items()]
+
+
+def finalize():
+    """Pack every baked LOD in the kit collection into the shared normal atlas."""
+    col = bpy.data.collections.get(COLLECTION_NAME)
+    if col is not None:
+        normal_bake.pack_atlas({obj.data for obj in col.all_objects if obj.type == "MESH"}, NORMAL_ATLAS_NAME)
+
+
+def main(only: Optional[Iterable[str]] = None):
     ensure_units_meters()
     purge_warehouse_objects()
     wipe_collection(COLLECTION_NAME)
     col = get_or_create_collection(COLLECTION_NAME)
 
+    wanted = set(only) if only is not None else None
     created = 0
 
-    items = MODULES + PRESETS
-    if EXPORT_MODE == "modules_only":
-        items = MODULES
-    elif EXPORT_MODE == "presets_only":
-        items = PRESETS
-
-    for item in items:
-        if not item.get("enabled", True):
+    for item in enabled_items():
+        if wanted is not None and item["name"] not in wanted:
             continue
-        root = build_asset_lods(item, col)
-        if root:
+        objs = build_cache.build_or_restore(ASSET_TYPE, item, build_asset_lods, col)
+        if objs:
             created += 1
 
+    finalize()
     print(f"Created {created} warehouse assets in collection '{COLLECTION_NAME}'.")
 
 
@@ -1,9 +1,14 @@
 'use client';
 
 import { useFrame } from '@react-three/fiber';
-import React, { useRef, useMemo, useEffect } from 'react';
+import React, { useRef, useMemo, useEffect, useState } from 'react';
 import * as THREE from 'three';
 
+import {
+  fetchSeabedHeightmap,
+  type SeabedHeightmap,
+} from '../../lib/tiles/seabedHeightmap';
+
 // Import shader code
 import causticsFragmentShader from './shaders/caustics.frag';
 import causticsVertexShader from './shaders/caustics.vert';
@@ -18,10 +23,17 @@ interface OceanFloorProps {
   causticsColor?: string;
   causticsIntensity?: number;
   causticsSpeed?: number;
+  /**
+   * Seabed tile (.hmap from scripts/assets/seabed_kit.py). When set, the
+   * floor becomes a flat grid at the tile's resolution that the vertex
+   * shader displaces, placed at the tile's origin relative to position.
+   */
+  heightmapUrl?: string;
 }
 
 /**
- * Renders the ocean floor with sand texture and dynamic caustics effect
+ * Renders the ocean floor with sand texture and dynamic caustics effect,
+ * optionally displaced by a seabed heightmap tile
  */
 function OceanFloor({
   size = 100000,
@@ -30,11 +42,33 @@ function OceanFloor({
   causticsColor = '#ffffff',
   causticsIntensity = 0.3,
   causticsSpeed = 0.2,
+  heightmapUrl,
 }: OceanFloorProps): React.ReactElement {
   const meshRef = useRef<THREE.Mesh>(null);
   const materialRef = useRef<THREE.ShaderMaterial>(null);
 
   const disposables = useRef<Array<{ dispose: () => void }>>([]);
+  const [heightmap, setHeightmap] = useState<SeabedHeightmap | null>(null);
+
+  // Load seabed heightmap tile
+  useEffect(() => {
+    if (!heightmapUrl) {
+      setHeightmap(null);
+      return;
+    }
+    let cancelled = false;
+    fetchSeabedHeightmap(heightmapUrl)
+      .then(map => {
+        if (!cancelled) setHeightmap(map);
+      })
+      .catch(error => {
+        console.error(error);
+        if (!cancelled) setHeightmap(null);
+      });
+    return () => {
+      cancelled = true;
+    };
+  }, [heightmapUrl]);
 
   // Load sand texture
   const texture = useMemo(() => {
@@ -46,12 +80,42 @@ function OceanFloor({
     return tex;
   }, [textureUrl]);
 
-  // Create geometry
+  // Create geometry: one vertex per heightmap sample, spanning the tile from
+  // its origin corner; otherwise a single large quad centred on position.
   const geometry = useMemo(() => {
+    if (heightmap) {
+      const segments = heightmap.samples - 1;
+      const geo = new THREE.PlaneGeometry(
+        heightmap.tileSize,
+        heightmap.tileSize,
+        segments,
+        segments,
+      );
+      geo.translate(heightmap.tileSize / 2, heightmap.tileSize / 2, 0);
+      disposables.current.push(geo);
+      return geo;
+    }
     const geo = new THREE.PlaneGeometry(size, size);
     disposables.current.push(geo);
     return geo;
-  }, [size]);
+  }, [size, heightmap]);
+
+  // Heightmap texture sampled in the vertex shader
+  const heightTexture = useMemo(() => {
+    if (!heightmap) return null;
+    const tex = new THREE.DataTexture(
+      heightmap.values,
+      heightmap.samples,
+      heightmap.samples,
+      THREE.RedFormat,
+      THREE.FloatType,
+    );
+    tex.minFilter = THREE.NearestFilter;
+    tex.magFilter = THREE.NearestFilter;
+    tex.needsUpdate = true;
+    disposables.current.push(tex);
+    return tex;
+  }, [heightmap]);
 
   // Create shader material
   const material = useMemo(() => {
@@ -67,11 +131,33 @@ function OceanFloor({
         uCausticsSpeed: { value: causticsSpeed },
         uCausticsThickness: { value: 0.4 },
         uCausticsOffset: { value: 0.75 },
+        uHeightmap: { value: heightTexture },
+        uHeightmapSize: { value: heightmap ? heightmap.samples : 1 },
+        uHeightRange: {
+          value: heightmap
+            ? new THREE.Vector2(heightmap.minZ, heightmap.maxZ)
+            : new THREE.Vector2(0, 0),
+        },
+        uUseHeightmap: { value: heightmap ? 1 : 0 },
       },
     });
     disposables.current.push(mat);
     return mat;
-  }, [texture, causticsColor, causticsIntensity, causticsSpeed]);
+  }, [
+    texture,
+    causticsColor,
+    causticsIntensity,
+    causticsSpeed,
+    heightmap,
+    heightTexture,
+  ]);
+
+  // Blender tiles are Z-up: their +Y runs along -Z once the plane is laid flat
+  const meshPosition = useMemo<[number, number, number]>(() => {
+    if (!heightmap) return position;
+    const [ox, oy, oz] = heightmap.origin;
+    return [position[0] + ox, position[1] + oz, position[2] - oy];
+  }, [position, heightmap]);
 
   // Update time uniform in animation loop
   useFrame((_, delta) => {
@@ -95,7 +181,7 @@ function OceanFloor({
   return (
     <mesh
       ref={meshRef}
-      position={position}
+      position={meshPosition}
       rotation={[-Math.PI / 2, 0, 0]}
       receiveShadow
     >
@@ -1,6 +1,18 @@
+uniform sampler2D uHeightmap;
+uniform float uHeightmapSize;
+uniform vec2 uHeightRange;
+uniform float uUseHeightmap;
+
 varying vec2 vUv;
 
 void main() {
   vUv = uv;
-  gl_Position = projectionMatrix * modelViewMatrix * vec4(position, 1.0);
+  vec3 displaced = position;
+  if (uUseHeightmap > 0.5) {
+    // Grid vertices land exactly on texel centres.
+    vec2 st = (uv * (uHeightmapSize - 1.0) + 0.5) / uHeightmapSize;
+    float h = texture2D(uHeightmap, st).r;
+    displaced.z += mix(uHeightRange.x, uHeightRange.y, h);
+  }
+  gl_Position = projectionMatrix * modelViewMatrix * vec4(displaced, 1.0);
 }
@@ -0,0 +1,215 @@
+// Reader for the asset manifest written by scripts/assets/kitlib/manifest.py
+// next to the exported kit GLBs. manifest.json and manifest.bin hold the
+// same catalogue; the binary form is fixed-size little-endian records:
+//   32-byte header: magic "SSAM", version u32, asset/lod/snap/collider/
+//                   material counts u32, string table bytes u32
+//   assets     72 bytes: name/kit/file string offsets u32, file bytes u32,
+//              bounds min/max f32[6], first/count of lods, snaps,
+//              colliders, materials u32[8]
+//   lods       28 bytes: node u32, lod u32, triangles u32, vertices u32,
+//              byte offset u32, byte length u32, switch distance f32
+//   snaps      32 bytes: name u32, translation f32[3], rotation f32[4]
+//   colliders  48 bytes: name u32, shape u32, center f32[3], size f32[3],
+//              rotation f32[4]
+//   materials  4 bytes: name u32
+//   strings    u16 byte length + UTF-8, addressed by the offsets above
+// Positions are in each asset's root space, glTF axes (Y up).
+
+export const ASSET_MANIFEST_MAGIC = 'SSAM';
+export const ASSET_MANIFEST_VERSION = 1;
+export const ASSET_MANIFEST_HEADER_BYTES = 32;
+
+const ASSET_BYTES = 72;
+const LOD_BYTES = 28;
+const SNAP_BYTES = 32;
+const COLLIDER_BYTES = 48;
+const MATERIAL_BYTES = 4;
+
+export const COLLIDER_SHAPES = ['box', 'cylinder', 'hull'] as const;
+
+type Vec3 = [number, number, number];
+type Quat = [number, number, number, number];
+
+export type ColliderShape = (typeof COLLIDER_SHAPES)[number];
+
+export type ManifestLod = {
+  lod: number;
+  node: string;
+  triangles: number;
+  vertices: number;
+  /** Span of the LOD's mesh data in the GLB, for range requests. */
+  byteOffset: number;
+  byteLength: number;
+  /** Reference-camera switch distance (m); null for LOD0 or unmeasured. */
+  switchDistance: number | null;
+};
+
+export type ManifestSnap = {
+  name: string;
+  /** START, END, TOP, HOOK, ... from SNAP_<KIND>_<asset>. */
+  kind: string;
+  translation: Vec3;
+  rotation: Quat;
+};
+
+export type ManifestCollider = {
+  name: string;
+  shape: ColliderShape;
+  center: Vec3;
+  /** Local extents; a cylinder is (diameter, height, diameter) along Y. */
+  size: Vec3;
+  rotation: Quat;
+};
+
+export type ManifestAsset = {
+  name: string;
+  kit: string;
+  /** GLB path relative to the manifest, or null when not exported. */
+  file: string | null;
+  fileBytes: number;
+  bounds: { min: Vec3; max: Vec3 };
+  lods: ManifestLod[];
+  materials: string[];
+  snaps: ManifestSnap[];
+  /** Compound collider: one primitive per COLLIDER_ node of the asset. */
+  colliders: ManifestCollider[];
+};
+
+export type AssetManifest = {
+  version: number;
+  assets: ManifestAsset[];
+};
+
+const SNAP_KIND = /^SNAP_([A-Z]+)_/;
+
+export function snapKind(name: string): string {
+  return SNAP_KIND.exec(name)?.[1] ?? '';
+}
+
+export function parseAssetManifest(buffer: ArrayBuffer): AssetManifest {
+  if (buffer.byteLength < ASSET_MANIFEST_HEADER_BYTES) {
+    throw new Error('Asset manifest is shorter than its header');
+  }
+  const view = new DataView(buffer);
+  const magic = String.fromCharCode(
+    view.getUint8(0),
+    view.getUint8(1),
+    view.getUint8(2),
+    view.getUint8(3),
+  );
+  if (magic !== ASSET_MANIFEST_MAGIC) {
+    throw new Error(`Not an asset manifest (magic "${magic}")`);
+  }
+  const version = view.getUint32(4, true);
+  if (version !== ASSET_MANIFEST_VERSION) {
+    throw new Error(`Unsupported asset manifest version ${version}`);
+  }
+
+  const [assetCount, lodCount, snapCount, colliderCount, materialCount] = [
+    8, 12, 16, 20, 24,
+  ].map(offset => view.getUint32(offset, true));
+  const stringBytes = view.getUint32(28, true);
+
+  const assetsAt = ASSET_MANIFEST_HEADER_BYTES;
+  const lodsAt = assetsAt + assetCount * ASSET_BYTES;
+  const snapsAt = lodsAt + lodCount * LOD_BYTES;
+  const collidersAt = snapsAt + snapCount * SNAP_BYTES;
+  const materialsAt = collidersAt + colliderCount * COLLIDER_BYTES;
+  const stringsAt = materialsAt + materialCount * MATERIAL_BYTES;
+  if (buffer.byteLength < stringsAt + stringBytes) {
+    throw new Error('Asset manifest truncated');
+  }
+
+  const decoder = new TextDecoder('utf-8');
+  const string = (offset: number) => {
+    const at = stringsAt + offset;
+    const length = view.getUint16(at, true);
+    return decoder.decode(new Uint8Array(buffer, at + 2, length));
+  };
+  const u32 = (at: number) => view.getUint32(at, true);
+  const f32 = (at: number) => view.getFloat32(at, true);
+  const vec3 = (at: number): Vec3 => [f32(at), f32(at + 4), f32(at + 8)];
+  const quat = (at: number): Quat => [
+    f32(at),
+    f32(at + 4),
+    f32(at + 8),
+    f32(at + 12),
+  ];
+  const range = <T>(
+    first: number,
+    count: number,
+    read: (index: number) => T,
+  ): T[] => Array.from({ length: count }, (_, i) => read(first + i));
+
+  const readLod = (i: number): ManifestLod => {
+    const at = lodsAt + i * LOD_BYTES;
+    const switchDistance = f32(at + 24);
+    return {
+      node: string(u32(at)),
+      lod: u32(at + 4),
+      triangles: u32(at + 8),
+      vertices: u32(at + 12),
+      byteOffset: u32(at + 16),
+      byteLength: u32(at + 20),
+      switchDistance: Number.isNaN(switchDistance) ? null : switchDistance,
+    };
+  };
+  const readSnap = (i: number): ManifestSnap => {
+    const at = snapsAt + i * SNAP_BYTES;
+    const name = string(u32(at));
+    return {
+      name,
+      kind: snapKind(name),
+      translation: vec3(at + 4),
+      rotation: quat(at + 16),
+    };
+  };
+  const readCollider = (i: number): ManifestCollider => {
+    const at = collidersAt + i * COLLIDER_BYTES;
+    const shape = COLLIDER_SHAPES[u32(at + 4)];
+    if (!shape) throw new Error(`Unknown collider shape ${u32(at + 4)}`);
+    return {
+      name: string(u32(at)),
+      shape,
+      center: vec3(at + 8),
+      size: vec3(at + 20),
+      rotation: quat(at + 32),
+    };
+  };
+  const readMaterial = (i: number) =>
+    string(u32(materialsAt + i * MATERIAL_BYTES));
+
+  const assets = range(0, assetCount, i => {
+    const at = assetsAt + i * ASSET_BYTES;
+    const file = string(u32(at + 8));
+    const counts = (slot: number) => [
+      u32(at + 40 + slot * 8),
+      u32(at + 44 + slot * 8),
+    ];
+    const [firstLod, lods] = counts(0);
+    const [firstSnap, snaps] = counts(1);
+    const [firstCollider, colliders] = counts(2);
+    const [firstMaterial, materials] = counts(3);
+    return {
+      name: string(u32(at)),
+      kit: string(u32(at + 4)),
+      file: file || null,
+      fileBytes: u32(at + 12),
+      bounds: { min: vec3(at + 16), max: vec3(at + 28) },
+      lods: range(firstLod, lods, readLod),
+      materials: range(firstMaterial, materials, readMaterial),
+      snaps: range(firstSnap, snaps, readSnap),
+      colliders: range(firstCollider, colliders, readCollider),
+    };
+  });
+
+  return { version, assets };
+}
+
+export async function fetchAssetManifest(url: string): Promise<AssetManifest> {
+  const response = await fetch(url);
+  if (!response.ok) {
+    throw new Error(`Failed to load asset manifest ${url}: ${response.status}`);
+  }
+  return parseAssetManifest(await response.arrayBuffer());
+}
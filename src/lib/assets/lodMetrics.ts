@@ -0,0 +1,74 @@
+// LOD switch distances measured by scripts/assets/kitlib/lod_metrics.py.
+// The kits store them on each asset's lod0 node (glTF extras / build
+// report) for a reference camera; at a switch distance the next LOD's
+// surface error covers at most `pixelError` pixels. Distances scale with
+// viewport height and inversely with tan(fov / 2) and the pixel budget.
+
+export type AssetLodMetrics = {
+  /** Distance (m) at which to switch to lod1, lod2, ... in order. */
+  switchDistances: number[];
+  referenceFovDeg: number;
+  referenceHeightPx: number;
+  pixelError: number;
+};
+
+export type LodCamera = {
+  fovDeg: number;
+  viewportHeightPx: number;
+  /** Allowed screen-space error in pixels; defaults to the reference. */
+  pixelError?: number;
+};
+
+const isFiniteNumber = (value: unknown): value is number =>
+  typeof value === 'number' && Number.isFinite(value);
+
+export function parseAssetLodMetrics(
+  extras: Record<string, unknown> | null | undefined,
+): AssetLodMetrics | null {
+  if (!extras) return null;
+  const distances = extras.lod_switch_distances;
+  const fov = extras.lod_reference_fov_deg;
+  const height = extras.lod_reference_height_px;
+  const pixelError = extras.lod_pixel_error;
+  if (
+    !Array.isArray(distances) ||
+    !distances.every(isFiniteNumber) ||
+    !isFiniteNumber(fov) ||
+    !isFiniteNumber(height) ||
+    !isFiniteNumber(pixelError)
+  ) {
+    return null;
+  }
+  return {
+    switchDistances: distances,
+    referenceFovDeg: fov,
+    referenceHeightPx: height,
+    pixelError,
+  };
+}
+
+const halfFovTan = (fovDeg: number) => Math.tan((fovDeg * Math.PI) / 360);
+
+export function scaleSwitchDistances(
+  metrics: AssetLodMetrics,
+  camera: LodCamera,
+): number[] {
+  const pixelError = camera.pixelError ?? metrics.pixelError;
+  const scale =
+    (camera.viewportHeightPx / metrics.referenceHeightPx) *
+    (halfFovTan(metrics.referenceFovDeg) / halfFovTan(camera.fovDeg)) *
+    (metrics.pixelError / pixelError);
+  return metrics.switchDistances.map(distance => distance * scale);
+}
+
+/** Index of the coarsest LOD whose switch distance `distance` has reached. */
+export function selectAssetLod(
+  distance: number,
+  switchDistances: number[],
+): number {
+  let lod = 0;
+  while (lod < switchDistances.length && distance >= switchDistances[lod]) {
+    lod += 1;
+  }
+  return lod;
+}
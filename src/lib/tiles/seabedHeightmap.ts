@@ -0,0 +1,79 @@
+// Reader for the seabed .hmap tiles written by scripts/assets/seabed_kit.py
+// (kitlib/heightfield.py). Layout, little-endian:
+//   32-byte header: magic "SBHM", version u16, samples per side u16,
+//                   origin x/y/z f32, tile size f32, min z f32, max z f32
+//   samples * samples uint16 heights, rows along +Y, columns along +X
+// Coordinates are Blender's (Z up); height = minZ + q / 65535 * (maxZ - minZ).
+
+export const SEABED_HEIGHTMAP_MAGIC = 'SBHM';
+export const SEABED_HEIGHTMAP_VERSION = 1;
+export const SEABED_HEIGHTMAP_HEADER_BYTES = 32;
+
+export type SeabedHeightmap = {
+  samples: number;
+  origin: [number, number, number];
+  tileSize: number;
+  minZ: number;
+  maxZ: number;
+  /** Heights normalized to 0..1 across minZ..maxZ, row-major. */
+  values: Float32Array;
+};
+
+export function parseSeabedHeightmap(buffer: ArrayBuffer): SeabedHeightmap {
+  if (buffer.byteLength < SEABED_HEIGHTMAP_HEADER_BYTES) {
+    throw new Error('Seabed heightmap is shorter than its header');
+  }
+  const view = new DataView(buffer);
+  const magic = String.fromCharCode(
+    view.getUint8(0),
+    view.getUint8(1),
+    view.getUint8(2),
+    view.getUint8(3),
+  );
+  if (magic !== SEABED_HEIGHTMAP_MAGIC) {
+    throw new Error(`Not a seabed heightmap (magic "${magic}")`);
+  }
+  const version = view.getUint16(4, true);
+  if (version !== SEABED_HEIGHTMAP_VERSION) {
+    throw new Error(`Unsupported seabed heightmap version ${version}`);
+  }
+
+  const samples = view.getUint16(6, true);
+  const count = samples * samples;
+  if (buffer.byteLength < SEABED_HEIGHTMAP_HEADER_BYTES + count * 2) {
+    throw new Error(
+      `Seabed heightmap truncated: expected ${count} samples of ${samples}x${samples}`,
+    );
+  }
+
+  const values = new Float32Array(count);
+  for (let i = 0; i < count; i += 1) {
+    values[i] =
+      view.getUint16(SEABED_HEIGHTMAP_HEADER_BYTES + i * 2, true) / 65535;
+  }
+
+  return {
+    samples,
+    origin: [
+      view.getFloat32(8, true),
+      view.getFloat32(12, true),
+      view.getFloat32(16, true),
+    ],
+    tileSize: view.getFloat32(20, true),
+    minZ: view.getFloat32(24, true),
+    maxZ: view.getFloat32(28, true),
+    values,
+  };
+}
+
+export async function fetchSeabedHeightmap(
+  url: string,
+): Promise<SeabedHeightmap> {
+  const response = await fetch(url);
+  if (!response.ok) {
+    throw new Error(
+      `Failed to load seabed heightmap ${url}: ${response.status}`,
+    );
+  }
+  return parseSeabedHeightmap(await response.arrayBuffer());
+}
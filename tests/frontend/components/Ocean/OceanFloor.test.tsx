@@ -1,7 +1,9 @@
 import { useFrame } from '@react-three/fiber';
-import { render } from '@testing-library/react';
+import { render, waitFor } from '@testing-library/react';
 import React from 'react';
 
+import { fetchSeabedHeightmap } from '../../../../src/lib/tiles/seabedHeightmap';
+
 type MockTextureShape = {
   wrapS: unknown;
   wrapT: unknown;
@@ -12,11 +14,28 @@ type MockTextureShape = {
 type MockGeometryShape = {
   width: number;
   height: number;
+  widthSegments?: number;
+  heightSegments?: number;
+  translate: jest.Mock;
   dispose: jest.Mock;
 };
 
 type MockMaterialShape = {
-  uniforms: { uTime: { value: number } };
+  uniforms: {
+    uTime: { value: number };
+    uUseHeightmap: { value: number };
+    uHeightmapSize: { value: number };
+    uHeightRange: { value: { x: number; y: number } };
+    uHeightmap: { value: unknown };
+  };
+  dispose: jest.Mock;
+};
+
+type MockDataTextureShape = {
+  data: Float32Array;
+  width: number;
+  height: number;
+  needsUpdate: boolean;
   dispose: jest.Mock;
 };
 
@@ -24,6 +43,7 @@ const testGlobals = globalThis as typeof globalThis & {
   __lastTexture?: MockTextureShape;
   __lastGeometry?: MockGeometryShape;
   __lastShaderMaterial?: MockMaterialShape;
+  __lastDataTexture?: MockDataTextureShape;
 };
 
 jest.mock('../../../../src/components/Ocean/shaders/caustics.vert', () => '', {
@@ -38,6 +58,10 @@ jest.mock('@react-three/fiber', () => ({
   useFrame: jest.fn(),
 }));
 
+jest.mock('../../../../src/lib/tiles/seabedHeightmap', () => ({
+  fetchSeabedHeightmap: jest.fn(),
+}));
+
 jest.mock('three', () => {
   class MockTexture {
     wrapS: unknown = null;
@@ -56,18 +80,35 @@ jest.mock('three', () => {
 
   class MockPlaneGeometry {
     dispose = jest.fn();
+    translate = jest.fn();
     constructor(
       public width: number,
       public height: number,
+      public widthSegments?: number,
+      public heightSegments?: number,
     ) {
       testGlobals.__lastGeometry = this;
     }
   }
 
+  class MockDataTexture {
+    needsUpdate = false;
+    minFilter: unknown = null;
+    magFilter: unknown = null;
+    dispose = jest.fn();
+    constructor(
+      public data: Float32Array,
+      public width: number,
+      public height: number,
+    ) {
+      testGlobals.__lastDataTexture = this;
+    }
+  }
+
   class MockShaderMaterial {
     dispose = jest.fn();
-    uniforms: { uTime: { value: number } };
-    constructor(params: { uniforms: { uTime: { value: number } } }) {
+    uniforms: MockMaterialShape['uniforms'];
+    constructor(params: { uniforms: MockMaterialShape['uniforms'] }) {
       this.uniforms = params.uniforms;
       testGlobals.__lastShaderMaterial = this;
     }
@@ -77,12 +118,24 @@ jest.mock('three', () => {
     constructor(public value: unknown) {}
   }
 
+  class MockVector2 {
+    constructor(
+      public x: number,
+      public y: number,
+    ) {}
+  }
+
   return {
     TextureLoader: MockTextureLoader,
     PlaneGeometry: MockPlaneGeometry,
+    DataTexture: MockDataTexture,
     ShaderMaterial: MockShaderMaterial,
     Color: MockColor,
+    Vector2: MockVector2,
     RepeatWrapping: 'RepeatWrapping',
+    RedFormat: 'RedFormat',
+    FloatType: 'FloatType',
+    NearestFilter: 'NearestFilter',
   };
 });
 
@@ -107,10 +160,57 @@ describe('OceanFloor', () => {
     expect(geometry.height).toBe(50);
 
     expect(material.uniforms.uTime.value).toBe(0);
+    expect(material.uniforms.uUseHeightmap.value).toBe(0);
+    expect(fetchSeabedHeightmap).not.toHaveBeenCalled();
 
     unmount();
     expect(texture.dispose).toHaveBeenCalled();
     expect(geometry.dispose).toHaveBeenCalled();
     expect(material.dispose).toHaveBeenCalled();
   });
+
+  it('displaces a tile-resolution grid with a seabed heightmap', async () => {
+    (useFrame as jest.Mock).mockImplementation(() => undefined);
+    const values = new Float32Array(9).fill(0.5);
+    (fetchSeabedHeightmap as jest.Mock).mockResolvedValue({
+      samples: 3,
+      origin: [25, 50, 0],
+      tileSize: 25,
+      minZ: -0.4,
+      maxZ: 0.4,
+      values,
+    });
+
+    const { unmount } = render(
+      <OceanFloor heightmapUrl="/seabed/tile_x001_y002.hmap" />,
+    );
+
+    await waitFor(() =>
+      expect(
+        testGlobals.__lastShaderMaterial!.uniforms.uUseHeightmap.value,
+      ).toBe(1),
+    );
+    expect(fetchSeabedHeightmap).toHaveBeenCalledWith(
+      '/seabed/tile_x001_y002.hmap',
+    );
+
+    const geometry = testGlobals.__lastGeometry!;
+    expect(geometry.width).toBe(25);
+    expect(geometry.widthSegments).toBe(2);
+    expect(geometry.heightSegments).toBe(2);
+    expect(geometry.translate).toHaveBeenCalledWith(12.5, 12.5, 0);
+
+    const heightTexture = testGlobals.__lastDataTexture!;
+    expect(heightTexture.data).toBe(values);
+    expect(heightTexture.width).toBe(3);
+    expect(heightTexture.needsUpdate).toBe(true);
+
+    const { uniforms } = testGlobals.__lastShaderMaterial!;
+    expect(uniforms.uHeightmap.value).toBe(heightTexture);
+    expect(uniforms.uHeightmapSize.value).toBe(3);
+    expect(uniforms.uHeightRange.value).toEqual({ x: -0.4, y: 0.4 });
+
+    unmount();
+    expect(heightTexture.dispose).toHaveBeenCalled();
+  });
 });
@@ -0,0 +1,105 @@
+import {
+  ASSET_MANIFEST_HEADER_BYTES,
+  parseAssetManifest,
+  snapKind,
+} from '../../../../src/lib/assets/assetManifest';
+
+// kitlib.manifest.pack() output for one bollard with two LODs, one snap,
+// a cylinder collider and one material.
+const FIXTURE_HEX =
+  '5353414d0100000001000000020000000100000001000000010000007a000000' +
+  '000000000b0000001400000000100000000000bf00000000000000bf0000003f' +
+  '0000803f0000003f000000000200000000000000010000000000000001000000' +
+  '00000000010000002b0000000000000078000000500000000004000000080000' +
+  '0000c07f3b00000001000000280000001e000000000c00000002000000004841' +
+  '4b000000000000000000803f000000000000000000000000000000000000803f' +
+  '5f00000001000000000000000000003f000000000000803f0000803f0000803f' +
+  '0000000000000000000000000000803f730000000900626f6c6c6172645f6107' +
+  '00626f6c6c6172641500626f6c6c6172642f626f6c6c6172645f612e676c620e' +
+  '00626f6c6c6172645f615f6c6f64300e00626f6c6c6172645f615f6c6f643112' +
+  '00534e41505f544f505f626f6c6c6172645f611200434f4c4c494445525f626f' +
+  '6c6c6172645f6105004d6574616c';
+
+const fixture = (): ArrayBuffer => {
+  const bytes = new Uint8Array(FIXTURE_HEX.length / 2);
+  for (let i = 0; i < bytes.length; i += 1) {
+    bytes[i] = parseInt(FIXTURE_HEX.slice(i * 2, i * 2 + 2), 16);
+  }
+  return bytes.buffer;
+};
+
+describe('parseAssetManifest', () => {
+  it('reads assets with their lods, snaps, colliders and materials', () => {
+    const manifest = parseAssetManifest(fixture());
+
+    expect(manifest.version).toBe(1);
+    expect(manifest.assets).toHaveLength(1);
+    const [asset] = manifest.assets;
+    expect(asset.name).toBe('bollard_a');
+    expect(asset.kit).toBe('bollard');
+    expect(asset.file).toBe('bollard/bollard_a.glb');
+    expect(asset.fileBytes).toBe(4096);
+    expect(asset.bounds).toEqual({ min: [-0.5, 0, -0.5], max: [0.5, 1, 0.5] });
+    expect(asset.materials).toEqual(['Metal']);
+
+    expect(asset.lods).toEqual([
+      {
+        lod: 0,
+        node: 'bollard_a_lod0',
+        triangles: 120,
+        vertices: 80,
+        byteOffset: 1024,
+        byteLength: 2048,
+        switchDistance: null,
+      },
+      {
+        lod: 1,
+        node: 'bollard_a_lod1',
+        triangles: 40,
+        vertices: 30,
+        byteOffset: 3072,
+        byteLength: 512,
+        switchDistance: 12.5,
+      },
+    ]);
+    expect(asset.snaps).toEqual([
+      {
+        name: 'SNAP_TOP_bollard_a',
+        kind: 'TOP',
+        translation: [0, 1, 0],
+        rotation: [0, 0, 0, 1],
+      },
+    ]);
+    expect(asset.colliders).toEqual([
+      {
+        name: 'COLLIDER_bollard_a',
+        shape: 'cylinder',
+        center: [0, 0.5, 0],
+        size: [1, 1, 1],
+        rotation: [0, 0, 0, 1],
+      },
+    ]);
+  });
+
+  it('rejects foreign, newer or truncated files', () => {
+    const foreign = fixture();
+    new DataView(foreign).setUint8(0, 'G'.charCodeAt(0));
+    expect(() => parseAssetManifest(foreign)).toThrow(/magic/);
+
+    const newer = fixture();
+    new DataView(newer).setUint32(4, 2, true);
+    expect(() => parseAssetManifest(newer)).toThrow(/version 2/);
+
+    expect(() =>
+      parseAssetManifest(fixture().slice(0, ASSET_MANIFEST_HEADER_BYTES - 1)),
+    ).toThrow(/header/);
+    expect(() => parseAssetManifest(fixture().slice(0, 200))).toThrow(
+      /truncated/,
+    );
+  });
+
+  it('derives snap kinds from the naming convention', () => {
+    expect(snapKind('SNAP_HOOK_tire_fender_single')).toBe('HOOK');
+    expect(snapKind('COLLIDER_bollard_a')).toBe('');
+  });
+});
@@ -0,0 +1,77 @@
+import {
+  parseAssetLodMetrics,
+  scaleSwitchDistances,
+  selectAssetLod,
+} from '../../../../src/lib/assets/lodMetrics';
+
+const extras = {
+  lod_switch_distances: [12, 80],
+  lod_reference_fov_deg: 55,
+  lod_reference_height_px: 1080,
+  lod_pixel_error: 1,
+};
+
+const referenceMetrics = () => {
+  const metrics = parseAssetLodMetrics(extras);
+  if (!metrics) throw new Error('expected metrics');
+  return metrics;
+};
+
+describe('lodMetrics', () => {
+  it('parses metrics from lod0 extras', () => {
+    expect(parseAssetLodMetrics(extras)).toEqual({
+      switchDistances: [12, 80],
+      referenceFovDeg: 55,
+      referenceHeightPx: 1080,
+      pixelError: 1,
+    });
+  });
+
+  it('rejects missing or malformed metrics', () => {
+    expect(parseAssetLodMetrics(undefined)).toBeNull();
+    expect(parseAssetLodMetrics({ lod: 0 })).toBeNull();
+    expect(
+      parseAssetLodMetrics({ ...extras, lod_switch_distances: ['12'] }),
+    ).toBeNull();
+  });
+
+  it('keeps reference distances for the reference camera', () => {
+    const metrics = referenceMetrics();
+    const scaled = scaleSwitchDistances(metrics, {
+      fovDeg: 55,
+      viewportHeightPx: 1080,
+    });
+    expect(scaled[0]).toBeCloseTo(12);
+    expect(scaled[1]).toBeCloseTo(80);
+  });
+
+  it('scales with resolution, field of view and pixel budget', () => {
+    const metrics = referenceMetrics();
+    const taller = scaleSwitchDistances(metrics, {
+      fovDeg: 55,
+      viewportHeightPx: 2160,
+    });
+    expect(taller[0]).toBeCloseTo(24);
+
+    const looser = scaleSwitchDistances(metrics, {
+      fovDeg: 55,
+      viewportHeightPx: 1080,
+      pixelError: 2,
+    });
+    expect(looser[1]).toBeCloseTo(40);
+
+    const zoomed = scaleSwitchDistances(metrics, {
+      fovDeg: 30,
+      viewportHeightPx: 1080,
+    });
+    expect(zoomed[0]).toBeGreaterThan(12);
+  });
+
+  it('selects the coarsest LOD whose switch distance is reached', () => {
+    expect(selectAssetLod(0, [12, 80])).toBe(0);
+    expect(selectAssetLod(11.9, [12, 80])).toBe(0);
+    expect(selectAssetLod(12, [12, 80])).toBe(1);
+    expect(selectAssetLod(500, [12, 80])).toBe(2);
+    expect(selectAssetLod(5, [])).toBe(0);
+  });
+});
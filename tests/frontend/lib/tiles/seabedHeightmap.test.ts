@@ -0,0 +1,62 @@
+import {
+  SEABED_HEIGHTMAP_HEADER_BYTES,
+  parseSeabedHeightmap,
+} from '../../../../src/lib/tiles/seabedHeightmap';
+
+const buildHeightmap = (
+  samples: number,
+  codes: number[],
+  options: { magic?: string; version?: number } = {},
+): ArrayBuffer => {
+  const buffer = new ArrayBuffer(
+    SEABED_HEIGHTMAP_HEADER_BYTES + codes.length * 2,
+  );
+  const view = new DataView(buffer);
+  const magic = options.magic ?? 'SBHM';
+  for (let i = 0; i < 4; i += 1) view.setUint8(i, magic.charCodeAt(i));
+  view.setUint16(4, options.version ?? 1, true);
+  view.setUint16(6, samples, true);
+  view.setFloat32(8, 25, true);
+  view.setFloat32(12, 50, true);
+  view.setFloat32(16, 0, true);
+  view.setFloat32(20, 25, true);
+  view.setFloat32(24, -0.5, true);
+  view.setFloat32(28, 0.5, true);
+  codes.forEach((code, i) => {
+    view.setUint16(SEABED_HEIGHTMAP_HEADER_BYTES + i * 2, code, true);
+  });
+  return buffer;
+};
+
+describe('parseSeabedHeightmap', () => {
+  it('reads the header and normalizes samples', () => {
+    const map = parseSeabedHeightmap(
+      buildHeightmap(2, [0, 65535, 32768, 16384]),
+    );
+
+    expect(map.samples).toBe(2);
+    expect(map.origin).toEqual([25, 50, 0]);
+    expect(map.tileSize).toBe(25);
+    expect(map.minZ).toBe(-0.5);
+    expect(map.maxZ).toBe(0.5);
+    expect(map.values[0]).toBe(0);
+    expect(map.values[1]).toBe(1);
+    expect(map.values[2]).toBeCloseTo(0.5, 4);
+    expect(map.values[3]).toBeCloseTo(0.25, 4);
+  });
+
+  it('rejects foreign or truncated files', () => {
+    expect(() =>
+      parseSeabedHeightmap(buildHeightmap(2, [0, 0, 0, 0], { magic: 'GLTF' })),
+    ).toThrow('Not a seabed heightmap');
+    expect(() =>
+      parseSeabedHeightmap(buildHeightmap(2, [0, 0, 0, 0], { version: 2 })),
+    ).toThrow('Unsupported seabed heightmap version 2');
+    expect(() => parseSeabedHeightmap(buildHeightmap(3, [0, 0]))).toThrow(
+      'truncated',
+    );
+    expect(() => parseSeabedHeightmap(new ArrayBuffer(8))).toThrow(
+      'shorter than its header',
+    );
+  });
+});